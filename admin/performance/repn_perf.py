@@ -0,0 +1,91 @@
+#
+# This script compares the throughput of the recursive and iterative
+# standard representation collectors
+#
+
+from pyomo.environ import *
+import pyomo.repn.standard_repn as sr
+
+import gc
+import sys
+import time
+import argparse
+
+try:
+    RecursionError
+except:
+    RecursionError = RuntimeError
+
+NTerms = 20
+NExprs = 2000
+N = 5
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--nterms", help="The number of terms in test expressions", action="store", type=int, default=None)
+parser.add_argument("--nexprs", help="The number of test expressions", action="store", type=int, default=None)
+parser.add_argument("--ntrials", help="The number of test trials", action="store", type=int, default=None)
+parser.add_argument("--depth", help="The nesting depth of the deep expression test", action="store", type=int, default=None)
+args = parser.parse_args()
+
+if args.nterms:
+    NTerms = args.nterms
+if args.nexprs:
+    NExprs = args.nexprs
+if args.ntrials:
+    N = args.ntrials
+Depth = args.depth or 5*sys.getrecursionlimit()
+print("NTerms %d   NExprs %d   NTrials %d   Depth %d\n\n" % (NTerms, NExprs, N, Depth))
+
+
+def linear_exprs(m):
+    return [sum(m.p[j]*m.x[j] for j in range(i, i+NTerms)) for i in range(NExprs)]
+
+def quadratic_exprs(m):
+    return [sum(m.p[j]*m.x[j] for j in range(i, i+NTerms)) + m.x[i]*m.x[i+1]
+            + exp(m.x[i]) for i in range(NExprs)]
+
+def nested_exprs(m):
+    return [(m.x[i] + 2*m.x[i+1])*(3 - m.x[i+2]) / (1 + m.p[i]) - m.x[i+3]**2
+            for i in range(NExprs)]
+
+def deep_exprs(m):
+    e = m.x[0]
+    for i in range(1, Depth):
+        e = -(e - 2*m.x[i % (NExprs + NTerms)])
+    return [e]
+
+
+def collect(fn, exprs):
+    sr.Results = sr.ResultsWithQuadratics
+    for e in exprs:
+        fn(e, idMap={None: {}}, repn=sr.StandardRepn())
+
+def measure(fn, exprs):
+    ans = []
+    for i in range(N):
+        gc.collect()
+        start = time.time()
+        try:
+            collect(fn, exprs)
+        except RecursionError:
+            return None
+        ans.append(time.time() - start)
+    return sum(ans) / N
+
+
+m = ConcreteModel()
+m.x = Var(range(NExprs + NTerms), initialize=1)
+m.p = Param(range(NExprs + NTerms), mutable=True, initialize=2)
+
+for name, builder in (('linear', linear_exprs),
+                      ('quadratic', quadratic_exprs),
+                      ('nested', nested_exprs),
+                      ('deep', deep_exprs)):
+    exprs = builder(m)
+    recursive = measure(sr._generate_standard_repn, exprs)
+    iterative = measure(sr._generate_standard_repn_iterative, exprs)
+    if recursive is None:
+        print("%-10s  recursive: RecursionError   iterative: %.4f s" % (name, iterative))
+    else:
+        print("%-10s  recursive: %.4f s   iterative: %.4f s   ratio: %.2f"
+              % (name, recursive, iterative, iterative / recursive))
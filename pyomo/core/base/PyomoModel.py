@@ -44,7 +44,7 @@ from pyomo.common.deprecation import deprecation_warning
 from pyomo.core.expr import expr_common
 from pyomo.core.expr.symbol_map import SymbolMap
 
-from pyomo.core.base.var import _VarData, Var
+from pyomo.core.base.var import _VarData, _ArrayVarData, Var
 from pyomo.core.base.constraint import Constraint
 from pyomo.core.base.objective import Objective
 from pyomo.core.base.set_types import *
@@ -53,11 +53,13 @@ from pyomo.core.base.indexed_component import IndexedComponent
 from pyomo.dataportal import DataPortal
 from pyomo.core.base.plugin import *
 from pyomo.core.base.numvalue import *
+from pyomo.core.base.numvalue import native_integer_types
 from pyomo.core.base.block import SimpleBlock
 from pyomo.core.base.sets import Set
 from pyomo.core.base.component import Component, ComponentUID
 from pyomo.core.base.plugin import ModelComponentFactory, TransformationFactory
 from pyomo.core.base.label import CNameLabeler, CuidLabeler
+from pyomo.core.base.snapshot import save_snapshot
 
 import pyomo.opt
 from pyomo.opt.results import SolverResults, Solution, SolutionStatus, UndefinedData
@@ -125,6 +127,11 @@ class ModelSolution(object):
         #
         for name in ['objective', 'variable', 'constraint', 'problem']:
             self._entry[name] = {}
+        #
+        # arrays[name]: (list of object weakrefs,
+        #                {attribute: sequence of values})
+        #
+        self._arrays = {}
 
     def __getattr__(self, name):
         if name[0] == '_':
@@ -144,7 +151,9 @@ class ModelSolution(object):
     def __getstate__(self):
         state = {
             '_metadata': self._metadata,
-            '_entry': {}
+            '_entry': {},
+            '_arrays': dict((name, self._get_arrays(name))
+                            for name in self._arrays)
         }
         for (name, data) in iteritems(self._entry):
             tmp = state['_entry'][name] = []
@@ -165,12 +174,48 @@ class ModelSolution(object):
 
     def __setstate__(self, state):
         self._metadata = state['_metadata']
+        self._arrays = {}
+        for name, (objs, data) in iteritems(state.get('_arrays', {})):
+            self._arrays[name] = ([weakref_ref(obj) for obj in objs], data)
         self._entry = {}
         for name, data in iteritems(state['_entry']):
             tmp = self._entry[name] = {}
             for obj, entry in data:
                 tmp[ id(obj) ] = ( weakref_ref(obj), entry )
 
+    def _get_arrays(self, name):
+        """
+        Return the objects and the data stored as arrays for 'variable'
+        or 'constraint', without the objects that no longer exist.
+        """
+        refs, data = self._arrays[name]
+        objs = [ref() for ref in refs]
+        if any(obj is None for obj in objs):
+            logger.warn(
+                "%s solution components stored as arrays in '%s' are no "
+                "longer accessible"
+                % (sum(1 for obj in objs if obj is None), name))
+            keep = [i for i, obj in enumerate(objs) if obj is not None]
+            objs = [objs[i] for i in keep]
+            data = dict((key, [values[i] for i in keep])
+                        for key, values in iteritems(data))
+        return objs, data
+
+    def _get_array_entries(self, name):
+        """
+        Return the data stored as arrays for 'variable' or 'constraint'
+        as a dictionary: id -> {attribute: value}.
+        """
+        if name not in self._arrays:
+            return {}
+        objs, data = self._get_arrays(name)
+        columns = [(key, values.tolist() if hasattr(values, 'tolist')
+                    else values)
+                   for key, values in iteritems(data)]
+        return dict((id(obj), dict((key, values[i])
+                                   for key, values in columns))
+                    for i, obj in enumerate(objs))
+
 
 class ModelSolutions(object):
 
@@ -326,6 +371,7 @@ class ModelSolutions(object):
                 vals['Value'] = value(obj)
                 soln.objective[ sm.getSymbol(obj, labeler) ] = vals
             entry = soln_._entry['variable']
+            array_entry = soln_._get_array_entries('variable')
             for obj in instance.component_data_objects(Var, active=True):
                 if obj.stale:
                     continue
@@ -334,15 +380,24 @@ class ModelSolutions(object):
                     vals = {}
                 else:
                     vals = vals[1]
+                if id(obj) in array_entry:
+                    vals = dict(vals)
+                    vals.update(array_entry[id(obj)])
                 vals['Value'] = value(obj)
                 soln.variable[ sm.getSymbol(obj, labeler) ] = vals
             entry = soln_._entry['constraint']
+            array_entry = soln_._get_array_entries('constraint')
             for obj in instance.component_data_objects(Constraint, active=True):
                 vals = entry.get(id(obj), None)
                 if vals is None:
-                    continue
+                    if id(obj) not in array_entry:
+                        continue
+                    vals = {}
                 else:
                     vals = vals[1]
+                if id(obj) in array_entry:
+                    vals = dict(vals)
+                    vals.update(array_entry[id(obj)])
                 soln.constraint[ sm.getSymbol(obj, labeler) ] = vals
             results.solution.insert( soln )
 
@@ -369,6 +424,8 @@ class ModelSolutions(object):
             # Cache symbol names, which might be re-used in subsequent
             # calls to add_solution()
             #
+            if getattr(solution, '_arrays', None):
+                solution.expand_arrays()
             if cache is None:
                 cache = {}
             if solution._cuid:
@@ -440,6 +497,35 @@ class ModelSolutions(object):
 
                     tmp[id(obj())] = (obj, val)
             #
+            # Map solution arrays
+            #
+            for name, (symbols, data) in \
+                    iteritems(getattr(solution, '_arrays', {})):
+                bySymbol = smap.bySymbol
+                aliases = smap.aliases
+                objs = []
+                missing = []
+                for i, symb in enumerate(symbols):
+                    obj = bySymbol.get(symb, None)
+                    if obj is None:
+                        obj = aliases.get(symb, None)
+                        if obj is None:
+                            missing.append(i)
+                            continue
+                    objs.append(obj)
+                if missing:
+                    if not ignore_missing_symbols:          #pragma:nocover
+                        raise RuntimeError(
+                            "ERROR: Symbol %s is missing from "
+                            "model %s when loading with a symbol map!"
+                            % (symbols[missing[0]], instance.name))
+                    missing = set(missing)
+                    positions = [i for i in range(len(symbols))
+                                 if i not in missing]
+                    data = dict((key, [values[i] for i in positions])
+                                for key, values in iteritems(data))
+                soln._arrays[name] = (objs, data)
+            #
             # Wrap up
             #
             if delete_symbol_map:
@@ -449,6 +535,11 @@ class ModelSolutions(object):
         # Collect fixed variables
         #
         tmp = soln._entry['variable']
+        if (default_variable_value is not None) and \
+           ('variable' in soln._arrays):
+            loaded = set(id(ref()) for ref in soln._arrays['variable'][0])
+        else:
+            loaded = ()
         for vdata in instance.component_data_objects(Var):
             id_ = id(vdata)
             if vdata.fixed:
@@ -456,7 +547,8 @@ class ModelSolutions(object):
             elif (default_variable_value is not None) and \
                  (smap_id is not None) and \
                  (id_ in smap.byObject) and \
-                 (id_ not in tmp):
+                 (id_ not in tmp) and \
+                 (id_ not in loaded):
                 tmp[id_] = (weakref_ref(vdata), {'Value':default_variable_value})
 
         self.solutions.append(soln)
@@ -530,20 +622,10 @@ class ModelSolutions(object):
             if vdata.fixed is True:
                 if ignore_fixed_vars:
                     continue
-                if not allow_consistent_values_for_fixed_vars:
-                    msg = "Variable '%s' in model '%s' is currently fixed - new" \
-                          ' value is not expected in solution'
-                    raise TypeError(msg % (vdata.name, instance.name))
-                if math.fabs(val - vdata.value) > comparison_tolerance_for_fixed_vars:
-                    raise TypeError("Variable '%s' in model '%s' is currently "
-                                    "fixed - a value of '%s' in solution is "
-                                    "not within tolerance=%s of the current "
-                                    "value of '%s'"
-                                    % (vdata.name,
-                                       instance.name,
-                                       str(val),
-                                       str(comparison_tolerance_for_fixed_vars),
-                                       str(vdata.value)))
+                self._check_fixed_var_value(
+                    vdata, val,
+                    allow_consistent_values_for_fixed_vars,
+                    comparison_tolerance_for_fixed_vars)
 
             vdata.value = val
             vdata.stale = False
@@ -563,6 +645,163 @@ class ModelSolutions(object):
                 attr_key = _attr_key[0].lower() + _attr_key[1:]
                 if attr_key in valid_import_suffixes:
                     valid_import_suffixes[attr_key][cdata] = attr_value
+        #
+        # Load variable and constraint data stored as arrays
+        #
+        for name in soln._arrays:
+            objs, data = soln._get_arrays(name)
+            if name == 'variable':
+                self._load_variable_values(
+                    objs, data['Value'],
+                    allow_consistent_values_for_fixed_vars,
+                    comparison_tolerance_for_fixed_vars,
+                    ignore_fixed_vars)
+            for _attr_key, attr_values in iteritems(data):
+                attr_key = _attr_key[0].lower() + _attr_key[1:]
+                if (attr_key == 'value') or \
+                   (attr_key not in valid_import_suffixes):
+                    continue
+                suffix = valid_import_suffixes[attr_key]
+                if hasattr(attr_values, 'tolist'):
+                    attr_values = attr_values.tolist()
+                if (name == 'variable') and ignore_fixed_vars:
+                    for vdata, attr_value in zip(objs, attr_values):
+                        if not vdata.fixed:
+                            suffix[vdata] = attr_value
+                else:
+                    for obj, attr_value in zip(objs, attr_values):
+                        suffix[obj] = attr_value
+
+    def load_values(self,
+                    variables,
+                    values,
+                    reduced_costs=None,
+                    constraints=None,
+                    duals=None,
+                    clear=True,
+                    select=True,
+                    **kwds):
+        """
+        Add a solution whose variable values (and optionally reduced
+        costs and constraint duals) are sequences, e.g. NumPy arrays,
+        that are aligned with a list of variables (and constraints).
+        The values are assigned in bulk when the solution is selected,
+        without creating a SolverResults object.  Reduced costs and
+        duals are stored in the active 'rc' and 'dual' import suffixes.
+
+        The remaining keyword arguments are passed to select().  Returns
+        the index of the new solution.
+        """
+        soln = ModelSolution()
+        variables = list(variables)
+        data = {'Value': values}
+        if reduced_costs is not None:
+            data['Rc'] = reduced_costs
+        for key, vals in iteritems(data):
+            if len(vals) != len(variables):
+                raise ValueError(
+                    "The '%s' array has %s values for %s variables"
+                    % (key, len(vals), len(variables)))
+        soln._arrays['variable'] = ([weakref_ref(v) for v in variables], data)
+        if duals is not None:
+            if constraints is None:
+                raise ValueError("The constraints must be specified to "
+                                 "load the duals")
+            constraints = list(constraints)
+            if len(duals) != len(constraints):
+                raise ValueError(
+                    "The 'Dual' array has %s values for %s constraints"
+                    % (len(duals), len(constraints)))
+            soln._arrays['constraint'] = (
+                [weakref_ref(c) for c in constraints], {'Dual': duals})
+
+        if clear:
+            self.clear(clear_symbol_maps=False)
+        self.solutions.append(soln)
+        index = len(self.solutions)-1
+        if select:
+            self.select(index, **kwds)
+        return index
+
+    def _check_fixed_var_value(self,
+                               vdata,
+                               val,
+                               allow_consistent_values_for_fixed_vars,
+                               comparison_tolerance_for_fixed_vars):
+        instance = self._instance()
+        if not allow_consistent_values_for_fixed_vars:
+            msg = "Variable '%s' in model '%s' is currently fixed - new" \
+                  ' value is not expected in solution'
+            raise TypeError(msg % (vdata.name, instance.name))
+        if math.fabs(val - vdata.value) > comparison_tolerance_for_fixed_vars:
+            raise TypeError("Variable '%s' in model '%s' is currently "
+                            "fixed - a value of '%s' in solution is "
+                            "not within tolerance=%s of the current "
+                            "value of '%s'"
+                            % (vdata.name,
+                               instance.name,
+                               str(val),
+                               str(comparison_tolerance_for_fixed_vars),
+                               str(vdata.value)))
+
+    def _load_variable_values(self,
+                              variables,
+                              values,
+                              allow_consistent_values_for_fixed_vars,
+                              comparison_tolerance_for_fixed_vars,
+                              ignore_fixed_vars):
+        if hasattr(values, 'tolist'):
+            values = values.tolist()
+        #
+        # Variables stored in the arrays of their Var component
+        # (array_storage=True) are grouped by component and assigned
+        # with a single NumPy operation
+        #
+        array_vars = {}
+        for vdata, val in zip(variables, values):
+            if vdata.__class__ is _ArrayVarData:
+                group = array_vars.get(vdata._component, None)
+                if group is None:
+                    group = array_vars[vdata._component] = ([], [], [])
+                group[0].append(vdata)
+                group[1].append(vdata._ndx)
+                group[2].append(val)
+                continue
+            if vdata.fixed:
+                if ignore_fixed_vars:
+                    continue
+                self._check_fixed_var_value(
+                    vdata, val,
+                    allow_consistent_values_for_fixed_vars,
+                    comparison_tolerance_for_fixed_vars)
+            vdata.value = val
+            vdata.stale = False
+
+        if not array_vars:
+            return
+        import numpy
+        for component, (vardata, ndx, vals) in iteritems(array_vars):
+            var = component()
+            ndx = numpy.array(ndx, dtype=int)
+            integer = numpy.fromiter(
+                (val.__class__ in native_integer_types for val in vals),
+                dtype=bool, count=len(vals))
+            vals = numpy.array(vals, dtype=float)
+            fixed = var._array_fixed[ndx]
+            if fixed.any():
+                if ignore_fixed_vars:
+                    ndx = ndx[~fixed]
+                    vals = vals[~fixed]
+                    integer = integer[~fixed]
+                else:
+                    for i in fixed.nonzero()[0]:
+                        self._check_fixed_var_value(
+                            vardata[i], vals[i],
+                            allow_consistent_values_for_fixed_vars,
+                            comparison_tolerance_for_fixed_vars)
+            var._array_value[ndx] = vals
+            var._array_integer[ndx] = integer
+            var._array_stale[ndx] = False
 
 
 @ModelComponentFactory.register('Model objects can be used as a component of other models.')
@@ -817,6 +1056,13 @@ from solvers are immediately loaded into the original model instance.""")
                               namespaces,
                               profile_memory=profile_memory)
 
+    def save_snapshot(self, filename):
+        """
+        Save this (constructed) model to a binary snapshot file.  The
+        model can be recreated with load_snapshot(filename).
+        """
+        save_snapshot(self, filename)
+
     def _tuplize(self, data, setobj):
         if data is None:            #pragma:nocover
             return None
@@ -14,6 +14,7 @@ __all__ = ['Block', 'TraversalStrategy', 'SortComponents',
 
 import copy
 import sys
+import types
 import weakref
 import logging
 from inspect import isclass
@@ -22,9 +23,12 @@ from six import iteritems, iterkeys, itervalues, StringIO, string_types, \
     advance_iterator, PY3
 
 from pyomo.common.timing import ConstructionTimer
+from pyomo.core.expr.numvalue import native_types
+from pyomo.core.expr.numeric_expr import ExpressionBase, \
+    _MutableSumExpression, _MutableLinearExpression
 from pyomo.core.base.plugin import *  # ModelComponentFactory
 from pyomo.core.base.component import Component, ActiveComponentData, \
-    ComponentUID
+    ComponentUID, _name_index_generator
 from pyomo.core.base.sets import Set,  _SetDataBase
 from pyomo.core.base.var import Var
 from pyomo.core.base.misc import apply_indexed_rule
@@ -38,6 +42,9 @@ from pyomo.opt import WriterFactory
 
 logger = logging.getLogger('pyomo.core')
 
+_mutable_expression_types = set([_MutableSumExpression,
+                                 _MutableLinearExpression])
+
 
 # Monkey-patch for deepcopying weakrefs
 # Only required on Python <= 2.6
@@ -469,6 +476,203 @@ if PY3:
     PseudoMap.items = PseudoMap.iteritems
 
 
+def _clear_name_cache(block, component):
+    # Adding or deleting a component changes the names of the component
+    # (and, for blocks, of all the components in the sub-blocks)
+    block.__dict__.pop('_name_cache', None)
+    if isinstance(component, Block):
+        for blockdata in itervalues(component._data):
+            blockdata.__dict__.pop('_name_cache', None)
+            for comp, _ in blockdata._decl_order:
+                if isinstance(comp, Block):
+                    _clear_name_cache(blockdata, comp)
+
+
+def _clear_ctype_index(block):
+    # The structure of the block hierarchy below this block changed
+    # (components were added or deleted, or sub-blocks were activated or
+    # deactivated): clear the ctype index of this block and of all its
+    # parents (see _BlockData.use_ctype_index)
+    while block is not None:
+        _index = block.__dict__.get('_ctype_index', None)
+        if _index:
+            _index.clear()
+        try:
+            block = block.parent_block()
+        except AttributeError:
+            # Components can be added to a block before the block is
+            # fully initialized (e.g., in the _BlockData constructor
+            # of derived classes), in which case it has no parent yet
+            break
+
+
+def _component_data_items(comp, active, sort_indices):
+    """Generate the (index, component data) pairs for a component"""
+    # _NOTE_: Suffix has a dict interface (something other derived
+    #         non-indexed Components may do as well), so we don't want
+    #         to test the existence of iteritems as a check for
+    #         components. Also, the case where we test len(comp) after
+    #         seeing that comp.is_indexed is False is a hack for a
+    #         SimpleConstraint whose expression resolved to
+    #         Constraint.skip or Constraint.feasible (in which case its
+    #         data is empty and iteritems would have been empty as well)
+    if comp.is_indexed():
+        _items = comp.iteritems()
+    # This is a hack (see _NOTE_ above).
+    elif len(comp) or not hasattr(comp, '_data'):
+        _items = ((None, comp),)
+    else:
+        _items = tuple()
+
+    if sort_indices:
+        _items = sorted(_items, key=itemgetter(0))
+    if active is None or not isinstance(comp, ActiveIndexedComponent):
+        return _items
+    else:
+        return ((idx, compData) for idx, compData in _items
+                if compData.active == active)
+
+
+class _StructuralCloner(object):
+    """
+    A clone engine for blocks that copies the component data directly.
+
+    The clone is performed in two passes: first, an empty instance is
+    created for every component (and component data) owned by the
+    block hierarchy, so that all references to these objects can be
+    remapped in a single pass over the component states.  Second, the
+    state of each object is copied into the corresponding new instance.
+
+    Objects outside the block hierarchy are not copied.  Expression
+    trees are copied "on write": when share_expressions is True, only
+    the expression nodes that (directly or indirectly) refer to a
+    cloned component are copied; all other subtrees are shared with
+    the original model.  Objects that this engine does not know how to
+    copy are handed off to copy.deepcopy() (with the same memo).
+    """
+
+    _atomic_types = set([type, types.FunctionType, types.BuiltinFunctionType,
+                         weakref.ref])
+
+    def __init__(self, block, share_expressions=True):
+        self.share_expressions = share_expressions
+        self.memo = {
+            '__block_scope__': {id(block): True, id(None): False},
+            '__paranoid__': False,
+        }
+        self.objects = []
+        # The memo is keyed by id: keep the copied objects (in
+        # particular, temporary containers returned by __getstate__)
+        # alive so that their ids are not reused during the clone (this
+        # is the same list that copy.deepcopy uses)
+        self.keep_alive = self.memo[id(self.memo)] = []
+        self._register(block)
+
+    def clone(self, block):
+        _copy = self.copy
+        for src, dest in self.objects:
+            state = {}
+            for key, val in iteritems(src.__getstate__()):
+                if val.__class__ in native_types:
+                    state[key] = val
+                else:
+                    state[key] = _copy(val)
+            dest.__setstate__(state)
+        return self.memo[id(block)]
+
+    def _register(self, block):
+        memo = self.memo
+        objects = self.objects
+
+        def _new(obj):
+            ans = memo[id(obj)] = obj.__class__.__new__(obj.__class__)
+            objects.append((obj, ans))
+
+        _new(block)
+        stack = [block]
+        while stack:
+            for comp, _ in stack.pop()._decl_order:
+                if comp is None:
+                    continue
+                _new(comp)
+                _data = getattr(comp, '_data', None)
+                if _data is not None:
+                    for data in itervalues(_data):
+                        # Skip the data of simple components (the
+                        # component is its own data) and data that is
+                        # owned by other components (e.g., References)
+                        if data is comp or data.parent_component() is not comp:
+                            continue
+                        _new(data)
+                        if isinstance(data, _BlockData):
+                            stack.append(data)
+                if isinstance(comp, _BlockData):
+                    stack.append(comp)
+
+    def copy(self, obj):
+        memo = self.memo
+        _id = id(obj)
+        if _id in memo:
+            return memo[_id]
+        _type = obj.__class__
+        if _type in native_types or _type in self._atomic_types:
+            return obj
+        if _type is list:
+            ans = memo[_id] = []
+            self.keep_alive.append(obj)
+            ans.extend(self.copy(x) for x in obj)
+            return ans
+        if _type is dict:
+            ans = memo[_id] = {}
+            self.keep_alive.append(obj)
+            for key, val in iteritems(obj):
+                ans[self.copy(key)] = self.copy(val)
+            return ans
+        if _type is tuple:
+            ans = tuple(self.copy(x) for x in obj)
+            if all(x is y for x, y in zip(ans, obj)):
+                ans = obj
+            memo[_id] = ans
+            self.keep_alive.append(obj)
+            return ans
+        if _type is set:
+            ans = memo[_id] = set(self.copy(x) for x in obj)
+            self.keep_alive.append(obj)
+            return ans
+        if isinstance(obj, ExpressionBase):
+            return self._copy_expression(obj)
+        # Components that were not registered are either outside the
+        # block hierarchy or are not owned by a component: defer to
+        # their __deepcopy__ method (which checks the __block_scope__)
+        return copy.deepcopy(obj, memo)
+
+    def _copy_expression(self, obj):
+        new_state = {}
+        changed = not self.share_expressions \
+            or obj.__class__ in _mutable_expression_types
+        for key, val in iteritems(obj.__getstate__()):
+            # The argument lists are only copied if they refer to
+            # something that was cloned
+            if val.__class__ is list or val.__class__ is tuple:
+                ans = [self.copy(x) for x in val]
+                if changed or any(x is not y for x, y in zip(ans, val)):
+                    ans = val.__class__(ans)
+                else:
+                    ans = val
+            else:
+                ans = self.copy(val)
+            if ans is not val:
+                changed = True
+            new_state[key] = ans
+        self.keep_alive.append(obj)
+        if not changed:
+            self.memo[id(obj)] = obj
+            return obj
+        ans = self.memo[id(obj)] = obj.__class__.__new__(obj.__class__)
+        ans.__setstate__(new_state)
+        return ans
+
+
 class _BlockData(ActiveComponentData):
     """
     This class holds the fundamental block data.
@@ -530,14 +734,21 @@ class _BlockData(ActiveComponentData):
         # Note sure why we are deleting these...
         if '_repn' in ans:
             del ans['_repn']
+        # The name cache is keyed by object ids
+        if '_name_cache' in ans:
+            del ans['_name_cache']
+        # The ctype index refers to the components of this block: only
+        # record whether it is enabled (see __setstate__)
+        if ans.get('_ctype_index', None) is not None:
+            del ans['_ctype_index']
+            ans['_use_ctype_index'] = True
         return ans
 
-    #
-    # The base class __setstate__ is sufficient (assigning all the
-    # pickled attributes to the object is appropriate
-    #
-    # def __setstate__(self, state):
-    #    pass
+    def __setstate__(self, state):
+        use_ctype_index = state.pop('_use_ctype_index', False)
+        super(_BlockData, self).__setstate__(state)
+        if use_ctype_index:
+            self.use_ctype_index()
 
     def __getattr__(self, val):
         if val in ModelComponentFactory:
@@ -894,6 +1105,8 @@ component, use the block del_component() and add_component() methods.
         #
         val._name = name
         val._parent = weakref.ref(self)
+        _clear_name_cache(self, val)
+        _clear_ctype_index(self)
         #
         # We want to add the temporary / implicit sets first so that
         # they get constructed before this component
@@ -1051,6 +1264,8 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
 
         # Clear the _parent attribute
         obj._parent = None
+        _clear_name_cache(self, obj)
+        _clear_ctype_index(self)
 
         # Now that this component is not in the _decl map, we can call
         # delattr as usual.
@@ -1062,6 +1277,53 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
         # the next class up the MRO.
         super(_BlockData, self).__delattr__(name)
 
+    def _cached_name(self, obj):
+        """
+        Return the fully qualified name of a component (or component
+        data) declared on this block.
+
+        The names of all members of the component are generated at
+        once and cached on this block.  The cache is cleared when
+        components are added to or deleted from this block, and when
+        this block is moved in the block hierarchy.
+        """
+        cache = self.__dict__.get('_name_cache', None)
+        if cache is None:
+            cache = ({}, {})
+            super(_BlockData, self).__setattr__('_name_cache', cache)
+        # The objects are stored (in a separate dict, to avoid creating
+        # a tuple for every entry) so that the ids of deleted objects
+        # are not confused with the ids of new objects
+        names, objs = cache
+        _id = id(obj)
+        if objs.get(_id, None) is obj:
+            return names[_id]
+        c = obj.parent_component()
+        base = c.getname(fully_qualified=True)
+        names[id(c)] = base
+        objs[id(c)] = c
+        if c.is_indexed():
+            for idx, cdata in iteritems(c._data):
+                names[id(cdata)] = base + _name_index_generator(idx)
+                objs[id(cdata)] = cdata
+        if objs.get(_id, None) is obj:
+            return names[_id]
+        return obj.getname(fully_qualified=True)
+
+    def _clear_cached_name(self, obj):
+        """
+        Remove a (deleted) component data object from the name cache
+        of this block.
+        """
+        cache = self.__dict__.get('_name_cache', None)
+        if cache is None:
+            return
+        names, objs = cache
+        _id = id(obj)
+        if objs.get(_id, None) is obj:
+            del names[_id]
+            del objs[_id]
+
     def reclassify_component_type(self, name_or_object, new_ctype,
                                   preserve_declaration_order=True):
         """
@@ -1107,6 +1369,7 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
                 ctype_info[1] = prev
 
         obj._type = new_ctype
+        _clear_ctype_index(self)
 
         # Insert into the new ctype list
         if new_ctype not in self._ctypes:
@@ -1133,9 +1396,24 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
             self._decl_order[prev] = (self._decl_order[prev][0], idx)
             self._decl_order[idx] = (obj, tmp)
 
-    def clone(self):
+    def clone(self, share_expressions=None):
         """
-        TODO
+        Return a copy of this block and all the components beneath it.
+
+        Components outside this block hierarchy (e.g., variables on a
+        parent block that appear in expressions on this block) are not
+        copied.  The clone is performed by a structural clone engine
+        that copies the component data directly; if that fails, a
+        warning is logged and the block is copied using
+        copy.deepcopy() (unless share_expressions was specified, in
+        which case the exception is raised).
+
+        Arguments:
+            share_expressions (bool): If True (or not specified),
+                expression subtrees that do not refer to any of the
+                cloned components are shared between this block and
+                the clone (Pyomo expression trees are immutable).  If
+                False, all expression nodes are copied.
         """
         # FYI: we used to remove all _parent() weakrefs before
         # deepcopying and then restore them on the original and cloned
@@ -1153,22 +1431,96 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
         #
         save_parent, self._parent = self._parent, None
         try:
-            new_block = copy.deepcopy(
-                self, {
-                    '__block_scope__': {id(self): True, id(None): False},
-                    '__paranoid__': False,
-                    })
-        except:
-            new_block = copy.deepcopy(
-                self, {
-                    '__block_scope__': {id(self): True, id(None): False},
-                    '__paranoid__': True,
-                    })
+            try:
+                return _StructuralCloner(
+                    self, share_expressions is not False).clone(self)
+            except Exception as e:
+                if share_expressions is not None:
+                    raise
+                logger.warning("Structural clone of block '%s' failed "
+                               "(%s: %s); falling back on copy.deepcopy()"
+                               % (self.name, type(e).__name__, e))
+            try:
+                new_block = copy.deepcopy(
+                    self, {
+                        '__block_scope__': {id(self): True, id(None): False},
+                        '__paranoid__': False,
+                        })
+            except:
+                new_block = copy.deepcopy(
+                    self, {
+                        '__block_scope__': {id(self): True, id(None): False},
+                        '__paranoid__': True,
+                        })
         finally:
             self._parent = save_parent
 
         return new_block
 
+    def activate(self):
+        """Set the active attribute to True"""
+        super(_BlockData, self).activate()
+        _clear_ctype_index(self)
+
+    def deactivate(self):
+        """Set the active attribute to False"""
+        super(_BlockData, self).deactivate()
+        _clear_ctype_index(self)
+
+    def use_ctype_index(self, flag=True):
+        """
+        Enable (or disable) the ctype index for this block.
+
+        With the ctype index, block_data_objects(), component_objects()
+        and component_data_objects() (with the default unsorted,
+        prefix depth-first traversal) cache the lists of blocks and
+        components of each type in this block hierarchy, so repeated
+        iteration over the model becomes a scan over flat lists.  The
+        index is cleared when components are added to or deleted from
+        any block in the hierarchy, and when blocks are activated or
+        deactivated.  The activity of the components (and component
+        data) is still checked during iteration.
+
+        Note: the iterators return the objects in the index when the
+        iteration starts.  Components that are added while iterating
+        are not returned.
+        """
+        super(_BlockData, self).__setattr__(
+            '_ctype_index', {} if flag else None)
+
+    def _ctype_index_lookup(self, ctype, active, sort, descend_into,
+                            descent_order):
+        """
+        Return the list of blocks (ctype is None) or components (of
+        type ctype) in this block hierarchy from the ctype index.
+        Returns None if the ctype index is not enabled or does not
+        support the requested traversal.
+        """
+        _index = self.__dict__.get('_ctype_index', None)
+        if _index is None or descend_into is not True \
+           or SortComponents.sort_names(sort) \
+           or SortComponents.sort_indices(sort) \
+           or descent_order not in (None,
+                                    TraversalStrategy.PrefixDepthFirstSearch):
+            return None
+        if ctype is _BlockData:
+            key = ('blocks', active)
+        elif ctype is None or isclass(ctype):
+            key = (ctype, active)
+        else:
+            key = (tuple(ctype), active)
+        ans = _index.get(key, None)
+        if ans is None:
+            if key[0] == 'blocks':
+                ans = list(self._tree_iterator(active=active))
+            else:
+                ans = [ comp for _block in self._ctype_index_lookup(
+                            _BlockData, active, sort, descend_into,
+                            descent_order)
+                        for comp in PseudoMap(_block, ctype).itervalues() ]
+            _index[key] = ans
+        return ans
+
     def contains_component(self, ctype):
         """
         Return True if the component type is in _ctypes and ... TODO.
@@ -1246,37 +1598,9 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
         _sort_indices = SortComponents.sort_indices(sort)
         _subcomp = PseudoMap(self, ctype, active, sort)
         for name, comp in _subcomp.iteritems():
-            # _NOTE_: Suffix has a dict interface (something other
-            #         derived non-indexed Components may do as well),
-            #         so we don't want to test the existence of
-            #         iteritems as a check for components. Also,
-            #         the case where we test len(comp) after seeing
-            #         that comp.is_indexed is False is a hack for a
-            #         SimpleConstraint whose expression resolved to
-            #         Constraint.skip or Constraint.feasible (in which
-            #         case its data is empty and iteritems would have
-            #         been empty as well)
-            # try:
-            #    _items = comp.iteritems()
-            # except AttributeError:
-            #    _items = [ (None, comp) ]
-            if comp.is_indexed():
-                _items = comp.iteritems()
-            # This is a hack (see _NOTE_ above).
-            elif len(comp) or not hasattr(comp, '_data'):
-                _items = ((None, comp),)
-            else:
-                _items = tuple()
-
-            if _sort_indices:
-                _items = sorted(_items, key=itemgetter(0))
-            if active is None or not isinstance(comp, ActiveIndexedComponent):
-                for idx, compData in _items:
-                    yield (name, idx), compData
-            else:
-                for idx, compData in _items:
-                    if compData.active == active:
-                        yield (name, idx), compData
+            for idx, compData in _component_data_items(
+                    comp, active, _sort_indices):
+                yield (name, idx), compData
 
     def all_components(self, *args, **kwargs):
         logger.warning(
@@ -1311,6 +1635,13 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
             for x in self.component_map(ctype, active, sort).itervalues():
                 yield x
             return
+        _index = self._ctype_index_lookup(
+            ctype, active, sort, descend_into, descent_order)
+        if _index is not None:
+            for x in _index:
+                if active is None or x.active == active:
+                    yield x
+            return
         for _block in self.block_data_objects(active, sort, descend_into, descent_order):
             for x in _block.component_map(ctype, active, sort).itervalues():
                 yield x
@@ -1327,6 +1658,16 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
         block.  By default, this generator recursively
         descends into sub-blocks.
         """
+        _index = self._ctype_index_lookup(
+            ctype, active, sort, descend_into, descent_order)
+        if _index is not None:
+            for comp in _index:
+                if active is None or comp.active == active:
+                    for idx, compData in _component_data_items(
+                            comp, active, False):
+                        yield compData
+            return
+
         if descend_into:
             block_generator = self.block_data_objects(
                 active=active,
@@ -1357,6 +1698,16 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
             ((component name, index value), _ComponentData)
 
         """
+        _index = self._ctype_index_lookup(
+            ctype, active, sort, descend_into, descent_order)
+        if _index is not None:
+            for comp in _index:
+                if active is None or comp.active == active:
+                    for idx, compData in _component_data_items(
+                            comp, active, False):
+                        yield (comp._name, idx), compData
+            return
+
         if descend_into:
             block_generator = self.block_data_objects(
                 active=active,
@@ -1403,6 +1754,10 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
                 return ().__iter__()
             else:
                 return (self,).__iter__()
+        _index = self._ctype_index_lookup(
+            _BlockData, active, sort, descend_into, descent_order)
+        if _index is not None:
+            return _index.__iter__()
         #
         # Rely on the _tree_iterator:
         #
@@ -1775,6 +2130,15 @@ class Block(ActiveIndexedComponent):
     def _getitem_when_not_present(self, idx):
         return self._setitem_when_not_present(idx, None)
 
+    def _setitem_when_not_present(self, index, value):
+        ans = super(Block, self)._setitem_when_not_present(index, value)
+        _clear_ctype_index(self.parent_block())
+        return ans
+
+    def __delitem__(self, index):
+        super(Block, self).__delitem__(index)
+        _clear_ctype_index(self.parent_block())
+
     def find_component(self, label_or_component):
         """
         Return a block component given a name.
@@ -24,6 +24,7 @@ from pyomo.core.expr.numvalue import (ZeroConstant,
                                       as_numeric,
                                       is_constant,
                                       native_numeric_types,
+                                      native_types,
                                       _sub)
 from pyomo.core.base.plugin import ModelComponentFactory
 from pyomo.core.base.component import ActiveComponentData
@@ -636,6 +637,11 @@ class Constraint(ActiveIndexedComponent):
             A Pyomo expression for this constraint
         rule 
             A function that is used to construct constraint expressions
+        template
+            If True, the rule of an indexed constraint is called once
+            with IndexTemplate indices and the resulting template
+            expression is instantiated for every index.  The rule must
+            not branch on the index values.
         doc 
             A text string describing this component
         name 
@@ -688,6 +694,7 @@ class Constraint(ActiveIndexedComponent):
     def __init__(self, *args, **kwargs):
         self.rule = kwargs.pop('rule', None)
         self._init_expr = kwargs.pop('expr', None)
+        self._template = kwargs.pop('template', False)
         #if self.rule is None and self._init_expr is None:
         #    raise ValueError("A simple Constraint component requires a 'rule' or 'expr' option")
         kwargs.setdefault('ctype', Constraint)
@@ -771,6 +778,11 @@ class Constraint(ActiveIndexedComponent):
                     "of a constraint with a single expression" %
                     (self.name,) )
 
+            if self._template and \
+               self._construct_from_template(_init_rule, _self_parent):
+                timer.report()
+                return
+
             for ndx in self._index:
                 try:
                     tmp = apply_indexed_rule(self,
@@ -790,6 +802,111 @@ class Constraint(ActiveIndexedComponent):
                 self._setitem_when_not_present(ndx, tmp)
         timer.report()
 
+    def _construct_from_template(self, rule, block):
+        """
+        Construct the constraints by evaluating the rule once with
+        IndexTemplate indices and instantiating the template expression
+        for every index.  Returns False (without adding any constraints)
+        if the rule cannot be evaluated with index templates.
+        """
+        from pyomo.core.base.template_expr import (
+            templatize_rule, compile_template_expression)
+        try:
+            expr, indices = templatize_rule(block, rule, self._index)
+        except Exception:
+            err = sys.exc_info()[1]
+            expr = None
+            reason = type(err).__name__
+            if str(err):
+                reason += ": %s" % (err,)
+        else:
+            reason = "the rule did not return a relational expression"
+        if type(expr) is tuple:
+            if len(expr) not in (2, 3) or \
+               all(arg.__class__ in native_types for arg in expr):
+                expr = None
+        elif not (hasattr(expr, 'is_relational') and expr.is_relational()):
+            expr = None
+        if expr is None:
+            logger.warning(
+                "Constraint '%s': the rule cannot be evaluated with index "
+                "templates (%s).  Calling the rule for each index."
+                % (self.name, reason))
+            return False
+
+        instantiate = compile_template_expression(expr)
+        reason = self._check_template_row(rule, block, indices, instantiate)
+        if reason is not None:
+            logger.warning(
+                "Constraint '%s': %s.  Calling the rule for each index."
+                % (self.name, reason))
+            return False
+
+        ndx = None
+        try:
+            if len(indices) == 1:
+                index = indices[0]
+                for ndx in self._index:
+                    index.set_value(ndx)
+                    self._setitem_when_not_present(ndx, instantiate())
+            else:
+                for ndx in self._index:
+                    for index, val in zip(indices, ndx):
+                        index.set_value(val)
+                    self._setitem_when_not_present(ndx, instantiate())
+        except Exception:
+            err = sys.exc_info()[1]
+            logger.error(
+                "Template instantiation failed when generating expression "
+                "for constraint %s with index %s:\n%s: %s"
+                % (self.name,
+                   str(ndx),
+                   type(err).__name__,
+                   err))
+            raise
+        finally:
+            for index in indices:
+                index.set_value(None)
+        return True
+
+    def _check_template_row(self, rule, block, indices, instantiate):
+        """
+        Compare the template expression instantiated for the first
+        index with the expression returned by the rule for that index.
+        Returns None if they match, and the reason otherwise.
+        """
+        for ndx in self._index:
+            break
+        else:
+            return None
+        try:
+            if len(indices) == 1:
+                indices[0].set_value(ndx)
+            else:
+                for index, val in zip(indices, ndx):
+                    index.set_value(val)
+            expected = apply_indexed_rule(self, rule, block, ndx)
+            actual = instantiate()
+        except Exception:
+            err = sys.exc_info()[1]
+            return "checking the template for index %s raised %s: %s" \
+                % (str(ndx), type(err).__name__, err)
+        finally:
+            for index in indices:
+                index.set_value(None)
+        if type(expected) is tuple and type(actual) is tuple:
+            same = len(expected) == len(actual) and \
+                all(str(e) == str(a) for e, a in zip(expected, actual))
+        else:
+            same = type(expected) is not tuple and \
+                type(actual) is not tuple and \
+                str(expected) == str(actual)
+        if not same:
+            return "the template expression does not match the rule " \
+                "for index %s (the rule may depend on the index value)" \
+                % (str(ndx),)
+        return None
+
     def _pprint(self):
         """
         Return data that will be printed for this component.
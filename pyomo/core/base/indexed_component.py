@@ -430,8 +430,13 @@ You can silence this warning by one of three ways:
         else:
             # Handle the normal deletion operation
             if self.is_indexed():
-                # Remove reference to this object
-                self._data[index]._component = None
+                # Remove reference to this object (and drop it from the
+                # name cache of the owning block)
+                obj = self._data[index]
+                obj._component = None
+                parent = self.parent_block()
+                if parent is not None:
+                    parent._clear_cached_name(obj)
             del self._data[index]
 
     def _not_constructed_error(self, idx):
@@ -86,6 +86,15 @@ def alphanum_label_from_name(name):
 
     return _translate(name, _alphanum_translation_table)
 
+def _fully_qualified_name(obj, name_buffer):
+    # Use the name cache of the block that owns the object (see
+    # _BlockData._cached_name).  The name_buffer is used for objects
+    # that are not owned by a block.
+    try:
+        return obj.parent_block()._cached_name(obj)
+    except AttributeError:
+        return obj.getname(True, name_buffer)
+
 class CuidLabeler(object):
 
     def __call__(self, obj=None):
@@ -126,31 +135,33 @@ class CNameLabeler(object):
         self.name_buffer = {}
 
     def __call__(self, obj):
-        return obj.getname(True, self.name_buffer)
+        return _fully_qualified_name(obj, self.name_buffer)
 
 class TextLabeler(object):
     def __init__(self):
         self.name_buffer = {}
 
     def __call__(self, obj):
-        return cpxlp_label_from_name(obj.getname(True, self.name_buffer))
+        return cpxlp_label_from_name(
+            _fully_qualified_name(obj, self.name_buffer))
 
     def remove_obj(self, obj):
-        self.name_buffer.pop(id(obj))
+        self.name_buffer.pop(id(obj), None)
 
 class AlphaNumericTextLabeler(object):
     def __init__(self):
         self.name_buffer = {}
 
     def __call__(self, obj):
-        return alphanum_label_from_name(obj.getname(True, self.name_buffer))
+        return alphanum_label_from_name(
+            _fully_qualified_name(obj, self.name_buffer))
 
 class NameLabeler(object):
     def __init__(self):
         self.name_buffer = {}
 
     def __call__(self, obj):
-        return obj.getname(True, self.name_buffer)
+        return _fully_qualified_name(obj, self.name_buffer)
 
 class ShortNameLabeler(object):
     def __init__(self, limit, prefix, start=0, labeler=None):
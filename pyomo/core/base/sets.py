@@ -447,7 +447,7 @@ class _OrderedSetData(_SetDataBase):
             self._sort()
         try:
             return self.order_dict[match_element] + 1
-        except IndexError:
+        except KeyError:
             raise IndexError("Unknown input element="+str(match_element)+" provided as input to ord() method for set="+self.name)
 
     def next(self, match_element, k=1):
@@ -483,10 +483,10 @@ class _OrderedSetData(_SetDataBase):
         """
         try:
             element_position = self.ord(match_element)
-        except KeyError:
+        except IndexError:
             raise KeyError("Cannot obtain nextw() member of set="+self.name+"; input element="+str(match_element)+" is not a member of the set!")
         #
-        return self[(element_position+k-1) % len(self.value_list) + 1]
+        return self[(element_position+k-1) % len(self) + 1]
 
     def prev(self, match_element, k=1):
         """
@@ -1600,6 +1600,123 @@ class _SetProduct(_SetOperator):
             ans *= len(_set)
         return ans
 
+    #
+    # Positional access for products of ordered sets.  Positions are
+    # computed from the positions in the individual sets (the product
+    # is never materialized), so these methods are O(1) when ord() and
+    # __getitem__() are O(1) for the individual sets.
+    #
+
+    def _check_positional(self):
+        if not self.ordered:
+            raise ValueError("Cannot use positional access on the product "
+                             "of unordered sets '%s'" % (self.name,))
+        if self.dimen is None:
+            raise ValueError("Cannot use positional access on the product "
+                             "set '%s' with an unknown dimension"
+                             % (self.name,))
+
+    def __getitem__(self, idx):
+        """
+        Return the specified member of the set.  Valid index values
+        are 1 .. len(set), or -1 .. -len(set).
+        """
+        self._check_positional()
+        n = len(self)
+        if idx >= 1:
+            if idx > n:
+                raise IndexError("Cannot index a set past the last element")
+            pos = idx - 1
+        elif idx < 0:
+            if n+idx < 0:
+                raise IndexError("Cannot index a set past the first element")
+            pos = n + idx
+        else:
+            raise IndexError("Valid index values for sets are 1 .. len(set) or -1 .. -len(set)")
+        members = []
+        for _set in reversed(self.set_tuple):
+            pos, i = divmod(pos, len(_set))
+            members.append((_set.dimen, _set[i+1]))
+        ans = []
+        for d, val in reversed(members):
+            if d == 1:
+                ans.append(val)
+            else:
+                ans.extend(val)
+        return tuple(ans)
+
+    def ord(self, match_element):
+        """
+        Return the position index of the input value.  The
+        position indices start at 1.
+        """
+        self._check_positional()
+        if type(match_element) is not tuple or len(match_element) != self.dimen:
+            raise IndexError("Unknown input element="+str(match_element)+" provided as input to ord() method for set="+self.name)
+        pos = 0
+        ctr = 0
+        for _set in self.set_tuple:
+            d = _set.dimen
+            if d == 1:
+                i = _set.ord(match_element[ctr])
+            else:
+                i = _set.ord(match_element[ctr:ctr+d])
+            pos = pos*len(_set) + i - 1
+            ctr += d
+        return pos + 1
+
+    def first(self):
+        """
+        Return the first element of the set.
+        """
+        return self[1]
+
+    def last(self):
+        """
+        Return the last element of the set.
+        """
+        return self[-1]
+
+    def next(self, match_element, k=1):
+        """
+        Return the next element in the set. The k option can
+        specify how many steps are taken to get the next element.
+
+        If the next element is beyond the end of the set,
+        then an exception is raised.
+        """
+        try:
+            element_position = self.ord(match_element)
+        except IndexError:
+            raise KeyError("Cannot obtain next() member of set="+self.name+"; input element="+str(match_element)+" is not a member of the set!")
+        if element_position+k < 1:
+            raise IndexError("Cannot index a set past the first element")
+        return self[element_position+k]
+
+    def nextw(self, match_element, k=1):
+        """
+        Return the next element in the set, wrapping around to
+        the beginning of the set.
+        """
+        try:
+            element_position = self.ord(match_element)
+        except IndexError:
+            raise KeyError("Cannot obtain nextw() member of set="+self.name+"; input element="+str(match_element)+" is not a member of the set!")
+        return self[(element_position+k-1) % len(self) + 1]
+
+    def prev(self, match_element, k=1):
+        """
+        Return the previous element in the set.
+        """
+        return self.next(match_element, k=-k)
+
+    def prevw(self, match_element, k=1):
+        """
+        Return the previous element in the set, wrapping around
+        to the end of the set.
+        """
+        return self.nextw(match_element, k=-k)
+
     def _compute_dimen(self):
         ans=0
         for _set in self.set_tuple:
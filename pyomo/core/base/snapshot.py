@@ -0,0 +1,313 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+#
+# Binary model snapshots
+#
+# A snapshot file has three sections:
+#
+#   - a fixed-size header (magic string, format version, and the
+#     location of the pickled structure)
+#   - the numeric arrays (64-byte aligned raw NumPy data)
+#   - the pickled component hierarchy
+#
+# The component hierarchy (blocks, components, set data, expression
+# DAGs, ...) is pickled with the highest pickle protocol.  The data of
+# regular variables and mutable parameters is not pickled per object:
+# the pickle only records a (persistent) integer id for each of these
+# objects, and their values, bounds and flags are stored in numeric
+# arrays.  NumPy arrays held by the model (e.g., the storage of
+# variables declared with array_storage=True) are written directly to
+# the array section.
+#
+# When loading a snapshot, the file is memory-mapped copy-on-write, so
+# the array data is shared (until modified) by all the processes that
+# load the same snapshot.
+#
+
+__all__ = ['save_snapshot', 'load_snapshot']
+
+import io
+import mmap
+import struct
+from weakref import ref as weakref_ref
+
+from six import PY3
+from six.moves import cPickle as pickle, xrange
+
+try:
+    import numpy
+    numpy_available = True
+except ImportError:                               #pragma:nocover
+    numpy_available = False
+
+from pyomo.core.base.var import _GeneralVarData
+from pyomo.core.base.param import _ParamData
+
+_MAGIC = b'PYOMOSNP'
+_VERSION = 1
+# magic, version, (reserved), pickle offset, pickle length
+_HEADER = struct.Struct('<8sIIQQ')
+_ALIGNMENT = 64
+
+# Value kinds stored in the snapshot "kinds" arrays
+_NONE = 0
+_FLOAT = 1
+_INT = 2
+_OTHER = 3
+
+
+def _encode_values(values, other, offset):
+    """Return the numbers and kinds arrays for a list of values.  Values
+    that cannot be represented exactly as a float64 are stored in the
+    'other' dictionary (keyed by (position, offset))."""
+    numbers = []
+    kinds = []
+    for i, val in enumerate(values):
+        if val is None:
+            numbers.append(0)
+            kinds.append(_NONE)
+        elif val.__class__ is float:
+            numbers.append(val)
+            kinds.append(_FLOAT)
+        elif val.__class__ is int and -2**53 <= val <= 2**53:
+            numbers.append(val)
+            kinds.append(_INT)
+        else:
+            numbers.append(0)
+            kinds.append(_OTHER)
+            other[i, offset] = val
+    return ( numpy.array(numbers, dtype=float),
+             numpy.array(kinds, dtype=numpy.uint8) )
+
+
+def _decode_values(numbers, kinds, other, offset):
+    """The inverse of _encode_values()"""
+    ans = numbers.tolist()
+    for i, kind in enumerate(kinds.tolist()):
+        if kind == _FLOAT:
+            continue
+        elif kind == _INT:
+            ans[i] = int(ans[i])
+        elif kind == _NONE:
+            ans[i] = None
+        else:
+            ans[i] = other[i, offset]
+    return ans
+
+
+def _runs(values):
+    """Run-length encode a list of objects (compared by identity)"""
+    ans = []
+    last = None
+    for val in values:
+        if ans and val is last:
+            ans[-1][1] += 1
+        else:
+            ans.append([val, 1])
+            last = val
+    return ans
+
+
+def _expand_runs(runs):
+    ans = []
+    for val, n in runs:
+        ans.extend([val]*n)
+    return ans
+
+
+class _SnapshotWriter(object):
+
+    def __init__(self, ostream):
+        self.ostream = ostream
+        self.vars = []
+        self.params = []
+        self._ids = {}
+        # Note: persistent_id() is called for every object that is
+        # pickled, so the test for "persistent" types needs to be fast
+        self._persistent_types = set([_GeneralVarData, _ParamData,
+                                      numpy.ndarray, numpy.memmap])
+
+    def persistent_id(self, obj):
+        if obj.__class__ not in self._persistent_types:
+            return None
+        _id = id(obj)
+        if _id in self._ids:
+            return self._ids[_id]
+        if obj.__class__ is _GeneralVarData:
+            ans = 2*len(self.vars)
+            self.vars.append(obj)
+        elif obj.__class__ is _ParamData:
+            ans = 2*len(self.params) + 1
+            self.params.append(obj)
+        else:
+            ans = self._write_array(obj)
+        self._ids[_id] = ans
+        return ans
+
+    def _write_array(self, array):
+        array = numpy.ascontiguousarray(array)
+        if array.dtype.hasobject:
+            raise TypeError(
+                "Cannot write a NumPy array of Python objects to a snapshot")
+        offset = self.ostream.tell()
+        pad = -offset % _ALIGNMENT
+        self.ostream.write(b'\0'*pad)
+        self.ostream.write(array.tostring() if not PY3 else array.tobytes())
+        return ('ndarray', array.dtype.str, array.shape, offset + pad)
+
+    def var_data(self):
+        other = {}
+        numbers, kinds = zip(*[
+            _encode_values([getattr(v, name) for v in self.vars], other, j)
+            for j, name in enumerate(('_value', '_lb', '_ub')) ])
+        flags = numpy.array([[v.fixed for v in self.vars],
+                             [v.stale for v in self.vars]], dtype=bool)
+        return { 'numbers': numpy.array(numbers).reshape(3, len(self.vars)),
+                 'kinds': numpy.array(kinds).reshape(3, len(self.vars)),
+                 'flags': flags.reshape(2, len(self.vars)),
+                 'other': other,
+                 'domain': _runs(v._domain for v in self.vars),
+                 'component': _runs(v.parent_component() for v in self.vars) }
+
+    def param_data(self):
+        other = {}
+        numbers, kinds = _encode_values(
+            [p._value for p in self.params], other, 0)
+        return { 'numbers': numbers,
+                 'kinds': kinds,
+                 'other': other,
+                 'component': _runs(p.parent_component() for p in self.params) }
+
+
+class _SnapshotReader(object):
+
+    def __init__(self, buf):
+        self.buf = buf
+        self.vars = {}
+        self.params = {}
+
+    def persistent_load(self, pid):
+        if pid.__class__ is tuple:
+            _, dtype, shape, offset = pid
+            count = 1
+            for n in shape:
+                count *= n
+            return numpy.frombuffer(
+                self.buf, dtype=dtype, count=count, offset=offset
+            ).reshape(shape)
+        ndx, is_param = divmod(pid, 2)
+        if is_param:
+            if ndx not in self.params:
+                self.params[ndx] = _ParamData.__new__(_ParamData)
+            return self.params[ndx]
+        else:
+            if ndx not in self.vars:
+                self.vars[ndx] = _GeneralVarData.__new__(_GeneralVarData)
+            return self.vars[ndx]
+
+    def set_var_data(self, data):
+        numbers, kinds, other = data['numbers'], data['kinds'], data['other']
+        values, lbs, ubs = [ _decode_values(numbers[j], kinds[j], other, j)
+                             for j in xrange(3) ]
+        fixed = data['flags'][0].tolist()
+        stale = data['flags'][1].tolist()
+        domains = _expand_runs(data['domain'])
+        components = _expand_runs(data['component'])
+        for i in xrange(len(values)):
+            v = self.vars[i]
+            v._value = values[i]
+            v._lb = lbs[i]
+            v._ub = ubs[i]
+            v._domain = domains[i]
+            v.fixed = fixed[i]
+            v.stale = stale[i]
+            c = components[i]
+            v._component = None if c is None else weakref_ref(c)
+
+    def set_param_data(self, data):
+        values = _decode_values(
+            data['numbers'], data['kinds'], data['other'], 0)
+        components = _expand_runs(data['component'])
+        for i in xrange(len(values)):
+            p = self.params[i]
+            p._value = values[i]
+            c = components[i]
+            p._component = None if c is None else weakref_ref(c)
+
+
+def save_snapshot(model, filename):
+    """
+    Save a (constructed) model to a binary snapshot file.
+
+    The snapshot can be loaded with load_snapshot().  Objects outside
+    the model that are referenced by the model (e.g., rules) are
+    pickled, so they must be importable when the snapshot is loaded.
+    """
+    if not numpy_available:
+        raise ImportError("Model snapshots require NumPy")
+    with open(filename, 'wb') as ostream:
+        ostream.write(b'\0'*_HEADER.size)
+        writer = _SnapshotWriter(ostream)
+        pickle_stream = io.BytesIO()
+        pickler = pickle.Pickler(pickle_stream, pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = writer.persistent_id
+        # Detach the model from its parent (if any) while pickling
+        save_parent, model._parent = model._parent, None
+        try:
+            pickler.dump(model)
+        finally:
+            model._parent = save_parent
+        # Note: the same pickler is used (sharing the memo), so the
+        # components are not pickled again
+        pickler.dump((writer.var_data(), writer.param_data()))
+
+        offset = ostream.tell()
+        offset += -offset % _ALIGNMENT
+        ostream.seek(offset)
+        ostream.write(pickle_stream.getvalue())
+        ostream.seek(0)
+        ostream.write(_HEADER.pack(_MAGIC, _VERSION, 0, offset,
+                                   len(pickle_stream.getvalue())))
+
+
+def load_snapshot(filename, use_mmap=True):
+    """
+    Load a model from a snapshot file created by save_snapshot().
+
+    If use_mmap is True, the file is memory-mapped (copy-on-write): the
+    numeric arrays in the model (e.g., the storage of variables declared
+    with array_storage=True) are views into the mapped file, which are
+    only copied into private memory when they are modified.
+    """
+    if not numpy_available:
+        raise ImportError("Model snapshots require NumPy")
+    with open(filename, 'rb') as istream:
+        if use_mmap:
+            buf = mmap.mmap(istream.fileno(), 0, access=mmap.ACCESS_COPY)
+        else:
+            buf = bytearray(istream.read())
+    if len(buf) < _HEADER.size:
+        raise ValueError("File '%s' is not a Pyomo model snapshot"
+                         % (filename,))
+    magic, version, _, offset, length = _HEADER.unpack_from(buf, 0)
+    if magic != _MAGIC:
+        raise ValueError("File '%s' is not a Pyomo model snapshot"
+                         % (filename,))
+    if version != _VERSION:
+        raise ValueError("Unsupported snapshot format version %s in file '%s'"
+                         % (version, filename))
+    reader = _SnapshotReader(buf)
+    unpickler = pickle.Unpickler(io.BytesIO(buf[offset:offset+length]))
+    unpickler.persistent_load = reader.persistent_load
+    model = unpickler.load()
+    var_data, param_data = unpickler.load()
+    reader.set_var_data(var_data)
+    reader.set_param_data(param_data)
+    return model
@@ -10,9 +10,11 @@
 
 import copy
 import logging
+from six import itervalues
 from pyomo.core.expr import current as EXPR
+from pyomo.core.expr.numeric_expr import _MutableSumExpression
 from pyomo.core.expr.numvalue import (
-    NumericValue, native_numeric_types, as_numeric, value )
+    NumericValue, native_numeric_types, native_types, as_numeric, value )
 import pyomo.core.base
 from pyomo.core.expr.expr_errors import TemplateExpressionError
 
@@ -31,11 +33,13 @@ class IndexTemplate(NumericValue):
        _set: the Set from which this IndexTemplate can take values
     """
 
-    __slots__ = ('_set', '_value')
+    __slots__ = ('_set', '_value', '_in_rule')
 
     def __init__(self, _set):
         self._set = _set
         self._value = None
+        # True while templatize_rule evaluates a rule with this index
+        self._in_rule = False
 
     def __getstate__(self):
         """
@@ -101,6 +105,11 @@ class IndexTemplate(NumericValue):
         return False
 
     def __str__(self):
+        if self._in_rule:
+            # The rule is using the index value as a string
+            raise TemplateExpressionError(
+                self, "The rule converted the index template %s to a "
+                "string" % (self.getname(),))
         return self.getname()
 
     def getname(self, fully_qualified=False, name_buffer=None, relative_to=None):
@@ -231,3 +240,290 @@ def substitute_template_with_value(expr):
         return as_numeric(expr())
     else:
         return expr.resolve_template()
+
+
+def templatize_rule(block, rule, index_set):
+    """Evaluate an indexed component rule once with IndexTemplate indices.
+
+    The rule is called with one IndexTemplate for each (dimension 1)
+    set in the index set.  The rule must not branch on the index
+    values: a rule that needs the value of an IndexTemplate (e.g.,
+    ``if i == 1: ...``), converts it to a string, or evaluates a
+    relational expression in a boolean context (e.g., ``max(i, 2)``)
+    raises a TemplateExpressionError.
+
+    Args:
+        block: the block passed as the first argument to the rule
+        rule: the rule
+        index_set: the index set of the component
+
+    Returns:
+        a tuple (expr, indices), where expr is the template expression
+        returned by the rule and indices is the tuple of IndexTemplate
+        objects passed to the rule.
+    """
+    if hasattr(index_set, 'set_tuple'):
+        sets = tuple(index_set.set_tuple)
+    else:
+        sets = (index_set,)
+    for s in sets:
+        if s.dimen != 1:
+            raise TemplateExpressionError(
+                None, "Cannot create index templates for the set '%s' "
+                "with dimen=%s" % (s.name, s.dimen))
+    indices = tuple(IndexTemplate(s) for s in sets)
+    _chainedInequality = EXPR._chainedInequality
+    _chainedInequality.prev = None
+    _chainedInequality.call_info = None
+    for index in indices:
+        index._in_rule = True
+    try:
+        expr = rule(block, *indices)
+    finally:
+        for index in indices:
+            index._in_rule = False
+    if _chainedInequality.call_info is not None:
+        # The rule evaluated a relational expression in a boolean
+        # context (e.g., "if m.p[i] > 0: ..." or "max(i, 2)").  This
+        # includes the deprecated chained inequalities, whose result
+        # cannot be told apart from a chain formed by such a test.
+        _chainedInequality.prev = None
+        _chainedInequality.call_info = None
+        raise TemplateExpressionError(
+            None, "The rule evaluated a relational expression involving "
+            "an index template")
+    for arg in (expr if type(expr) is tuple else (expr,)):
+        if _contains_nested_relational(arg):
+            raise TemplateExpressionError(
+                None, "The rule returned a relational expression nested "
+                "in another expression")
+    return expr, indices
+
+
+def _contains_nested_relational(expr):
+    # Returns True if a relational expression appears below the root
+    # of expr
+    if expr.__class__ in native_types or not expr.is_expression_type():
+        return False
+    stack = list(expr.args)
+    while stack:
+        node = stack.pop()
+        if node.__class__ in native_types or not node.is_expression_type():
+            continue
+        if node.is_relational():
+            return True
+        stack.extend(node.args)
+    return False
+
+
+def compile_template_expression(expr):
+    """Compile a template expression for repeated instantiation.
+
+    This returns a function (taking no arguments) that returns the
+    expression for the current values of the IndexTemplate objects
+    (the same result as substituting with substitute_template_with_value).
+    The expression tree is walked only once.  Sub-expressions that do
+    not depend on an IndexTemplate are shared by all instances.
+
+    Args:
+        expr: a template expression, or a tuple of template expressions
+
+    Returns:
+        a function that instantiates the template expression
+    """
+    if type(expr) is tuple:
+        fcns = tuple(_compile_template_node(e) for e in expr)
+        return lambda: tuple(e if f is None else f()
+                             for e, f in zip(expr, fcns))
+    fcn = _compile_template_node(expr)
+    if fcn is None:
+        return lambda: expr
+    return fcn
+
+
+def _compile_template_node(node):
+    # Returns None if the node does not depend on an IndexTemplate
+    if node.__class__ in native_types:
+        return None
+    if node.__class__ is IndexTemplate:
+        return node.__call__
+    if not node.is_expression_type() or node.is_named_expression_type():
+        return None
+
+    if node.__class__ is EXPR.GetItemExpression:
+        base = node._base
+        args = tuple(node.args)
+        fcns = tuple(_compile_template_node(arg) for arg in args)
+        if len(args) == 1:
+            fcn = fcns[0]
+            if fcn is None:
+                return None
+            if args[0].__class__ is IndexTemplate:
+                # The most common case: m.x[i]
+                index = args[0]
+                return lambda: base[index._value]
+            return lambda: base[value(fcn())]
+        return lambda: base[tuple(value(arg) if fcn is None else value(fcn())
+                                  for arg, fcn in zip(args, fcns))]
+
+    if node.__class__ is EXPR.LinearExpression:
+        args = [node.constant] + list(node.linear_coefs)
+        fcns = [_compile_template_node(arg) for arg in args]
+        templated = [(i, fcn) for i, fcn in enumerate(fcns) if fcn is not None]
+        if not templated:
+            return None
+        linear_vars = list(node.linear_vars)
+        def _linear():
+            new_args = list(args)
+            for i, fcn in templated:
+                new_args[i] = fcn()
+            return EXPR.LinearExpression(new_args + linear_vars)
+        return _linear
+
+    args = tuple(node.args)
+    templated = []
+    for i, arg in enumerate(args):
+        fcn = _compile_template_node(arg)
+        if fcn is not None:
+            templated.append((i, fcn))
+    if not templated:
+        return None
+    if node.is_relational():
+        # The arguments of relational expressions must be numeric
+        # objects (indexing an immutable Param returns a native value)
+        templated = [(i, (lambda f: lambda: as_numeric(f()))(fcn))
+                     for i, fcn in templated]
+    if node.__class__ is _MutableSumExpression:
+        create = EXPR.SumExpression
+    else:
+        create = node.create_node_with_local_data
+    if len(args) == 2:
+        # Binary operators (products, divisions, powers, inequalities)
+        # are the most common template nodes
+        arg0, arg1 = args
+        if len(templated) == 2:
+            fcn0, fcn1 = templated[0][1], templated[1][1]
+            return lambda: create((fcn0(), fcn1()))
+        i, fcn = templated[0]
+        if i:
+            return lambda: create((arg0, fcn()))
+        return lambda: create((fcn(), arg1))
+    def _node():
+        new_args = list(args)
+        for i, fcn in templated:
+            new_args[i] = fcn()
+        return create(tuple(new_args))
+    return _node
+
+
+def compile_template_standard_repn(expr, quadratic=True):
+    """Compile a template expression into a standard representation.
+
+    The standard representation of the template is generated once, with
+    a placeholder variable for every indexed variable in the expression.
+    This returns a function (taking no arguments) that returns the
+    StandardRepn of the expression for the current values of the
+    IndexTemplate objects, without creating the expression.  Values of
+    parameters and fixed variables are computed as in
+    generate_standard_repn.
+
+    Args:
+        expr: a (numeric) template expression
+        quadratic: if True, quadratic terms are collected
+
+    Returns:
+        a function that generates the standard representation, or None
+        if the template expression is not polynomial (or is indexed by
+        components other than variables and parameters).
+    """
+    from pyomo.repn.standard_repn import (StandardRepn,
+                                          generate_standard_repn)
+
+    placeholders = {}
+    def _substituter(node):
+        if node.__class__ is IndexTemplate:
+            return node
+        ctype = node._base.type()
+        if ctype is pyomo.core.base.param.Param:
+            return node
+        if ctype is not pyomo.core.base.var.Var:
+            raise TemplateExpressionError(
+                None, "Cannot compile the standard representation of "
+                "'%s'" % (node,))
+        var = pyomo.core.base.var._GeneralVarData()
+        # (the placeholder is stored to keep its id unique)
+        placeholders[id(var)] = (var, _compile_template_node(node))
+        return var
+
+    try:
+        template = substitute_template_expression(expr, _substituter)
+    except TemplateExpressionError:
+        return None
+    repn = generate_standard_repn(template, compute_values=False,
+                                  quadratic=quadratic)
+    if repn.nonlinear_expr is not None:
+        return None
+
+    def _var(v):
+        if id(v) in placeholders:
+            return placeholders[id(v)][1]
+        return lambda: v
+
+    constant = repn.constant
+    linear = tuple((_var(v), c) for v, c in
+                   zip(repn.linear_vars, repn.linear_coefs))
+    quadratic = tuple((_var(v1), _var(v2), c) for (v1, v2), c in
+                      zip(repn.quadratic_vars, repn.quadratic_coefs))
+
+    def _generate():
+        const = value(constant)
+        linear_terms = {}
+        quadratic_terms = {}
+        for fcn, c in linear:
+            v = fcn()
+            c = value(c)
+            if v.fixed:
+                const += c*v.value
+            elif id(v) in linear_terms:
+                linear_terms[id(v)][1] += c
+            else:
+                linear_terms[id(v)] = [v, c]
+        for fcn1, fcn2, c in quadratic:
+            v1 = fcn1()
+            v2 = fcn2()
+            c = value(c)
+            if v1.fixed:
+                c *= v1.value
+                if v2.fixed:
+                    const += c*v2.value
+                elif id(v2) in linear_terms:
+                    linear_terms[id(v2)][1] += c
+                else:
+                    linear_terms[id(v2)] = [v2, c]
+                continue
+            if v2.fixed:
+                c *= v2.value
+                if id(v1) in linear_terms:
+                    linear_terms[id(v1)][1] += c
+                else:
+                    linear_terms[id(v1)] = [v1, c]
+                continue
+            if id(v1) > id(v2):
+                v1, v2 = v2, v1
+            key = (id(v1), id(v2))
+            if key in quadratic_terms:
+                quadratic_terms[key][2] += c
+            else:
+                quadratic_terms[key] = [v1, v2, c]
+
+        ans = StandardRepn()
+        ans.constant = const
+        terms = [term for term in itervalues(linear_terms) if term[1] != 0]
+        ans.linear_vars = tuple(term[0] for term in terms)
+        ans.linear_coefs = tuple(term[1] for term in terms)
+        terms = [term for term in itervalues(quadratic_terms)
+                 if term[2] != 0]
+        ans.quadratic_vars = tuple((term[0], term[1]) for term in terms)
+        ans.quadratic_coefs = tuple(term[2] for term in terms)
+        return ans
+    return _generate
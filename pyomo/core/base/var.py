@@ -8,13 +8,15 @@
 #  This software is distributed under the 3-clause BSD License.
 #  ___________________________________________________________________________
 
-__all__ = ['Var', '_VarData', '_GeneralVarData', 'VarList', 'SimpleVar']
+__all__ = ['Var', '_VarData', '_GeneralVarData', '_ArrayVarData', 'VarList',
+           'SimpleVar']
 
 import logging
 from weakref import ref as weakref_ref
 
 from pyomo.common.timing import ConstructionTimer
-from pyomo.core.base.numvalue import NumericValue, value, is_fixed
+from pyomo.core.base.numvalue import (NumericValue, value, is_fixed,
+                                      native_integer_types)
 from pyomo.core.base.set_types import BooleanSet, IntegerSet, RealSet, Reals
 from pyomo.core.base.plugin import ModelComponentFactory
 from pyomo.core.base.component import ComponentData
@@ -28,6 +30,8 @@ from six.moves import xrange
 
 logger = logging.getLogger('pyomo.core')
 
+_nan = float('nan')
+
 class _VarData(ComponentData, NumericValue):
     """
     This class defines the data for a single variable.
@@ -458,6 +462,185 @@ class _GeneralVarData(_VarData):
     free = unfix
 
 
+class _ArrayVarData(_VarData):
+    """
+    This class defines the data for a single variable of an IndexedVar
+    declared with array_storage=True.  The value, bounds, fixed and
+    stale flags are stored in NumPy arrays on the owning Var (at
+    position '_ndx'), so this object is only a lightweight view.
+
+    Constructor Arguments:
+        ndx         The position of this variable in the arrays.
+        component   The Var object that owns this data.
+
+    Unlike _GeneralVarData, the bounds are stored as numeric values:
+    passing a mutable Param to setlb or setub records its current
+    value.  A value of None is stored as NaN.  Values are stored as
+    floats, with a flag recording that an integer was assigned so
+    that it is returned as an int.
+    """
+
+    __slots__ = ('_ndx',)
+
+    def __init__(self, ndx, component=None):
+        #
+        # These lines represent in-lining of the
+        # following constructors:
+        #   - _VarData
+        #   - ComponentData
+        #   - NumericValue
+        self._component = weakref_ref(component) if (component is not None) \
+                          else None
+        self._ndx = ndx
+
+    def __getstate__(self):
+        state = super(_ArrayVarData, self).__getstate__()
+        for i in _ArrayVarData.__slots__:
+            state[i] = getattr(self, i)
+        return state
+
+    #
+    # Abstract Interface
+    #
+
+    @property
+    def value(self):
+        """Return the value for this variable."""
+        comp = self._component()
+        val = comp._array_value[self._ndx]
+        if val != val:
+            return None
+        if comp._array_integer[self._ndx]:
+            return int(val)
+        return float(val)
+    @value.setter
+    def value(self, val):
+        """Set the value for this variable."""
+        comp = self._component()
+        if val is None:
+            comp._array_value[self._ndx] = _nan
+            comp._array_integer[self._ndx] = False
+        else:
+            val = value(val)
+            comp._array_value[self._ndx] = val
+            comp._array_integer[self._ndx] = \
+                val.__class__ in native_integer_types
+
+    @property
+    def domain(self):
+        """Return the domain for this variable."""
+        comp = self._component()
+        return comp._array_domain.get(self._ndx, comp._domain_init_value)
+    @domain.setter
+    def domain(self, domain):
+        """Set the domain for this variable."""
+        if not hasattr(domain, 'bounds'):
+            raise ValueError(
+                "%s is not a valid domain. Variable domains must be an "
+                "instance of one of %s, or an object that declares a method "
+                "for bounds (like a Pyomo Set). Examples: NonNegativeReals, "
+                "Integers, Binary" % (domain, (RealSet, IntegerSet, BooleanSet)))
+        comp = self._component()
+        if domain is comp._domain_init_value:
+            comp._array_domain.pop(self._ndx, None)
+        else:
+            comp._array_domain[self._ndx] = domain
+
+    @property
+    def lb(self):
+        """Return the lower bound for this variable."""
+        dlb, _ = self.domain.bounds()
+        lb = self._component()._array_lb[self._ndx]
+        if lb != lb:
+            return dlb
+        elif dlb is None:
+            return float(lb)
+        return max(float(lb), dlb)
+    @lb.setter
+    def lb(self, val):
+        raise AttributeError("Assignment not allowed. Use the setlb method")
+
+    @property
+    def ub(self):
+        """Return the upper bound for this variable."""
+        _, dub = self.domain.bounds()
+        ub = self._component()._array_ub[self._ndx]
+        if ub != ub:
+            return dub
+        elif dub is None:
+            return float(ub)
+        return min(float(ub), dub)
+    @ub.setter
+    def ub(self, val):
+        raise AttributeError("Assignment not allowed. Use the setub method")
+
+    @property
+    def fixed(self):
+        """Return the fixed indicator for this variable."""
+        return bool(self._component()._array_fixed[self._ndx])
+    @fixed.setter
+    def fixed(self, val):
+        """Set the fixed indicator for this variable."""
+        self._component()._array_fixed[self._ndx] = val
+
+    @property
+    def stale(self):
+        """Return the stale indicator for this variable."""
+        return bool(self._component()._array_stale[self._ndx])
+    @stale.setter
+    def stale(self, val):
+        """Set the stale indicator for this variable."""
+        self._component()._array_stale[self._ndx] = val
+
+    def setlb(self, val):
+        """
+        Set the lower bound for this variable after validating that
+        the value is fixed (or None).
+        """
+        # Note: is_fixed(None) returns True
+        if is_fixed(val):
+            self._component()._array_lb[self._ndx] = \
+                _nan if val is None else value(val)
+        else:
+            raise ValueError(
+                "Non-fixed input of type '%s' supplied as variable lower "
+                "bound - legal types must be fixed expressions or variables."
+                % (type(val),))
+
+    def setub(self, val):
+        """
+        Set the upper bound for this variable after validating that
+        the value is fixed (or None).
+        """
+        # Note: is_fixed(None) returns True
+        if is_fixed(val):
+            self._component()._array_ub[self._ndx] = \
+                _nan if val is None else value(val)
+        else:
+            raise ValueError(
+                "Non-fixed input of type '%s' supplied as variable upper "
+                "bound - legal types are fixed expressions or variables."
+                "parameters"
+                % (type(val),))
+
+    def fix(self, *val):
+        """
+        Set the fixed indicator to True. Value argument is optional,
+        indicating the variable should be fixed at its current value.
+        """
+        self.fixed = True
+        if len(val) == 1:
+            self.value = val[0]
+        elif len(val) > 1:
+            raise TypeError("fix expected at most 1 arguments, got %d" % (len(val)))
+
+    def unfix(self):
+        """Sets the fixed indicator to False."""
+        self.fixed = False
+
+    free = unfix
+
+
 @ModelComponentFactory.register("Decision variables.")
 class Var(IndexedComponent):
     """A numeric variable, which may be defined over an index.
@@ -477,6 +660,13 @@ class Var(IndexedComponent):
             `index_set()` when constructing the Var (True) or just the
             variables returned by `initialize`/`rule` (False).  Defaults
             to True.
+        array_storage (bool, optional): Store the values, bounds and
+            fixed/stale flags of an indexed Var in contiguous NumPy
+            arrays (True).  The variable data objects are then
+            lightweight views, and `get_values_array()` and
+            `set_values_array()` access the values without copying
+            them through Python objects.  Bounds are stored as
+            numeric values.  Defaults to False.
     """
 
     _ComponentDataClass = _GeneralVarData
@@ -499,6 +689,7 @@ class Var(IndexedComponent):
         domain = kwd.pop('domain', domain)
         bounds = kwd.pop('bounds', None)
         self._dense = kwd.pop('dense', True)
+        array_storage = kwd.pop('array_storage', False)
 
         #
         # Initialize the base class
@@ -506,6 +697,11 @@ class Var(IndexedComponent):
         kwd.setdefault('ctype', Var)
         IndexedComponent.__init__(self, *args, **kwd)
         #
+        # Array storage only applies to indexed variables
+        #
+        self._array_storage = bool(array_storage) and self.is_indexed()
+        self._array_size = None
+        #
         # Determine if the domain argument is a functor or other object
         #
         self._domain_init_value = None
@@ -544,6 +740,10 @@ class Var(IndexedComponent):
         """
         Set the 'stale' attribute of every variable data object to True.
         """
+        if self._array_storage:
+            if self._array_size is not None:
+                self._array_stale[:] = True
+            return
         for var_data in itervalues(self._data):
             var_data.stale = True
 
@@ -570,6 +770,66 @@ class Var(IndexedComponent):
         for index, new_value in iteritems(new_values):
             self[index].set_value(new_value, valid)
 
+    def _array_positions(self):
+        # Positions of the variable data objects in the storage arrays
+        # (variables that were deleted leave unused positions)
+        if len(self._data) == self._array_size:
+            return slice(0, self._array_size)
+        return sorted(vardata._ndx for vardata in itervalues(self._data))
+
+    def get_values_array(self):
+        """
+        Return a NumPy array with the values of the variables (NaN for
+        variables without a value).
+
+        For variables declared with array_storage=True the values are
+        ordered as the variables were created (the order of the index
+        set for dense variables); otherwise they are in the iteration
+        order of this component.
+        """
+        import numpy
+        if self._array_storage:
+            if self._array_size is None:
+                return numpy.empty(0)
+            return self._array_value[self._array_positions()].copy()
+        return numpy.fromiter(
+            (_nan if vardata.value is None else vardata.value
+             for vardata in itervalues(self)),
+            dtype=float, count=len(self))
+
+    def set_values_array(self, values, valid=False):
+        """
+        Set the values of the variables from a sequence ordered as in
+        get_values_array().  NaN entries clear the values.
+
+        The default behavior is to validate the values against the
+        variable domains.  When valid is True and the variables use
+        array storage, the values are copied into the storage array
+        without visiting the variable data objects.
+        """
+        import numpy
+        values = numpy.asarray(values)
+        if values.shape != (len(self),):
+            raise ValueError(
+                "Cannot set the values of Var '%s' (size %s) from an "
+                "array with shape %s" % (self.name, len(self), values.shape))
+        if self._array_storage and valid:
+            if self._array_size is not None:
+                positions = self._array_positions()
+                self._array_value[positions] = values
+                self._array_integer[positions] = \
+                    numpy.issubdtype(values.dtype, numpy.integer)
+                self._array_stale[positions] = False
+            return
+        if self._array_storage:
+            data = sorted(itervalues(self._data), key=lambda v: v._ndx)
+        else:
+            data = itervalues(self)
+        for vardata, val in zip(data, values.tolist()):
+            if val != val:
+                val = None
+            vardata.set_value(val, valid)
+
     def construct(self, data=None):
         """Construct this component."""
         if __debug__ and logger.isEnabledFor(logging.DEBUG):   #pragma:nocover
@@ -595,6 +855,16 @@ class Var(IndexedComponent):
         if not self.is_indexed():
             self._data[None] = self
             self._initialize_members((None,))
+        elif self._array_storage:
+            self._allocate_arrays(len(self._index) if self._dense else 0)
+            if self._dense:
+                self_weakref = weakref_ref(self)
+                for i, ndx in enumerate(self._index):
+                    cdata = _ArrayVarData(i, component=None)
+                    cdata._component = self_weakref
+                    self._data[ndx] = cdata
+                self._array_size = len(self._data)
+                self._initialize_members(self._index)
         elif self._dense:
             # This loop is optimized for speed with pypy.
             # Calling dict.update((...) for ...) is roughly
@@ -621,6 +891,14 @@ class Var(IndexedComponent):
         """Returns the default component data value."""
         if index is None and not self.is_indexed():
             obj = self._data[index] = self
+        elif self._array_storage:
+            if self._array_size is None:
+                self._allocate_arrays(0)
+            ndx = self._array_size
+            if ndx == len(self._array_value):
+                self._allocate_arrays(max(8, 2*ndx))
+            obj = self._data[index] = _ArrayVarData(ndx, component=self)
+            self._array_size += 1
         else:
             obj = self._data[index] = self._ComponentDataClass(
                 self._domain_init_value, component=self)
@@ -641,6 +919,33 @@ class Var(IndexedComponent):
             del self._data[index]
             raise
 
+    def _allocate_arrays(self, size):
+        """Allocate (or grow) the arrays used with array_storage=True."""
+        import numpy
+        value = numpy.full(size, _nan)
+        lb = numpy.full(size, _nan)
+        ub = numpy.full(size, _nan)
+        integer = numpy.zeros(size, dtype=bool)
+        fixed = numpy.zeros(size, dtype=bool)
+        stale = numpy.ones(size, dtype=bool)
+        if self._array_size is None:
+            self._array_size = 0
+            self._array_domain = {}
+        else:
+            n = self._array_size
+            value[:n] = self._array_value[:n]
+            integer[:n] = self._array_integer[:n]
+            lb[:n] = self._array_lb[:n]
+            ub[:n] = self._array_ub[:n]
+            fixed[:n] = self._array_fixed[:n]
+            stale[:n] = self._array_stale[:n]
+        self._array_value = value
+        self._array_integer = integer
+        self._array_lb = lb
+        self._array_ub = ub
+        self._array_fixed = fixed
+        self._array_stale = stale
+
     def _initialize_members(self, init_set):
         """Initialize variable data for all indices in a set."""
         # TODO: determine if there is any advantage to supporting init_set.
@@ -714,6 +1019,19 @@ class Var(IndexedComponent):
                     val = self._value_init_value[key]
                     vardata = self._data[key]
                     vardata.set_value(val)
+            elif self._array_storage and (init_set is self._index) and \
+                 (self._domain_init_rule is None):
+                # Optimization: validate the value once and assign it
+                #               to every variable with a single array
+                #               operation (init_set is only the index
+                #               set when constructing dense variables)
+                val = value(self._value_init_value)
+                n = self._array_size
+                if n:
+                    self._data[next(iter(init_set))].set_value(val)
+                    self._array_value[:n] = self._array_value[0]
+                    self._array_integer[:n] = self._array_integer[0]
+                    self._array_stale[:n] = False
             else:
                 val = value(self._value_init_value)
                 for key in init_set:
@@ -745,10 +1063,19 @@ class Var(IndexedComponent):
             # Initialize bounds with a value
             #
             (lb, ub) = self._bounds_init_value
-            for key in init_set:
-                vardata = self._data[key]
-                vardata.setlb(lb)
-                vardata.setub(ub)
+            if self._array_storage and (init_set is self._index):
+                n = self._array_size
+                if n:
+                    vardata = self._data[next(iter(init_set))]
+                    vardata.setlb(lb)
+                    vardata.setub(ub)
+                    self._array_lb[:n] = self._array_lb[0]
+                    self._array_ub[:n] = self._array_ub[0]
+            else:
+                for key in init_set:
+                    vardata = self._data[key]
+                    vardata.setlb(lb)
+                    vardata.setub(ub)
 
     def _pprint(self):
         """Print component information."""
@@ -924,11 +1251,25 @@ class IndexedVar(Var):
         Set the fixed indicator to True. Value argument is optional,
         indicating the variable should be fixed at its current value.
         """
+        if self._array_storage and (self._array_size is not None) and \
+           len(val) <= 1:
+            positions = self._array_positions()
+            self._array_fixed[positions] = True
+            if len(val) == 1:
+                val = None if val[0] is None else value(val[0])
+                self._array_value[positions] = _nan if val is None else val
+                self._array_integer[positions] = \
+                    val.__class__ in native_integer_types
+            return
         for vardata in itervalues(self):
             vardata.fix(*val)
 
     def unfix(self):
         """Sets the fixed indicator to False."""
+        if self._array_storage:
+            if self._array_size is not None:
+                self._array_fixed[self._array_positions()] = False
+            return
         for vardata in itervalues(self):
             vardata.unfix()
 
@@ -941,6 +1282,20 @@ class IndexedVar(Var):
     @domain.setter
     def domain(self, domain):
         """Sets the domain for all variables in this container."""
+        if self._array_storage and (self._array_size is not None) and \
+           (len(self._data) == self._array_size):
+            # Replace the default domain shared by the array data
+            # objects (this also applies to variables added later)
+            if not hasattr(domain, 'bounds'):
+                raise ValueError(
+                    "%s is not a valid domain. Variable domains must be an "
+                    "instance of one of %s, or an object that declares a "
+                    "method for bounds (like a Pyomo Set). Examples: "
+                    "NonNegativeReals, Integers, Binary"
+                    % (domain, (RealSet, IntegerSet, BooleanSet)))
+            self._domain_init_value = domain
+            self._array_domain.clear()
+            return
         for vardata in itervalues(self):
             vardata.domain = domain
 
@@ -0,0 +1,312 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+#
+# Compilation of expressions to Python functions
+#
+# value() walks the expression tree every time an expression is
+# evaluated.  When the same expression is evaluated many times (with
+# different variable values), it is faster to generate (once) the
+# source of a Python function that computes the expression, and to call
+# that function instead.
+#
+# The generated function takes a sequence of variable values: each
+# expression node becomes one statement (shared subexpressions are
+# computed once), the variables in the variable list are read from the
+# argument, and the other leaves (parameters, variables not in the
+# list) are evaluated when the function is called.  With
+# vectorize=True, the intrinsic functions are mapped to their NumPy
+# equivalents, so the function can be called with arrays of values
+# (one row per variable) and computes the expressions at many points.
+#
+
+from __future__ import division
+
+__all__ = ('compile_expression', 'CompiledExpression')
+
+from six.moves import xrange
+
+try:
+    import numpy
+    numpy_available = True
+except ImportError:                               #pragma:nocover
+    numpy_available = False
+
+from pyomo.core.expr.numvalue import (
+    NumericValue, nonpyomo_leaf_types, native_types, value,
+)
+from pyomo.core.expr.numeric_expr import (
+    SumExpressionBase, LinearExpression, ProductExpression,
+    ReciprocalExpression, PowExpression, NegationExpression,
+    UnaryFunctionExpression, AbsExpression, Expr_ifExpression,
+)
+from pyomo.core.expr.visitor import identify_variables
+
+# Sums with more terms than this are generated as calls to sum()
+# (instead of chains of "+"), which would exceed the nesting limits of
+# the Python compiler for long sums.
+_MAX_INLINE_TERMS = 32
+
+_numpy_functions = {
+    'log': 'log', 'log10': 'log10', 'exp': 'exp', 'sqrt': 'sqrt',
+    'sin': 'sin', 'cos': 'cos', 'tan': 'tan',
+    'sinh': 'sinh', 'cosh': 'cosh', 'tanh': 'tanh',
+    'asin': 'arcsin', 'acos': 'arccos', 'atan': 'arctan',
+    'asinh': 'arcsinh', 'acosh': 'arccosh', 'atanh': 'arctanh',
+    'ceil': 'ceil', 'floor': 'floor', 'abs': 'abs',
+}
+
+
+class _ExpressionCompiler(object):
+
+    def __init__(self, variables, vectorize):
+        self.vectorize = vectorize
+        self.var_map = dict((id(v), i) for i, v in enumerate(variables))
+        self.namespace = {'_value': value}
+        self.functions = {}
+        self.lines = []
+        self.memo = {}
+        # Hold references to the compiled nodes, so the ids in the memo
+        # remain valid
+        self.nodes = []
+        self.watched = []
+
+    def _name(self, prefix, obj):
+        name = '_%s%d' % (prefix, len(self.namespace))
+        self.namespace[name] = obj
+        return name
+
+    def _leaf(self, node):
+        if node.__class__ is float or node.__class__ is int:
+            if node - node != 0:
+                # inf and nan
+                return self._name('c', node)
+            if node < 0:
+                return '(%r)' % (node,)
+            return repr(node)
+        if node.__class__ in nonpyomo_leaf_types:
+            return self._name('c', node)
+        if node.is_expression_type():
+            return None
+        if id(node) in self.var_map:
+            return 'x[%d]' % (self.var_map[id(node)],)
+        return '_value(%s)' % (self._name('l', node),)
+
+    def _children(self, node):
+        if node.is_named_expression_type():
+            return (node.expr,)
+        if isinstance(node, LinearExpression):
+            return [node.constant] + list(node.linear_coefs) \
+                + list(node.linear_vars)
+        return node.args
+
+    def _sum(self, terms):
+        if len(terms) > _MAX_INLINE_TERMS:
+            return 'sum((%s,))' % (', '.join(terms),)
+        return ' + '.join(terms)
+
+    def _node(self, node, args):
+        if node.is_named_expression_type():
+            self.watched.append((node, 'expr', node.expr))
+            return args[0]
+        if isinstance(node, LinearExpression):
+            n = len(node.linear_coefs)
+            ans = self._sum(
+                [args[0]] + ['%s*%s' % (args[1+i], args[1+n+i])
+                             for i in xrange(n)])
+        elif isinstance(node, SumExpressionBase):
+            ans = self._sum(args)
+        elif isinstance(node, ProductExpression):
+            ans = '%s * %s' % tuple(args)
+        elif isinstance(node, ReciprocalExpression):
+            ans = '1 / %s' % tuple(args)
+        elif isinstance(node, PowExpression):
+            ans = '%s ** %s' % tuple(args)
+        elif isinstance(node, NegationExpression):
+            ans = '- %s' % tuple(args)
+        elif isinstance(node, AbsExpression):
+            ans = 'abs(%s)' % tuple(args)
+        elif isinstance(node, UnaryFunctionExpression):
+            if self.vectorize:
+                name = node.getname()
+                if name not in _numpy_functions:
+                    raise ValueError(
+                        "Cannot vectorize the intrinsic function '%s'"
+                        % (name,))
+                fcn = '_np_' + name
+                self.namespace[fcn] = getattr(numpy, _numpy_functions[name])
+            else:
+                fcn = self.functions.get(id(node._fcn), None)
+                if fcn is None:
+                    fcn = self.functions[id(node._fcn)] \
+                          = self._name('f', node._fcn)
+            ans = '%s(%s)' % (fcn, args[0])
+        elif isinstance(node, Expr_ifExpression):
+            if self.vectorize:
+                self.namespace['_np_where'] = numpy.where
+                ans = '_np_where(%s, %s, %s)' % tuple(args)
+            else:
+                ans = '%s if %s else %s' % (args[1], args[0], args[2])
+        else:
+            # Generic node: rely on the node's own evaluation method
+            ans = '%s._apply_operation((%s,))' % (
+                self._name('n', node), ', '.join(args))
+        tmp = 't%d' % (len(self.lines),)
+        self.lines.append('    %s = %s' % (tmp, ans))
+        return tmp
+
+    def compile(self, root):
+        """Generate the statements computing root; return the name of
+        the local variable (or the literal) holding its value"""
+        memo = self.memo
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            if id(node) in memo:
+                stack.pop()
+                continue
+            ans = self._leaf(node)
+            if ans is None:
+                children = self._children(node)
+                pending = [ c for c in children if id(c) not in memo ]
+                if pending:
+                    stack.extend(reversed(pending))
+                    continue
+                ans = self._node(node, [ memo[id(c)] for c in children ])
+            stack.pop()
+            self.nodes.append(node)
+            memo[id(node)] = ans
+        return memo[id(root)]
+
+    def function(self, roots, single):
+        results = [ self.compile(r) for r in roots ]
+        if single:
+            ret = results[0]
+        else:
+            ret = '(%s,)' % (', '.join(results),) if results else '()'
+        src = '\n'.join(['def _compiled_expression(x):'] + self.lines
+                        + ['    return %s' % (ret,)])
+        exec(compile(src, '<compiled pyomo expression>', 'exec'),
+             self.namespace)
+        return self.namespace['_compiled_expression']
+
+
+def _root_expression(obj):
+    """Return the expression to compile for obj and the (obj, attribute,
+    expression) tuple to watch for changes (if any)"""
+    if obj.__class__ in native_types or isinstance(obj, NumericValue):
+        return obj, None
+    # Constraints (and other components with a body)
+    body = obj.body
+    return body, (obj, 'body', body)
+
+
+class CompiledExpression(object):
+    """
+    An expression (or list of expressions) compiled to a Python
+    function.
+
+    Calling this object evaluates the expression(s).  The argument is
+    the sequence of values of the variables (in the order of the
+    :attr:`variables` list); if it is omitted, the current values of
+    the variables are used.  The variables are never modified.
+
+    The function is regenerated (when the object is called) if a named
+    expression or constraint body that was compiled is changed.  The
+    list of variables is fixed when the object is created: variables
+    that appear in the new expressions, but not in the list, are
+    evaluated like parameters (using their current value).
+
+    Args:
+        expr: An expression, named expression, or constraint, or a list
+            of them.
+        variables: The variables whose values are passed to the
+            compiled function.  Defaults to all the variables in the
+            expressions (including fixed variables), in the order they
+            are first encountered.
+        vectorize (bool): If :const:`True`, the intrinsic functions
+            (log, exp, ...) and Expr_if are evaluated with NumPy, so the
+            compiled function can be called with a 2-D array of values
+            (one row per variable, one column per point).  Defaults to
+            :const:`False`.
+    """
+
+    def __init__(self, expr, variables=None, vectorize=False):
+        if vectorize and not numpy_available:
+            raise ImportError(
+                "Vectorized expression compilation requires NumPy")
+        self._single = type(expr) not in (list, tuple)
+        self._objs = [expr] if self._single else list(expr)
+        self.vectorize = vectorize
+        if variables is None:
+            seen = set()
+            variables = []
+            for obj in self._objs:
+                expr = _root_expression(obj)[0]
+                if expr.__class__ in nonpyomo_leaf_types:
+                    continue
+                for v in identify_variables(expr):
+                    if id(v) not in seen:
+                        seen.add(id(v))
+                        variables.append(v)
+        self.variables = list(variables)
+        self._fcn = None
+        self._watched = ()
+
+    def _compile(self):
+        compiler = _ExpressionCompiler(self.variables, self.vectorize)
+        roots = []
+        for obj in self._objs:
+            expr, watched = _root_expression(obj)
+            if watched is not None:
+                compiler.watched.append(watched)
+            roots.append(expr)
+        self._fcn = compiler.function(roots, self._single)
+        self._watched = compiler.watched
+
+    def _is_stale(self):
+        if self._fcn is None:
+            return True
+        for obj, attr, expr in self._watched:
+            if getattr(obj, attr) is not expr:
+                return True
+        return False
+
+    def __call__(self, values=None):
+        if self._is_stale():
+            self._compile()
+        if values is None:
+            values = [ value(v) for v in self.variables ]
+        if not self.vectorize:
+            return self._fcn(values)
+        values = numpy.asarray(values, dtype=float)
+        ans = self._fcn(values)
+        shape = values.shape[1:]
+        if self._single:
+            return _broadcast(ans, shape)
+        return [ _broadcast(x, shape) for x in ans ]
+
+
+def _broadcast(x, shape):
+    if numpy.ndim(x) == 0:
+        return numpy.full(shape, x, dtype=float)
+    return x
+
+
+def compile_expression(expr, variables=None, vectorize=False):
+    """
+    Compile an expression (or a list of expressions) to a Python
+    function for fast repeated evaluation.
+
+    Returns:
+        A :class:`CompiledExpression` object.  See
+        :class:`CompiledExpression` for the description of the
+        arguments.
+    """
+    return CompiledExpression(expr, variables, vectorize)
@@ -45,6 +45,7 @@ if _mode == Mode.pyomo5_trees:
     )
     from pyomo.core.expr import visitor as _visitor
     from pyomo.core.expr.visitor import *
+    from pyomo.core.expr.compiler import *
     # FIXME: we shouldn't need circular dependencies between modules
     _visitor.LinearExpression = _numeric_expr.LinearExpression
     _visitor.MonomialTermExpression = _numeric_expr.MonomialTermExpression
@@ -1271,19 +1271,29 @@ class LinearExpression(ExpressionBase):
 
     PRECEDENCE = 6
 
-    def __init__(self, args=None):
+    def __init__(self, args=None, constant=None, linear_coefs=None,
+                 linear_vars=None):
         # I am not sure why LinearExpression allows omitting args, but
         # it does.  If they are provided, they should be the constant
         # followed by the coefficients followed by the variables.
+        #
+        # Alternatively, the constant, coefficients and variables can be
+        # passed directly (the lists are used, not copied).  This avoids
+        # building the flattened args tuple when generating expressions
+        # in bulk.
         if args:
+            if constant is not None or linear_coefs is not None \
+               or linear_vars is not None:
+                raise ValueError("Cannot specify both args and any of "
+                                 "{constant, linear_coefs, or linear_vars}")
             self.constant = args[0]
             n = (len(args)-1) // 2
             self.linear_coefs = args[1:n+1]
             self.linear_vars = args[n+1:]
         else:
-            self.constant = 0
-            self.linear_coefs = []
-            self.linear_vars = []
+            self.constant = constant if constant is not None else 0
+            self.linear_coefs = linear_coefs if linear_coefs else []
+            self.linear_vars = linear_vars if linear_vars else []
         self._args_ = tuple()
 
     def nargs(self):
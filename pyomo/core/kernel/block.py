@@ -361,6 +361,8 @@ class block(IBlock):
         from pyomo.core.kernel.suffix import \
             import_suffix_generator
 
+        if getattr(solution, "_arrays", None):
+            solution.expand_arrays()
         symbol_map = solution.symbol_map
         default_variable_value = getattr(solution,
                                          "default_variable_value",
@@ -11,8 +11,10 @@
 # Unit Tests for Elements of a Block
 #
 
+import gc
 import os
 import sys
+import weakref
 import six
 
 from six import StringIO
@@ -27,7 +29,8 @@ import pyutilib.services
 
 from pyomo.environ import *
 from pyomo.common.log import LoggingIntercept
-from pyomo.core.base.block import SimpleBlock, SubclassOf
+from pyomo.core.base.block import (
+    SimpleBlock, SubclassOf, _BlockData, _StructuralCloner)
 from pyomo.core.expr import current as EXPR
 from pyomo.opt import *
 
@@ -921,6 +924,141 @@ class TestBlock(unittest.TestCase):
         self.assertFalse('x' in m.__dict__)
         self.assertIs(m.component('x'), None)
 
+    def test_cached_name(self):
+        m = ConcreteModel()
+        m.b = Block([1,2])
+        m.b[1].x = Var([1,2])
+        self.assertEqual(m.b[1]._cached_name(m.b[1].x[2]), 'b[1].x[2]')
+        self.assertEqual(m.b[1]._cached_name(m.b[1].x), 'b[1].x')
+        self.assertIn(id(m.b[1].x[1]), m.b[1]._name_cache[0])
+
+        # Moving the block to a new name invalidates the cache of all
+        # the blocks below it
+        b = m.b
+        m.del_component(b)
+        self.assertNotIn('_name_cache', b[1].__dict__)
+        self.assertEqual(b[1]._cached_name(b[1].x[2]),
+                         b[1].x[2].getname(fully_qualified=True))
+        m.c = b
+        self.assertEqual(b[1]._cached_name(b[1].x[2]), 'c[1].x[2]')
+
+        # Deleted components are not returned for new objects
+        b[1].del_component('x')
+        b[1].del_component('x_index')
+        b[1].x = Var([1,2])
+        self.assertEqual(b[1]._cached_name(b[1].x[1]), 'c[1].x[1]')
+
+        # The cache is not copied by clone
+        i = m.clone()
+        self.assertNotIn('_name_cache', i.c[1].__dict__)
+        self.assertEqual(i.c[1]._cached_name(i.c[1].x[1]), 'c[1].x[1]')
+
+    def test_cached_name_deleted_objects(self):
+        m = ConcreteModel()
+        m.x = Var([1,2,3])
+        self.assertEqual(m._cached_name(m.x[3]), 'x[3]')
+        ref = weakref.ref(m.x[3])
+        del m.x[3]
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(m._cached_name(m.x[2]), 'x[2]')
+
+        ref = weakref.ref(m.x[1])
+        m.del_component(m.x)
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_ctype_index(self):
+        m = ConcreteModel()
+        m.x = Var()
+        m.b = Block([1,2])
+        m.b[1].y = Var([1,2])
+        m.b[2].c = Block()
+        m.b[2].c.z = Var()
+        m.b[2].c.con = Constraint(expr=m.b[2].c.z >= 0)
+
+        def _names(**kwds):
+            active = kwds.get('active', None)
+            return ( [x.name for x in m.component_data_objects(**kwds)],
+                     [x.name for x in m.component_objects(**kwds)],
+                     [x.name for x in m.block_data_objects(active=active)],
+                     [k for k,x in m.component_data_iterindex(**kwds)] )
+
+        def _check():
+            for kwds in ({}, {'active': True}, {'active': False},
+                         {'ctype': Var}, {'ctype': (Var, Constraint)},
+                         {'ctype': Block, 'active': True}):
+                m.use_ctype_index(False)
+                ref = _names(**kwds)
+                m.use_ctype_index()
+                self.assertEqual(_names(**kwds), ref)
+                # (from the index)
+                self.assertEqual(_names(**kwds), ref)
+            return ref
+
+        _check()
+        self.assertEqual(
+            [x.name for x in m.component_data_objects(Var)],
+            ['x', 'b[1].y[1]', 'b[1].y[2]', 'b[2].c.z'])
+        self.assertTrue(m._ctype_index)
+
+        # Adding and deleting components (at any level) clears the index
+        m.b[2].c.w = Var()
+        self.assertFalse(m._ctype_index)
+        self.assertEqual(
+            [x.name for x in m.component_data_objects(Var)],
+            ['x', 'b[1].y[1]', 'b[1].y[2]', 'b[2].c.z', 'b[2].c.w'])
+        m.b[1].del_component('y')
+        self.assertEqual(
+            [x.name for x in m.component_data_objects(Var)],
+            ['x', 'b[2].c.z', 'b[2].c.w'])
+
+        # Activating / deactivating blocks clears the index
+        m.b[2].c.deactivate()
+        self.assertEqual(
+            [x.name for x in m.component_data_objects(Var, active=True)],
+            ['x'])
+        _check()
+        m.b[2].c.activate()
+        self.assertEqual(
+            [x.name for x in m.component_data_objects(Var, active=True)],
+            ['x', 'b[2].c.z', 'b[2].c.w'])
+
+        # The activity of the other components is checked on iteration
+        m.b[2].c.con.deactivate()
+        self.assertEqual(
+            [x.name for x in m.component_data_objects(Constraint,
+                                                      active=True)], [])
+
+        # New block data clear the index
+        m.d = Block(Any)
+        m.d[1]
+        m.d[2]
+        self.assertEqual(len(list(m.block_data_objects())), 6)
+        m.d[3].v = Var()
+        self.assertEqual(
+            [x.name for x in m.block_data_objects()],
+            ['unknown', 'b[1]', 'b[2]', 'b[2].c', 'd[1]', 'd[2]', 'd[3]'])
+        del m.d[1]
+        self.assertEqual(
+            [x.name for x in m.block_data_objects()],
+            ['unknown', 'b[1]', 'b[2]', 'b[2].c', 'd[2]', 'd[3]'])
+        _check()
+
+        # Sorted traversals do not use the index
+        self.assertEqual(
+            [x.name for x in m.component_data_objects(
+                Var, sort=SortComponents.alphabetical)],
+            ['x', 'b[2].c.w', 'b[2].c.z', 'd[3].v'])
+
+        # The index is not copied by clone
+        i = m.clone()
+        self.assertEqual(i._ctype_index, {})
+        self.assertNotIn('_use_ctype_index', i.__dict__)
+        m.use_ctype_index(False)
+        self.assertIsNone(m._ctype_index)
+        self.assertIsNone(m.clone()._ctype_index)
+
     def test_reclassify_component(self):
         m = Block()
         m.a = Var()
@@ -1885,6 +2023,108 @@ class TestBlock(unittest.TestCase):
             sorted(id(x) for x in (m.x, m.y[1], nb.x, nb.y[1])),
         )
 
+    def test_clone_share_expressions(self):
+        m = ConcreteModel()
+        m.x = Var()
+        m.b = Block()
+        m.b.y = Var([1,2])
+        m.b.r = Reference(m.b.y)
+        m.b.c = Constraint(expr=m.x**2 + 2*m.x >= 1)
+        m.b.d = Constraint(expr=m.x**2 + m.b.y[1] <= 5)
+        m.b.s = Suffix()
+        m.b.s[m.b.y[2]] = 3
+
+        nb = m.b.clone()
+        # Subtrees that only refer to components outside the block are
+        # shared
+        self.assertIs(nb.c.body, m.b.c.body)
+        self.assertIsNot(nb.d.body, m.b.d.body)
+        self.assertIs(nb.d.body.arg(0), m.b.d.body.arg(0))
+        self.assertIs(nb.d.body.arg(1), nb.y[1])
+        self.assertIs(nb.r[1], nb.y[1])
+        self.assertEqual(nb.s[nb.y[2]], 3)
+        self.assertNotIn(m.b.y[2], nb.s)
+
+        nb = m.b.clone(share_expressions=False)
+        self.assertIsNot(nb.c.body, m.b.c.body)
+        self.assertIsNot(nb.d.body.arg(0), m.b.d.body.arg(0))
+        self.assertEqual(str(nb.c.body), str(m.b.c.body))
+        self.assertIs(nb.d.body.arg(1), nb.y[1])
+
+    def test_clone_structural(self):
+        m = ConcreteModel()
+        m.I = Set(initialize=[1,2,3])
+        m.p = Param(m.I, initialize={1:1, 2:4, 3:9}, mutable=True)
+        m.x = Var(m.I, bounds=(0, None))
+        m.e = Expression(expr=sum(m.p[i]*m.x[i] for i in m.I))
+        m.c = Constraint(m.I, rule=lambda m, i: m.x[i] <= m.p[i])
+        m.o = Objective(expr=m.e)
+        m.b = Block()
+        m.b.y = Var()
+        m.b.c = Constraint(expr=m.b.y + m.x[1] >= 1)
+
+        # The structural clone engine does not deepcopy the blocks
+        calls = []
+        def _deepcopy(self, memo):
+            calls.append(self)
+            raise RuntimeError("deepcopy called")
+        _BlockData.__deepcopy__ = _deepcopy
+        try:
+            OUTPUT = StringIO()
+            with LoggingIntercept(OUTPUT, 'pyomo.core'):
+                n = m.clone()
+                nb = m.b.clone(share_expressions=False)
+        finally:
+            del _BlockData.__deepcopy__
+        self.assertEqual(calls, [])
+        self.assertEqual(OUTPUT.getvalue(), "")
+        self.assertIsNot(n.b.c.body.arg(0), m.b.y)
+        self.assertIs(n.b.c.body.arg(0).parent_block(), n.b)
+        self.assertIs(nb.c.body.arg(1), m.x[1])
+        self.assertEqual(str(n.o.expr.expr), str(m.o.expr.expr))
+
+    def test_clone_ctype_index(self):
+        m = ConcreteModel()
+        m.b = Block(range(50))
+        for i in range(50):
+            m.b[i].x = Var()
+            m.b[i].use_ctype_index()
+            self.assertEqual(
+                list(m.b[i].component_data_objects(Var)), [m.b[i].x])
+
+        n = m.clone()
+        self.assertEqual(
+            len(set(id(n.b[i]._ctype_index) for i in range(50))), 50)
+        for i in range(50):
+            self.assertIsNot(n.b[i]._ctype_index, m.b[i]._ctype_index)
+            self.assertEqual(
+                list(n.b[i].component_data_objects(Var)), [n.b[i].x])
+
+    def test_clone_structural_error(self):
+        m = ConcreteModel()
+        m.x = Var()
+        m.c = Constraint(expr=m.x >= 1)
+
+        def _clone(self, block):
+            raise RuntimeError("clone failed")
+        orig = _StructuralCloner.clone
+        _StructuralCloner.clone = _clone
+        try:
+            # Fall back on deepcopy (with a warning)...
+            OUTPUT = StringIO()
+            with LoggingIntercept(OUTPUT, 'pyomo.core'):
+                n = m.clone()
+            self.assertIn("Structural clone of block 'unknown' failed "
+                          "(RuntimeError: clone failed)", OUTPUT.getvalue())
+            self.assertIs(n.c.body, n.x)
+            # ...unless share_expressions was requested explicitly
+            self.assertRaisesRegexp(RuntimeError, "clone failed",
+                                    m.clone, share_expressions=True)
+            self.assertRaisesRegexp(RuntimeError, "clone failed",
+                                    m.clone, share_expressions=False)
+        finally:
+            _StructuralCloner.clone = orig
+
     def test_clone_unclonable_attribute(self):
         class foo(object):
             def __deepcopy__(bogus):
@@ -0,0 +1,144 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+#
+# Unit Tests for expression compilation
+#
+
+import math
+
+import pyutilib.th as unittest
+
+from pyomo.environ import (ConcreteModel, Var, Param, Expression, Constraint,
+                           Objective, Expr_if, value, log, exp, sqrt, sin,
+                           floor)
+from pyomo.core.expr.current import compile_expression, CompiledExpression
+from pyomo.core.expr.compiler import numpy_available
+from pyomo.core.expr.numeric_expr import LinearExpression
+
+if numpy_available:
+    import numpy
+
+
+class TestCompileExpression(unittest.TestCase):
+
+    def _model(self):
+        m = ConcreteModel()
+        m.x = Var([1,2,3], initialize={1: 1.5, 2: 2, 3: -0.5})
+        m.p = Param(initialize=2, mutable=True)
+        m.e = Expression(expr=m.x[1]**2 - m.p*log(m.x[2]))
+        m.c = Constraint(expr=exp(m.e) + sum(i*m.x[i] for i in m.x)
+                         + 1/m.x[1] - abs(m.x[3]) <= 10)
+        return m
+
+    def test_scalar(self):
+        m = self._model()
+        f = compile_expression(m.c)
+        self.assertIs(type(f), CompiledExpression)
+        self.assertEqual(f.variables, [m.x[1], m.x[2], m.x[3]])
+        self.assertAlmostEqual(f(), value(m.c.body))
+        ans = f([2, 3, 1])
+        # the variables are not modified
+        self.assertEqual(m.x[1].value, 1.5)
+        m.x[1] = 2
+        m.x[2] = 3
+        m.x[3] = 1
+        self.assertAlmostEqual(ans, value(m.c.body))
+        # Parameters are evaluated on every call
+        m.p = 1
+        self.assertAlmostEqual(f(), value(m.c.body))
+
+    def test_explicit_variables(self):
+        m = self._model()
+        f = compile_expression(m.x[1]*m.x[2] - 2*m.x[3], variables=[m.x[2]])
+        self.assertEqual(f([4]), 1.5*4 + 1)
+        m.x[1] = 3
+        self.assertEqual(f([4]), 3*4 + 1)
+
+    def test_list(self):
+        m = self._model()
+        m.o = Objective(expr=m.x[1] - 5)
+        f = compile_expression([m.e, m.o, m.x[2]**-2, 3])
+        self.assertEqual(f.variables, [m.x[1], m.x[2]])
+        ans = f()
+        self.assertEqual(len(ans), 4)
+        self.assertAlmostEqual(ans[0], value(m.e))
+        self.assertEqual(ans[1:], (-3.5, 0.25, 3))
+
+    def test_linear_expression(self):
+        m = self._model()
+        e = LinearExpression(constant=m.p, linear_coefs=[-1, 2*m.p],
+                             linear_vars=[m.x[1], m.x[2]])
+        f = compile_expression(e**2)
+        self.assertEqual(f(), value(e**2))
+        self.assertEqual(f([1, 1]), 25)
+
+    def test_expr_if(self):
+        m = self._model()
+        e = Expr_if(IF=m.x[1] >= 1, THEN=m.x[1], ELSE=-m.x[1]*m.x[2])
+        f = compile_expression(e)
+        self.assertEqual(f(), 1.5)
+        self.assertEqual(f([0.5, 3]), -1.5)
+
+    def test_invalidation(self):
+        m = self._model()
+        f = compile_expression(m.c)
+        self.assertAlmostEqual(f(), value(m.c.body))
+        m.e = m.x[1] + 1
+        self.assertAlmostEqual(f(), value(m.c.body))
+        m.c.set_value(m.x[1] + m.x[2] == 1)
+        self.assertEqual(f([1, 2, 3]), 3)
+        # New variables are not added to the variable list
+        m.y = Var(initialize=5)
+        m.c.set_value(m.x[1] + m.y == 1)
+        self.assertEqual(f([1, 2, 3]), 6)
+
+    def test_evaluation_errors(self):
+        m = self._model()
+        f = compile_expression(sqrt(m.x[3]))
+        self.assertRaises(ValueError, f)
+        m.x[3] = None
+        self.assertRaisesRegexp(ValueError, "No value for uninitialized", f)
+        self.assertEqual(f([4]), 2)
+
+    def test_long_sum(self):
+        m = ConcreteModel()
+        m.x = Var(range(5000), initialize=1)
+        f = compile_expression(sum(m.x[i]*i for i in m.x))
+        self.assertEqual(f(), sum(range(5000)))
+
+    @unittest.skipIf(not numpy_available, "NumPy is not available")
+    def test_vectorize(self):
+        m = self._model()
+        e = m.c.body + sin(m.x[1]) + Expr_if(IF=m.x[3] >= 0, THEN=1, ELSE=2)
+        f = compile_expression([e, m.p], vectorize=True)
+        points = numpy.array([[1.5, 2, -0.5], [1, 3, 0.5], [2, 2, 2]])
+        ans = f(points.T)
+        self.assertEqual(len(ans), 2)
+        self.assertEqual(ans[0].shape, (3,))
+        for i, pt in enumerate(points):
+            m.x.set_values(dict(zip([1,2,3], pt)))
+            self.assertAlmostEqual(ans[0][i], value(e))
+        self.assertEqual(list(ans[1]), [2, 2, 2])
+
+        f = compile_expression(floor(m.x[1]), vectorize=True)
+        self.assertEqual(list(f([[1.5, -1.5]])), [1, -2])
+
+        def ufunc(x):
+            return x
+        from pyomo.core.expr.current import UnaryFunctionExpression
+        f = compile_expression(UnaryFunctionExpression(m.x[1], 'f', ufunc),
+                               vectorize=True)
+        self.assertRaisesRegexp(
+            ValueError, "Cannot vectorize the intrinsic function 'f'",
+            f, [[1.5]])
+
+
+if __name__ == "__main__":
+    unittest.main()
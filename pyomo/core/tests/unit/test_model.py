@@ -25,6 +25,7 @@ from pyomo.opt import SolutionStatus
 from pyomo.opt.parallel.local import SolverManager_Serial
 from pyomo.environ import *
 from pyomo.core.expr import current as EXPR
+from pyomo.core.expr.symbol_map import SymbolMap
 
 solvers = pyomo.opt.check_available_solvers('glpk')
 
@@ -34,6 +35,12 @@ try:
 except ImportError:
     yaml_available=False
 
+try:
+    import numpy
+    numpy_available=True
+except ImportError:
+    numpy_available=False
+
 
 class Test(unittest.TestCase):
 
@@ -744,6 +751,144 @@ class Test(unittest.TestCase):
             join(currdir,"solve_with_store8.out"),
             join(currdir,"solve_with_store4.txt"))
 
+    def test_load_values(self):
+        model = ConcreteModel()
+        model.x = Var([1,2,3])
+        model.y = Var()
+        model.y.fix(4)
+        model.c = Constraint(expr=model.x[1] + model.x[2] >= 0)
+        model.rc = Suffix(direction=Suffix.IMPORT)
+        model.dual = Suffix(direction=Suffix.IMPORT)
+        variables = [model.x[3], model.x[1], model.y]
+        index = model.solutions.load_values(variables, [3, 1, 5],
+                                            reduced_costs=[0, 2, 1],
+                                            constraints=[model.c],
+                                            duals=[-1])
+        self.assertEqual(index, 0)
+        self.assertEqual(len(model.solutions), 1)
+        self.assertEqual(model.x[1].value, 1)
+        self.assertIsNone(model.x[2].value)
+        self.assertEqual(model.x[3].value, 3)
+        self.assertEqual(model.y.value, 4)
+        self.assertFalse(model.x[1].stale)
+        self.assertTrue(model.x[2].stale)
+        self.assertEqual(model.rc[model.x[1]], 2)
+        self.assertNotIn(model.y, model.rc)
+        self.assertEqual(model.dual[model.c], -1)
+
+        self.assertRaises(TypeError, model.solutions.load_values,
+                          variables, [3, 1, 5], ignore_fixed_vars=False)
+        model.solutions.load_values(variables, [3, 1, 4],
+                                    ignore_fixed_vars=False,
+                                    allow_consistent_values_for_fixed_vars=True)
+        self.assertEqual(len(model.dual), 0)
+        self.assertFalse(model.y.stale)
+
+        self.assertRaises(ValueError, model.solutions.load_values,
+                          variables, [1, 2])
+        self.assertRaises(ValueError, model.solutions.load_values,
+                          variables, [1, 2, 3], duals=[0])
+
+    @unittest.skipIf(not numpy_available, "NumPy is not available")
+    def test_load_values_array_storage(self):
+        model = ConcreteModel()
+        model.x = Var(range(5), array_storage=True)
+        model.y = Var()
+        model.x[2].fix(0)
+        model.solutions.load_values(
+            [model.x[4], model.y, model.x[0], model.x[2]],
+            numpy.array([4., 1., 2., 3.]), select=False)
+        self.assertIsNone(model.x[4].value)
+        model.solutions.select()
+        self.assertEqual(model.x.get_values_array()[[0, 4]].tolist(),
+                         [2, 4])
+        self.assertEqual(model.x[2].value, 0)
+        self.assertEqual(model.y.value, 1)
+        self.assertFalse(model.x[4].stale)
+        self.assertTrue(model.x[1].stale)
+        self.assertTrue(model.x[2].stale)
+
+    def test_load_from_solution_arrays(self):
+        model = ConcreteModel()
+        model.x = Var([1,2], bounds=(0,1))
+        model.o = Objective(expr=model.x[1] + model.x[2])
+        model.rc = Suffix(direction=Suffix.IMPORT)
+        smap = SymbolMap()
+        labeler = NumericLabeler('x')
+        for v in model.x.values():
+            smap.getSymbol(v, labeler)
+
+        def _results():
+            results = pyomo.opt.SolverResults()
+            results.solver.status = pyomo.opt.SolverStatus.ok
+            soln = results.solution.add()
+            soln.status = SolutionStatus.optimal
+            soln.set_arrays('variable', ['x2', 'x1', 'x3'],
+                            Value=[0.5, 1.0, 2.0], Rc=[0.0, 1.0, 3.0])
+            results._smap = smap
+            return results
+
+        model.solutions.load_from(_results())
+        self.assertEqual(model.x[1].value, 1)
+        self.assertEqual(model.x[2].value, 0.5)
+        self.assertEqual(model.rc[model.x[1]], 1)
+        self.assertEqual(len(model.solutions[0]._entry['variable']), 0)
+
+        # The arrays are expanded when the solution has no symbol map
+        model.x[2].value = None
+        results = _results()
+        results._smap = None
+        results.solution(1)._cuid = False
+        results.solution(1)._arrays['variable'] = (
+            ['x[1]', 'x[2]'], {'Value': [0.0, 0.25]})
+        model.solutions.load_from(results)
+        self.assertEqual(model.x[1].value, 0)
+        self.assertEqual(model.x[2].value, 0.25)
+        self.assertEqual(results.solution(1).variable['x[2]'],
+                         {'Value': 0.25})
+
+        results = _results()
+        self.assertRaises(ValueError, results.solution(1).set_arrays,
+                          'variable', ['x1'], Value=[1, 2])
+        self.assertRaises(ValueError, results.solution(1).set_arrays,
+                          'objective', ['o'], Value=[1])
+
+    def test_store_solution_arrays(self):
+        model = ConcreteModel()
+        model.x = Var([1,2])
+        model.c = Constraint(expr=model.x[1] + model.x[2] >= 1)
+        model.solutions.load_values([model.x[1], model.x[2]], [1, 0],
+                                    reduced_costs=[0.5, 0],
+                                    constraints=[model.c],
+                                    duals=[3.0])
+        results = pyomo.opt.SolverResults()
+        model.solutions.store_to(results)
+        soln = results.solution(0)
+        self.assertEqual(soln.variable['x[1]'], {'Value': 1, 'Rc': 0.5})
+        self.assertEqual(soln.variable['x[2]'], {'Value': 0, 'Rc': 0})
+        self.assertEqual(soln.constraint['c'], {'Dual': 3.0})
+
+        # the solution is pickled with the model
+        model2 = pickle.loads(pickle.dumps(model))
+        results = pyomo.opt.SolverResults()
+        model2.solutions.store_to(results)
+        self.assertEqual(results.solution(0).constraint['c'], {'Dual': 3.0})
+
+    def test_solution_arrays_weakrefs(self):
+        import gc
+        import weakref
+        model = ConcreteModel()
+        model.x = Var([1,2])
+        model.y = Var()
+        model.solutions.load_values([model.x[1], model.y, model.x[2]],
+                                    [1, 2, 3], select=False)
+        ref = weakref.ref(model.y)
+        model.del_component(model.y)
+        gc.collect()
+        self.assertIsNone(ref())
+        model.solutions.select()
+        self.assertEqual(model.x[1].value, 1)
+        self.assertEqual(model.x[2].value, 3)
 
     def test_create_concrete_from_rule(self):
         def make(m):
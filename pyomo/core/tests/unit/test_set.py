@@ -671,6 +671,21 @@ class TestRangeSetMisc(unittest.TestCase):
         self.assertEqual(tmp, list(range(1,11,2)))
         self.assertEqual( instance.d.bounds(), (1,9))
 
+    def test_ord(self):
+        a=RangeSet(3,15,3)
+        a.construct()
+        self.assertEqual([a.ord(i) for i in a], [1,2,3,4,5])
+        self.assertEqual(a.next(6), 9)
+        self.assertEqual(a.prev(6), 3)
+        self.assertEqual(a.nextw(15), 3)
+        self.assertEqual(a.prevw(3), 15)
+        self.assertRaises(IndexError, a.ord, 4)
+        self.assertRaises(KeyError, a.next, 4)
+
+        b=RangeSet(0,1,0.1)
+        b.construct()
+        self.assertEqual([b.ord(i) for i in b], list(range(1,12)))
+
 class SimpleSetB(SimpleSetA):
 
     def setUp(self):
@@ -2585,6 +2600,65 @@ class TestMisc(PyomoModel):
         self.assertEqual(len(tmp),9)
 
 
+class TestProductPositions(unittest.TestCase):
+
+    def setUp(self):
+        self.m = m = ConcreteModel()
+        m.A = Set(initialize=[3,1,2], ordered=True)
+        m.B = RangeSet(2)
+        m.C = Set(initialize=[('a',1), ('b',2)], ordered=True)
+        m.D = Set(initialize=['x','y'])
+
+    def test_ord_getitem(self):
+        m = self.m
+        m.P = m.A*m.B*m.C
+        ref = list(m.P)
+        self.assertEqual(len(ref), 12)
+        self.assertEqual(ref[0], (3,1,'a',1))
+        for i, val in enumerate(ref):
+            self.assertEqual(m.P[i+1], val)
+            self.assertEqual(m.P[i-len(ref)], val)
+            self.assertEqual(m.P.ord(val), i+1)
+        self.assertEqual(m.P.first(), (3,1,'a',1))
+        self.assertEqual(m.P.last(), (2,2,'b',2))
+        self.assertRaises(IndexError, m.P.__getitem__, 0)
+        self.assertRaises(IndexError, m.P.__getitem__, 13)
+        self.assertRaises(IndexError, m.P.ord, (3,1,'c',1))
+        self.assertRaises(IndexError, m.P.ord, (3,1,'a'))
+
+    def test_next_prev(self):
+        m = self.m
+        m.P = m.A*m.B
+        self.assertEqual(m.P.next((3,2)), (1,1))
+        self.assertEqual(m.P.next((3,1), k=3), (1,2))
+        self.assertEqual(m.P.prev((1,1)), (3,2))
+        self.assertEqual(m.P.nextw((2,2)), (3,1))
+        self.assertEqual(m.P.prevw((3,1), k=2), (2,1))
+        self.assertRaises(IndexError, m.P.next, (2,2))
+        self.assertRaises(IndexError, m.P.prev, (3,1))
+        self.assertRaises(KeyError, m.P.next, (4,1))
+
+    def test_unordered(self):
+        m = self.m
+        m.P = m.A*m.D
+        self.assertRaises(ValueError, m.P.__getitem__, 1)
+        self.assertRaises(ValueError, m.P.ord, (3,'x'))
+
+    def test_large_product(self):
+        m = self.m
+        m.T = RangeSet(0, 999)
+        m.N = RangeSet(1000)
+        m.S = Set(initialize=['s%s' % i for i in range(100)], ordered=True)
+        m.P = m.T*m.N*m.S
+        self.assertEqual(len(m.P), 10**8)
+        self.assertIn((5,7,'s3'), m.P)
+        self.assertNotIn((5,7,'s100'), m.P)
+        self.assertEqual(m.P.ord((5,7,'s3')), 500604)
+        self.assertEqual(m.P[500604], (5,7,'s3'))
+        self.assertEqual(m.P.next((5,1000,'s99')), (6,1,'s0'))
+        self.assertEqual(m.P.last(), (999,1000,'s99'))
+
+
 class TestSetsInPython3(unittest.TestCase):
     def test_pprint_mixed(self):
         # In Python3, sorting a mixed string fails.  We have added a
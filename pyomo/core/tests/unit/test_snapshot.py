@@ -0,0 +1,118 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+#
+# Unit Tests for model snapshots
+#
+
+import pyutilib.th as unittest
+from pyutilib.services import TempfileManager
+
+from pyomo.environ import (ConcreteModel, Block, Var, Param, Constraint,
+                           Objective, Suffix, Set, Binary, Integers,
+                           NonNegativeReals, value, save_snapshot,
+                           load_snapshot)
+from pyomo.core.base.snapshot import numpy_available
+
+
+def _x_init(m, i):
+    return i/2.0
+
+def _c_rule(m, i):
+    return m.x[i] + m.p[i]*m.z[i] <= m.q
+
+
+@unittest.skipIf(not numpy_available, "NumPy is not available")
+class TestSnapshot(unittest.TestCase):
+
+    def tearDown(self):
+        TempfileManager.clear_tempfiles()
+
+    def _model(self):
+        m = ConcreteModel()
+        m.I = Set(initialize=[1,2,3])
+        m.x = Var(m.I, initialize=_x_init, bounds=(0, 10))
+        m.x[2].fix()
+        m.x[3].setub(None)
+        m.x[3].domain = Integers
+        m.y = Var(within=Binary)
+        m.z = Var(m.I, array_storage=True, bounds=(-1, 1), initialize=0.5)
+        m.p = Param(m.I, initialize={1: 2, 2: 3.5}, default=1, mutable=True)
+        m.q = Param(initialize=4, mutable=True)
+        m.b = Block()
+        m.b.w = Var(within=NonNegativeReals)
+        m.b.v = Var([1,2])
+        m.b.v[1].setlb(m.q)
+        m.c = Constraint(m.I, rule=_c_rule)
+        m.o = Objective(expr=m.y + m.b.w)
+        m.dual = Suffix(direction=Suffix.IMPORT)
+        m.dual[m.c[1]] = 5
+        return m
+
+    def _roundtrip(self, m, **kwds):
+        fname = TempfileManager.create_tempfile(suffix='.snap')
+        m.save_snapshot(fname)
+        return load_snapshot(fname, **kwds)
+
+    def _check(self, m, i):
+        for v, w in ((m.x[1], i.x[1]), (m.x[2], i.x[2]), (m.x[3], i.x[3]),
+                     (m.y, i.y), (m.b.w, i.b.w), (m.b.v[2], i.b.v[2])):
+            self.assertIsNot(v, w)
+            self.assertEqual(v.name, w.name)
+            self.assertEqual(v.value, w.value)
+            self.assertEqual(type(v.value), type(w.value))
+            self.assertEqual(v.bounds, w.bounds)
+            self.assertEqual(v.fixed, w.fixed)
+            self.assertEqual(v.stale, w.stale)
+            self.assertEqual(v.domain.name, w.domain.name)
+        self.assertIs(i.x[1].parent_component(), i.x)
+        self.assertIs(i.b.v[2].parent_block(), i.b)
+        self.assertEqual(list(i.z.get_values_array()), [0.5]*3)
+        self.assertEqual(i.z[1].bounds, (-1, 1))
+        self.assertEqual([value(i.p[j]) for j in i.I], [2, 3.5, 1])
+        self.assertIs(i.p[1].parent_component(), i.p)
+        self.assertIs(i.b.v[1]._lb, i.q)
+        self.assertEqual(i.b.v[1].lb, 4)
+        self.assertIs(i.c[2].body.arg(0), i.x[2])
+        self.assertIs(i.c[2].body.arg(1).arg(0), i.p[2])
+        self.assertIs(i.c[2].upper, i.q)
+        self.assertEqual(i.dual[i.c[1]], 5)
+        i.q = 6
+        self.assertEqual(value(i.c[1].upper), 6)
+        self.assertEqual(value(m.c[1].upper), 4)
+
+    def test_roundtrip(self):
+        m = self._model()
+        self._check(m, self._roundtrip(m))
+
+    def test_roundtrip_no_mmap(self):
+        m = self._model()
+        self._check(m, self._roundtrip(m, use_mmap=False))
+
+    def test_mmap_copy_on_write(self):
+        m = self._model()
+        fname = TempfileManager.create_tempfile(suffix='.snap')
+        save_snapshot(m, fname)
+        i = load_snapshot(fname)
+        i.z[1].value = 0.25
+        i.z.set_values_array([0, 0.75, 1])
+        self.assertEqual(i.z[2].value, 0.75)
+        j = load_snapshot(fname)
+        self.assertEqual(list(j.z.get_values_array()), [0.5]*3)
+
+    def test_invalid_file(self):
+        fname = TempfileManager.create_tempfile(suffix='.snap')
+        with open(fname, 'w') as f:
+            f.write("not a snapshot"*10)
+        self.assertRaisesRegexp(ValueError, "is not a Pyomo model snapshot",
+                                load_snapshot, fname)
+
+
+if __name__ == "__main__":
+    unittest.main()
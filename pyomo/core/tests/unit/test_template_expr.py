@@ -11,7 +11,10 @@
 
 import pyutilib.th as unittest
 
-from pyomo.environ import ConcreteModel, RangeSet, Param, Var, Set, value
+from pyomo.common.log import LoggingIntercept
+
+from pyomo.environ import (ConcreteModel, RangeSet, Param, Var, Set,
+                           Constraint, value)
 import pyomo.core.expr.current as EXPR
 from pyomo.core.base.template_expr import (
     IndexTemplate, 
@@ -19,7 +22,12 @@ from pyomo.core.base.template_expr import (
     substitute_template_expression, 
     substitute_getitem_with_param,
     substitute_template_with_value,
+    templatize_rule,
+    compile_template_expression,
+    compile_template_standard_repn,
+    TemplateExpressionError,
 )
+from pyomo.repn import generate_standard_repn
 
 import six
 
@@ -359,5 +367,160 @@ class TestTemplateSubstitution(unittest.TestCase):
             str(E),
             'dxdt[5,2]  ==  5.0*x[5,2]**2 + y**2' )
 
+class TestTemplateCompilation(unittest.TestCase):
+    def setUp(self):
+        self.m = m = ConcreteModel()
+        m.I = RangeSet(1,4)
+        m.J = Set(initialize=['a','b'])
+        m.x = Var(m.I, m.J)
+        m.y = Var(m.I)
+        m.p = Param(m.I, initialize=lambda m,i: 10-i, mutable=True)
+        m.q = Param(m.I, initialize=lambda m,i: i)
+
+    def _rule(self, m, i, j):
+        return m.p[i]*m.x[i,j] + m.y[i]**2 \
+            + sum(m.x[i,k] for k in m.J) >= m.p[i]
+
+    def test_templatize_rule(self):
+        m = self.m
+        m.c = Constraint(m.I, m.J)
+        expr, indices = templatize_rule(m, self._rule, m.c.index_set())
+        self.assertEqual(len(indices), 2)
+        self.assertIs(indices[0]._set, m.I)
+        self.assertIs(indices[1]._set, m.J)
+        self.assertTrue(expr.is_relational())
+        self.assertIs(type(expr.arg(0)), EXPR.GetItemExpression)
+
+        # Rules that depend on the index values cannot be templatized
+        self.assertRaises(
+            TemplateExpressionError, templatize_rule, m,
+            lambda m,i: m.y[i] if value(m.q[i]) > 1 else m.y[1], m.I)
+        self.assertRaises(
+            TemplateExpressionError, templatize_rule, m,
+            lambda m,i: m.y[i] if m.p[i] > 1 else m.y[1], m.I)
+        self.assertRaises(
+            TypeError, templatize_rule, m,
+            lambda m,i: m.y[i] >= 0 if m.p[i] > 1 else m.y[1] >= 0, m.I)
+
+    def test_compile_template_expression(self):
+        m = self.m
+        expr, (i, j) = templatize_rule(m, self._rule, m.I*m.J)
+        build = compile_template_expression(expr)
+        for ndx in m.I*m.J:
+            i.set_value(ndx[0])
+            j.set_value(ndx[1])
+            e = build()
+            self.assertEqual(str(e), str(self._rule(m, *ndx)))
+        e = compile_template_expression((expr.arg(0), m.y[i], 5))()
+        self.assertIs(e[0], m.p[4])
+        self.assertIs(e[1], m.y[4])
+        self.assertEqual(e[2], 5)
+
+    def test_compile_template_standard_repn(self):
+        m = self.m
+        m.x[2,'b'].fix(3)
+        i = IndexTemplate(m.I)
+        e = m.p[i]*m.x[i,'a'] + 2*m.x[i,'b'] - m.x[i,'a'] + m.q[i]
+        generate = compile_template_standard_repn(e)
+        build = compile_template_expression(e)
+        for idx in m.I:
+            i.set_value(idx)
+            repn = generate()
+            ref = generate_standard_repn(build())
+            self.assertEqual(value(repn.constant), value(ref.constant))
+            self.assertEqual(
+                sorted((v.name, value(c)) for v, c in
+                       zip(repn.linear_vars, repn.linear_coefs)),
+                sorted((v.name, value(c)) for v, c in
+                       zip(ref.linear_vars, ref.linear_coefs)))
+        m.p[1] = 1
+        i.set_value(1)
+        repn = generate()
+        self.assertEqual([v.name for v in repn.linear_vars], ['x[1,b]'])
+
+        i = IndexTemplate(m.I)
+        e = m.y[i]**2 + m.x[i,'a']*m.y[i]
+        generate = compile_template_standard_repn(e)
+        i.set_value(1)
+        repn = generate()
+        self.assertEqual(len(repn.linear_vars), 0)
+        self.assertEqual([tuple(sorted((v1.name, v2.name))) for v1, v2 in
+                          repn.quadratic_vars], [('y[1]', 'y[1]'),
+                                                 ('x[1,a]', 'y[1]')])
+        self.assertIsNone(compile_template_standard_repn(EXPR.exp(m.y[i])))
+        self.assertIsNone(
+            compile_template_standard_repn(m.y[i]**2, quadratic=False))
+
+    def test_template_constraint(self):
+        m = self.m
+        output = six.StringIO()
+        with LoggingIntercept(output, 'pyomo.core'):
+            m.c = Constraint(m.I, m.J, rule=self._rule, template=True)
+        self.assertEqual(output.getvalue(), "")
+        m.d = Constraint(m.I, m.J, rule=self._rule)
+        self.assertEqual(len(m.c), 8)
+        for ndx in m.d:
+            self.assertEqual(str(m.c[ndx].expr), str(m.d[ndx].expr))
+
+        m.e = Constraint(m.I, template=True,
+                         rule=lambda m,i: (0, m.y[i] + m.q[i], m.p[i]))
+        self.assertEqual(m.e[2].lower, 0)
+        self.assertIs(m.e[2].upper, m.p[2])
+        self.assertEqual(str(m.e[2].body), "y[2] + 2")
+
+    def test_template_constraint_fallback(self):
+        m = self.m
+        output = six.StringIO()
+        with LoggingIntercept(output, 'pyomo.core'):
+            m.c = Constraint(m.I, template=True, rule=lambda m,i:
+                             m.y[i] >= 0 if value(m.q[i]) > 2
+                             else Constraint.Skip)
+        self.assertIn("Calling the rule for each index", output.getvalue())
+        self.assertEqual(list(m.c.keys()), [3, 4])
+
+        output = six.StringIO()
+        with LoggingIntercept(output, 'pyomo.core'):
+            m.d = Constraint(m.I, template=True, rule=lambda m,i:
+                             m.y[i] >= 0 if m.q[i] >= 3 else m.y[i] <= 0)
+        self.assertIn("Calling the rule for each index", output.getvalue())
+        self.assertEqual(str(m.d[2].expr), "y[2]  <=  0.0")
+        self.assertEqual(str(m.d[3].expr), "0.0  <=  y[3]")
+        self.assertEqual(list(m.c.keys()), [3, 4])
+
+    def test_template_constraint_index_value(self):
+        m = self.m
+        # max() compares the index template in a boolean context
+        output = six.StringIO()
+        with LoggingIntercept(output, 'pyomo.core'):
+            m.c = Constraint(m.I, template=True,
+                             rule=lambda m,i: m.y[i] >= max(i, 2))
+        self.assertIn("Calling the rule for each index", output.getvalue())
+        self.assertEqual(str(m.c[1].expr), "2.0  <=  y[1]")
+        self.assertEqual(str(m.c[4].expr), "4.0  <=  y[4]")
+
+        # the index template cannot be converted to a string
+        output = six.StringIO()
+        with LoggingIntercept(output, 'pyomo.core'):
+            m.d = Constraint(m.I, template=True,
+                             rule=lambda m,i: str(i).count('2')*m.y[i]
+                             + m.y[1] >= 0)
+        self.assertIn("converted the index template", output.getvalue())
+        for i in m.I:
+            repn = generate_standard_repn(m.d[i].body)
+            coefs = dict((id(v), c) for v, c in
+                         zip(repn.linear_vars, repn.linear_coefs))
+            self.assertEqual(coefs.get(id(m.y[i]), 0), 1 if i <= 2 else 0)
+
+        # rules that depend on the index in other ways are caught by
+        # comparing the first row with the rule
+        output = six.StringIO()
+        with LoggingIntercept(output, 'pyomo.core'):
+            m.e = Constraint(m.I, template=True,
+                             rule=lambda m,i: m.y[i] >=
+                             (5 if isinstance(i, int) else 0))
+        self.assertIn("does not match the rule", output.getvalue())
+        self.assertEqual(str(m.e[2].expr), "5.0  <=  y[2]")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -19,6 +19,20 @@ import pyomo.core.expr.current as EXPR
 import pyutilib.th as unittest
 
 from pyomo.environ import *
+from pyomo.core.util import (linear_expression_from_array,
+                             linear_expressions_from_csr)
+
+try:
+    import numpy
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+try:
+    import scipy.sparse
+    scipy_available = True
+except ImportError:
+    scipy_available = False
 
 def obj_rule(model):
     return sum(model.x[a] + model.y[a] for a in model.A)
@@ -194,6 +208,89 @@ class Test(unittest.TestCase):
         self.assertEqual(list(sequence(8,10)), [8,9,10])
         self.assertEqual(list(sequence(1,10,3)), [1,4,7,10])
 
+    def test_linear_expression_from_array(self):
+        model = ConcreteModel()
+        model.x = Var([1,2,3])
+        expr = linear_expression_from_array(model.x, [1, 2.5, 3], 4)
+        self.assertIs(type(expr), EXPR.LinearExpression)
+        self.assertEqual( str(expr), "4 + x[1] + 2.5*x[2] + 3*x[3]" )
+        expr = linear_expression_from_array([model.x[3], model.x[1]], (1, 2))
+        self.assertEqual( str(expr), "x[3] + 2*x[1]" )
+        self.assertRaisesRegexp(
+            ValueError, "the number of coefficients \(2\) does not match "
+            "the number of variables \(3\)",
+            linear_expression_from_array, model.x, [1, 2])
+
+    @unittest.skipIf(not numpy_available, "NumPy is not available")
+    def test_linear_expression_from_numpy_array(self):
+        model = ConcreteModel()
+        model.x = Var([1,2,3])
+        expr = linear_expression_from_array(
+            model.x, numpy.array([1., 0., 3.]))
+        self.assertEqual(expr.linear_coefs, [1., 0., 3.])
+        self.assertEqual(expr.linear_vars, list(model.x.values()))
+        self.assertEqual([type(c) for c in expr.linear_coefs], [float]*3)
+        model.x.fix(2)
+        self.assertEqual(value(expr), 8)
+
+    @unittest.skipIf(not numpy_available, "NumPy is not available")
+    def test_linear_expressions_from_csr_dense(self):
+        model = ConcreteModel()
+        model.x = Var([1,2,3], initialize={1: 1, 2: 2, 3: 3})
+        A = numpy.array([[1, 0, 2],
+                         [0, 0, 0],
+                         [0, 3, 0]])
+        exprs = linear_expressions_from_csr(model.x, A, constant=[0, 1, -1])
+        self.assertEqual(len(exprs), 3)
+        for e in exprs:
+            self.assertIs(type(e), EXPR.LinearExpression)
+        self.assertEqual( [str(e) for e in exprs],
+                          ["x[1] + 2*x[3]", "1", "-1 + 3*x[2]"] )
+        self.assertEqual([type(c) for c in exprs[0].linear_coefs], [int]*2)
+        self.assertEqual([value(e) for e in exprs], list(A.dot([1,2,3])+[0,1,-1]))
+
+        self.assertRaisesRegexp(
+            ValueError, "the number of matrix columns \(3\) does not match "
+            "the number of variables \(2\)",
+            linear_expressions_from_csr, [model.x[1], model.x[2]], A)
+        self.assertRaisesRegexp(
+            ValueError, "the number of constants \(2\) does not match "
+            "the number of rows \(3\)",
+            linear_expressions_from_csr, model.x, A, [1, 2])
+        self.assertRaisesRegexp(
+            ValueError, "the matrix must be 2-dimensional",
+            linear_expressions_from_csr, model.x, A[0])
+
+    @unittest.skipIf(not numpy_available, "NumPy is not available")
+    def test_linear_expressions_from_csr_arrays(self):
+        model = ConcreteModel()
+        model.x = Var([1,2,3])
+        data = numpy.array([1.5, 2., 3.])
+        indices = numpy.array([2, 0, 1])
+        indptr = numpy.array([0, 1, 1, 3])
+        exprs = linear_expressions_from_csr(
+            model.x, (data, indices, indptr))
+        self.assertEqual( [str(e) for e in exprs[::2]],
+                          ["1.5*x[3]", "2.0*x[1] + 3.0*x[2]"] )
+        self.assertTrue(exprs[1].is_constant())
+        self.assertEqual(exprs[1].constant, 0)
+        self.assertRaisesRegexp(
+            ValueError, "column index out of range",
+            linear_expressions_from_csr, [model.x[1], model.x[2]],
+            (data, indices, indptr))
+
+    @unittest.skipIf(not scipy_available, "SciPy is not available")
+    def test_linear_expressions_from_csr_sparse(self):
+        model = ConcreteModel()
+        model.x = Var([1,2,3])
+        A = scipy.sparse.coo_matrix(([2., 4.], ([1, 0], [0, 2])),
+                                    shape=(2, 3))
+        exprs = linear_expressions_from_csr(model.x, A)
+        self.assertEqual( [str(e) for e in exprs],
+                          ["4.0*x[3]", "2.0*x[1]"] )
+        model.c = Constraint([0, 1], rule=lambda m, i: exprs[i] <= 1)
+        self.assertIs(model.c[1].body, exprs[1])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -12,6 +12,7 @@
 #
 # TestSimpleVar                Class for testing single variables
 # TestArrayVar                Class for testing array of variables
+# TestArrayStorageVar         Class for testing variables stored in arrays
 #
 
 import os
@@ -21,8 +22,15 @@ currdir = dirname(abspath(__file__))+os.sep
 import pyutilib.th as unittest
 
 from pyomo.core.base import IntegerSet
+from pyomo.core.base.var import _ArrayVarData
 from pyomo.environ import *
 
+try:
+    import numpy
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
 class PyomoModel(unittest.TestCase):
 
     def setUp(self):
@@ -1017,6 +1025,140 @@ class TestVarComplexArray(PyomoModel):
         self.assertEqual(self.instance.B[1,2,False],-4)
 
 
+@unittest.skipIf(not numpy_available, "numpy is not available")
+class TestArrayStorageVar(unittest.TestCase):
+
+    def test_construct(self):
+        m = ConcreteModel()
+        m.x = Var([1,2,3], bounds=(0,4), initialize=1, array_storage=True)
+        m.y = Var([1,2], within=Binary, array_storage=True)
+        m.z = Var([1,2], initialize={1:5}, bounds=lambda m,i: (i,None),
+                  dense=False, array_storage=True)
+        self.assertIs(type(m.x[1]), _ArrayVarData)
+        self.assertEqual(m.x[2].value, 1)
+        self.assertEqual(m.x[2].bounds, (0,4))
+        self.assertFalse(m.x[2].stale)
+        self.assertFalse(m.x[2].fixed)
+        self.assertIsNone(m.y[1].value)
+        self.assertTrue(m.y[1].stale)
+        self.assertEqual(m.y[1].bounds, (0,1))
+        self.assertTrue(m.y[1].is_binary())
+        self.assertEqual(len(m.z), 0)
+        self.assertEqual(m.z[1].value, 5)
+        self.assertEqual(m.z[2].bounds, (2,None))
+        self.assertIsNone(m.z[2].value)
+        self.assertEqual(len(m.z), 2)
+        self.assertRaises(ValueError, m.y.__setitem__, 1, 2)
+
+    def test_data_attributes(self):
+        m = ConcreteModel()
+        m.p = Param(mutable=True, initialize=3)
+        m.x = Var(['a','b'], array_storage=True)
+        m.x['a'].setlb(m.p)
+        m.x['a'].setub(10)
+        m.p = 5
+        # bounds are stored as values
+        self.assertEqual(m.x['a'].bounds, (3,10))
+        m.x['a'].setlb(None)
+        self.assertIsNone(m.x['a'].lb)
+        self.assertRaises(ValueError, m.x['a'].setub, m.x['b'])
+        m.x['b'].fix(2)
+        self.assertTrue(m.x['b'].fixed)
+        self.assertEqual(value(m.x['b']), 2)
+        self.assertFalse(m.x['a'].fixed)
+        m.x['b'].domain = NonNegativeIntegers
+        self.assertTrue(m.x['b'].is_integer())
+        self.assertFalse(m.x['a'].is_integer())
+        m.x.domain = Binary
+        self.assertTrue(m.x['b'].is_binary())
+        m.x['b'].value = None
+        self.assertIsNone(m.x['b'].value)
+        m.x.fix(1)
+        self.assertTrue(m.x['a'].fixed)
+        self.assertEqual(m.x['a'].value, 1)
+        m.x.unfix()
+        self.assertFalse(m.x['b'].fixed)
+        m.x.flag_as_stale()
+        self.assertTrue(m.x['a'].stale)
+
+    def test_values_array(self):
+        m = ConcreteModel()
+        m.x = Var(range(4), initialize=lambda m,i: i, array_storage=True)
+        m.y = Var(range(4), initialize=lambda m,i: i)
+        for v in (m.x, m.y):
+            self.assertEqual(list(v.get_values_array()), [0,1,2,3])
+            v.set_values_array(numpy.array([3.0, 2.0, numpy.nan, 0.0]))
+            self.assertEqual(v[0].value, 3)
+            self.assertIsNone(v[2].value)
+            self.assertRaises(ValueError, v.set_values_array, [1, 2])
+            v.flag_as_stale()
+            v.set_values_array([4, 5, 6, 7], valid=True)
+            self.assertEqual(v[3].value, 7)
+            self.assertFalse(v[3].stale)
+            self.assertFalse(numpy.isnan(v.get_values_array()).any())
+
+        m.b = Var(range(2), within=Binary, array_storage=True)
+        self.assertRaises(ValueError, m.b.set_values_array, [0, 2])
+        m.b.set_values_array([0, 1])
+        self.assertEqual(m.b[1].value, 1)
+
+        # variables that were added or deleted
+        m.l = VarList(array_storage=True)
+        for i in range(20):
+            m.l.add().value = i
+        del m.l[3]
+        values = m.l.get_values_array()
+        self.assertEqual(len(values), 19)
+        self.assertEqual(values[3], 4)
+        m.l.set_values_array(values + 1)
+        self.assertEqual(m.l[20].value, 20)
+
+    def test_value_types(self):
+        m = ConcreteModel()
+        m.x = Var(range(3), within=Integers, initialize=1,
+                  array_storage=True)
+        m.y = Var(range(3), within=Integers, initialize=1)
+        for v in (m.x, m.y):
+            self.assertIs(type(v[0].value), int)
+            v[1].value = 2.0
+            self.assertIs(type(v[1].value), float)
+            v[1].value = 2
+            self.assertIs(type(v[1].value), int)
+            v.fix(1.0)
+            self.assertIs(type(v[2].value), float)
+            v.unfix()
+            v.set_values_array(numpy.array([3, 4, 5]), valid=True)
+            self.assertIs(type(v[2].value), int)
+            self.assertEqual(v[2].value, 5)
+            v.set_values_array([3.0, 4.0, 5.0], valid=True)
+            self.assertIs(type(v[2].value), float)
+            m.solutions.load_values([v[0], v[1]], [1, 0.5])
+            self.assertIs(type(v[0].value), int)
+            self.assertIs(type(v[1].value), float)
+
+    def test_expressions(self):
+        m = ConcreteModel()
+        m.x = Var([1,2], initialize=2, array_storage=True)
+        e = m.x[1] + 3*m.x[2]
+        self.assertEqual(value(e), 8)
+        from pyomo.repn import generate_standard_repn
+        repn = generate_standard_repn(e)
+        self.assertEqual([id(v) for v in repn.linear_vars],
+                         [id(m.x[1]), id(m.x[2])])
+        m.x[2].fix()
+        repn = generate_standard_repn(e)
+        self.assertEqual(repn.constant, 6)
+
+    def test_clone(self):
+        m = ConcreteModel()
+        m.x = Var([1,2], initialize=2, array_storage=True)
+        i = m.clone()
+        i.x[1].value = 4
+        self.assertEqual(m.x[1].value, 2)
+        self.assertIs(i.x[1].parent_component(), i.x)
+        self.assertEqual(list(i.x.get_values_array()), [4,2])
+
+
 class MiscVarTests(unittest.TestCase):
 
     def test_error1(self):
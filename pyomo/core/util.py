@@ -12,7 +12,8 @@
 # Utility functions
 #
 
-__all__ = ['sum_product', 'summation', 'dot_product', 'sequence', 'prod', 'quicksum']
+__all__ = ['sum_product', 'summation', 'dot_product', 'sequence', 'prod', 'quicksum',
+           'linear_expression_from_array', 'linear_expressions_from_csr']
 
 from six.moves import xrange
 from functools import reduce
@@ -21,6 +22,13 @@ from pyomo.core.expr.numvalue import native_numeric_types
 from pyomo.core.expr.numeric_expr import decompose_term
 from pyomo.core.expr import current as EXPR
 import pyomo.core.base.var
+from pyomo.core.base.indexed_component import IndexedComponent
+
+try:
+    import numpy
+    numpy_available = True
+except ImportError:                               #pragma:nocover
+    numpy_available = False
 
 
 def prod(terms):
@@ -247,6 +255,129 @@ def sum_product(*args, **kwds):
         return quicksum((prod(args[j][i] for j in num_index)/prod(denom[j][i] for j in denom_index) for i in index), start)
 
 
+def _var_list(vars_):
+    if isinstance(vars_, IndexedComponent):
+        return list(vars_.values())
+    return list(vars_)
+
+
+def linear_expression_from_array(vars_, coefs, constant=0):
+    """
+    A utility function to create a linear expression from a sequence
+    of variables and a NumPy array of coefficients.
+
+    This is equivalent to :func:`sum_product` with a parameter and a
+    variable, but the :class:`LinearExpression
+    <pyomo.core.expr.numeric_expr.LinearExpression>` is created
+    directly from the coefficient array, instead of adding the terms
+    one by one.
+
+    Args:
+        vars_: A sequence of variables (or an indexed variable, whose
+            values are used in the order of its index set)
+        coefs: A 1-D array (or sequence) of numeric coefficients
+        constant: The constant term of the expression.  Defaults to
+            zero.
+
+    Returns:
+        A :class:`LinearExpression
+        <pyomo.core.expr.numeric_expr.LinearExpression>` object.
+    """
+    vars_ = _var_list(vars_)
+    if numpy_available and isinstance(coefs, numpy.ndarray):
+        coefs = coefs.tolist()
+    else:
+        coefs = list(coefs)
+    if len(coefs) != len(vars_):
+        raise ValueError(
+            "linear_expression_from_array(): the number of coefficients "
+            "(%s) does not match the number of variables (%s)"
+            % (len(coefs), len(vars_)))
+    return EXPR.LinearExpression(constant=constant,
+                                 linear_coefs=coefs,
+                                 linear_vars=vars_)
+
+
+def linear_expressions_from_csr(vars_, A, constant=None):
+    """
+    A utility function to create the linear expressions for the rows
+    of a matrix-vector product, A*vars.
+
+    The expressions are created in bulk from the (sparse) matrix data:
+    only the nonzero entries of each row generate terms, and each row
+    is returned as a :class:`LinearExpression
+    <pyomo.core.expr.numeric_expr.LinearExpression>`.
+
+    Args:
+        vars_: A sequence of variables (or an indexed variable, whose
+            values are used in the order of its index set)
+        A: The matrix.  This can be a SciPy sparse matrix, a dense
+            2-D NumPy array, or a tuple (data, indices, indptr) of
+            arrays with the matrix in compressed sparse row format.
+        constant: An optional 1-D array (or sequence) of the
+            constant terms of the rows.
+
+    Returns:
+        A list of :class:`LinearExpression
+        <pyomo.core.expr.numeric_expr.LinearExpression>` objects.
+    """
+    if not numpy_available:
+        raise ImportError(
+            "linear_expressions_from_csr() requires NumPy")
+    vars_ = _var_list(vars_)
+    if type(A) is tuple:
+        data, indices, indptr = A
+        ncols = None
+    else:
+        if not hasattr(A, 'tocsr'):
+            A = numpy.asarray(A)
+            if A.ndim != 2:
+                raise ValueError(
+                    "linear_expressions_from_csr(): the matrix must be "
+                    "2-dimensional (got %s dimensions)" % (A.ndim,))
+            rows, cols = numpy.nonzero(A)
+            data = A[rows, cols]
+            indices = cols
+            indptr = numpy.zeros(A.shape[0]+1, dtype=int)
+            numpy.cumsum(numpy.bincount(rows, minlength=A.shape[0]),
+                         out=indptr[1:])
+        else:
+            A = A.tocsr()
+            data, indices, indptr = A.data, A.indices, A.indptr
+        ncols = A.shape[1]
+    if ncols is not None and ncols != len(vars_):
+        raise ValueError(
+            "linear_expressions_from_csr(): the number of matrix columns "
+            "(%s) does not match the number of variables (%s)"
+            % (ncols, len(vars_)))
+    #
+    # Convert the arrays to Python objects once, so that the
+    # expressions hold native numbers
+    #
+    data = numpy.asarray(data).tolist()
+    row_vars = numpy.asarray(indices).tolist()
+    if row_vars and (min(row_vars) < 0 or max(row_vars) >= len(vars_)):
+        raise ValueError(
+            "linear_expressions_from_csr(): column index out of range")
+    row_vars = [vars_[j] for j in row_vars]
+    indptr = numpy.asarray(indptr).tolist()
+    nrows = len(indptr) - 1
+    if constant is None:
+        constant = [0]*nrows
+    else:
+        constant = numpy.asarray(constant).tolist()
+        if len(constant) != nrows:
+            raise ValueError(
+                "linear_expressions_from_csr(): the number of constants "
+                "(%s) does not match the number of rows (%s)"
+                % (len(constant), nrows))
+    LinearExpression = EXPR.LinearExpression
+    return [ LinearExpression(constant=constant[i],
+                              linear_coefs=data[indptr[i]:indptr[i+1]],
+                              linear_vars=row_vars[indptr[i]:indptr[i+1]])
+             for i in xrange(nrows) ]
+
+
 #: An alias for :func:`sum_product <pyomo.core.expr.util>`
 dot_product = sum_product
 
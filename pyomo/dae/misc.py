@@ -427,14 +427,13 @@ def add_continuity_equations(block, d, i, loc):
         afinal = s.get_discretization_info()['afinal']
 
         def _fun(i):
-            tmp = sorted(s)
-            idx = tmp.index(i)
+            idx = s.ord(i)
             low = s.get_lower_element_boundary(i)
-            if i != low or idx == 0:
+            if i != low or idx == 1:
                 raise IndexError("list index out of range")
-            low = s.get_lower_element_boundary(tmp[idx - 1])
-            lowidx = tmp.index(low)
-            return sum(v(tmp[lowidx + j]) * afinal[j] for j in range(ncp + 1))
+            low = s.get_lower_element_boundary(s[idx - 1])
+            lowidx = s.ord(low)
+            return sum(v(s[lowidx + j]) * afinal[j] for j in range(ncp + 1))
         return _fun
     expr = create_partial_expression(_cont_exp, create_access_function(svar),
                                      i, loc)
@@ -526,9 +525,7 @@ def _get_idx(l, ds, n, i, k):
     points and is not separated into finite elements and collocation
     points.
     """
-    t = sorted(ds)
-    tmp = t.index(ds._fe[i])
-    tik = t[tmp + k]
+    tik = ds[ds.ord(ds._fe[i]) + k]
     if n is None:
         return tik
     else:
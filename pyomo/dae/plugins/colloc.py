@@ -46,14 +46,13 @@ def _lagrange_radau_transform(v, s):
     adot = s.get_discretization_info()['adot']
 
     def _fun(i):
-        tmp = sorted(s)
-        idx = tmp.index(i)
-        if idx == 0:  # Don't apply this equation at initial point
+        idx = s.ord(i)
+        if idx == 1:  # Don't apply this equation at initial point
             raise IndexError("list index out of range")
         low = s.get_lower_element_boundary(i)
-        lowidx = tmp.index(low)
-        return sum(v(tmp[lowidx + j]) * adot[j][idx - lowidx] *
-                   (1.0 / (tmp[lowidx + ncp] - tmp[lowidx]))
+        lowidx = s.ord(low)
+        return sum(v(s[lowidx + j]) * adot[j][idx - lowidx] *
+                   (1.0 / (s[lowidx + ncp] - s[lowidx]))
                    for j in range(ncp + 1))
     return _fun
 
@@ -63,14 +62,13 @@ def _lagrange_radau_transform_order2(v, s):
     adotdot = s.get_discretization_info()['adotdot']
 
     def _fun(i):
-        tmp = sorted(s)
-        idx = tmp.index(i)
-        if idx == 0:  # Don't apply this equation at initial point
+        idx = s.ord(i)
+        if idx == 1:  # Don't apply this equation at initial point
             raise IndexError("list index out of range")
         low = s.get_lower_element_boundary(i)
-        lowidx = tmp.index(low)
-        return sum(v(tmp[lowidx + j]) * adotdot[j][idx - lowidx] *
-                   (1.0 / (tmp[lowidx + ncp] - tmp[lowidx]) ** 2)
+        lowidx = s.ord(low)
+        return sum(v(s[lowidx + j]) * adotdot[j][idx - lowidx] *
+                   (1.0 / (s[lowidx + ncp] - s[lowidx]) ** 2)
                    for j in range(ncp + 1))
     return _fun
 
@@ -80,18 +78,17 @@ def _lagrange_legendre_transform(v, s):
     adot = s.get_discretization_info()['adot']
 
     def _fun(i):
-        tmp = sorted(s)
-        idx = tmp.index(i)
-        if idx == 0:  # Don't apply this equation at initial point
+        idx = s.ord(i)
+        if idx == 1:  # Don't apply this equation at initial point
             raise IndexError("list index out of range")
         elif i in s.get_finite_elements():  # Don't apply at finite element
                                             # points continuity equations
                                             # added later
             raise IndexError("list index out of range")
         low = s.get_lower_element_boundary(i)
-        lowidx = tmp.index(low)
-        return sum(v(tmp[lowidx + j]) * adot[j][idx - lowidx] *
-                   (1.0 / (tmp[lowidx + ncp + 1] - tmp[lowidx]))
+        lowidx = s.ord(low)
+        return sum(v(s[lowidx + j]) * adot[j][idx - lowidx] *
+                   (1.0 / (s[lowidx + ncp + 1] - s[lowidx]))
                    for j in range(ncp + 1))
     return _fun
 
@@ -101,18 +98,17 @@ def _lagrange_legendre_transform_order2(v, s):
     adotdot = s.get_discretization_info()['adotdot']
 
     def _fun(i):
-        tmp = sorted(s)
-        idx = tmp.index(i)
-        if idx == 0:  # Don't apply this equation at initial point
+        idx = s.ord(i)
+        if idx == 1:  # Don't apply this equation at initial point
             raise IndexError("list index out of range")
         elif i in s.get_finite_elements():  # Don't apply at finite element
                                             # points continuity equations
                                             # added later
             raise IndexError("list index out of range")
         low = s.get_lower_element_boundary(i)
-        lowidx = tmp.index(low)
-        return sum(v(tmp[lowidx + j]) * adotdot[j][idx - lowidx] *
-                   (1.0 / (tmp[lowidx + ncp + 1] - tmp[lowidx]) ** 2) \
+        lowidx = s.ord(low)
+        return sum(v(s[lowidx + j]) * adotdot[j][idx - lowidx] *
+                   (1.0 / (s[lowidx + ncp + 1] - s[lowidx]) ** 2) \
                    for j in range(ncp + 1))
     return _fun
 
@@ -32,12 +32,11 @@ def _central_transform(v, s):
     derivatives
     """
     def _ctr_fun(i):
-        tmp = sorted(s)
-        idx = tmp.index(i)
-        if idx == 0:  # Needed since '-1' is considered a valid index in Python
+        idx = s.ord(i)
+        if idx == 1:  # Needed since '-1' is considered a valid set index
             raise IndexError("list index out of range")
-        return 1 / (tmp[idx + 1] - tmp[idx - 1]) * \
-               (v(tmp[idx + 1]) - v(tmp[idx - 1]))
+        return 1 / (s[idx + 1] - s[idx - 1]) * \
+               (v(s[idx + 1]) - v(s[idx - 1]))
     return _ctr_fun
 
 
@@ -47,12 +46,11 @@ def _central_transform_order2(v, s):
     derivatives
     """
     def _ctr_fun2(i):
-        tmp = sorted(s)
-        idx = tmp.index(i)
-        if idx == 0:  # Needed since '-1' is considered a valid index in Python
+        idx = s.ord(i)
+        if idx == 1:  # Needed since '-1' is considered a valid set index
             raise IndexError("list index out of range")
-        return 1 / ((tmp[idx + 1] - tmp[idx]) * (tmp[idx] - tmp[idx - 1])) * \
-               (v(tmp[idx + 1]) - 2 * v(tmp[idx]) + v(tmp[idx - 1]))
+        return 1 / ((s[idx + 1] - s[idx]) * (s[idx] - s[idx - 1])) * \
+               (v(s[idx + 1]) - 2 * v(s[idx]) + v(s[idx - 1]))
     return _ctr_fun2
 
 
@@ -61,9 +59,8 @@ def _forward_transform(v, s):
     Applies the Forward Difference formula of order O(h) for first derivatives
     """
     def _fwd_fun(i):
-        tmp = sorted(s)
-        idx = tmp.index(i)
-        return 1 / (tmp[idx + 1] - tmp[idx]) * (v(tmp[idx + 1]) - v(tmp[idx]))
+        idx = s.ord(i)
+        return 1 / (s[idx + 1] - s[idx]) * (v(s[idx + 1]) - v(s[idx]))
     return _fwd_fun
 
 
@@ -72,11 +69,10 @@ def _forward_transform_order2(v, s):
     Applies the Forward Difference formula of order O(h) for second derivatives
     """
     def _fwd_fun(i):
-        tmp = sorted(s)
-        idx = tmp.index(i)
-        return 1 / ((tmp[idx + 2] - tmp[idx + 1]) *
-                    (tmp[idx + 1] - tmp[idx])) *\
-               (v(tmp[idx + 2]) - 2 * v(tmp[idx + 1]) + v(tmp[idx]))
+        idx = s.ord(i)
+        return 1 / ((s[idx + 2] - s[idx + 1]) *
+                    (s[idx + 1] - s[idx])) *\
+               (v(s[idx + 2]) - 2 * v(s[idx + 1]) + v(s[idx]))
     return _fwd_fun
 
 
@@ -85,11 +81,10 @@ def _backward_transform(v, s):
     Applies the Backward Difference formula of order O(h) for first derivatives
     """
     def _bwd_fun(i):
-        tmp = sorted(s)
-        idx = tmp.index(i)
-        if idx == 0:  # Needed since '-1' is considered a valid index in Python
+        idx = s.ord(i)
+        if idx == 1:  # Needed since '-1' is considered a valid set index
             raise IndexError("list index out of range")
-        return 1 / (tmp[idx] - tmp[idx - 1]) * (v(tmp[idx]) - v(tmp[idx - 1]))
+        return 1 / (s[idx] - s[idx - 1]) * (v(s[idx]) - v(s[idx - 1]))
     return _bwd_fun
 
 
@@ -99,15 +94,14 @@ def _backward_transform_order2(v, s):
     derivatives
     """
     def _bwd_fun(i):
-        tmp = sorted(s)
-        idx = tmp.index(i)
+        idx = s.ord(i)
 
-        # This check is needed since '-1' is considered a valid index in Python
-        if idx == 0 or idx == 1:
+        # This check is needed since '-1' is considered a valid set index
+        if idx == 1 or idx == 2:
             raise IndexError("list index out of range")
-        return 1 / ((tmp[idx - 1] - tmp[idx - 2]) *
-                    (tmp[idx] - tmp[idx - 1])) * \
-               (v(tmp[idx]) - 2 * v(tmp[idx - 1]) + v(tmp[idx - 2]))
+        return 1 / ((s[idx - 1] - s[idx - 2]) *
+                    (s[idx] - s[idx - 1])) * \
+               (v(s[idx]) - 2 * v(s[idx - 1]) + v(s[idx - 2]))
     return _bwd_fun
 
 
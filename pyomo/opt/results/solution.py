@@ -72,8 +72,49 @@ class Solution(MapContainer):
         self.declare('variable', value={})
         self.declare('constraint', value={})
 
+        #
+        # name -> (symbols, {attribute: sequence of values})
+        #
+        self._arrays = {}
+
         self._option = default_print_options
 
+    def set_arrays(self, name, symbols, **data):
+        """
+        Store the 'variable' or 'constraint' data of this solution as
+        sequences (e.g., NumPy arrays) that are aligned with a list of
+        symbols, rather than as a dictionary for each symbol.  Solvers
+        use this to avoid building the per-symbol entries when the
+        solution is loaded directly into a model.
+
+        Example:
+            soln.set_arrays('variable', names, Value=x, Rc=rc)
+        """
+        if name not in ('variable', 'constraint'):
+            raise ValueError("Cannot store solution arrays for '%s'" % (name,))
+        for key, values in iteritems(data):
+            if len(values) != len(symbols):
+                raise ValueError(
+                    "The '%s' array has %s values for %s symbols"
+                    % (key, len(values), len(symbols)))
+        self._arrays[name] = (symbols, data)
+
+    def expand_arrays(self):
+        """
+        Move the data stored with set_arrays() into the per-symbol
+        'variable' and 'constraint' entries.
+        """
+        for name, (symbols, data) in iteritems(self._arrays):
+            entries = getattr(self, name)
+            columns = [(key, values.tolist() if hasattr(values, 'tolist')
+                        else values)
+                       for key, values in iteritems(data)]
+            for i, symbol in enumerate(symbols):
+                entry = entries.setdefault(symbol, {})
+                for key, values in columns:
+                    entry[key] = values[i]
+        self._arrays = {}
+
     def load(self, repn):
         # delete key from dictionary, call base class load, handle variable loading.
         if "Variable" in repn:
@@ -13,9 +13,14 @@ from math import fabs
 
 from pyomo.pysp.generators import \
     scenario_tree_node_variables_generator_noinstances
+from pyomo.pysp.phutils import (numpy_available,
+                                values_array)
 
 from six import iteritems, iterkeys
 
+if numpy_available:
+    import numpy
+
 #
 # This module contains a hierarchy of convergence "computers" for PH
 # (or any other scenario-based decomposition strategy). Their basic
@@ -25,6 +30,47 @@ from six import iteritems, iterkeys
 # of instances (with solutions).
 #
 
+#
+# Utilities for the vectorized computation of the metrics (when numpy
+# is available). The values at a tree node are processed one scenario
+# at a time, as a vector over the variables at the node.
+#
+
+def _node_squared_deviation(tree_node, variable_ids, center):
+    """Return the probability-weighted sum over the scenarios at the
+    tree node of the squared 2-norm of the difference between the
+    scenario solution and center (an array over the variable_ids)."""
+    node_squared_deviation = 0.0
+    for scenario in tree_node._scenarios:
+        deviation = values_array(scenario._x[tree_node._name],
+                                 variable_ids) - center
+        node_squared_deviation += \
+            scenario._probability * float(numpy.dot(deviation, deviation))
+    return node_squared_deviation
+
+def _term_diff_variable_ids(tree_node):
+    """Return the ids of the (non-derived) variables at the tree node
+    that contribute to the term diff metrics: the variables that are
+    fixed at the node or not stale in any scenario (see
+    scenario_tree_node_variables_generator_noinstances)."""
+    stale_ids = set()
+    fixed_counts = {}
+    for scenario in tree_node._scenarios:
+        stale_ids.update(scenario._stale[tree_node._name])
+        for variable_id in scenario._fixed[tree_node._name]:
+            fixed_counts[variable_id] = fixed_counts.get(variable_id, 0) + 1
+    for variable_id, instance_fixed_count in iteritems(fixed_counts):
+        if (variable_id in tree_node._standard_variable_ids) and \
+           (instance_fixed_count < len(tree_node._scenarios)):
+            variable_name, index = tree_node._variable_ids[variable_id]
+            raise RuntimeError("Variable="+variable_name+str(index)+" is "
+                               "fixed in "+str(instance_fixed_count)+" "
+                               "scenarios, which is less than the number "
+                               "of scenarios at tree node="+tree_node._name)
+    return [variable_id for variable_id in tree_node._standard_variable_ids
+            if (variable_id not in stale_ids) or \
+               tree_node.is_variable_fixed(variable_id)]
+
 class ConvergenceBase(object):
 
     """ Constructor
@@ -150,6 +196,16 @@ class PrimalDualResidualConvergence(ConvergenceBase):
             for tree_node in stage.nodes:
                 node_residual_squared_norm = 0.0
                 node_previous_average = previous_average[tree_node.name]
+                if numpy_available:
+                    variable_ids = list(tree_node._standard_variable_ids)
+                    residual_squared_norm += \
+                        tree_node.conditional_probability * \
+                        _node_squared_deviation(
+                            tree_node,
+                            variable_ids,
+                            values_array(node_previous_average,
+                                         variable_ids))
+                    continue
                 for scenario in tree_node.scenarios:
                     scenario_node_x = scenario._x[tree_node.name]
                     scenario_residual_squared_norm = 0.0
@@ -172,6 +228,15 @@ class PrimalDualResidualConvergence(ConvergenceBase):
             for tree_node in stage.nodes:
                 node_primal_residual_squared_norm = 0.0
                 node_average = tree_node._averages
+                if numpy_available:
+                    variable_ids = list(tree_node._standard_variable_ids)
+                    primal_residual_squared_norm += \
+                        tree_node.conditional_probability * \
+                        _node_squared_deviation(
+                            tree_node,
+                            variable_ids,
+                            values_array(node_average, variable_ids))
+                    continue
                 for scenario in tree_node.scenarios:
                     scenario_node_x = scenario._x[tree_node.name]
                     scenario_primal_residual_squared_norm = 0.0
@@ -196,6 +261,16 @@ class PrimalDualResidualConvergence(ConvergenceBase):
                 node_previous_average = previous_average[tree_node.name]
                 node_average = tree_node._averages
                 node_rho = tree_node._scenarios[0]._rho[tree_node.name]
+                if numpy_available:
+                    variable_ids = list(tree_node._standard_variable_ids)
+                    difference = values_array(node_average, variable_ids) - \
+                        values_array(node_previous_average, variable_ids)
+                    if rho_scaled:
+                        difference *= values_array(node_rho, variable_ids)
+                    dual_residual_squared_norm += \
+                        tree_node.conditional_probability * \
+                        float(numpy.dot(difference, difference))
+                    continue
                 for variable_id in tree_node._standard_variable_ids:
                     if rho_scaled:
                         node_dual_residual_squared_norm += \
@@ -244,6 +319,21 @@ class TermDiffConvergence(ConvergenceBase):
 
         term_diff = 0.0
 
+        if numpy_available:
+            for stage in scenario_tree._stages[:-1]:
+                for tree_node in stage._tree_nodes:
+                    variable_ids = _term_diff_variable_ids(tree_node)
+                    average_values = values_array(tree_node._averages,
+                                                  variable_ids)
+                    for scenario in tree_node._scenarios:
+                        term_diff += \
+                            scenario._probability * \
+                            float(numpy.abs(
+                                values_array(scenario._x[tree_node._name],
+                                             variable_ids) - \
+                                average_values).sum())
+            return term_diff
+
         for stage, tree_node, variable_id, variable_values, is_fixed, is_stale \
             in scenario_tree_node_variables_generator_noinstances(
                 scenario_tree,
@@ -285,6 +375,28 @@ class NormalizedTermDiffConvergence(ConvergenceBase):
 
         normalized_term_diff = 0.0
 
+        if numpy_available:
+            for stage in scenario_tree._stages[:-1]:
+                for tree_node in stage._tree_nodes:
+                    variable_ids = _term_diff_variable_ids(tree_node)
+                    average_values = values_array(tree_node._averages,
+                                                  variable_ids)
+                    # see the note about the magic constant below
+                    included = numpy.abs(average_values) > 0.0001
+                    variable_ids = [variable_id for variable_id, flag
+                                    in zip(variable_ids, included.tolist())
+                                    if flag]
+                    average_values = average_values[included]
+                    for scenario in tree_node._scenarios:
+                        normalized_term_diff += \
+                            scenario._probability * \
+                            float(numpy.abs(
+                                (values_array(scenario._x[tree_node._name],
+                                              variable_ids) - \
+                                 average_values) / average_values).sum())
+            return normalized_term_diff / \
+                (ph._total_discrete_vars + ph._total_continuous_vars)
+
         for stage, tree_node, variable_id, variable_values, is_fixed, is_stale \
             in scenario_tree_node_variables_generator_noinstances(
                 scenario_tree,
@@ -0,0 +1,658 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+#
+# A writer for the extensive form that never builds the EF instance.
+#
+# create_ef_instance links every scenario instance into a single
+# binding model, so the scenario instances (and the repns generated by
+# the LP/MPS writers) for all scenarios are in memory at the same time.
+# The writer below constructs one scenario instance at a time, writes
+# its rows and columns (along with the nonanticipativity rows linking
+# its variables to the master variables of the non-leaf tree nodes)
+# to temporary files holding the sections of the output file, and
+# releases the instance before the next scenario is constructed. The
+# sections are concatenated into the output file at the end.
+#
+# Names are built as in the EF written by write_ef with symbolic
+# labels: the scenario rows and columns are prefixed by the scenario
+# name, the master variables and the nonanticipativity rows are named
+# after the tree node (MASTER_BLEND_VAR_<node>(<variable>) and
+# MASTER_BLEND_CONSTRAINT_<node>(<scenario variable>)).
+#
+
+__all__ = ('write_streaming_ef',)
+
+import os
+import gc
+import shutil
+import tempfile
+
+from six import iterkeys
+
+from pyomo.core.base import (Var, Block, Constraint, SOSConstraint,
+                             SortComponents, TextLabeler, minimize,
+                             value, is_fixed)
+from pyomo.core.base.label import cpxlp_label_from_name
+from pyomo.repn import generate_standard_repn
+from pyomo.pysp.phutils import (find_active_objective,
+                                extractComponentIndices)
+
+_precision_string = '.17g'
+
+def _no_negative_zero(val):
+    """Make sure -0 is never output. Makes diff tests easier."""
+    if val == 0:
+        return 0
+    return val
+
+def _get_bound(exp):
+    if exp is None:
+        return None
+    if is_fixed(exp):
+        return value(exp)
+    raise ValueError("non-fixed bound or weight: " + str(exp))
+
+def _check_linear(repn, name):
+    degree = repn.polynomial_degree()
+    if (degree is None) or (degree > 1):
+        raise ValueError(
+            "Cannot write the extensive form by streaming scenarios: "
+            "'%s' is not linear. Only linear scenario models are "
+            "supported by this writer." % (name))
+
+def _nonanticipative_vardatas(instance, tree_node):
+    """Yields the (non-derived) variables of a scenario instance
+    that are blended at the given tree node, in the order in which
+    the tree node assigns them ids."""
+    templates = []
+    stage_variables = tree_node._stage._variable_templates
+    for component_name in sorted(iterkeys(stage_variables)):
+        templates.append((component_name,
+                          stage_variables[component_name]))
+    node_variables = tree_node._variable_templates
+    for component_name in sorted(iterkeys(node_variables)):
+        templates.append((component_name,
+                          node_variables[component_name]))
+
+    for component_name, match_templates in templates:
+        component = instance.find_component(component_name)
+        if component is None:
+            raise RuntimeError(
+                "The component=%s associated with stage=%s "
+                "is not present in instance=%s"
+                % (component_name,
+                   tree_node._stage._name,
+                   instance.name))
+        indices = []
+        for match_template in match_templates:
+            indices.extend(extractComponentIndices(component,
+                                                   match_template))
+        if component.type() is Block:
+            for index in indices:
+                if component[index].active:
+                    for vardata in component[index].component_data_objects(
+                            Var,
+                            sort=SortComponents.indices,
+                            descend_into=True):
+                        yield vardata
+        elif component.type() is Var:
+            for index in sorted(indices):
+                yield component[index]
+        else:
+            raise RuntimeError(
+                "The component=%s associated with stage=%s "
+                "is present in instance=%s but is not a "
+                "variable - type=%s"
+                % (component_name,
+                   tree_node._stage._name,
+                   instance.name,
+                   type(component)))
+
+class _StreamingEFWriter(object):
+    """The sections of the output file, filled one scenario at a
+    time. Subclasses implement the file format."""
+
+    _section_names = ()
+
+    def __init__(self):
+        self._sections = dict((name, tempfile.TemporaryFile(mode='w+'))
+                              for name in self._section_names)
+
+    def close(self):
+        for section in self._sections.values():
+            section.close()
+        self._sections = {}
+
+    def _copy_section(self, name, output_file):
+        section = self._sections[name]
+        section.seek(0)
+        shutil.copyfileobj(section, output_file)
+
+    def begin_scenario(self):
+        pass
+
+    def end_scenario(self):
+        pass
+
+    def add_objective_terms(self, terms):
+        raise NotImplementedError
+
+    def add_row(self, label, sense, terms, rhs):
+        raise NotImplementedError
+
+    def add_linking_row(self, label, master_label, column_label, rhs):
+        raise NotImplementedError
+
+    def add_column(self, label, vardata):
+        raise NotImplementedError
+
+    def add_master_column(self, label, row_labels):
+        raise NotImplementedError
+
+    def finish(self, output_file, name, minimizing, objective_constant):
+        raise NotImplementedError
+
+class _StreamingEFWriter_LP(_StreamingEFWriter):
+
+    _section_names = ('objective', 'constraints', 'bounds',
+                      'general', 'binary')
+
+    linear_coef_string_template = '%+'+_precision_string+' %s\n'
+    eq_string_template =          "= %"+_precision_string+'\n'
+    geq_string_template =         ">= %"+_precision_string+'\n\n'
+    leq_string_template =         "<= %"+_precision_string+'\n\n'
+    lb_string_template =          "%"+_precision_string+" <= "
+    ub_string_template =          " <= %"+_precision_string+"\n"
+
+    _sense_templates = {'E': eq_string_template+'\n',
+                        'G': geq_string_template,
+                        'L': leq_string_template}
+
+    def _format_terms(self, terms):
+        if len(terms) == 0:
+            # see ProblemWriter_cpxlp._print_expr_canonical
+            return self.linear_coef_string_template % (0, 'ONE_VAR_CONSTANT')
+        template = self.linear_coef_string_template
+        return "".join(template % (coef, name)
+                       for name, coef in sorted(terms))
+
+    def add_objective_terms(self, terms):
+        if len(terms):
+            self._sections['objective'].write(self._format_terms(terms))
+
+    def add_row(self, label, sense, terms, rhs):
+        self._sections['constraints'].write(
+            "%s:\n%s%s" % (label,
+                           self._format_terms(terms),
+                           self._sense_templates[sense]
+                           % (_no_negative_zero(rhs))))
+
+    def add_linking_row(self, label, master_label, column_label, rhs):
+        if column_label is None:
+            terms = [(master_label, 1)]
+        else:
+            terms = [(master_label, 1), (column_label, -1)]
+        self.add_row(label, 'E', terms, rhs)
+
+    def add_column(self, label, vardata):
+        if label == "e":
+            raise ValueError(
+                "Attempting to write variable with name 'e' in a CPLEX LP "
+                "formatted file will cause a parse failure due to confusion with "
+                "numeric values expressed in scientific notation")
+        if vardata.is_binary():
+            self._sections['binary'].write('  %s\n' % (label))
+        elif vardata.is_integer():
+            self._sections['general'].write('  %s\n' % (label))
+        elif not vardata.is_continuous():
+            raise TypeError("Invalid domain type for variable with name '%s'. "
+                            "Variable is not continuous, integer, or binary."
+                            % (vardata.name))
+        output = ["   "]
+        if vardata.has_lb():
+            output.append(self.lb_string_template
+                          % (_no_negative_zero(_get_bound(vardata.lb))))
+        else:
+            output.append(" -inf <= ")
+        output.append(label)
+        if vardata.has_ub():
+            output.append(self.ub_string_template
+                          % (_no_negative_zero(_get_bound(vardata.ub))))
+        else:
+            output.append(" <= +inf\n")
+        self._sections['bounds'].write("".join(output))
+
+    def add_master_column(self, label, row_labels):
+        self._sections['bounds'].write("    -inf <= %s <= +inf\n" % (label))
+
+    def finish(self, output_file, name, minimizing, objective_constant):
+        # NOTE: this *must* use the "\* ... *\" comment format: the GLPK
+        # LP parser does not correctly handle other formats (notably, "%").
+        output_file.write(
+            "\\* Source Pyomo model name=%s *\\\n\n" % (name,))
+        output_file.write("min \n" if minimizing else "max \n")
+        output_file.write("%s:\n" % (name))
+        self._copy_section('objective', output_file)
+        if objective_constant != 0:
+            output_file.write(self.linear_coef_string_template
+                              % (objective_constant, 'ONE_VAR_CONSTANT'))
+        output_file.write("\ns.t.\n\n")
+        self._copy_section('constraints', output_file)
+        output_file.write("c_e_ONE_VAR_CONSTANT: \n")
+        output_file.write("ONE_VAR_CONSTANT = 1.0\n")
+        output_file.write("\n")
+        output_file.write("bounds\n")
+        self._copy_section('bounds', output_file)
+        for section in ('general', 'binary'):
+            if self._sections[section].tell() > 0:
+                output_file.write("%s\n" % (section))
+                self._copy_section(section, output_file)
+        output_file.write("end\n")
+
+class _StreamingEFWriter_MPS(_StreamingEFWriter):
+
+    _section_names = ('rows', 'columns', 'rhs', 'bounds')
+
+    column_template = "     %s %s %"+_precision_string+"\n"
+    rhs_template = "     RHS %s %"+_precision_string+"\n"
+    entry_template = "%s %"+_precision_string+"\n"
+
+    def __init__(self):
+        super(_StreamingEFWriter_MPS, self).__init__()
+        self._objective_label = None
+        self._column_data = None
+
+    def begin_scenario(self):
+        # the entries of the columns of the current scenario
+        self._column_data = {}
+
+    def end_scenario(self):
+        # The scenario variables only appear in the rows of their
+        # scenario, so their columns are complete at this point.
+        columns = self._sections['columns']
+        column_template = self.column_template
+        for label in sorted(self._column_data):
+            for row_label, coef in self._column_data[label]:
+                columns.write(column_template
+                              % (label, row_label, _no_negative_zero(coef)))
+        self._column_data = None
+
+    def add_objective_terms(self, terms):
+        for name, coef in terms:
+            self._column_data.setdefault(name, []).append(
+                (self._objective_label, coef))
+
+    def add_row(self, label, sense, terms, rhs):
+        self._sections['rows'].write(" %s  %s\n" % (sense, label))
+        for name, coef in terms:
+            self._column_data.setdefault(name, []).append((label, coef))
+        self._sections['rhs'].write(self.rhs_template
+                                    % (label, _no_negative_zero(rhs)))
+
+    def add_linking_row(self, label, master_label, column_label, rhs):
+        # the master column entries are written by add_master_column
+        if column_label is None:
+            self.add_row(label, 'E', (), rhs)
+        else:
+            self.add_row(label, 'E', ((column_label, -1),), rhs)
+
+    def add_column(self, label, vardata):
+        bounds = self._sections['bounds']
+        entry_template = self.entry_template
+        vardata_lb = _no_negative_zero(_get_bound(vardata.lb))
+        vardata_ub = _no_negative_zero(_get_bound(vardata.ub))
+        unbounded_lb = not vardata.has_lb()
+        unbounded_ub = not vardata.has_ub()
+        treat_as_integer = False
+        if vardata.is_binary():
+            if (vardata_lb == 0) and (vardata_ub == 1):
+                bounds.write(" BV BOUND %s\n" % (label))
+                return
+            else:
+                # so we can add bounds
+                treat_as_integer = True
+        if treat_as_integer or vardata.is_integer():
+            # see ProblemWriter_mps._print_model_MPS
+            if not unbounded_lb:
+                bounds.write((" LI BOUND "+entry_template)
+                             % (label, vardata_lb))
+            else:
+                bounds.write(" LI BOUND %s -10E20\n" % (label))
+            if not unbounded_ub:
+                bounds.write((" UI BOUND "+entry_template)
+                             % (label, vardata_ub))
+            else:
+                bounds.write(" UI BOUND %s 10E20\n" % (label))
+        else:
+            if not vardata.is_continuous():
+                raise TypeError(
+                    "Invalid domain type for variable with name '%s'. "
+                    "Variable is not continuous, integer, or binary."
+                    % (vardata.name))
+            if unbounded_lb and unbounded_ub:
+                bounds.write(" FR BOUND %s\n" % (label))
+            else:
+                if not unbounded_lb:
+                    bounds.write((" LO BOUND "+entry_template)
+                                 % (label, vardata_lb))
+                else:
+                    bounds.write(" MI BOUND %s\n" % (label))
+                if not unbounded_ub:
+                    bounds.write((" UP BOUND "+entry_template)
+                                 % (label, vardata_ub))
+
+    def add_master_column(self, label, row_labels):
+        columns = self._sections['columns']
+        column_template = self.column_template
+        for row_label in row_labels:
+            columns.write(column_template % (label, row_label, 1))
+        self._sections['bounds'].write(" FR BOUND %s\n" % (label))
+
+    def finish(self, output_file, name, minimizing, objective_constant):
+        output_file.write("* Source:     Pyomo MPS Writer\n")
+        output_file.write("* Format:     Free MPS\n")
+        output_file.write("*\n")
+        output_file.write("NAME %s\n" % (name,))
+        output_file.write("OBJSENSE\n")
+        output_file.write(" MIN\n" if minimizing else " MAX\n")
+        output_file.write("ROWS\n")
+        output_file.write(" N  %s\n" % (name))
+        self._copy_section('rows', output_file)
+        if objective_constant != 0:
+            output_file.write(" E  c_e_ONE_VAR_CONSTANT\n")
+        output_file.write("COLUMNS\n")
+        self._copy_section('columns', output_file)
+        if objective_constant != 0:
+            output_file.write(self.column_template
+                              % ("ONE_VAR_CONSTANT", name,
+                                 objective_constant))
+            output_file.write(self.column_template
+                              % ("ONE_VAR_CONSTANT",
+                                 "c_e_ONE_VAR_CONSTANT", 1))
+        output_file.write("RHS\n")
+        self._copy_section('rhs', output_file)
+        if objective_constant != 0:
+            output_file.write(self.rhs_template
+                              % ("c_e_ONE_VAR_CONSTANT", 1))
+        output_file.write("BOUNDS\n")
+        self._copy_section('bounds', output_file)
+        output_file.write("ENDATA\n")
+
+def _constraint_data_and_repns(instance):
+    sort = SortComponents.indices
+    for block in instance.block_data_objects(active=True, sort=sort):
+        for constraint_data in block.component_data_objects(
+                Constraint,
+                active=True,
+                sort=sort,
+                descend_into=False):
+            if (not constraint_data.has_lb()) and \
+               (not constraint_data.has_ub()):
+                assert not constraint_data.equality
+                continue # non-binding, so skip
+            if constraint_data._linear_canonical_form:
+                repn = constraint_data.canonical_form()
+            else:
+                repn = generate_standard_repn(constraint_data.body)
+            yield constraint_data, repn
+
+def write_streaming_ef(scenario_tree,
+                       scenario_instance_factory,
+                       output_filename,
+                       ef_instance_name="MASTER",
+                       objective_sense=None,
+                       verbose=False):
+    """
+    Write the extensive form of a stochastic program to an LP or MPS
+    file without constructing the extensive form instance.
+
+    The scenario instances are constructed (and released) one at a
+    time, so at most one scenario instance is in memory. The
+    sections of the output file are buffered in temporary files.
+    The rows and columns of each scenario are prefixed by the
+    scenario name. The nonanticipativity constraints equate each
+    scenario variable blended at a non-leaf tree node with the
+    corresponding (free) master variable of that node. The
+    objective is the expected value of the scenario objectives.
+
+    The scenario models must be linear. The CVaR and chance
+    constraint options of create_ef_instance are not supported.
+
+    Args:
+        scenario_tree: The scenario tree. It does not need to be
+            linked to scenario instances.
+        scenario_instance_factory: A ScenarioTreeInstanceFactory, or
+            a function that returns the instance for a scenario when
+            called with the scenario name.
+        output_filename (str): The name of the output file. The
+            format is determined by its suffix ('.lp' or '.mps').
+        ef_instance_name (str): The name of the objective (and of
+            the model, in the file header). Defaults to 'MASTER'.
+        objective_sense: If not :const:`None`, the scenario
+            objectives are replaced by the sum of the stage cost
+            variables, with this sense (minimize or maximize), as
+            with the objective_sense argument of
+            ScenarioTree.linkInInstances.
+        verbose (bool): Print progress information.
+    """
+    suffix = os.path.splitext(output_filename)[1]
+    if suffix == ".lp":
+        writer = _StreamingEFWriter_LP()
+    elif suffix == ".mps":
+        writer = _StreamingEFWriter_MPS()
+    else:
+        raise RuntimeError("Unknown file suffix=%s specified when writing "
+                           "extensive form by streaming scenarios "
+                           "(supported suffixes are .lp and .mps)"
+                           % (suffix))
+    writer._objective_label = ef_instance_name
+
+    if hasattr(scenario_instance_factory, "construct_scenario_instance"):
+        def construct_instance(scenario_name):
+            return scenario_instance_factory.construct_scenario_instance(
+                scenario_name,
+                scenario_tree,
+                verbose=verbose)
+    else:
+        construct_instance = scenario_instance_factory
+
+    # The master variable labels of each non-leaf tree node (in the
+    # order of the first scenario passing through the node) and the
+    # names of the scenarios that have been written for the node. This
+    # is all that is needed to regenerate the nonanticipativity row
+    # labels when the master columns are written.
+    master_labels = {}
+    node_scenarios = {}
+    minimizing = None
+    objective_constant = 0.0
+
+    try:
+        for scenario in scenario_tree.scenarios:
+
+            if verbose:
+                print("Writing extensive form rows and columns for "
+                      "scenario=%s" % (scenario.name))
+
+            instance = construct_instance(scenario.name)
+
+            if objective_sense is None:
+                objective = find_active_objective(instance,
+                                                  safety_checks=True)
+                if objective is None:
+                    raise RuntimeError(
+                        "An active Objective could not be found on "
+                        "instance for scenario %s." % (scenario.name))
+                objective_name = objective.name
+                objective_expr = objective.expr
+                is_minimizing = objective.is_minimizing()
+            else:
+                objective_name = "stage cost of scenario %s" \
+                                 % (scenario.name)
+                objective_expr = sum(
+                    instance.find_component(tree_node._cost_variable[0])\
+                    [tree_node._cost_variable[1]]
+                    for tree_node in scenario.node_list)
+                is_minimizing = (objective_sense == minimize)
+            if minimizing is None:
+                minimizing = is_minimizing
+            elif minimizing != is_minimizing:
+                raise ValueError(
+                    "The objective sense of scenario %s differs from "
+                    "the objective sense of the other scenarios"
+                    % (scenario.name))
+            for _ in instance.component_data_objects(SOSConstraint,
+                                                     active=True):
+                raise ValueError(
+                    "Cannot write the extensive form by streaming "
+                    "scenarios: SOS constraints are not supported "
+                    "(scenario %s)" % (scenario.name))
+
+            writer.begin_scenario()
+            labeler = TextLabeler()
+            prefix = cpxlp_label_from_name(scenario.name) + "_"
+            column_labels = {}
+            referenced = {}
+
+            def column_terms(repn, scale=1):
+                terms = []
+                for vardata, coef in zip(repn.linear_vars,
+                                         repn.linear_coefs):
+                    label = column_labels.get(id(vardata))
+                    if label is None:
+                        label = column_labels[id(vardata)] = \
+                            prefix + labeler(vardata)
+                        referenced[id(vardata)] = vardata
+                    terms.append((label, scale * coef))
+                return terms
+
+            #
+            # Objective
+            #
+            repn = generate_standard_repn(objective_expr)
+            _check_linear(repn, objective_name)
+            probability = scenario.probability
+            writer.add_objective_terms(column_terms(repn, probability))
+            objective_constant += probability * repn.constant
+
+            #
+            # Constraints
+            #
+            for constraint_data, repn in _constraint_data_and_repns(instance):
+                _check_linear(repn, constraint_data.name)
+                terms = column_terms(repn)
+                con_symbol = prefix + labeler(constraint_data)
+                offset = repn.constant
+                if constraint_data.equality:
+                    assert value(constraint_data.lower) == \
+                        value(constraint_data.upper)
+                    writer.add_row('c_e_%s_' % con_symbol, 'E', terms,
+                                   _get_bound(constraint_data.lower) - offset)
+                    continue
+                if constraint_data.has_lb():
+                    if constraint_data.has_ub():
+                        label = 'r_l_%s_' % con_symbol
+                    else:
+                        label = 'c_l_%s_' % con_symbol
+                    writer.add_row(label, 'G', terms,
+                                   _get_bound(constraint_data.lower) - offset)
+                if constraint_data.has_ub():
+                    if constraint_data.has_lb():
+                        label = 'r_u_%s_' % con_symbol
+                    else:
+                        label = 'c_u_%s_' % con_symbol
+                    writer.add_row(label, 'L', terms,
+                                   _get_bound(constraint_data.upper) - offset)
+
+            #
+            # Nonanticipativity
+            #
+            for tree_node in scenario.node_list[:-1]:
+                node_prefix = cpxlp_label_from_name(tree_node.name)
+                node_labels = []
+                for vardata in _nonanticipative_vardatas(instance, tree_node):
+                    var_label = labeler(vardata)
+                    master_label = "MASTER_BLEND_VAR_%s(%s)" \
+                                   % (node_prefix, var_label)
+                    node_labels.append((master_label, var_label))
+                    if vardata.fixed:
+                        # fixed variables do not get a column (as in
+                        # the LP writer, they are treated as constants)
+                        column_label = None
+                        rhs = value(vardata.value)
+                    else:
+                        column_label = column_labels.get(id(vardata))
+                        if column_label is None:
+                            column_label = column_labels[id(vardata)] = \
+                                prefix + var_label
+                            referenced[id(vardata)] = vardata
+                        rhs = 0.0
+                    writer.add_linking_row(
+                        "c_e_MASTER_BLEND_CONSTRAINT_%s(%s%s)_"
+                        % (node_prefix, prefix, var_label),
+                        master_label,
+                        column_label,
+                        rhs)
+                if tree_node.name not in master_labels:
+                    master_labels[tree_node.name] = node_labels
+                    node_scenarios[tree_node.name] = []
+                elif master_labels[tree_node.name] != node_labels:
+                    raise ValueError(
+                        "The variables blended at tree node %s for "
+                        "scenario %s do not match those of the other "
+                        "scenarios passing through the node"
+                        % (tree_node.name, scenario.name))
+                node_scenarios[tree_node.name].append(prefix)
+
+            #
+            # Columns
+            #
+            for vardata in instance.component_data_objects(
+                    Var, sort=SortComponents.indices):
+                if id(vardata) in referenced:
+                    writer.add_column(column_labels[id(vardata)], vardata)
+
+            writer.end_scenario()
+
+            # release the scenario instance before the next one
+            # is constructed (the names are rebound rather than
+            # deleted, as they are used by column_terms)
+            instance = None
+            column_labels = None
+            referenced = None
+            gc.collect()
+
+        if minimizing is None:
+            raise ValueError("The scenario tree does not contain any "
+                             "scenarios")
+
+        for stage in scenario_tree.stages[:-1]:
+            for tree_node in stage.nodes:
+                if tree_node.name not in master_labels:
+                    continue
+                node_prefix = cpxlp_label_from_name(tree_node.name)
+                scenario_prefixes = node_scenarios[tree_node.name]
+                for master_label, var_label in master_labels[tree_node.name]:
+                    writer.add_master_column(
+                        master_label,
+                        ("c_e_MASTER_BLEND_CONSTRAINT_%s(%s%s)_"
+                         % (node_prefix, scenario_prefix, var_label)
+                         for scenario_prefix in scenario_prefixes))
+
+        with open(output_filename, "w") as output_file:
+            writer.finish(output_file,
+                          ef_instance_name,
+                          minimizing,
+                          _no_negative_zero(objective_constant))
+    finally:
+        writer.close()
+
+    if verbose:
+        print("Extensive form written to file=%s" % (output_filename))
@@ -58,6 +58,9 @@ from pyomo.pysp.solutionioextensions import \
      IPySPSolutionLoaderExtension)
 from pyomo.pysp.solutionwriter import ISolutionWriterExtension
 from pyomo.pysp.ef import write_ef, create_ef_instance
+from pyomo.pysp.ef_streaming import write_streaming_ef
+from pyomo.pysp.scenariotree.instance_factory import \
+    ScenarioTreeInstanceFactory
 
 logger = logging.getLogger('pyomo.pysp')
 
@@ -586,6 +589,25 @@ def runef_register_options(options=None):
             doc=None,
             visibility=0),
         ap_group=_output_options_group_title)
+    safe_register_unique_option(
+        options,
+        "stream_ef",
+        PySPConfigValue(
+            False,
+            domain=bool,
+            description=(
+                "Write the extensive form to the output file by "
+                "constructing, writing, and releasing one scenario "
+                "instance at a time, without building the extensive "
+                "form instance. This bounds the memory required to "
+                "write the extensive form of problems with many "
+                "scenarios. The scenario models must be linear, the "
+                "output file must be in LP or MPS format, and the "
+                "extensive form can not be solved. Default is False."
+            ),
+            doc=None,
+            visibility=0),
+        ap_group=_output_options_group_title)
     safe_register_unique_option(
         options,
         "solve",
@@ -695,6 +717,9 @@ def runef(options,
     solution_savers = sort_extensions_by_precedence(solution_savers)
     solution_writers = sort_extensions_by_precedence(solution_writers)
 
+    if options.stream_ef:
+        return _runef_streaming(options, start_time)
+
     with ScenarioTreeManagerClientSerial(options) \
          as manager:
         manager.initialize()
@@ -804,6 +829,55 @@ def runef(options,
 
     return 0
 
+#
+# Write the extensive form one scenario instance at a time,
+# without constructing a scenario tree manager.
+#
+
+def _runef_streaming(options, start_time):
+
+    if options.solve:
+        raise ValueError("The stream_ef option can not be used "
+                         "when solving the extensive form")
+    if options.generate_weighted_cvar or \
+       (options.cc_indicator_var is not None):
+        raise ValueError("The stream_ef option can not be used with "
+                         "CVaR or chance constraint options")
+
+    filename = options.output_file
+    if os.path.splitext(filename)[1] not in ('.lp', '.mps'):
+        filename += '.lp'
+
+    with ScenarioTreeInstanceFactory(options.model_location,
+                                     options.scenario_tree_location) \
+         as factory:
+        scenario_tree = factory.generate_scenario_tree(
+            downsample_fraction=options.scenario_tree_downsample_fraction,
+            random_seed=options.scenario_tree_random_seed,
+            verbose=options.verbose)
+
+        write_start_time = time.time()
+        if options.verbose:
+            print("Starting to write extensive form")
+
+        write_streaming_ef(scenario_tree,
+                           factory,
+                           filename,
+                           objective_sense=options.objective_sense_stage_based,
+                           verbose=options.verbose)
+
+        print("Extensive form written to file="+filename)
+        if options.verbose or options.output_times:
+            print("Time to write output file=%.2f seconds"
+                  % (time.time() - write_start_time))
+
+    print("")
+    print("Total EF execution time=%.2f seconds"
+          % (time.time() - start_time))
+    print("")
+
+    return 0
+
 #
 # The main driver routine for the runef script
 #
@@ -59,6 +59,9 @@ from pyomo.pysp.phutils import (create_block_symbol_maps,
                                 preprocess_block_objectives,
                                 preprocess_block_constraints,
                                 extract_solve_times,
+                                numpy_available,
+                                values_array,
+                                update_from_array,
                                 _OLD_OUTPUT)
 from pyomo.pysp.util.misc import load_external_module
 from pyomo.pysp import phsolverserverutils
@@ -68,6 +71,9 @@ from pyomo.opt.parallel.local import SolverManager_Serial
 from six import iterkeys, itervalues, iteritems
 from six.moves import xrange
 
+if numpy_available:
+    import numpy
+
 logger = logging.getLogger('pyomo.pysp')
 
 # PH iteratively solves scenario sub-problems, so we don't want to
@@ -934,6 +940,11 @@ class _PHBase(object):
 
     def _preprocess_scenario_instances(self, ignore_bundles=False, subproblems=None):
 
+        # TODO: Does this import need to be delayed because
+        #       it is in a plugins subdirectory
+        from pyomo.solvers.plugins.solvers.persistent_solver import \
+            PersistentSolver
+
         start_time = time.time()
 
         if (not self._scenario_tree.contains_bundles()) or ignore_bundles:
@@ -972,6 +983,8 @@ class _PHBase(object):
                 preprocess_bundle_constraints = False
 
                 bundle_solver = self._solver_map[scenario_bundle_name]
+                persistent_solver_in_use = \
+                    isinstance(bundle_solver, PersistentSolver)
 
                 for scenario_name in self._bundle_scenario_instance_map[scenario_bundle_name]:
 
@@ -1001,7 +1014,9 @@ class _PHBase(object):
                             user_constraints_updated[scenario_name],
                         self._problem_states.ph_constraints_updated[scenario_name],
                         self._problem_states.ph_constraints[scenario_name],
-                        objective_updated,
+                        # a persistent solver only holds the bundle
+                        # objective (set below)
+                        objective_updated and (not persistent_solver_in_use),
                         not self._write_fixed_variables,
                         bundle_solver)
 
@@ -1010,6 +1025,15 @@ class _PHBase(object):
                     self._problem_states.clear_fixed_variables(scenario_name)
                     self._problem_states.clear_freed_variables(scenario_name)
 
+                if persistent_solver_in_use:
+                    # the bundle objective and constraint representations
+                    # generated below are only used when writing problem
+                    # files
+                    if preprocess_bundle_objective:
+                        preprocess_bundle_instance(bundle_ef_instance,
+                                                   bundle_solver)
+                    continue
+
                 # TBD - much of this can be done in preprocess_bundle_instance
                 var_id_map = {}
                 if preprocess_bundle_objective:
@@ -3414,6 +3438,10 @@ class ProgressiveHedging(_PHBase):
 
             for tree_node in stage._tree_nodes:
 
+                if numpy_available:
+                    self._update_node_variable_statistics(tree_node)
+                    continue
+
                 xbars = tree_node._xbars
 
                 scenario_solutions = \
@@ -3453,6 +3481,47 @@ class ProgressiveHedging(_PHBase):
         if self._output_times:
             print("Variable statistics compute time=%.2f seconds" % (end_time - start_time))
 
+    #
+    # A vectorized implementation of the loop over the variables of a
+    # tree node in update_variable_statistics. The values are
+    # processed one scenario at a time (a vector over the variables at
+    # the node) so that the averages are accumulated in the same order
+    # as in that loop.
+    #
+    def _update_node_variable_statistics(self, tree_node):
+
+        variable_ids = list(tree_node._standard_variable_ids)
+        stale = numpy.zeros(len(variable_ids), dtype=bool)
+        avg_values = numpy.zeros(len(variable_ids))
+        min_values = max_values = None
+        for scenario in tree_node._scenarios:
+            values = values_array(scenario._x[tree_node._name], variable_ids)
+            stale |= numpy.isnan(values)
+            avg_values += scenario._probability * values
+            if min_values is None:
+                min_values = max_values = values
+            else:
+                min_values = numpy.minimum(min_values, values)
+                max_values = numpy.maximum(max_values, values)
+        avg_values /= tree_node._probability
+        not_stale = ~stale
+
+        update_from_array(tree_node._minimums, variable_ids,
+                          min_values, not_stale)
+        update_from_array(tree_node._maximums, variable_ids,
+                          max_values, not_stale)
+        if self._ph_xbar_updates_enabled:
+            if (self._overrelax) and (self._current_iteration >= 1):
+                xbar_values = self._nu*avg_values + \
+                    (1-self._nu)*values_array(tree_node._averages,
+                                              variable_ids)
+            else:
+                xbar_values = avg_values
+            update_from_array(tree_node._xbars, variable_ids,
+                              xbar_values, not_stale)
+        update_from_array(tree_node._averages, variable_ids,
+                          avg_values, not_stale)
+
     def update_weights(self):
 
         start_time = time.time()
@@ -3494,6 +3563,13 @@ class ProgressiveHedging(_PHBase):
                 tree_node_wbars = tree_node._wbars = \
                     dict((var_id,0) for var_id in tree_node._variable_ids)
 
+                if numpy_available:
+                    self._update_node_weights(tree_node,
+                                              tree_node._scenarios,
+                                              tree_node_xbars,
+                                              tree_node_wbars)
+                    continue
+
                 for scenario in tree_node._scenarios:
 
                     instance = scenario._instance
@@ -3583,6 +3659,12 @@ class ProgressiveHedging(_PHBase):
                 tree_node_xbars = tree_node._averages
             blend_values = tree_node._blend
 
+            if numpy_available:
+                self._update_node_weights(tree_node,
+                                          (scenario,),
+                                          tree_node_xbars)
+                continue
+
             # Note: This does not update wbar
             for variable_id in tree_node._standard_variable_ids:
 
@@ -3633,6 +3715,66 @@ class ProgressiveHedging(_PHBase):
         end_time = time.time()
         self._cumulative_weight_time += (end_time - start_time)
 
+    #
+    # A vectorized implementation of the weight updates for the
+    # variables of a tree node in update_weights and
+    # update_weights_for_scenario (wbars is only updated if
+    # provided). The weights are updated one scenario at a time (a
+    # vector over the variables at the node), using the same
+    # arithmetic as in those loops.
+    #
+    def _update_node_weights(self, tree_node, scenarios, xbars, wbars=None):
+
+        nu_value = 1.0
+        if self._overrelax:
+            nu_value = self._nu
+        minimizing = (self._objective_sense == minimize)
+
+        variable_ids = list(tree_node._standard_variable_ids)
+        xbar_values = values_array(xbars, variable_ids)
+        blend_values = values_array(tree_node._blend, variable_ids)
+        if wbars is not None:
+            wbar_values = numpy.zeros(len(variable_ids))
+            updated = numpy.zeros(len(variable_ids), dtype=bool)
+
+        for scenario in scenarios:
+
+            weight_values = scenario._w[tree_node._name]
+            var_values = values_array(scenario._x[tree_node._name],
+                                      variable_ids)
+            rho_values = values_array(scenario._rho[tree_node._name],
+                                      variable_ids)
+            # we are currently not updating weights if blending is
+            # disabled for a variable (see update_weights)
+            active = ~numpy.isnan(var_values)
+            weight_update = blend_values * rho_values * nu_value * \
+                            (var_values - xbar_values)
+            if not self._dual_mode:
+                if minimizing:
+                    weights = values_array(weight_values, variable_ids) + \
+                              weight_update
+                else:
+                    weights = values_array(weight_values, variable_ids) - \
+                              weight_update
+            else:
+                # **Adding these asserts simply because we haven't
+                # **thought about what this means for other steps in
+                # **the code
+                assert (blend_values[active] == 1.0).all()
+                assert nu_value == 1.0
+                assert minimizing
+                weights = weight_update
+            update_from_array(weight_values, variable_ids, weights, active)
+
+            if wbars is not None:
+                wbar_values[active] += \
+                    scenario._probability * weights[active] / \
+                    tree_node._probability
+                updated |= active
+
+        if wbars is not None:
+            update_from_array(wbars, variable_ids, wbar_values, updated)
+
     def iteration_k_solves(self):
 
         if self._verbose:
@@ -9,6 +9,13 @@
 #  ___________________________________________________________________________
 
 import sys
+import operator
+
+try:
+    import numpy
+    numpy_available = True
+except ImportError:                               #pragma:nocover
+    numpy_available = False
 
 from pyomo.core import *
 from pyomo.opt import ProblemFormat
@@ -68,6 +75,34 @@ def extract_solve_times(results, default=undefined):
 
     return solve_time, pyomo_solve_time
 
+#
+# Utilities for the vectorized computation of tree node statistics.
+# The solution, weight and rho values of each scenario at a tree node
+# are stored in dictionaries keyed by variable id: these functions
+# gather the values for a list of variable ids into a NumPy array and
+# store computed values back.
+#
+
+def values_array(value_map, keys):
+    """Return a float array with the values of the keys in the
+    value_map dictionary. None values are stored as NaN."""
+    if len(keys) == 0:
+        return numpy.empty(0)
+    if len(keys) == 1:
+        return numpy.array([value_map[keys[0]]], dtype=float)
+    return numpy.array(operator.itemgetter(*keys)(value_map), dtype=float)
+
+def update_from_array(value_map, keys, values, mask=None):
+    """Store values[i] as the value of keys[i] in the value_map
+    dictionary, for the positions i where mask (if provided) is
+    True."""
+    values = values.tolist()
+    if (mask is None) or mask.all():
+        value_map.update(zip(keys, values))
+    else:
+        value_map.update((keys[i], values[i])
+                         for i in numpy.flatnonzero(mask).tolist())
+
 class BasicSymbolMap(object):
 
     def __init__(self):
@@ -743,12 +778,11 @@ def preprocess_scenario_instance(scenario_instance,
         return
 
     if instance_objective_modified:
-        # if only the objective changed, there is minimal work to do.
-        _preprocess(scenario_instance,
-                    objective=True,
-                    constraints=False)
-
         if persistent_solver_in_use:
+            # the preprocessed objective is only used when writing
+            # problem files. re-setting the objective the solver
+            # already holds only updates its coefficients (e.g., the
+            # PH weight and proximal terms).
             active_objective_datas = []
             for active_objective_data in scenario_instance.component_data_objects(Objective,
                                                                                   active=True,
@@ -758,9 +792,15 @@ def preprocess_scenario_instance(scenario_instance,
                 raise RuntimeError("Multiple active objectives identified for scenario=%s" % scenario_instance._name)
             elif len(active_objective_datas) == 1:
                 solver.set_objective(active_objective_datas[0])
+        else:
+            # if only the objective changed, there is minimal work to do.
+            _preprocess(scenario_instance,
+                        objective=True,
+                        constraints=False)
 
     if (instance_variables_fixed or instance_variables_freed) and \
-       (preprocess_fixed_variables):
+       (preprocess_fixed_variables) and \
+       (not persistent_solver_in_use):
 
         _preprocess(scenario_instance)
 
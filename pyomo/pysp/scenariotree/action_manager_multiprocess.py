@@ -0,0 +1,332 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+__all__ = ("ScenarioTreeActionManagerMultiprocess",
+           "ScenarioTreeServerMultiprocess")
+
+import sys
+import time
+import logging
+import threading
+import traceback
+import multiprocessing
+try:
+    import cPickle as pickle
+except:                                           #pragma:nocover
+    import pickle
+try:
+    from multiprocessing.connection import wait as _wait_for_connections
+except ImportError:                               #pragma:nocover
+    _wait_for_connections = None
+
+from pyutilib.pyro import TaskProcessingError
+from pyomo.opt.parallel.manager import ActionStatus
+from pyomo.opt.parallel.pyro import PyroAsynchronousActionManager
+from pyomo.pysp.scenariotree.server_pyro import _ScenarioTreeServerImpl
+
+from six.moves import queue
+
+logger = logging.getLogger('pyomo.pysp')
+
+#
+# A scenario tree server that lives in a process spawned by the
+# ScenarioTreeActionManagerMultiprocess. It receives the same task
+# data as the Pyro-based scenario tree server (through a pipe instead
+# of a dispatcher), so all registered worker types can be used.
+#
+
+class ScenarioTreeServerMultiprocess(_ScenarioTreeServerImpl):
+
+    def __init__(self, name, verbose=False):
+        self.WORKERNAME = name
+        self._verbose = verbose
+        self._worker_shutdown = False
+        self._init_server()
+
+    def process(self, data):
+        try:
+            return pickle.dumps(self._process(pickle.loads(data)))
+        except:
+            logger.error(
+                "Scenario tree server %s caught an exception of type "
+                "%s while processing a task."
+                % (self.WORKERNAME, sys.exc_info()[0].__name__))
+            traceback.print_exception(*sys.exc_info())
+            return pickle.dumps(TaskProcessingError(traceback.format_exc()))
+
+def _read_tasks(task_conn, tasks):
+    # Tasks are moved from the pipe to a local queue as soon as they
+    # arrive. Otherwise, a client transmitting many (or large) tasks
+    # could block on a full pipe while this process blocks sending a
+    # result that the client is not yet reading.
+    while True:
+        try:
+            task = task_conn.recv()
+        except (EOFError, IOError, OSError):
+            task = None
+        tasks.put(task)
+        if task is None:
+            break
+
+def _server_main(task_conn, result_conn, name, worker_modules, verbose):
+    import pyomo.environ
+    # Worker types are registered when the module that defines them
+    # is imported. This is only required when the process was not
+    # created by forking the client process.
+    for module_name in worker_modules:
+        if module_name not in sys.modules:
+            try:
+                __import__(module_name)
+            except ImportError:
+                logger.warning(
+                    "Scenario tree server %s failed to import module %s "
+                    "defining a registered worker type"
+                    % (name, module_name))
+
+    server = ScenarioTreeServerMultiprocess(name, verbose=verbose)
+    tasks = queue.Queue()
+    reader = threading.Thread(target=_read_tasks, args=(task_conn, tasks))
+    reader.daemon = True
+    reader.start()
+    while not server._worker_shutdown:
+        task = tasks.get()
+        if task is None:
+            break
+        task_id, generate_response, data = task
+        result = server.process(data)
+        if generate_response:
+            result_conn.send((task_id, result))
+    server.reset()
+    result_conn.close()
+
+#
+# A specialized asynchronous action manager that executes the
+# scenario tree server protocol on local processes that it spawns
+# (rather than on scenario tree servers acquired through Pyro)
+#
+
+class ScenarioTreeActionManagerMultiprocess(PyroAsynchronousActionManager):
+
+    def __init__(self, *args, **kwds):
+        super(ScenarioTreeActionManagerMultiprocess, self).__init__(*args,
+                                                                    **kwds)
+        # the names of the ScenarioTreeServerMultiprocess processes
+        # associated with this manager
+        self.server_pool = []
+        self._processes = {}
+        self._task_conns = {}
+        self._result_conns = {}
+        # the number of tasks sent to the servers for which a
+        # response has not been received
+        self._outstanding_task_counter = 0
+        # tells the action manager to ignore task errors
+        # (it will still report them, just take no action)
+        self.ignore_task_errors = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the manager."""
+        if len(self.server_pool):
+            self.release_servers()
+        super(ScenarioTreeActionManagerMultiprocess, self).close()
+
+    def acquire_servers(self, servers_requested, timeout=None):
+        """Spawn the requested number of scenario tree server
+        processes. The timeout argument is ignored."""
+
+        if self._verbose:
+            print("Starting %s scenario tree server processes"
+                  % (servers_requested))
+
+        assert len(self.server_pool) == 0
+        worker_modules = sorted(set(
+            worker_type.__module__ for worker_type in
+            _ScenarioTreeServerImpl._registered_workers.values()))
+        for i in range(servers_requested):
+            server_name = "ScenarioTreeServerMultiprocess_%d" % (i+1)
+            task_recv, task_send = multiprocessing.Pipe(False)
+            result_recv, result_send = multiprocessing.Pipe(False)
+            process = multiprocessing.Process(
+                target=_server_main,
+                name=server_name,
+                args=(task_recv, result_send, server_name,
+                      worker_modules, self._verbose > 1))
+            process.daemon = True
+            process.start()
+            # close the ends of the pipes owned by the server
+            task_recv.close()
+            result_send.close()
+            self._processes[server_name] = process
+            self._task_conns[server_name] = task_send
+            self._result_conns[server_name] = result_recv
+            self.server_pool.append(server_name)
+
+    def release_servers(self):
+
+        if self._verbose:
+            print("Stopping scenario tree server processes")
+
+        for server_name in self.server_pool:
+            try:
+                self._task_conns[server_name].send(None)
+            except (IOError, OSError):
+                # the server has already shut down
+                pass
+        for server_name in self.server_pool:
+            process = self._processes[server_name]
+            process.join(10)
+            if process.is_alive():
+                logger.warning("Terminating scenario tree server process %s"
+                               % (server_name))
+                process.terminate()
+                process.join()
+            self._task_conns[server_name].close()
+            self._result_conns[server_name].close()
+
+        self.server_pool = []
+        self._processes = {}
+        self._task_conns = {}
+        self._result_conns = {}
+        self._outstanding_task_counter = 0
+
+    def unpause(self):
+        self._paused = False
+        for server_name, tasks in self._paused_task_dict.items():
+            conn = self._task_conns[server_name]
+            for task in tasks:
+                conn.send(task)
+                if task[1]:
+                    self._outstanding_task_counter += 1
+        self._paused_task_dict = {}
+
+    #
+    # Perform the queue operation. This method returns the
+    # ActionHandle, and the ActionHandle status indicates whether
+    # the queue was successful.
+    #
+    def _perform_queue(self,
+                       ah,
+                       *args,
+                       **kwds):
+
+        queue_name = kwds.pop('queue_name', None)
+        generate_response = kwds.pop('generate_response', True)
+        try:
+            task = (ah.id,
+                    generate_response,
+                    self._get_task_data(ah, *args, **kwds))
+
+            if self._paused:
+                if queue_name not in self._paused_task_dict:
+                    self._paused_task_dict[queue_name] = []
+                self._paused_task_dict[queue_name].append(task)
+            else:
+                self._task_conns[queue_name].send(task)
+                if generate_response:
+                    self._outstanding_task_counter += 1
+        except:
+            # the task was not queued, so no result will be received
+            # for it (otherwise wait_all would block forever)
+            self.queued_action_counter -= 1
+            self.event_handle.pop(ah.id, None)
+            raise
+
+        # only populate the action_handle-to-task dictionary is a
+        # response is expected.
+        if not generate_response:
+            ah.status = ActionStatus.done
+            self.event_handle[ah.id].update(ah)
+            self.queued_action_counter -= 1
+
+        return ah
+
+    #
+    # Abstract Methods
+    #
+
+    def _get_dispatcher_name(self, queue_name):
+        return queue_name
+
+    def _get_task_data(self, ah, **kwds):
+        # The task data is pickled here (and unpickled on the server)
+        # for the same reasons as with the Pyro-based action manager:
+        # in particular, errors raised while unpickling are reported
+        # as task processing errors by the server.
+        return pickle.dumps(kwds)
+
+    def _download_results(self):
+
+        if self._outstanding_task_counter == 0:
+            # there is nothing to wait for (the connections would
+            # never become ready)
+            if self._paused and len(self._paused_task_dict):
+                raise RuntimeError(
+                    "The %s is paused: no tasks have been sent to the "
+                    "scenario tree servers. Call unpause() before "
+                    "waiting for results." % (type(self).__name__))
+            raise RuntimeError(
+                "The %s is waiting for results, but no tasks are "
+                "outstanding on the scenario tree servers"
+                % (type(self).__name__))
+
+        conns = list(self._result_conns.items())
+        if _wait_for_connections is not None:
+            ready = set(_wait_for_connections(
+                [conn for _, conn in conns]))
+        else:                                     #pragma:nocover
+            ready = set(conn for _, conn in conns if conn.poll())
+            if len(ready) == 0:
+                time.sleep(0.01)
+
+        for server_name, conn in conns:
+            if conn not in ready:
+                continue
+            try:
+                task_id, result = conn.recv()
+            except (EOFError, IOError, OSError):
+                raise RuntimeError(
+                    "Scenario tree server process %s terminated "
+                    "unexpectedly (exit code: %s)"
+                    % (server_name, self._processes[server_name].exitcode))
+            self._outstanding_task_counter -= 1
+            self.queued_action_counter -= 1
+            result = pickle.loads(result)
+
+            ah = self.event_handle.get(task_id, None)
+            if ah is None:
+                # if we are here, this is really bad news!
+                raise RuntimeError(
+                    "The %s found results for task with id=%s"
+                    " - but no corresponding action handle "
+                    "could be located! Showing task result "
+                    "below:\n%s" % (type(self).__name__,
+                                    task_id,
+                                    result))
+            if type(result) is TaskProcessingError:
+                ah.status = ActionStatus.error
+                self.event_handle[ah.id].update(ah)
+                msg = ("ScenarioTreeServer reported a processing "
+                       "error for task with id=%s. Reason: \n%s"
+                       % (task_id, result.args[0]))
+                if not self.ignore_task_errors:
+                    raise RuntimeError(msg)
+                elif self.ignore_task_errors == 1:
+                    logger.warning(msg)
+                # any value other than 0 or 1 will
+                # silently ignore task errors
+            else:
+                ah.status = ActionStatus.done
+                self.event_handle[ah.id].update(ah)
+                self.results[ah.id] = result
@@ -24,6 +24,7 @@ from pyutilib.misc import (ArchiveReaderFactory,
 
 from pyomo.dataportal import DataPortal
 from pyomo.core import (Block,
+                        Param,
                         IPyomoScriptModifyInstance,
                         AbstractModel)
 from pyomo.core.base.block import _BlockData
@@ -323,6 +324,8 @@ class ScenarioTreeInstanceFactory(object):
         self._scenario_tree_model = None
         self._scenario_tree = None
         self._data_directory = None
+        self._template_instance = None
+        self._template_data = None
         try:
             self._init(model, scenario_tree, data)
         except:
@@ -528,6 +531,8 @@ class ScenarioTreeInstanceFactory(object):
                 shutil.rmtree(tmpdir, True)
             archive.close()
         self._archives = []
+        self._template_instance = None
+        self._template_data = None
         self._closed = True
 
     #
@@ -565,7 +570,25 @@ class ScenarioTreeInstanceFactory(object):
                                     profile_memory=False,
                                     output_instance_construction_time=False,
                                     compile_instance=False,
+                                    clone_template_instance=False,
                                     verbose=False):
+        """Construct the instance for a scenario.
+
+        If clone_template_instance is True and the instance is
+        constructed from an abstract reference model and scenario
+        (or node) data files, the first instance constructed by
+        this factory is kept as a template, and the instances of
+        the other scenarios are clones of the template in which
+        the values of the mutable Params that differ in the
+        scenario data are updated. Instances whose data differ
+        from the template data in anything else (Sets, immutable
+        Params, the indices given for a Param, default values)
+        are constructed from the reference model. Do not use this
+        option if the value of a mutable Param is used when the
+        model is constructed (e.g., in a rule for a Set, for
+        another Param, or one deciding which constraints exist),
+        as this is not repeated for the clones.
+        """
         assert not self._closed
         if not scenario_tree.contains_scenario(scenario_name):
             raise ValueError("ScenarioTree does not contain scenario "
@@ -656,7 +679,22 @@ class ScenarioTreeInstanceFactory(object):
                     if verbose:
                         print("Data for scenario=%s loads from file=%s"
                               % (scenario_name, scenario_data_filename))
-                    if data is None:
+                    if clone_template_instance:
+                        if data is None:
+                            scenario_data = DataPortal(
+                                model=self._model_object,
+                                filename=scenario_data_filename)
+                        else:
+                            scenario_data = DataPortal(
+                                model=self._model_object,
+                                data_dict=data)
+                        scenario_instance = \
+                            self._construct_instance_from_template(
+                                scenario_data,
+                                profile_memory=profile_memory,
+                                output_instance_construction_time=\
+                                    output_instance_construction_time)
+                    elif data is None:
                         scenario_instance = \
                             self._model_object.create_instance(
                                 filename=scenario_data_filename,
@@ -691,10 +729,19 @@ class ScenarioTreeInstanceFactory(object):
                                   % (scenario_name, data_file))
                         scenario_data.load(filename=data_file)
 
-                    scenario_instance = self._model_object.create_instance(
-                        scenario_data,
-                        profile_memory=profile_memory,
-                        report_timing=output_instance_construction_time)
+                    if clone_template_instance:
+                        scenario_instance = \
+                            self._construct_instance_from_template(
+                                scenario_data,
+                                profile_memory=profile_memory,
+                                output_instance_construction_time=\
+                                    output_instance_construction_time)
+                    else:
+                        scenario_instance = \
+                            self._model_object.create_instance(
+                                scenario_data,
+                                profile_memory=profile_memory,
+                                report_timing=output_instance_construction_time)
             else:
                 raise RuntimeError("Unable to construct scenario instance. "
                                    "Neither a reference model or callback "
@@ -732,12 +779,74 @@ class ScenarioTreeInstanceFactory(object):
 
         return scenario_instance
 
+    #
+    # Returns the (name, values) pairs for the mutable Params
+    # whose data differ from the template data, or None if the data
+    # differ in any other way.
+    #
+    def _template_param_updates(self, scenario_data):
+        template_data = self._template_data
+        if (sorted(template_data._data, key=str) != \
+            sorted(scenario_data._data, key=str)) or \
+           (template_data._default != scenario_data._default):
+            return None
+        updates = []
+        for namespace in template_data._data:
+            if namespace is not None:
+                # only the default namespace is used to
+                # construct the instances
+                continue
+            template_values = template_data._data[namespace]
+            scenario_values = scenario_data._data[namespace]
+            for name in set(template_values).union(scenario_values):
+                values = scenario_values.get(name, None)
+                if values == template_values.get(name, None):
+                    continue
+                component = self._template_instance.component(name)
+                if (values is None) or \
+                   (name not in template_values) or \
+                   (component is None) or \
+                   (component.type() is not Param) or \
+                   (not component._mutable) or \
+                   (set(values) != set(template_values[name])):
+                    return None
+                updates.append((name, values))
+        return updates
+
+    def _construct_instance_from_template(
+            self,
+            scenario_data,
+            profile_memory=False,
+            output_instance_construction_time=False):
+        if self._template_instance is None:
+            self._template_instance = self._model_object.create_instance(
+                scenario_data,
+                profile_memory=profile_memory,
+                report_timing=output_instance_construction_time)
+            self._template_data = scenario_data
+            return self._template_instance.clone()
+        updates = self._template_param_updates(scenario_data)
+        if updates is None:
+            logger.debug("The scenario data differ from the template "
+                         "data in other components than mutable "
+                         "Params; constructing the scenario instance "
+                         "from the reference model")
+            return self._model_object.create_instance(
+                scenario_data,
+                profile_memory=profile_memory,
+                report_timing=output_instance_construction_time)
+        scenario_instance = self._template_instance.clone()
+        for name, values in updates:
+            scenario_instance.component(name).store_values(values)
+        return scenario_instance
+
     def construct_instances_for_scenario_tree(
             self,
             scenario_tree,
             profile_memory=False,
             output_instance_construction_time=False,
             compile_scenario_instances=False,
+            clone_template_instance=False,
             verbose=False):
         assert not self._closed
 
@@ -769,6 +878,7 @@ class ScenarioTreeInstanceFactory(object):
                         profile_memory=profile_memory,
                         output_instance_construction_time=output_instance_construction_time,
                         compile_instance=compile_scenario_instances,
+                        clone_template_instance=clone_template_instance,
                         verbose=verbose)
 
             scenario_instances[scenario._name] = scenario_instance
@@ -11,10 +11,12 @@
 __all__ = ("InvocationType",
            "ScenarioTreeManagerClientSerial",
            "ScenarioTreeManagerClientPyro",
+           "ScenarioTreeManagerClientMultiprocess",
            "ScenarioTreeManagerFactory")
 
 import math
 import sys
+import multiprocessing
 import time
 import itertools
 import inspect
@@ -46,6 +48,8 @@ from pyomo.pysp.scenariotree.instance_factory import \
     ScenarioTreeInstanceFactory
 from pyomo.pysp.scenariotree.action_manager_pyro \
     import ScenarioTreeActionManagerPyro
+from pyomo.pysp.scenariotree.action_manager_multiprocess \
+    import ScenarioTreeActionManagerMultiprocess
 from pyomo.pysp.scenariotree.server_pyro \
     import ScenarioTreeServerPyro
 from pyomo.pysp.ef import create_ef_instance
@@ -2114,6 +2118,8 @@ class ScenarioTreeManagerClientSerial(_ScenarioTreeManagerWorker,
                                    "output_instance_construction_time")
         safe_declare_common_option(options,
                                    "compile_scenario_instances")
+        safe_declare_common_option(options,
+                                   "clone_template_instance")
 
         return options
 
@@ -2169,6 +2175,8 @@ class ScenarioTreeManagerClientSerial(_ScenarioTreeManagerWorker,
                 profile_memory=self._options.profile_memory,
                 compile_scenario_instances=\
                     self._options.compile_scenario_instances,
+                clone_template_instance=\
+                    self._options.clone_template_instance,
                 verbose=self._options.verbose)
 
         if self._options.output_times or \
@@ -2622,6 +2630,12 @@ class _ScenarioTreeManagerClientPyroAdvanced(ScenarioTreeManagerClient,
     def _invoke_method_impl(self, *args, **kwds):
         raise NotImplementedError                  #pragma:nocover
 
+    def _create_action_manager(self):
+        return ScenarioTreeActionManagerPyro(
+            verbose=self._options.verbose,
+            host=self._options.pyro_host,
+            port=self._options.pyro_port)
+
     #
     # Extended interface for Pyro
     #
@@ -2631,10 +2645,7 @@ class _ScenarioTreeManagerClientPyroAdvanced(ScenarioTreeManagerClient,
         action manager."""
 
         assert self._action_manager is None
-        self._action_manager = ScenarioTreeActionManagerPyro(
-            verbose=self._options.verbose,
-            host=self._options.pyro_host,
-            port=self._options.pyro_port)
+        self._action_manager = self._create_action_manager()
         self._action_manager.acquire_servers(num_servers, timeout=timeout)
 
         scenario_instance_factory = \
@@ -3227,21 +3238,10 @@ class ScenarioTreeManagerClientPyro(_ScenarioTreeManagerClientPyroAdvanced,
     #
 
     # Override the implementation on _ScenarioTreeManagerClientPyroAdvanced
-    def _init_client(self):
-        assert self._scenario_tree is not None
-        if self._scenario_tree.contains_bundles():
-            for bundle in self._scenario_tree._scenario_bundles:
-                self._init_bundle(bundle.name, bundle._scenario_names)
-            num_jobs = len(self._scenario_tree._scenario_bundles)
-            if self._options.verbose:
-                print("Bundle jobs available: %s"
-                      % (str(num_jobs)))
-        else:
-            num_jobs = len(self._scenario_tree._scenarios)
-            if self._options.verbose:
-                print("Scenario jobs available: %s"
-                      % (str(num_jobs)))
-
+    def _num_scenariotreeservers_to_acquire(self, num_jobs):
+        """Return the number of scenario tree servers to acquire for
+        the given number of jobs and the timeout to use when acquiring
+        them."""
         servers_required = self._options.pyro_required_scenariotreeservers
         if servers_required == 0:
             servers_required = num_jobs
@@ -3266,6 +3266,25 @@ class ScenarioTreeManagerClientPyro(_ScenarioTreeManagerClientPyroAdvanced,
                 print("Waiting to acquire exactly %s servers to distribute "
                       "work over %s jobs" % (servers_required, num_jobs))
 
+        return servers_required, timeout
+
+    def _init_client(self):
+        assert self._scenario_tree is not None
+        if self._scenario_tree.contains_bundles():
+            for bundle in self._scenario_tree._scenario_bundles:
+                self._init_bundle(bundle.name, bundle._scenario_names)
+            num_jobs = len(self._scenario_tree._scenario_bundles)
+            if self._options.verbose:
+                print("Bundle jobs available: %s"
+                      % (str(num_jobs)))
+        else:
+            num_jobs = len(self._scenario_tree._scenarios)
+            if self._options.verbose:
+                print("Scenario jobs available: %s"
+                      % (str(num_jobs)))
+
+        servers_required, timeout = \
+            self._num_scenariotreeservers_to_acquire(num_jobs)
         self.acquire_scenariotreeservers(servers_required, timeout=timeout)
 
         if self._options.verbose:
@@ -3820,6 +3839,59 @@ class ScenarioTreeManagerClientPyro(_ScenarioTreeManagerClientPyroAdvanced,
         return self.get_server_for_worker(
             self.get_worker_for_bundle(bundle_name))
 
+#
+# This class replaces the Pyro-based scenario tree servers used by
+# ScenarioTreeManagerClientPyro with scenario tree server processes
+# spawned on the local machine, which communicate with the client
+# through pipes. No Pyro name server, dispatcher, or scenariotreeserver
+# processes need to be launched.
+#
+
+class ScenarioTreeManagerClientMultiprocess(ScenarioTreeManagerClientPyro,
+                                            PySPConfiguredObject):
+
+    @classmethod
+    def _declare_options(cls, options=None):
+        if options is None:
+            options = PySPConfigBlock()
+
+        safe_declare_common_option(options,
+                                   "multiprocess_workers")
+
+        return options
+
+    def _create_action_manager(self):
+        return ScenarioTreeActionManagerMultiprocess(
+            verbose=self._options.verbose)
+
+    def _num_scenariotreeservers_to_acquire(self, num_jobs):
+        servers_required = self._options.multiprocess_workers
+        if servers_required == 0:
+            try:
+                servers_required = min(num_jobs, multiprocessing.cpu_count())
+            except NotImplementedError:               #pragma:nocover
+                servers_required = num_jobs
+        elif servers_required > num_jobs:
+            print("Value assigned to multiprocess_workers option (%s) "
+                  "is greater than the number of available jobs (%s). "
+                  "Limiting the number of processes to start to %s"
+                  % (servers_required, num_jobs, num_jobs))
+            servers_required = num_jobs
+
+        if self._options.verbose:
+            print("Starting %s scenario tree server processes to distribute "
+                  "work over %s jobs" % (servers_required, num_jobs))
+
+        return servers_required, None
+
+    def _close_impl(self):
+        # there are no Pyro components to shut down
+        if self._action_manager is not None:
+            if self._error_shutdown:
+                self.release_scenariotreeservers(ignore_errors=2)
+            else:
+                self.release_scenariotreeservers()
+
 def ScenarioTreeManagerFactory(options, *args, **kwds):
     type_ = options.scenario_tree_manager
     try:
@@ -3839,6 +3911,8 @@ ScenarioTreeManagerFactory.registered_types['serial'] = \
     ScenarioTreeManagerClientSerial
 ScenarioTreeManagerFactory.registered_types['pyro'] = \
     ScenarioTreeManagerClientPyro
+ScenarioTreeManagerFactory.registered_types['multiprocess'] = \
+    ScenarioTreeManagerClientMultiprocess
 
 def _register_scenario_tree_manager_options(*args, **kwds):
     if len(args) == 0:
@@ -3860,6 +3934,8 @@ def _register_scenario_tree_manager_options(*args, **kwds):
                                                      **kwds)
     ScenarioTreeManagerClientPyro.register_options(options,
                                                    **kwds)
+    ScenarioTreeManagerClientMultiprocess.register_options(options,
+                                                           **kwds)
 
     return options
 
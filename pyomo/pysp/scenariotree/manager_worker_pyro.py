@@ -54,6 +54,8 @@ class ScenarioTreeManagerWorkerPyro(_ScenarioTreeManagerWorker,
                                    "output_instance_construction_time")
         safe_declare_common_option(options,
                                    "compile_scenario_instances")
+        safe_declare_common_option(options,
+                                   "clone_template_instance")
 
         #
         # various
@@ -204,7 +206,8 @@ class ScenarioTreeManagerWorkerPyro(_ScenarioTreeManagerWorker,
                 output_instance_construction_time=\
                    self.get_option("output_instance_construction_time"),
                 profile_memory=self.get_option("profile_memory"),
-                compile_scenario_instances=self.get_option("compile_scenario_instances"))
+                compile_scenario_instances=self.get_option("compile_scenario_instances"),
+                clone_template_instance=self.get_option("clone_template_instance"))
 
         # with the scenario instances now available, have the scenario
         # tree compute the variable match indices at each node.
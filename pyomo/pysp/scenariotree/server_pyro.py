@@ -65,7 +65,15 @@ from six import iteritems
 
 logger = logging.getLogger('pyomo.pysp')
 
-class ScenarioTreeServerPyro(TaskWorker):
+#
+# The scenario tree server implementation that is shared by the
+# Pyro-based server and the local multiprocess server (see
+# action_manager_multiprocess.py). Subclasses are responsible for
+# setting the WORKERNAME and _verbose attributes and for calling
+# _init_server.
+#
+
+class _ScenarioTreeServerImpl(object):
 
     # Maps name to a registered worker class to instantiate
     _registered_workers = {}
@@ -75,28 +83,11 @@ class ScenarioTreeServerPyro(TaskWorker):
         if name in cls._registered_workers:
             return cls._registered_workers[name]
         raise KeyError("No worker type has been registered under the name "
-                       "'%s' for ScenarioTreeServerPyro" % (name))
-
-    def __init__(self, *args, **kwds):
-
-        mpi = kwds.pop('mpi', None)
-        # add for purposes of diagnostic output.
-        kwds["name"] = ("ScenarioTreeServerPyro_%d@%s"
-                        % (os.getpid(), socket.gethostname()))
-        if mpi is not None:
-            assert len(mpi) == 2
-            kwds["name"] += "_MPIRank_"+str(mpi[1].rank)
-        kwds["caller_name"] = kwds["name"]
-        self._modules_imported = kwds.pop('modules_imported', {})
-
-        TaskWorker.__init__(self, **kwds)
-        assert hasattr(self, "_bulk_task_collection")
-        self._bulk_task_collection = True
-        self._contiguous_task_processing = False
+                       "'%s' for %s" % (name, cls.__name__))
 
-        self.type = self.WORKERNAME
-        self.block = True
-        self.timeout = None
+    def _init_server(self, modules_imported=None, mpi=None):
+        self._modules_imported = \
+            modules_imported if modules_imported is not None else {}
         self._worker_map = {}
         self._init_verbose = self._verbose
 
@@ -140,31 +131,6 @@ class ScenarioTreeServerPyro(TaskWorker):
         self._worker_map[name].close()
         del self._worker_map[name]
 
-    def process(self, data):
-        self._worker_task_return_queue = self._current_task_client
-        try:
-            # The only reason we are go through this much
-            # effort to deal with the serpent serializer
-            # is because it is the default in Pyro4.
-            if using_pyro4 and \
-               (Pyro4.config.SERIALIZER == 'serpent'):
-                if six.PY3:
-                    assert type(data) is dict
-                    assert data['encoding'] == 'base64'
-                    data = base64.b64decode(data['data'])
-                else:
-                    assert type(data) is unicode
-                    data = str(data)
-            return pickle.dumps(self._process(pickle.loads(data)))
-        except:
-            logger.error(
-                "Scenario tree server %s caught an exception of type "
-                "%s while processing a task. Going idle."
-                % (self.WORKERNAME, sys.exc_info()[0].__name__))
-            traceback.print_exception(*sys.exc_info())
-            self._worker_error = True
-            return pickle.dumps(TaskProcessingError(traceback.format_exc()))
-
     def _process(self, data):
         data = pyutilib.misc.Bunch(**data)
         result = None
@@ -289,6 +255,55 @@ class ScenarioTreeServerPyro(TaskWorker):
 
         return result
 
+class ScenarioTreeServerPyro(TaskWorker, _ScenarioTreeServerImpl):
+
+    def __init__(self, *args, **kwds):
+
+        mpi = kwds.pop('mpi', None)
+        # add for purposes of diagnostic output.
+        kwds["name"] = ("ScenarioTreeServerPyro_%d@%s"
+                        % (os.getpid(), socket.gethostname()))
+        if mpi is not None:
+            assert len(mpi) == 2
+            kwds["name"] += "_MPIRank_"+str(mpi[1].rank)
+        kwds["caller_name"] = kwds["name"]
+        modules_imported = kwds.pop('modules_imported', {})
+
+        TaskWorker.__init__(self, **kwds)
+        assert hasattr(self, "_bulk_task_collection")
+        self._bulk_task_collection = True
+        self._contiguous_task_processing = False
+
+        self.type = self.WORKERNAME
+        self.block = True
+        self.timeout = None
+        self._init_server(modules_imported=modules_imported, mpi=mpi)
+
+    def process(self, data):
+        self._worker_task_return_queue = self._current_task_client
+        try:
+            # The only reason we are go through this much
+            # effort to deal with the serpent serializer
+            # is because it is the default in Pyro4.
+            if using_pyro4 and \
+               (Pyro4.config.SERIALIZER == 'serpent'):
+                if six.PY3:
+                    assert type(data) is dict
+                    assert data['encoding'] == 'base64'
+                    data = base64.b64decode(data['data'])
+                else:
+                    assert type(data) is unicode
+                    data = str(data)
+            return pickle.dumps(self._process(pickle.loads(data)))
+        except:
+            logger.error(
+                "Scenario tree server %s caught an exception of type "
+                "%s while processing a task. Going idle."
+                % (self.WORKERNAME, sys.exc_info()[0].__name__))
+            traceback.print_exception(*sys.exc_info())
+            self._worker_error = True
+            return pickle.dumps(TaskProcessingError(traceback.format_exc()))
+
 def RegisterWorker(name, class_type):
     if name in ScenarioTreeServerPyro._registered_workers:
         raise ValueError("The name %s is already registered "
@@ -36,6 +36,9 @@ from pyomo.core.base.block import (_BlockData,
 from pyomo.core.base.sos import _SOSConstraintData
 from pyomo.repn import generate_standard_repn
 from pyomo.pysp.phutils import (BasicSymbolMap,
+                                numpy_available,
+                                values_array,
+                                update_from_array,
                                 indexToString,
                                 isVariableNameIndexed,
                                 extractVariableNameAndIndex,
@@ -46,6 +49,9 @@ import six
 from six import iterkeys, iteritems, itervalues
 from six.moves import xrange
 
+if numpy_available:
+    import numpy
+
 logger = logging.getLogger('pyomo.pysp')
 
 class _CUIDLabeler(object):
@@ -213,6 +219,10 @@ class ScenarioTreeNode(object):
     #
     def updateNodeStatistics(self):
 
+        if numpy_available:
+            self._updateNodeStatistics_numpy()
+            return
+
         scenario_solutions = \
             [(scenario._probability, scenario._x[self._name]) \
              for scenario in self._scenarios]
@@ -241,6 +251,36 @@ class ScenarioTreeNode(object):
                 self._maximums[variable_id] = max(values)
                 self._averages[variable_id] = avg_value
 
+    #
+    # A vectorized implementation of updateNodeStatistics. The values
+    # are processed one scenario at a time (a vector over the
+    # variables at this node) so that the averages are accumulated in
+    # the same order as in the loop above.
+    #
+    def _updateNodeStatistics_numpy(self):
+
+        variable_ids = list(self._variable_ids)
+        stale = numpy.zeros(len(variable_ids), dtype=bool)
+        avg_values = numpy.zeros(len(variable_ids))
+        min_values = max_values = None
+        for scenario in self._scenarios:
+            values = values_array(scenario._x[self._name], variable_ids)
+            stale |= numpy.isnan(values)
+            avg_values += scenario._probability * values
+            if min_values is None:
+                min_values = max_values = values
+            else:
+                min_values = numpy.minimum(min_values, values)
+                max_values = numpy.maximum(max_values, values)
+        avg_values /= self._probability
+
+        for statistics, statistic_values in ((self._minimums, min_values),
+                                             (self._maximums, max_values),
+                                             (self._averages, avg_values)):
+            update_from_array(statistics, variable_ids, statistic_values)
+            statistics.update((variable_ids[i], None)
+                              for i in numpy.flatnonzero(stale).tolist())
+
     #
     # given a set of scenario instances, compute the set of indices
     # for non-anticipative variables at this node, as defined by the
@@ -803,7 +843,11 @@ class ScenarioTreeNode(object):
         # scenario for each node and update once
         xbar_parameter_name = "PHXBAR_"+str(self._name)
         xbar_parameter = arbitrary_instance.find_component(xbar_parameter_name)
-        xbar_parameter.store_values(self._xbars)
+        # The PH parameters are indexed by the standard variable ids
+        # at this node (the keys of the _xbars, _w, and _rho
+        # dictionaries), so the per-index checks can safely be
+        # skipped
+        xbar_parameter.store_values(self._xbars, check=False)
 
     def push_fix_queue_to_instances(self):
         have_instances = (self._scenarios[0]._instance != None)
@@ -1048,20 +1092,17 @@ class Scenario(object):
 
         for tree_node in self._node_list:
             if (stages is None) or (tree_node.stage.name in stages):
-                # Some of these might be Expression objects so we use the
-                # __call__ method rather than directly accessing .value
-                # (since we want a number)
-                self._x[tree_node.name].update(
-                    (variable_id,
-                     scenariotree_sm_bySymbol[variable_id](exception=False)) \
-                    for variable_id in tree_node._variable_ids)
-
+                scenario_x = self._x[tree_node.name]
                 scenario_fixed = self._fixed[tree_node.name]
                 scenario_stale = self._stale[tree_node.name]
                 scenario_fixed.clear()
                 scenario_stale.clear()
                 for variable_id in tree_node._variable_ids:
                     vardata = scenariotree_sm_bySymbol[variable_id]
+                    # Some of these might be Expression objects so we
+                    # use the __call__ method rather than directly
+                    # accessing .value (since we want a number)
+                    scenario_x[variable_id] = vardata(exception=False)
                     if vardata.is_expression_type():
                         continue
                     if vardata.fixed:
@@ -1174,7 +1215,8 @@ class Scenario(object):
         for tree_node in self._node_list[:-1]:
             weight_parameter_name = "PHWEIGHT_"+str(tree_node._name)
             weight_parameter = self._instance.find_component(weight_parameter_name)
-            weight_parameter.store_values(self._w[tree_node._name])
+            weight_parameter.store_values(self._w[tree_node._name],
+                                          check=False)
 
     def push_rho_to_instance(self):
         assert self._instance != None
@@ -1182,7 +1224,8 @@ class Scenario(object):
         for tree_node in self._node_list[:-1]:
             rho_parameter_name = "PHRHO_"+str(tree_node._name)
             rho_parameter = self._instance.find_component(rho_parameter_name)
-            rho_parameter.store_values(self._rho[tree_node._name])
+            rho_parameter.store_values(self._rho[tree_node._name],
+                                       check=False)
 
     #
     # a utility to determine the stage to which the input variable belongs.
@@ -36,6 +36,7 @@ from pyomo.pysp.scenariotree.manager import (ScenarioTreeManager,
                                              _ScenarioTreeManagerWorker,
                                              ScenarioTreeManagerClientSerial,
                                              ScenarioTreeManagerClientPyro,
+                                             ScenarioTreeManagerClientMultiprocess,
                                              ScenarioTreeManagerFactory,
                                              InvocationType)
 from pyomo.pysp.scenariotree.manager_worker_pyro import \
@@ -258,7 +259,7 @@ class _ScenarioTreeManagerTesterBase(object):
                     async_call=async_call)
             manager.unpause_transmit()
             self.assertEqual(manager._transmission_paused, False)
-        if dill_available or \
+        if dill_available or not \
            isinstance(manager, ScenarioTreeManagerClientPyro):
             print("")
             print("Running InvocationType.Single... (using dill)")
@@ -670,7 +671,7 @@ class _ScenarioTreeManagerTesterBase(object):
                     oneway_call=True,
                     async_call=True)
 
-            if dill_available or \
+            if dill_available or not \
                isinstance(manager, ScenarioTreeManagerClientPyro):
                 print("")
                 print("Running InvocationType.Single... (using dill)")
@@ -1508,5 +1509,68 @@ class TestScenarioTreeManagerClientPyro_HandshakeAtStartup(
         _ScenarioTreeManagerClientPyroTesterBase._setup(self, options, servers=servers)
         options.pyro_handshake_at_startup = True
 
+@unittest.category('parallel')
+class TestScenarioTreeManagerClientMultiprocess(
+        unittest.TestCase,
+        _ScenarioTreeManagerClientPyroTesterBase):
+
+    cls = ScenarioTreeManagerClientMultiprocess
+
+    def setUp(self):
+        self.options = PySPConfigBlock()
+        ScenarioTreeManagerClientMultiprocess.register_options(
+            self.options,
+            registered_worker_name='ScenarioTreeManagerWorkerTest')
+
+    def _setup(self, options, servers=None):
+        _ScenarioTreeManagerTesterBase._setup(self, options)
+        if servers is not None:
+            options.multiprocess_workers = servers
+
+    def test_server_error(self):
+        self._setup(self.options)
+        with self.cls(self.options, **_init_kwds) as manager:
+            manager.initialize()
+            with self.assertRaisesRegexp(RuntimeError,
+                                         "reported a processing error"):
+                manager.invoke_method("not_a_method")
+            self.assertEqual(manager._action_manager.queued_action_counter, 0)
+            # the servers are still usable after a processing error
+            self.assertEqual(
+                sorted(manager.invoke_function(
+                    "_PerScenario",
+                    thisfile,
+                    invocation_type=InvocationType.PerScenario).items()),
+                [(s.name, s.name) for s in manager.scenario_tree.scenarios])
+
+    def test_queue_error(self):
+        self._setup(self.options)
+        with self.cls(self.options, **_init_kwds) as manager:
+            manager.initialize()
+            action_manager = manager._action_manager
+            num_handles = len(action_manager.event_handle)
+            # the task data can not be pickled
+            with self.assertRaises(Exception):
+                manager.invoke_function(
+                    "_PerScenarioChained",
+                    thisfile,
+                    function_args=(lambda x: x,),
+                    invocation_type=InvocationType.PerScenario)
+            manager.unpause_transmit()
+            self.assertEqual(action_manager.queued_action_counter, 0)
+            self.assertEqual(len(action_manager.event_handle), num_handles)
+            # waiting with nothing outstanding does not block
+            action_manager.wait_all()
+            with self.assertRaisesRegexp(RuntimeError,
+                                         "no tasks are outstanding"):
+                action_manager._download_results()
+            # the servers are still usable
+            self.assertEqual(
+                sorted(manager.invoke_function(
+                    "_PerScenario",
+                    thisfile,
+                    invocation_type=InvocationType.PerScenario).items()),
+                [(s.name, s.name) for s in manager.scenario_tree.scenarios])
+
 if __name__ == "__main__":
     unittest.main()
@@ -24,6 +24,7 @@ from pyomo.pysp.util.config import PySPConfigBlock
 from pyomo.pysp.scenariotree.manager import \
     (ScenarioTreeManagerClientSerial,
      ScenarioTreeManagerClientPyro,
+     ScenarioTreeManagerClientMultiprocess,
      InvocationType)
 from pyomo.pysp.scenariotree.instance_factory import \
     ScenarioTreeInstanceFactory
@@ -770,5 +771,29 @@ class TestScenarioTreeManagerSolverPyro(
         sp.initialize()
         return sp
 
+@unittest.skipIf(not has_networkx, "Networkx is not available")
+@unittest.skipIf(not has_dill, "Dill is not available")
+@unittest.category('parallel')
+class TestScenarioTreeManagerSolverMultiprocess(
+        unittest.TestCase,
+        _ScenarioTreeManagerSolverTesterBase):
+
+    @classmethod
+    def setUpClass(cls):
+        if not solver['glpk','lp']:
+            raise unittest.SkipTest(
+                "The glpk solver is not available")
+
+    @unittest.nottest
+    def _init(self, factory):
+        options = ScenarioTreeManagerClientMultiprocess.register_options()
+        options.multiprocess_workers = 3
+        options.pyro_handshake_at_startup = True
+        sp = ScenarioTreeManagerClientMultiprocess(
+            options,
+            factory=factory)
+        sp.initialize()
+        return sp
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,190 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+import os
+import sys
+from os.path import join, dirname, abspath
+
+import pyutilib.th as unittest
+
+from pyomo.pysp.scenariotree.instance_factory import \
+    ScenarioTreeInstanceFactory
+from pyomo.pysp.ef import create_ef_instance, write_ef
+from pyomo.pysp.ef_streaming import write_streaming_ef
+
+thisdir = dirname(abspath(__file__))
+pysp_examples_dir = \
+    join(dirname(dirname(dirname(dirname(thisdir)))), "examples", "pysp")
+farmer_model_dir = join(pysp_examples_dir, "farmer", "models")
+farmer_data_dir = join(pysp_examples_dir, "farmer", "scenariodata")
+
+def _safe_delete(filename):
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
+
+def _parse_lp(filename):
+    """Returns the objective terms, the rows (label -> lines) and the
+    bounds lines of an LP file"""
+    with open(filename) as f:
+        text = f.read()
+    objective, rest = text.split("s.t.\n")
+    constraints, bounds = rest.split("bounds\n")
+    rows = {}
+    for block in constraints.strip().split("\n\n"):
+        lines = block.strip().splitlines()
+        rows[lines[0]] = lines[1:]
+    return (set(line for line in objective.splitlines()[4:] if line),
+            rows,
+            set(bounds.splitlines()))
+
+class TestStreamingEF(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import pyomo.environ
+
+    def setUp(self):
+        if "ReferenceModel" in sys.modules:
+            del sys.modules["ReferenceModel"]
+        self.factory = ScenarioTreeInstanceFactory(farmer_model_dir,
+                                                   farmer_data_dir)
+        self.files = []
+
+    def tearDown(self):
+        self.factory.close()
+        for filename in self.files:
+            _safe_delete(filename)
+        if "ReferenceModel" in sys.modules:
+            del sys.modules["ReferenceModel"]
+
+    def _tempfile(self, name):
+        filename = join(thisdir, name)
+        self.files.append(filename)
+        return filename
+
+    def _write_ef(self, suffix):
+        scenario_tree = self.factory.generate_scenario_tree()
+        scenario_tree.linkInInstances(
+            self.factory.construct_instances_for_scenario_tree(
+                scenario_tree))
+        ef = create_ef_instance(scenario_tree)
+        filename = self._tempfile("ef_streaming_reference"+suffix)
+        write_ef(ef, filename, symbolic_solver_labels=True)
+        return filename
+
+    def test_lp(self):
+        filename = self._tempfile("ef_streaming.lp")
+        scenario_tree = self.factory.generate_scenario_tree()
+        write_streaming_ef(scenario_tree, self.factory, filename)
+        # the scenarios have not been linked to the instances
+        for scenario in scenario_tree.scenarios:
+            self.assertIs(scenario.instance, None)
+
+        obj, rows, bounds = _parse_lp(filename)
+        ef_obj, ef_rows, ef_bounds = _parse_lp(self._write_ef(".lp"))
+        self.assertEqual(obj, ef_obj)
+        self.assertEqual(
+            dict((k, v) for k, v in rows.items() if "MASTER" not in k),
+            dict((k, v) for k, v in ef_rows.items() if "MASTER" not in k))
+        self.assertEqual(
+            set(b for b in bounds if "MASTER" not in b),
+            set(b for b in ef_bounds if "MASTER" not in b))
+
+        # one nonanticipativity row per scenario and first-stage
+        # variable
+        master_rows = sorted(k for k in rows if "MASTER" in k)
+        self.assertEqual(len(master_rows), 9)
+        self.assertEqual(
+            len(master_rows),
+            len([k for k in ef_rows if "MASTER" in k]))
+        self.assertEqual(
+            rows["c_e_MASTER_BLEND_CONSTRAINT_RootNode("
+                 "AverageScenario_DevotedAcreage(CORN))_:"],
+            ["-1 AverageScenario_DevotedAcreage(CORN)",
+             "+1 MASTER_BLEND_VAR_RootNode(DevotedAcreage(CORN))",
+             "= 0"])
+        self.assertEqual(
+            sorted(b for b in bounds if "MASTER" in b),
+            ["    -inf <= MASTER_BLEND_VAR_RootNode(DevotedAcreage(%s)) "
+             "<= +inf" % (crop) for crop in ("CORN",
+                                            "SUGAR_BEETS",
+                                            "WHEAT")])
+
+    def test_mps(self):
+        filename = self._tempfile("ef_streaming.mps")
+        scenario_tree = self.factory.generate_scenario_tree()
+        write_streaming_ef(scenario_tree, self.factory, filename)
+        with open(filename) as f:
+            lines = f.read().splitlines()
+        with open(self._write_ef(".mps")) as f:
+            ef_lines = f.read().splitlines()
+        self.assertEqual(
+            sorted(line for line in lines if "MASTER_BLEND" not in line),
+            sorted(line for line in ef_lines if "MASTER_BLEND" not in line))
+
+        # the entries of each column are contiguous
+        columns = lines[lines.index("COLUMNS")+1:lines.index("RHS")]
+        column_names = [line.split()[0] for line in columns]
+        seen = set()
+        for i, name in enumerate(column_names):
+            if (i == 0) or (name != column_names[i-1]):
+                self.assertNotIn(name, seen)
+                seen.add(name)
+        self.assertEqual(
+            sorted(line.split()[1] for line in columns
+                   if line.split()[0] == \
+                   "MASTER_BLEND_VAR_RootNode(DevotedAcreage(WHEAT))"),
+            ["c_e_MASTER_BLEND_CONSTRAINT_RootNode("
+             "%s_DevotedAcreage(WHEAT))_" % (scenario)
+             for scenario in ("AboveAverageScenario",
+                              "AverageScenario",
+                              "BelowAverageScenario")])
+        self.assertIn(" FR BOUND MASTER_BLEND_VAR_RootNode"
+                      "(DevotedAcreage(SUGAR_BEETS))", lines)
+
+    def test_callback(self):
+        filename = self._tempfile("ef_streaming.lp")
+        scenario_tree = self.factory.generate_scenario_tree()
+        constructed = []
+        def construct_instance(scenario_name):
+            constructed.append(scenario_name)
+            return self.factory.construct_scenario_instance(scenario_name,
+                                                            scenario_tree)
+        write_streaming_ef(scenario_tree, construct_instance, filename,
+                           ef_instance_name="EF")
+        self.assertEqual(constructed,
+                         [s.name for s in scenario_tree.scenarios])
+        with open(filename) as f:
+            self.assertEqual(f.read().splitlines()[2:4], ["min ", "EF:"])
+
+    def test_errors(self):
+        scenario_tree = self.factory.generate_scenario_tree()
+        def construct_nonlinear_instance(scenario_name):
+            instance = self.factory.construct_scenario_instance(
+                scenario_name,
+                scenario_tree)
+            instance.Total_Cost_Objective.expr += \
+                instance.DevotedAcreage["CORN"]**2
+            return instance
+        filename = self._tempfile("ef_streaming.lp")
+        self.assertRaisesRegexp(
+            ValueError, "Only linear scenario models are supported",
+            write_streaming_ef, scenario_tree,
+            construct_nonlinear_instance, filename)
+        self.assertFalse(os.path.exists(filename))
+        self.assertRaisesRegexp(
+            RuntimeError, "Unknown file suffix=.nl",
+            write_streaming_ef, scenario_tree, self.factory,
+            self._tempfile("ef_streaming.nl"))
+
+if __name__ == "__main__":
+    unittest.main()
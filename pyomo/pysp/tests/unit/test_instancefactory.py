@@ -86,6 +86,15 @@ class Test(unittest.TestCase):
         self.assertEqual(instances["s1"].p(), 1)
         self.assertEqual(instances["s2"].p(), 2)
         self.assertEqual(instances["s3"].p(), 3)
+        instances = factory.construct_instances_for_scenario_tree(scenario_tree,
+                                                                  clone_template_instance=True,
+                                                                  verbose=True)
+        self.assertEqual(len(instances), 3)
+        self.assertEqual(instances["s1"].p(), 1)
+        self.assertEqual(instances["s2"].p(), 2)
+        self.assertEqual(instances["s3"].p(), 3)
+        self.assertEqual(instances["s2"].c.lower(), 2)
+        self.assertIsNot(instances["s1"].p, instances["s2"].p)
         self.assertEqual(factory.construct_scenario_instance("s1", scenario_tree, verbose=True).p(), 1)
         with self.assertRaises(ValueError):
             factory.construct_scenario_instance("s0", scenario_tree, verbose=True)
@@ -704,5 +713,37 @@ class Test(unittest.TestCase):
         self.assertEqual(len(factory._archives), 0)
         self.assertTrue("both_callbacks" in sys.modules)
 
+    def test_clone_template_instance(self):
+        import pyomo.environ
+        from pyomo.core import Param, value
+        farmer_dir = join(dirname(dirname(dirname(dirname(thisdir)))),
+                          "examples", "pysp", "farmer")
+        for data_dir in ("scenariodata", "nodedata"):
+            factory = ScenarioTreeInstanceFactory(
+                join(farmer_dir, "models"),
+                join(farmer_dir, data_dir))
+            scenario_tree = factory.generate_scenario_tree()
+            instances = factory.construct_instances_for_scenario_tree(
+                scenario_tree)
+            # the Yield parameter differs between the scenarios and
+            # is not mutable, so these instances are constructed
+            # from the reference model
+            template_instances = \
+                factory.construct_instances_for_scenario_tree(
+                    scenario_tree,
+                    clone_template_instance=True)
+            self.assertIsNot(factory._template_instance, None)
+            self.assertEqual(sorted(instances), sorted(template_instances))
+            for name in instances:
+                for param in instances[name].component_objects(Param):
+                    template_param = \
+                        template_instances[name].component(param.name)
+                    self.assertEqual(
+                        dict((k, value(v)) for k, v in param.items()),
+                        dict((k, value(v)) for k, v in template_param.items()))
+            factory.close()
+            self.assertIs(factory._template_instance, None)
+            del sys.modules["ReferenceModel"]
+
 if __name__ == "__main__":
     unittest.main()
@@ -13,6 +13,7 @@ from pyomo.pysp.scenariotree.tree_structure_model import \
     (ScenarioTreeModelFromNetworkX,
      CreateConcreteTwoStageScenarioTreeModel)
 from pyomo.pysp.scenariotree.tree_structure import ScenarioTree
+import pyomo.pysp.scenariotree.tree_structure as tree_structure
 from pyomo.core import (ConcreteModel,
                         Set,
                         Var,
@@ -357,6 +358,56 @@ class TestScenarioTree(unittest.TestCase):
                 self.assertEqual(
                     (name,index) in root._name_index_to_id, True)
 
+    def _check_node_statistics(self):
+        st_model = CreateConcreteTwoStageScenarioTreeModel(2)
+        st_model.ConditionalProbability['LeafNode_Scenario1'] = 0.25
+        st_model.ConditionalProbability['LeafNode_Scenario2'] = 0.75
+        st_model.StageVariables['Stage1'].add("x")
+        st_model.StageCost['Stage1'] = "FirstStageCost"
+        st_model.StageCost['Stage2'] = "SecondStageCost"
+        scenario_tree = ScenarioTree(scenariotreeinstance=st_model)
+
+        instances = {}
+        for name, values in (('Scenario1', {1: 1.0, 2: -2.0, 3: None}),
+                             ('Scenario2', {1: 3.0, 2: 2.0, 3: 1.0})):
+            model = ConcreteModel()
+            model.x = Var([1,2,3], initialize=values)
+            for vardata in model.x.values():
+                vardata.stale = False
+            model.FirstStageCost = Expression(expr=0.0)
+            model.SecondStageCost = Expression(expr=0.0)
+            model.obj = Objective(expr=0.0)
+            instances[name] = model
+        scenario_tree.linkInInstances(instances)
+        for scenario in scenario_tree.scenarios:
+            scenario.update_solution_from_instance()
+        scenario_tree.updateNodeStatistics()
+
+        root = scenario_tree.findRootNode()
+        x = dict((index, root._name_index_to_id[("x", index)])
+                 for index in (1,2,3))
+        self.assertEqual(root._minimums[x[1]], 1.0)
+        self.assertEqual(root._maximums[x[1]], 3.0)
+        self.assertEqual(root._averages[x[1]], 2.5)
+        self.assertEqual(root._minimums[x[2]], -2.0)
+        self.assertEqual(root._maximums[x[2]], 2.0)
+        self.assertEqual(root._averages[x[2]], 1.0)
+        # x[3] has no value in one of the scenarios
+        self.assertIs(root._minimums[x[3]], None)
+        self.assertIs(root._maximums[x[3]], None)
+        self.assertIs(root._averages[x[3]], None)
+
+    def test_node_statistics(self):
+        self._check_node_statistics()
+
+    def test_node_statistics_nonumpy(self):
+        numpy_available = tree_structure.numpy_available
+        tree_structure.numpy_available = False
+        try:
+            self._check_node_statistics()
+        finally:
+            tree_structure.numpy_available = numpy_available
+
 @unittest.skipIf(not has_networkx, "Requires networkx module")
 class TestScenarioTreeFromNetworkX(unittest.TestCase):
 
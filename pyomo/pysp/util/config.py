@@ -779,7 +779,27 @@ safe_declare_unique_option(
             "process and performs all scenario tree operations "
             "sequentially. If 'pyro' is specified, the scenario tree "
             "is fully distributed and scenario tree operations are "
-            "performed asynchronously."
+            "performed asynchronously. If 'multiprocess' is specified, "
+            "the scenario tree is distributed over processes started "
+            "on the local machine (without Pyro) and scenario tree "
+            "operations are performed asynchronously."
+        ),
+        doc=None,
+        visibility=0),
+    ap_group=_scenario_tree_options_group_title)
+
+safe_declare_unique_option(
+    common_block,
+    "multiprocess_workers",
+    PySPConfigValue(
+        0,
+        domain=_domain_nonnegative_integer,
+        description=(
+            "Set the number of scenario tree server processes to "
+            "start when the 'multiprocess' scenario tree manager is "
+            "selected. The default value of 0 indicates that one "
+            "process should be started for each scenario (or bundle), "
+            "up to the number of CPUs on the machine."
         ),
         doc=None,
         visibility=0),
@@ -1996,6 +2016,26 @@ safe_declare_unique_option(
         visibility=0),
     ap_group=_other_options_group_title)
 
+safe_declare_unique_option(
+    common_block,
+    "clone_template_instance",
+    PySPConfigValue(
+        False,
+        domain=bool,
+        description=(
+            "Construct the first scenario instance from the scenario "
+            "data and create the remaining instances by cloning it "
+            "and updating the values of the mutable parameters that "
+            "differ. Scenarios whose data differ in other ways are "
+            "constructed normally. Only applies to abstract models "
+            "with scenario or node data files, and should not be "
+            "used when mutable parameter values affect how the "
+            "model is constructed."
+        ),
+        doc=None,
+        visibility=0),
+    ap_group=_other_options_group_title)
+
 #
 # Deprecated command-line option names
 # (DO NOT REGISTER THEM OUTSIDE OF THIS FILE)
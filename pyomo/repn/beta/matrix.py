@@ -9,7 +9,8 @@
 #  ___________________________________________________________________________
 
 __all__ = ("_LinearConstraintData", "MatrixConstraint",
-           "compile_block_linear_constraints",)
+           "compile_block_linear_constraints",
+           "BlockLinearData", "extract_block_linear_data",)
 
 import time
 import logging
@@ -20,7 +21,9 @@ from weakref import ref as weakref_ref
 from pyomo.core.base.set_types import Any
 from pyomo.core.base import (SortComponents,
                              Var,
-                             Constraint)
+                             Constraint,
+                             Objective,
+                             minimize)
 from pyomo.core.base.numvalue import (is_fixed,
                                       value,
                                       ZeroConstant)
@@ -35,6 +38,17 @@ from pyomo.repn import generate_standard_repn
 from six import iteritems
 from six.moves import xrange
 
+try:
+    import numpy
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+try:
+    import scipy.sparse
+    scipy_available = True
+except ImportError:
+    scipy_available = False
+
 logger = logging.getLogger('pyomo.core')
 
 def _label_bytes(x):
@@ -321,6 +335,217 @@ def compile_block_linear_constraints(parent_block,
                                                 RangeTypes,
                                                 ColumnIndexToVarObject))
 
+#
+# The linear program data of a block as SciPy/NumPy arrays:
+#
+#     minimize/maximize   c'x + c0
+#     subject to          con_lb <= A x <= con_ub
+#                         var_lb <= x <= var_ub
+#
+# Infinite bounds are stored as -inf/+inf.  Row i corresponds to
+# constraints[i] and column j corresponds to variables[j].
+#
+BlockLinearData = collections.namedtuple(
+    'BlockLinearData',
+    ('A', 'con_lb', 'con_ub', 'c', 'c0', 'sense',
+     'var_lb', 'var_ub', 'variables', 'constraints', 'objective'))
+
+#
+# Extract the active linear constraints and objective of a block as a
+# scipy.sparse.csr_matrix and NumPy vectors, without modifying the
+# block.  Rows follow the deterministic order of the active constraints
+# and columns follow the deterministic order of the unfixed variables
+# (the same orders used by compile_block_linear_constraints).  Fixed
+# variables are folded into the bounds and the objective constant.
+#
+def extract_block_linear_data(parent_block,
+                              skip_trivial_constraints=False,
+                              include_unreferenced_variables=False,
+                              descend_into=True,
+                              repn_cache=None):
+
+    if not (numpy_available and scipy_available):
+        raise RuntimeError(
+            "extract_block_linear_data requires numpy and scipy")
+
+    if not parent_block.is_constructed():
+        raise RuntimeError(
+            "Attempting to extract the linear data of block '%s' with "
+            "unconstructed component(s)" % (parent_block.name))
+
+    if repn_cache is None:
+        generate_repn = generate_standard_repn
+    else:
+        generate_repn = repn_cache.generate
+
+    def _get_bound(exp):
+        if exp is None:
+            return None
+        if is_fixed(exp):
+            return value(exp)
+        raise ValueError("non-fixed bound: " + str(exp))
+
+    def _get_repn(component, expr):
+        if getattr(component, '_linear_canonical_form', False):
+            repn = component.canonical_form()
+        else:
+            repn = generate_repn(expr)
+        if repn.nonlinear_expr is not None or \
+           len(repn.quadratic_vars) > 0:
+            raise ValueError(
+                "Component '%s' is not linear" % (component.name))
+        return repn
+
+    sortOrder = SortComponents.indices | SortComponents.alphabetical
+    all_blocks = [_b for _b in parent_block.block_data_objects(
+        active=True,
+        sort=sortOrder,
+        descend_into=descend_into)]
+
+    #
+    # Assign each variable a deterministic symbol.  Variables declared
+    # off of this block are appended in the order they are referenced.
+    #
+    VarSymbolToVarObject = []
+    for block in all_blocks:
+        VarSymbolToVarObject.extend(
+            block.component_data_objects(Var,
+                                         sort=sortOrder,
+                                         descend_into=False))
+    VarIDToVarSymbol = \
+        dict((id(vardata), index)
+             for index, vardata in enumerate(VarSymbolToVarObject))
+
+    def _symbols(variables):
+        ans = []
+        for vardata in variables:
+            symbol = VarIDToVarSymbol.get(id(vardata))
+            if symbol is None:
+                symbol = VarIDToVarSymbol[id(vardata)] = \
+                    len(VarSymbolToVarObject)
+                VarSymbolToVarObject.append(vardata)
+            ans.append(symbol)
+        return ans
+
+    #
+    # Objective
+    #
+    objective = None
+    objective_symbols = []
+    objective_coefs = []
+    c0 = 0.0
+    sense = minimize
+    for block in all_blocks:
+        for objective_data in block.component_data_objects(
+                Objective,
+                active=True,
+                sort=sortOrder,
+                descend_into=False):
+            if objective is not None:
+                raise ValueError(
+                    "More than one active objective defined for block "
+                    "'%s': '%s' and '%s'"
+                    % (parent_block.name, objective.name,
+                       objective_data.name))
+            objective = objective_data
+    if objective is not None:
+        repn = _get_repn(objective, objective.expr)
+        objective_symbols = _symbols(repn.linear_vars)
+        objective_coefs = repn.linear_coefs
+        c0 = value(repn.constant)
+        sense = objective.sense
+
+    #
+    # Constraint rows (in CSR format)
+    #
+    constraints = []
+    SparseMat_pRows = [0]
+    SparseMat_jCols = []
+    SparseMat_Vals = []
+    LowerBounds = []
+    UpperBounds = []
+    for block in all_blocks:
+        for constraint_data in block.component_data_objects(
+                Constraint,
+                active=True,
+                sort=sortOrder,
+                descend_into=False):
+
+            repn = _get_repn(constraint_data, constraint_data.body)
+            if skip_trivial_constraints and len(repn.linear_vars) == 0:
+                continue
+
+            row_variable_symbols = _symbols(repn.linear_vars)
+            SparseMat_jCols.extend(row_variable_symbols)
+            SparseMat_Vals.extend(repn.linear_coefs)
+            SparseMat_pRows.append(len(SparseMat_jCols))
+
+            constant = value(repn.constant)
+            L = _get_bound(constraint_data.lower)
+            U = _get_bound(constraint_data.upper)
+            LowerBounds.append(L - constant if (L is not None)
+                               else -numpy.inf)
+            UpperBounds.append(U - constant if (U is not None)
+                               else numpy.inf)
+            constraints.append(constraint_data)
+
+    #
+    # Assign a column index to each unfixed variable (or only to the
+    # referenced variables), preserving the deterministic symbol order
+    #
+    if include_unreferenced_variables:
+        ColumnIndexToVarSymbol = [
+            symbol for symbol, vardata in enumerate(VarSymbolToVarObject)
+            if not vardata.fixed]
+    else:
+        ColumnIndexToVarSymbol = sorted(
+            set(SparseMat_jCols).union(objective_symbols))
+    VarSymbolToColumnIndex = numpy.full(len(VarSymbolToVarObject), -1,
+                                        dtype=numpy.int64)
+    VarSymbolToColumnIndex[ColumnIndexToVarSymbol] = \
+        numpy.arange(len(ColumnIndexToVarSymbol))
+    variables = [VarSymbolToVarObject[symbol]
+                 for symbol in ColumnIndexToVarSymbol]
+    nrows = len(constraints)
+    ncols = len(variables)
+
+    jCols = VarSymbolToColumnIndex[
+        numpy.array(SparseMat_jCols, dtype=numpy.int64)]
+    A = scipy.sparse.csr_matrix(
+        (numpy.array(SparseMat_Vals, dtype=numpy.float64),
+         jCols,
+         numpy.array(SparseMat_pRows, dtype=numpy.int64)),
+        shape=(nrows, ncols))
+    A.sum_duplicates()
+
+    c = numpy.zeros(ncols, dtype=numpy.float64)
+    numpy.add.at(c,
+                 VarSymbolToColumnIndex[
+                     numpy.array(objective_symbols, dtype=numpy.int64)],
+                 numpy.array(objective_coefs, dtype=numpy.float64))
+
+    var_lb = numpy.array([vardata.lb for vardata in variables],
+                         dtype=numpy.float64)
+    var_ub = numpy.array([vardata.ub for vardata in variables],
+                         dtype=numpy.float64)
+    # None bounds are converted to NaN above
+    var_lb[numpy.isnan(var_lb)] = -numpy.inf
+    var_ub[numpy.isnan(var_ub)] = numpy.inf
+
+    return BlockLinearData(A=A,
+                           con_lb=numpy.array(LowerBounds,
+                                              dtype=numpy.float64),
+                           con_ub=numpy.array(UpperBounds,
+                                              dtype=numpy.float64),
+                           c=c,
+                           c0=c0,
+                           sense=sense,
+                           var_lb=var_lb,
+                           var_ub=var_ub,
+                           variables=variables,
+                           constraints=constraints,
+                           objective=objective)
+
 #class _LinearConstraintData(_ConstraintData,LinearCanonicalRepn):
 #
 # This change breaks this class, but it's unclear whether this
@@ -12,7 +12,7 @@
 # AMPL Problem Writer Plugin
 #
 
-__all__ = ['ProblemWriter_nl']
+__all__ = ['ProblemWriter_nl', 'NLWriterCache']
 
 try:
     basestring
@@ -23,6 +23,8 @@ import itertools
 import logging
 import operator
 import os
+import struct
+import sys
 import time
 
 from pyutilib.math.util import isclose
@@ -41,14 +43,16 @@ from pyomo.core.base import _ExpressionData, Expression, SortComponents
 from pyomo.core.base import var
 from pyomo.core.base import param
 import pyomo.core.base.suffix
-from pyomo.repn.standard_repn import StandardRepn, generate_standard_repn
+from pyomo.repn.standard_repn import (StandardRepn,
+                                      generate_standard_repn,
+                                      ExpressionDependencies)
 
 import pyomo.core.kernel.suffix
 from pyomo.core.kernel.block import IBlock
 from pyomo.core.kernel.expression import IIdentityExpression
 from pyomo.core.kernel.variable import IVariable
 
-from six import itervalues, iteritems
+from six import itervalues, iteritems, StringIO
 from six.moves import xrange, zip
 
 logger = logging.getLogger('pyomo.core')
@@ -167,6 +171,127 @@ class _Counter(object):
         self._id += 1
         return tmp
 
+# Record layouts used by the binary ("b") NL format.  Integers are
+# written as 4-byte values and reals as 8-byte doubles, both in native
+# byte order (which is advertised through the "arith" field of the
+# header).
+_nl_int = struct.Struct('=i')
+_nl_int_int = struct.Struct('=ii')
+_nl_int_double = struct.Struct('=id')
+_nl_double = struct.Struct('=d')
+_nl_native_arith = 1 if sys.byteorder == 'little' else 2
+
+class _BinaryNLOutput(object):
+    """
+    A file-like wrapper that translates the text NL stream generated
+    by ProblemWriter_nl into the binary ("b") NL format.
+
+    Text is buffered until complete lines are available.  Each line is
+    then translated according to its leading key and the segment it
+    appears in.  Comments are dropped.  Segments that are already
+    available in binary form can be passed to write_binary().
+    """
+
+    _n_header_lines = 10
+
+    def __init__(self, ostream):
+        self._ostream = ostream
+        self.name = ostream.name
+        self._partial = ''
+        self._header_line = 0
+        self._segment = None
+
+    def write(self, text):
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self._write_line(line)
+
+    def writelines(self, lines):
+        for text in lines:
+            self.write(text)
+
+    def write_binary(self, data):
+        assert not self._partial
+        self._segment = None
+        self._ostream.write(data)
+
+    def _write_line(self, line):
+        OUTPUT = self._ostream
+        if self._header_line < self._n_header_lines:
+            # The header is always written as text.  The first
+            # character identifies the file format, and the third
+            # field on line 6 is the arithmetic (byte order) used by
+            # the binary segments.
+            if self._header_line == 0:
+                line = 'b' + line[1:]
+            elif self._header_line == 5:
+                data, comment = line.split('\t', 1)
+                fields = data.split()
+                fields[2] = str(_nl_native_arith)
+                line = ' ' + ' '.join(fields) + '\t' + comment
+            self._header_line += 1
+            OUTPUT.write((line + '\n').encode('utf-8'))
+            return
+
+        key = line[0]
+        if key == 'h':
+            # string arguments may contain any character, so they
+            # must be handled before comments are removed
+            n, arg = line[1:].split(':', 1)
+            arg = arg[:int(n)].encode('utf-8')
+            OUTPUT.write(b'h' + _nl_int.pack(len(arg)) + arg)
+            return
+        line = line.split('\t#', 1)[0]
+        segment = self._segment
+        if key.isdigit() or key == '-':
+            tokens = line.split()
+            if segment == 'expr' or segment == 'k':
+                OUTPUT.write(_nl_int.pack(int(tokens[0])))
+            elif segment == 'r' or segment == 'b':
+                if key == '5':
+                    OUTPUT.write(b'5' + _nl_int_int.pack(
+                        int(tokens[1]), int(tokens[2])))
+                else:
+                    OUTPUT.write(key.encode('ascii') + struct.pack(
+                        '=%dd' % (len(tokens)-1),
+                        *(float(x) for x in tokens[1:])))
+            elif segment == 'S_int':
+                OUTPUT.write(_nl_int_int.pack(
+                    int(tokens[0]), int(float(tokens[1]))))
+            else:
+                OUTPUT.write(_nl_int_double.pack(
+                    int(tokens[0]), float(tokens[1])))
+        elif key == 'o':
+            OUTPUT.write(b'o' + _nl_int.pack(int(line[1:])))
+        elif key == 'n':
+            OUTPUT.write(b'n' + _nl_double.pack(float(line[1:])))
+        elif key == 'v':
+            OUTPUT.write(b'v' + _nl_int.pack(int(line[1:])))
+        elif key == 'f':
+            OUTPUT.write(b'f' + _nl_int_int.pack(
+                *(int(x) for x in line[1:].split())))
+        elif key == 'S' or key == 'F':
+            # S<kind> <n> <name> or F<i> <type> <nargs> <name>
+            tokens = line[1:].split(None, 3 if key == 'F' else 2)
+            name = tokens.pop().strip().encode('utf-8')
+            OUTPUT.write(key.encode('ascii') +
+                         struct.pack('=%di' % len(tokens),
+                                     *(int(x) for x in tokens)) +
+                         _nl_int.pack(len(name)) + name)
+            if key == 'S':
+                self._segment = 'S_float' if int(tokens[0]) & 4 \
+                                else 'S_int'
+        elif key in 'COdxrbkJG':
+            tokens = line[1:].split()
+            OUTPUT.write(key.encode('ascii') +
+                         struct.pack('=%di' % len(tokens),
+                                     *(int(x) for x in tokens)))
+            self._segment = 'expr' if key in 'CO' else key
+        else:
+            raise ValueError(
+                "Unexpected line in NL output stream: %r" % (line,))
+
 class ModelSOS(object):
 
     class AmplSuffix(object):
@@ -261,6 +386,85 @@ class RepnWrapper(object):
         self.nonlinear_vars = nonlinear
 
 
+class _NLCacheEntry(object):
+
+    __slots__ = ('dependencies', 'repn', 'text')
+
+    def __init__(self, expr, repn):
+        self.dependencies = ExpressionDependencies((expr,))
+        self.repn = repn
+        self.text = None
+
+    def is_valid(self, expr):
+        return self.dependencies.is_valid((expr,))
+
+
+class NLWriterCache(object):
+    """
+    Data retained between NL files written for the same model.
+
+    Pass an instance through the 'nl_cache' io_option (e.g.,
+    ``opt.solve(model, nl_cache=cache)``) to write the same model
+    repeatedly.  The standard representation of an objective or
+    constraint is only regenerated when its expression, the fixed
+    status or value of a fixed variable, or the value of a mutable
+    parameter in the expression has changed.  The text of the
+    nonlinear expression graphs (the C and O segments) is reused as
+    long as the representation and the variable ordering are
+    unchanged.  The bounds, initial values and the remaining numeric
+    segments are always rewritten.
+
+    The cache holds a reference to the last model written.  Writing
+    a different model clears it.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Discard all cached data."""
+        self._model = None
+        self._entries = ComponentMap()
+        self._text_key = None
+        self.repn_hits = 0
+        self.text_hits = 0
+
+    def _begin(self, model):
+        if model is not self._model:
+            self.clear()
+            self._model = model
+
+    def _set_text_key(self, text_key):
+        # The expression text refers to variables and external
+        # functions by their position in the NL file
+        if text_key != self._text_key:
+            for entry in itervalues(self._entries):
+                entry.text = None
+            self._text_key = text_key
+
+    def _generate_repn(self, component, expr):
+        entry = self._entries.get(component)
+        if entry is not None and entry.is_valid(expr):
+            self.repn_hits += 1
+            return entry.repn
+        repn = generate_standard_repn(expr, quadratic=False)
+        self._entries[component] = _NLCacheEntry(expr, repn)
+        return repn
+
+    def _expression_text(self, component, repn, writer):
+        entry = self._entries.get(component)
+        if entry is None or entry.repn is not repn:
+            return writer()
+        if entry.text is None:
+            entry.text = writer()
+        else:
+            self.text_hits += 1
+        return entry.text
+
+
 @WriterFactory.register('nl', 'Generate the corresponding AMPL NL file.')
 class ProblemWriter_nl(AbstractProblemWriter):
 
@@ -272,6 +476,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
         self._ampl_obj_id = {}
         self._OUTPUT = None
         self._varID_map = None
+        self._binary = False
 
     def __call__(self,
                  model,
@@ -327,6 +532,16 @@ class ProblemWriter_nl(AbstractProblemWriter):
         include_all_variable_bounds = \
             io_options.pop("include_all_variable_bounds", False)
 
+        # If True, write the binary ("b") NL format instead of the
+        # text ("g") format. Comments requested through
+        # symbolic_solver_labels are not included in binary files
+        # (the .row and .col files are still written).
+        binary = io_options.pop("binary", False)
+
+        # An NLWriterCache used to reuse the representations and
+        # expression text from the previous write of this model
+        nl_cache = io_options.pop("nl_cache", None)
+
         if len(io_options):
             raise ValueError(
                 "ProblemWriter_nl passed unrecognized io_options:\n\t" +
@@ -361,13 +576,16 @@ class ProblemWriter_nl(AbstractProblemWriter):
         # passed into _print_nonlinear_terms_NL
         self._symbolic_solver_labels = symbolic_solver_labels
         self._output_fixed_variable_bounds = output_fixed_variable_bounds
+        self._binary = binary
         # Speeds up calling name on every component when
         # writing .row and .col files (when symbolic_solver_labels is True)
         self._name_labeler = NameLabeler()
 
         # Pause the GC for the duration of this method
         with PauseGC() as pgc:
-            with open(filename,"w") as f:
+            with open(filename,"wb" if binary else "w") as f:
+                if binary:
+                    f = _BinaryNLOutput(f)
                 self._OUTPUT = f
                 symbol_map = self._print_model_NL(
                     model,
@@ -375,10 +593,12 @@ class ProblemWriter_nl(AbstractProblemWriter):
                     show_section_timing=show_section_timing,
                     skip_trivial_constraints=skip_trivial_constraints,
                     file_determinism=file_determinism,
-                    include_all_variable_bounds=include_all_variable_bounds)
+                    include_all_variable_bounds=include_all_variable_bounds,
+                    nl_cache=nl_cache)
 
         self._symbolic_solver_labels = False
         self._output_fixed_variable_bounds = False
+        self._binary = False
         self._name_labeler = None
 
         self._OUTPUT = None
@@ -386,6 +606,44 @@ class ProblemWriter_nl(AbstractProblemWriter):
         self._op_string = None
         return filename, symbol_map
 
+    def _capture_NL(self, fcn, *args):
+        # Return the text written by fcn instead of writing it to
+        # the output file
+        OUTPUT = self._OUTPUT
+        self._OUTPUT = StringIO()
+        try:
+            fcn(*args)
+            return self._OUTPUT.getvalue()
+        finally:
+            self._OUTPUT = OUTPUT
+
+    def _print_constraint_body_NL(self, repn):
+        if repn.nonlinear_expr is not None:
+            assert not repn.is_quadratic()
+            self._print_nonlinear_terms_NL(repn.nonlinear_expr)
+        else:
+            assert repn.is_quadratic()
+            self._print_standard_quadratic_NL(repn.quadratic_vars,
+                                              repn.quadratic_coefs)
+
+    def _print_objective_body_NL(self, repn):
+        OUTPUT = self._OUTPUT
+        if repn.is_linear():
+            OUTPUT.write(self._op_string[NumericConstant] % (repn.constant))
+        else:
+            if repn.constant != 0:
+                _, binary_sum_str, _ = self._op_string[EXPR.SumExpressionBase]
+                OUTPUT.write(binary_sum_str)
+                OUTPUT.write(self._op_string[NumericConstant]
+                             % (repn.constant))
+            if repn.nonlinear_expr is not None:
+                assert not repn.is_quadratic()
+                self._print_nonlinear_terms_NL(repn.nonlinear_expr)
+            else:
+                assert repn.is_quadratic()
+                self._print_standard_quadratic_NL(repn.quadratic_vars,
+                                                  repn.quadratic_coefs)
+
     def _print_quad_term(self, v1, v2):
         OUTPUT = self._OUTPUT
         if v1 is not v2:
@@ -665,7 +923,8 @@ class ProblemWriter_nl(AbstractProblemWriter):
                         show_section_timing=False,
                         skip_trivial_constraints=False,
                         file_determinism=1,
-                        include_all_variable_bounds=False):
+                        include_all_variable_bounds=False,
+                        nl_cache=None):
 
         output_fixed_variable_bounds = self._output_fixed_variable_bounds
         symbolic_solver_labels = self._symbolic_solver_labels
@@ -679,6 +938,9 @@ class ProblemWriter_nl(AbstractProblemWriter):
         OUTPUT = self._OUTPUT
         assert OUTPUT is not None
 
+        if nl_cache is not None:
+            nl_cache._begin(model)
+
         # maps NL variables to the "real" variable names in the problem.
         # it's really NL variable ordering, as there are no variable names
         # in the NL format. however, we by convention make them go from
@@ -835,8 +1097,12 @@ class ProblemWriter_nl(AbstractProblemWriter):
                         max_rowname_len = len(objname)
 
                 if gen_obj_repn:
-                    repn = generate_standard_repn(active_objective.expr,
-                                                  quadratic=False)
+                    if nl_cache is None:
+                        repn = generate_standard_repn(active_objective.expr,
+                                                      quadratic=False)
+                    else:
+                        repn = nl_cache._generate_repn(active_objective,
+                                                       active_objective.expr)
                     block_repn[active_objective] = repn
                     linear_vars = repn.linear_vars
                     nonlinear_vars = repn.nonlinear_vars
@@ -953,8 +1219,12 @@ class ProblemWriter_nl(AbstractProblemWriter):
                     nonlinear_vars = repn.nonlinear_vars
                 else:
                     if gen_con_repn:
-                        repn = generate_standard_repn(constraint_data.body,
-                                                      quadratic=False)
+                        if nl_cache is None:
+                            repn = generate_standard_repn(constraint_data.body,
+                                                          quadratic=False)
+                        else:
+                            repn = nl_cache._generate_repn(
+                                constraint_data, constraint_data.body)
                         block_repn[constraint_data] = repn
                         linear_vars = repn.linear_vars
                         nonlinear_vars = repn.nonlinear_vars
@@ -1511,6 +1781,13 @@ class ProblemWriter_nl(AbstractProblemWriter):
         if symbolic_solver_labels:
             rowf = open(rowfilename,'w')
 
+        if nl_cache is not None:
+            nl_cache._set_text_key(
+                (symbolic_solver_labels,
+                 tuple(id(Vars_dict[var_ID]) for var_ID in full_var_list),
+                 tuple(sorted((name, fid) for name, (fcn, fid)
+                              in iteritems(self.external_byFcn)))))
+
         cu = [0 for i in xrange(len(full_var_list))]
         for con_ID in nonlin_con_order_list:
             con_data, wrapped_repn = Constraints_dict[con_ID]
@@ -1522,15 +1799,13 @@ class ProblemWriter_nl(AbstractProblemWriter):
                 rowf.write(lbl+"\n")
             OUTPUT.write("\n")
 
-            if wrapped_repn.repn.nonlinear_expr is not None:
-                assert not wrapped_repn.repn.is_quadratic()
-                self._print_nonlinear_terms_NL(
-                    wrapped_repn.repn.nonlinear_expr)
+            if nl_cache is None:
+                self._print_constraint_body_NL(wrapped_repn.repn)
             else:
-                assert wrapped_repn.repn.is_quadratic()
-                self._print_standard_quadratic_NL(
-                    wrapped_repn.repn.quadratic_vars,
-                    wrapped_repn.repn.quadratic_coefs)
+                OUTPUT.write(nl_cache._expression_text(
+                    con_data, wrapped_repn.repn,
+                    lambda: self._capture_NL(self._print_constraint_body_NL,
+                                             wrapped_repn.repn)))
 
             for var_ID in set(wrapped_repn.linear_vars).union(
                     wrapped_repn.nonlinear_vars):
@@ -1570,24 +1845,13 @@ class ProblemWriter_nl(AbstractProblemWriter):
                 rowf.write(lbl+"\n")
             OUTPUT.write("\n")
 
-            if wrapped_repn.repn.is_linear():
-                OUTPUT.write(self._op_string[NumericConstant]
-                             % (wrapped_repn.repn.constant))
+            if nl_cache is None:
+                self._print_objective_body_NL(wrapped_repn.repn)
             else:
-                if wrapped_repn.repn.constant != 0:
-                    _, binary_sum_str, _ = self._op_string[EXPR.SumExpressionBase]
-                    OUTPUT.write(binary_sum_str)
-                    OUTPUT.write(self._op_string[NumericConstant]
-                                 % (wrapped_repn.repn.constant))
-                if wrapped_repn.repn.nonlinear_expr is not None:
-                    assert not wrapped_repn.repn.is_quadratic()
-                    self._print_nonlinear_terms_NL(
-                        wrapped_repn.repn.nonlinear_expr)
-                else:
-                    assert wrapped_repn.repn.is_quadratic()
-                    self._print_standard_quadratic_NL(
-                        wrapped_repn.repn.quadratic_vars,
-                        wrapped_repn.repn.quadratic_coefs)
+                OUTPUT.write(nl_cache._expression_text(
+                    obj, wrapped_repn.repn,
+                    lambda: self._capture_NL(self._print_objective_body_NL,
+                                             wrapped_repn.repn)))
 
         if symbolic_solver_labels:
             rowf.close()
@@ -1630,12 +1894,17 @@ class ProblemWriter_nl(AbstractProblemWriter):
         # "x" lines
         #
         # variable initialization
+        binary = self._binary
         var_bound_list = []
         x_init_list = []
         for ampl_var_id, var_ID in enumerate(full_var_list):
             var = Vars_dict[var_ID]
             if var.value is not None:
-                x_init_list.append("%d %r\n" % (ampl_var_id, var.value))
+                if binary:
+                    x_init_list.append(
+                        _nl_int_double.pack(ampl_var_id, var.value))
+                else:
+                    x_init_list.append("%d %r\n" % (ampl_var_id, var.value))
             if var.fixed:
                 if not output_fixed_variable_bounds:
                     raise ValueError(
@@ -1672,7 +1941,10 @@ class ProblemWriter_nl(AbstractProblemWriter):
         if symbolic_solver_labels:
             OUTPUT.write("\t# initial guess")
         OUTPUT.write("\n")
-        OUTPUT.writelines(x_init_list)
+        if binary:
+            OUTPUT.write_binary(b''.join(x_init_list))
+        else:
+            OUTPUT.writelines(x_init_list)
         del x_init_list
 
         if show_section_timing:
@@ -1721,9 +1993,17 @@ class ProblemWriter_nl(AbstractProblemWriter):
             OUTPUT.write("\t#intermediate Jacobian column lengths")
         OUTPUT.write("\n")
         ktot = 0
-        for i in xrange(n1):
-            ktot += cu[i]
-            OUTPUT.write("%d\n"%(ktot))
+        if binary:
+            k_list = []
+            for i in xrange(n1):
+                ktot += cu[i]
+                k_list.append(ktot)
+            OUTPUT.write_binary(struct.pack('=%di' % n1, *k_list))
+            del k_list
+        else:
+            for i in xrange(n1):
+                ktot += cu[i]
+                OUTPUT.write("%d\n"%(ktot))
         del cu
 
         if show_section_timing:
@@ -1739,42 +2019,39 @@ class ProblemWriter_nl(AbstractProblemWriter):
             numnonlinear_vars = len(wrapped_repn.nonlinear_vars)
             numlinear_vars = len(wrapped_repn.linear_vars)
             if numnonlinear_vars == 0:
-                if numlinear_vars > 0:
-                    linear_dict = dict((var_ID, coef)
-                                       for var_ID, coef in
-                                       zip(wrapped_repn.linear_vars,
-                                           wrapped_repn.repn.linear_coefs))
-                    OUTPUT.write("J%d %d\n"%(nc, numlinear_vars))
-                    OUTPUT.writelines(
-                        "%d %r\n" % (self_ampl_var_id[con_var],
-                                     linear_dict[con_var])
-                        for con_var in sorted(linear_dict.keys()))
+                if numlinear_vars == 0:
+                    continue
+                linear_dict = dict((var_ID, coef)
+                                   for var_ID, coef in
+                                   zip(wrapped_repn.linear_vars,
+                                       wrapped_repn.repn.linear_coefs))
+                J_entries = [(self_ampl_var_id[con_var],
+                              linear_dict[con_var])
+                             for con_var in sorted(linear_dict.keys())]
             elif numlinear_vars == 0:
-                nl_con_vars = \
-                    sorted(wrapped_repn.nonlinear_vars)
-                OUTPUT.write("J%d %d\n"%(nc, numnonlinear_vars))
-                OUTPUT.writelines(
-                    "%d 0\n"%(self_ampl_var_id[con_var])
-                    for con_var in nl_con_vars)
+                J_entries = [(self_ampl_var_id[con_var], 0)
+                             for con_var in
+                             sorted(wrapped_repn.nonlinear_vars)]
             else:
-                con_vars = set(wrapped_repn.nonlinear_vars)
                 nl_con_vars = sorted(
-                    con_vars.difference(
+                    set(wrapped_repn.nonlinear_vars).difference(
                         wrapped_repn.linear_vars))
-                con_vars.update(wrapped_repn.linear_vars)
                 linear_dict = dict(
                     (var_ID, coef) for var_ID, coef in
                     zip(wrapped_repn.linear_vars,
                         wrapped_repn.repn.linear_coefs))
-                OUTPUT.write("J%d %d\n"%(nc, len(con_vars)))
-                OUTPUT.writelines(
-                    "%d %r\n" % (self_ampl_var_id[con_var],
-                                 linear_dict[con_var])
-                    for con_var in sorted(linear_dict.keys()))
-                OUTPUT.writelines(
-                    "%d 0\n"%(self_ampl_var_id[con_var])
-                    for con_var in nl_con_vars)
-
+                J_entries = [(self_ampl_var_id[con_var],
+                              linear_dict[con_var])
+                             for con_var in sorted(linear_dict.keys())]
+                J_entries.extend((self_ampl_var_id[con_var], 0)
+                                 for con_var in nl_con_vars)
+            if binary:
+                OUTPUT.write_binary(
+                    b'J' + _nl_int_int.pack(nc, len(J_entries)) +
+                    b''.join(_nl_int_double.pack(*_e) for _e in J_entries))
+            else:
+                OUTPUT.write("J%d %d\n" % (nc, len(J_entries)))
+                OUTPUT.writelines("%d %r\n" % _e for _e in J_entries)
 
         if show_section_timing:
             subsection_timer.report("Write J lines")
@@ -1796,6 +2073,14 @@ class ProblemWriter_nl(AbstractProblemWriter):
                     grad_entries[self_ampl_var_id[obj_var]] = 0
             len_ge = len(grad_entries)
             if len_ge > 0:
+                if binary:
+                    OUTPUT.write_binary(
+                        b'G' + _nl_int_int.pack(self_ampl_obj_id[obj_ID],
+                                                len_ge) +
+                        b''.join(_nl_int_double.pack(var_ID,
+                                                     grad_entries[var_ID])
+                                 for var_ID in sorted(grad_entries.keys())))
+                    continue
                 OUTPUT.write("G%d %d\n" % (self_ampl_obj_id[obj_ID],
                                            len_ge))
                 for var_ID in sorted(grad_entries.keys()):
@@ -30,8 +30,17 @@ from pyomo.core.base import \
      ComponentMap, is_fixed)
 from pyomo.repn import generate_standard_repn
 
+try:
+    import numpy
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
 logger = logging.getLogger('pyomo.core')
 
+# The number of rows formatted at once by the bulk writer
+_BULK_ROW_CHUNK = 10000
+
 def _no_negative_zero(val):
     """Make sure -0 is never output. Makes diff tests easier."""
     if val == 0:
@@ -129,6 +138,16 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
         force_objective_constant = \
             io_options.pop("force_objective_constant", False)
 
+        # A StandardRepnCache used to generate the standard
+        # representation of objectives and constraints.  Compiled
+        # representations are reused across writes of the same model.
+        repn_cache = io_options.pop("repn_cache", None)
+
+        # Assemble the constraint rows into sparse (CSR) arrays and
+        # format them in large chunks instead of term by term.
+        # Requires numpy.
+        bulk_write = io_options.pop("bulk_write", False)
+
         if len(io_options):
             raise ValueError(
                 "ProblemWriter_cpxlp passed unrecognized io_options:\n\t" +
@@ -139,6 +158,10 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                              "'symbolic_solver_labels' and 'labeler' "
                              "I/O options is forbidden")
 
+        if bulk_write and not numpy_available:
+            raise ValueError("ProblemWriter_cpxlp: The 'bulk_write' "
+                             "I/O option requires numpy")
+
         #
         # Create labeler
         #
@@ -172,7 +195,9 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                     column_order=column_order,
                     skip_trivial_constraints=skip_trivial_constraints,
                     force_objective_constant=force_objective_constant,
-                    include_all_variable_bounds=include_all_variable_bounds)
+                    include_all_variable_bounds=include_all_variable_bounds,
+                    repn_cache=repn_cache,
+                    bulk_write=bulk_write)
 
         self._referenced_variable_ids.clear()
 
@@ -377,6 +402,201 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                               % (variable_symbol_map.getSymbol(vardata),
                                  weight))
 
+    def _print_constraints_LP_bulk(self,
+                                   constraints,
+                                   output_file,
+                                   symbol_map,
+                                   labeler,
+                                   variable_list,
+                                   object_symbol_dictionary,
+                                   variable_symbol_dictionary,
+                                   column_order,
+                                   skip_trivial_constraints,
+                                   supports_quadratic_constraint):
+        """
+        Write the constraint rows using sparse arrays.
+
+        The linear terms of all rows are collected into CSR arrays
+        (row pointers, column indices and coefficients) along with the
+        right-hand-side values.  The terms in each row are sorted with
+        a single lexsort, and the rows are then formatted in chunks
+        using one format string per chunk.  Quadratic rows are rendered
+        with _print_expr_canonical and written in place as part of the
+        row header.
+
+        Returns True if any constraint was processed.
+        """
+        create_symbol_func = SymbolMap.createSymbol
+        alias_symbol_func = SymbolMap.alias
+        print_expr_canonical = self._print_expr_canonical
+
+        # The last column is ONE_VAR_CONSTANT, used for trivial rows
+        nvars = len(variable_list)
+        var_column = dict((id(vardata), i)
+                          for i, vardata in enumerate(variable_list))
+        names = [variable_symbol_dictionary[id(vardata)]
+                 for vardata in variable_list]
+        names.append('ONE_VAR_CONSTANT')
+        if column_order is None:
+            rank = sorted(xrange(nvars), key=names.__getitem__)
+        else:
+            rank = [column_order[vardata] for vardata in variable_list]
+        column_rank = numpy.empty(nvars+1, dtype=numpy.int64)
+        if column_order is None:
+            column_rank[rank] = numpy.arange(nvars)
+        else:
+            column_rank[:nvars] = rank
+        column_rank[nvars] = column_rank[:nvars].max()+1 if nvars else 0
+
+        eq_template = self.eq_string_template + "\n"
+        geq_template = self.geq_string_template
+        leq_template = self.leq_string_template
+
+        headers = []
+        senses = []
+        rhs = []
+        row_nnz = []
+        cols = []
+        coefs = []
+
+        have_nontrivial = False
+        for constraint_data, repn in constraints:
+            have_nontrivial = True
+
+            degree = repn.polynomial_degree()
+            if degree == 0:
+                if skip_trivial_constraints:
+                    continue
+            elif degree == 2:
+                if not supports_quadratic_constraint:
+                    raise ValueError(
+                        "Solver unable to handle quadratic expressions. Constraint"
+                        " at issue: '%s'" % (constraint_data.name))
+            elif degree is None:
+                raise ValueError(
+                    "Cannot write legal LP file.  Constraint '%s' has a body "
+                    "with nonlinear terms." % (constraint_data.name))
+
+            if degree == 2:
+                body = []
+                offset = print_expr_canonical(repn,
+                                              body,
+                                              object_symbol_dictionary,
+                                              variable_symbol_dictionary,
+                                              False,
+                                              column_order)
+                body = ":\n" + "".join(body)
+                row_cols = ()
+                row_coefs = ()
+            else:
+                body = ":\n"
+                offset = repn.constant
+                if degree == 0:
+                    row_cols = (nvars,)
+                    row_coefs = (0,)
+                else:
+                    row_cols = [var_column[id(vardata)]
+                                for vardata in repn.linear_vars]
+                    row_coefs = repn.linear_coefs
+
+            con_symbol = create_symbol_func(symbol_map, constraint_data, labeler)
+
+            rows = []
+            if constraint_data.equality:
+                assert value(constraint_data.lower) == \
+                    value(constraint_data.upper)
+                rows.append(('c_e_%s_' % con_symbol, eq_template,
+                             _get_bound(constraint_data.lower) - offset))
+            else:
+                if constraint_data.has_lb():
+                    if constraint_data.has_ub():
+                        label = 'r_l_%s_' % con_symbol
+                    else:
+                        label = 'c_l_%s_' % con_symbol
+                    rows.append((label, geq_template,
+                                 _get_bound(constraint_data.lower) - offset))
+                else:
+                    assert constraint_data.has_ub()
+                if constraint_data.has_ub():
+                    if constraint_data.has_lb():
+                        label = 'r_u_%s_' % con_symbol
+                    else:
+                        label = 'c_u_%s_' % con_symbol
+                    rows.append((label, leq_template,
+                                 _get_bound(constraint_data.upper) - offset))
+                else:
+                    assert constraint_data.has_lb()
+
+            for label, sense, bound in rows:
+                alias_symbol_func(symbol_map, constraint_data, label)
+                headers.append(label + body)
+                senses.append(sense)
+                rhs.append(bound)
+                row_nnz.append(len(row_cols))
+                cols.extend(row_cols)
+                coefs.extend(row_coefs)
+
+        nrows = len(headers)
+        if not nrows:
+            return have_nontrivial
+
+        indptr = numpy.zeros(nrows+1, dtype=numpy.int64)
+        numpy.cumsum(row_nnz, out=indptr[1:])
+        cols = numpy.array(cols, dtype=numpy.int64)
+        coefs = numpy.array(coefs, dtype=float)
+        rhs = numpy.array(rhs, dtype=float)
+        # Make sure -0 is never output
+        rhs[rhs == 0] = 0
+
+        # Record the referenced variables
+        for i in numpy.unique(cols).tolist():
+            if i < nvars:
+                vardata = variable_list[i]
+                self._referenced_variable_ids[id(vardata)] = vardata
+
+        # Sort the terms within each row by column rank
+        row_index = numpy.repeat(numpy.arange(nrows), row_nnz)
+        order = numpy.lexsort((column_rank[cols], row_index))
+        cols = cols[order]
+        coefs = coefs[order]
+        names = numpy.array(names, dtype=object)
+
+        term_template = self.linear_coef_string_template
+        row_templates = {}
+        for start in xrange(0, nrows, _BULK_ROW_CHUNK):
+            stop = min(start + _BULK_ROW_CHUNK, nrows)
+            nz_start = indptr[start]
+            nz_stop = indptr[stop]
+            chunk_nnz = row_nnz[start:stop]
+            #
+            # Build the format string for the chunk
+            #
+            template = []
+            for nnz, sense in zip(chunk_nnz, senses[start:stop]):
+                row_template = row_templates.get((nnz, sense), None)
+                if row_template is None:
+                    row_template = row_templates[nnz, sense] = \
+                        "%s" + term_template*nnz + sense
+                template.append(row_template)
+            template = "".join(template)
+            #
+            # Place the arguments: each row contributes its header,
+            # a (coef, name) pair for each term, and its rhs
+            #
+            args = numpy.empty(2*(stop-start) + 2*(nz_stop-nz_start),
+                               dtype=object)
+            row_offset = 2*numpy.arange(stop-start)
+            local_ptr = indptr[start:stop+1] - nz_start
+            args[2*local_ptr[:-1] + row_offset] = headers[start:stop]
+            args[2*local_ptr[1:] + row_offset + 1] = rhs[start:stop].tolist()
+            term_pos = 2*numpy.arange(nz_stop-nz_start) \
+                       + numpy.repeat(row_offset, chunk_nnz) + 1
+            args[term_pos] = coefs[nz_start:nz_stop].tolist()
+            args[term_pos+1] = names[cols[nz_start:nz_stop]]
+            output_file.write(template % tuple(args))
+
+        return have_nontrivial
+
     def _print_model_LP(self,
                         model,
                         output_file,
@@ -388,7 +608,14 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                         column_order=None,
                         skip_trivial_constraints=False,
                         force_objective_constant=False,
-                        include_all_variable_bounds=False):
+                        include_all_variable_bounds=False,
+                        repn_cache=None,
+                        bulk_write=False):
+
+        if repn_cache is None:
+            generate_repn = generate_standard_repn
+        else:
+            generate_repn = repn_cache.generate
 
         eq_string_template = self.eq_string_template
         leq_string_template = self.leq_string_template
@@ -512,7 +739,7 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                     output.append("max \n")
 
                 if gen_obj_repn:
-                    repn = generate_standard_repn(objective_data.expr)
+                    repn = generate_repn(objective_data.expr)
                     block_repn[objective_data] = repn
                 else:
                     repn = block_repn[objective_data]
@@ -593,7 +820,7 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                     if constraint_data._linear_canonical_form:
                         repn = constraint_data.canonical_form()
                     elif gen_con_repn:
-                        repn = generate_standard_repn(constraint_data.body)
+                        repn = generate_repn(constraint_data.body)
                         block_repn[constraint_data] = repn
                     else:
                         repn = block_repn[constraint_data]
@@ -609,62 +836,57 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
         else:
             yield_all_constraints = constraint_generator
 
-        # FIXME: This is a hack to get nested blocks working...
-        for constraint_data, repn in yield_all_constraints():
-            have_nontrivial = True
+        if bulk_write:
+            output_file.write("".join(output))
+            output = []
+            have_nontrivial = self._print_constraints_LP_bulk(
+                yield_all_constraints(),
+                output_file,
+                symbol_map,
+                labeler,
+                variable_list,
+                object_symbol_dictionary,
+                variable_symbol_dictionary,
+                column_order,
+                skip_trivial_constraints,
+                supports_quadratic_constraint)
+        else:
+            # FIXME: This is a hack to get nested blocks working...
+            for constraint_data, repn in yield_all_constraints():
+                have_nontrivial = True
 
-            degree = repn.polynomial_degree()
+                degree = repn.polynomial_degree()
 
-            #
-            # Write constraint
-            #
+                #
+                # Write constraint
+                #
 
-            # There are conditions, e.g., when fixing variables, under which
-            # a constraint block might be empty.  Ignore these, for both
-            # practical reasons and the fact that the CPLEX LP format
-            # requires a variable in the constraint body.  It is also
-            # possible that the body of the constraint consists of only a
-            # constant, in which case the "variable" of
-            if degree == 0:
-                if skip_trivial_constraints:
-                    continue
-            elif degree == 2:
-                if not supports_quadratic_constraint:
+                # There are conditions, e.g., when fixing variables, under which
+                # a constraint block might be empty.  Ignore these, for both
+                # practical reasons and the fact that the CPLEX LP format
+                # requires a variable in the constraint body.  It is also
+                # possible that the body of the constraint consists of only a
+                # constant, in which case the "variable" of
+                if degree == 0:
+                    if skip_trivial_constraints:
+                        continue
+                elif degree == 2:
+                    if not supports_quadratic_constraint:
+                        raise ValueError(
+                            "Solver unable to handle quadratic expressions. Constraint"
+                            " at issue: '%s'" % (constraint_data.name))
+                elif degree is None:
                     raise ValueError(
-                        "Solver unable to handle quadratic expressions. Constraint"
-                        " at issue: '%s'" % (constraint_data.name))
-            elif degree is None:
-                raise ValueError(
-                    "Cannot write legal LP file.  Constraint '%s' has a body "
-                    "with nonlinear terms." % (constraint_data.name))
+                        "Cannot write legal LP file.  Constraint '%s' has a body "
+                        "with nonlinear terms." % (constraint_data.name))
 
-            # Create symbol
-            con_symbol = create_symbol_func(symbol_map, constraint_data, labeler)
+                # Create symbol
+                con_symbol = create_symbol_func(symbol_map, constraint_data, labeler)
 
-            if constraint_data.equality:
-                assert value(constraint_data.lower) == \
-                    value(constraint_data.upper)
-                label = 'c_e_%s_' % con_symbol
-                alias_symbol_func(symbol_map, constraint_data, label)
-                output.append(label)
-                output.append(':\n')
-                offset = print_expr_canonical(repn,
-                                              output,
-                                              object_symbol_dictionary,
-                                              variable_symbol_dictionary,
-                                              False,
-                                              column_order)
-                bound = constraint_data.lower
-                bound = _get_bound(bound) - offset
-                output.append(eq_string_template
-                                  % (_no_negative_zero(bound)))
-                output.append("\n")
-            else:
-                if constraint_data.has_lb():
-                    if constraint_data.has_ub():
-                        label = 'r_l_%s_' % con_symbol
-                    else:
-                        label = 'c_l_%s_' % con_symbol
+                if constraint_data.equality:
+                    assert value(constraint_data.lower) == \
+                        value(constraint_data.upper)
+                    label = 'c_e_%s_' % con_symbol
                     alias_symbol_func(symbol_map, constraint_data, label)
                     output.append(label)
                     output.append(':\n')
@@ -676,36 +898,56 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                                                   column_order)
                     bound = constraint_data.lower
                     bound = _get_bound(bound) - offset
-                    output.append(geq_string_template
+                    output.append(eq_string_template
                                       % (_no_negative_zero(bound)))
+                    output.append("\n")
                 else:
-                    assert constraint_data.has_ub()
-
-                if constraint_data.has_ub():
                     if constraint_data.has_lb():
-                        label = 'r_u_%s_' % con_symbol
+                        if constraint_data.has_ub():
+                            label = 'r_l_%s_' % con_symbol
+                        else:
+                            label = 'c_l_%s_' % con_symbol
+                        alias_symbol_func(symbol_map, constraint_data, label)
+                        output.append(label)
+                        output.append(':\n')
+                        offset = print_expr_canonical(repn,
+                                                      output,
+                                                      object_symbol_dictionary,
+                                                      variable_symbol_dictionary,
+                                                      False,
+                                                      column_order)
+                        bound = constraint_data.lower
+                        bound = _get_bound(bound) - offset
+                        output.append(geq_string_template
+                                          % (_no_negative_zero(bound)))
                     else:
-                        label = 'c_u_%s_' % con_symbol
-                    alias_symbol_func(symbol_map, constraint_data, label)
-                    output.append(label)
-                    output.append(':\n')
-                    offset = print_expr_canonical(repn,
-                                                  output,
-                                                  object_symbol_dictionary,
-                                                  variable_symbol_dictionary,
-                                                  False,
-                                                  column_order)
-                    bound = constraint_data.upper
-                    bound = _get_bound(bound) - offset
-                    output.append(leq_string_template
-                                      % (_no_negative_zero(bound)))
-                else:
-                    assert constraint_data.has_lb()
+                        assert constraint_data.has_ub()
+
+                    if constraint_data.has_ub():
+                        if constraint_data.has_lb():
+                            label = 'r_u_%s_' % con_symbol
+                        else:
+                            label = 'c_u_%s_' % con_symbol
+                        alias_symbol_func(symbol_map, constraint_data, label)
+                        output.append(label)
+                        output.append(':\n')
+                        offset = print_expr_canonical(repn,
+                                                      output,
+                                                      object_symbol_dictionary,
+                                                      variable_symbol_dictionary,
+                                                      False,
+                                                      column_order)
+                        bound = constraint_data.upper
+                        bound = _get_bound(bound) - offset
+                        output.append(leq_string_template
+                                          % (_no_negative_zero(bound)))
+                    else:
+                        assert constraint_data.has_lb()
 
-            # A simple hack to avoid caching super large files
-            if len(output) > 1024:
-                output_file.write( "".join(output) )
-                output = []
+                # A simple hack to avoid caching super large files
+                if len(output) > 1024:
+                    output_file.write( "".join(output) )
+                    output = []
 
         if not have_nontrivial:
             logger.warning('Empty constraint block written in LP format '  \
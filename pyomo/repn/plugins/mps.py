@@ -12,6 +12,7 @@
 # Problem Writer for (Free) MPS Format Files
 #
 
+import itertools
 import logging
 import math
 import operator
@@ -30,8 +31,17 @@ from pyomo.core.base import \
      ComponentMap, is_fixed)
 from pyomo.repn import generate_standard_repn
 
+try:
+    import numpy
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
 logger = logging.getLogger('pyomo.core')
 
+# The number of entries formatted at once by the bulk writer
+_BULK_ENTRY_CHUNK = 50000
+
 def _no_negative_zero(val):
     """Make sure -0 is never output. Makes diff tests easier."""
     if val == 0:
@@ -129,6 +139,16 @@ class ProblemWriter_mps(AbstractProblemWriter):
         skip_objective_sense = \
             io_options.pop("skip_objective_sense", False)
 
+        # A StandardRepnCache used to generate the standard
+        # representation of objectives and constraints.  Compiled
+        # representations are reused across writes of the same model.
+        repn_cache = io_options.pop("repn_cache", None)
+
+        # Assemble the matrix entries into sparse (coordinate) arrays
+        # and format the COLUMNS and RHS sections in large chunks
+        # instead of entry by entry.  Requires numpy.
+        bulk_write = io_options.pop("bulk_write", False)
+
         if len(io_options):
             raise ValueError(
                 "ProblemWriter_mps passed unrecognized io_options:\n\t" +
@@ -139,6 +159,10 @@ class ProblemWriter_mps(AbstractProblemWriter):
                              "'symbolic_solver_labels' and 'labeler' "
                              "I/O options is forbidden")
 
+        if bulk_write and not numpy_available:
+            raise ValueError("ProblemWriter_mps: The 'bulk_write' "
+                             "I/O option requires numpy")
+
         if symbolic_solver_labels:
             labeler = TextLabeler()
         elif labeler is None:
@@ -170,7 +194,9 @@ class ProblemWriter_mps(AbstractProblemWriter):
                     skip_trivial_constraints=skip_trivial_constraints,
                     force_objective_constant=force_objective_constant,
                     include_all_variable_bounds=include_all_variable_bounds,
-                    skip_objective_sense=skip_objective_sense)
+                    skip_objective_sense=skip_objective_sense,
+                    repn_cache=repn_cache,
+                    bulk_write=bulk_write)
 
         self._referenced_variable_ids.clear()
 
@@ -208,6 +234,103 @@ class ProblemWriter_mps(AbstractProblemWriter):
         #
         return repn.constant
 
+    def _extract_variable_coefficients_bulk(
+            self,
+            row_label,
+            repn,
+            entry_data,
+            quadratic_data,
+            variable_to_column):
+        """
+        A version of _extract_variable_coefficients that records the
+        linear terms in the (row label, column, coefficient) lists
+        of entry_data.  The variable_to_column argument maps
+        id(vardata) to the column index.
+        """
+        rows, cols, coefs = entry_data
+
+        #
+        # Linear
+        #
+        if len(repn.linear_coefs) > 0:
+            rows.extend([row_label]*len(repn.linear_coefs))
+            cols.extend([variable_to_column[id(vardata)]
+                         for vardata in repn.linear_vars])
+            coefs.extend(repn.linear_coefs)
+
+        #
+        # Quadratic
+        #
+        if len(repn.quadratic_coefs) > 0:
+            quad_terms = []
+            for vardata, coef in zip(repn.quadratic_vars, repn.quadratic_coefs):
+                self._referenced_variable_ids[id(vardata[0])] = vardata[0]
+                self._referenced_variable_ids[id(vardata[1])] = vardata[1]
+                quad_terms.append( (vardata, coef) )
+            quadratic_data.append((row_label, quad_terms))
+
+        #
+        # Return the constant
+        #
+        return repn.constant
+
+    def _print_columns_MPS_bulk(self,
+                                output_file,
+                                entry_data,
+                                variable_list,
+                                variable_symbol_dictionary,
+                                objective_label,
+                                include_all_variable_bounds):
+        """
+        Write the COLUMNS section entries for the model variables.
+
+        The entries collected by _extract_variable_coefficients_bulk
+        are sorted by column with a (stable) argsort, so that the
+        entries in a column retain the row order, and are then
+        formatted in chunks using one format string per chunk.
+        """
+        rows, cols, coefs = entry_data
+        nvars = len(variable_list)
+        cols = numpy.array(cols, dtype=numpy.int64)
+        rows = numpy.array(rows, dtype=object)
+        coefs = numpy.array(coefs, dtype=float)
+
+        # Record the referenced variables
+        for i in numpy.unique(cols).tolist():
+            vardata = variable_list[i]
+            self._referenced_variable_ids[id(vardata)] = vardata
+
+        if include_all_variable_bounds:
+            # add a (0 * var) term to the objective for each empty
+            # column (see the comment in _print_model_MPS)
+            empty = numpy.flatnonzero(
+                numpy.bincount(cols, minlength=nvars) == 0)
+            cols = numpy.concatenate((cols, empty))
+            rows = numpy.concatenate(
+                (rows, numpy.array([objective_label]*len(empty),
+                                   dtype=object)))
+            coefs = numpy.concatenate((coefs, numpy.zeros(len(empty))))
+
+        order = numpy.argsort(cols, kind='mergesort')
+        cols = cols[order]
+        rows = rows[order]
+        coefs = coefs[order]
+        # Make sure -0 is never output
+        coefs[coefs == 0] = 0
+
+        names = numpy.array([variable_symbol_dictionary[id(vardata)]
+                             for vardata in variable_list],
+                            dtype=object)
+        column_template = "     %s %s %"+self._precision_string+"\n"
+        nnz = len(cols)
+        for start in xrange(0, nnz, _BULK_ENTRY_CHUNK):
+            stop = min(start + _BULK_ENTRY_CHUNK, nnz)
+            args = numpy.empty(3*(stop-start), dtype=object)
+            args[0::3] = names[cols[start:stop]]
+            args[1::3] = rows[start:stop]
+            args[2::3] = coefs[start:stop].tolist()
+            output_file.write((column_template*(stop-start)) % tuple(args))
+
     def _printSOS(self,
                   symbol_map,
                   labeler,
@@ -264,7 +387,14 @@ class ProblemWriter_mps(AbstractProblemWriter):
                          skip_trivial_constraints=False,
                          force_objective_constant=False,
                          include_all_variable_bounds=False,
-                         skip_objective_sense=False):
+                         skip_objective_sense=False,
+                         repn_cache=None,
+                         bulk_write=False):
+
+        if repn_cache is None:
+            generate_repn = generate_standard_repn
+        else:
+            generate_repn = repn_cache.generate
 
         symbol_map = SymbolMap()
         variable_symbol_map = SymbolMap()
@@ -322,6 +452,19 @@ class ProblemWriter_mps(AbstractProblemWriter):
             (vardata, i) for i, vardata in enumerate(variable_list))
         # add one position for ONE_VAR_CONSTANT
         column_data = [[] for i in xrange(len(variable_list)+1)]
+        if bulk_write:
+            # the linear terms are collected into flat lists of
+            # (row, column, coefficient) entries instead of the
+            # per-column lists in column_data (only the last
+            # position, for ONE_VAR_CONSTANT, is used)
+            extract_variable_coefficients = \
+                self._extract_variable_coefficients_bulk
+            entry_data = ([], [], [])
+            entry_columns = dict((id(vardata), i)
+                                 for i, vardata in enumerate(variable_list))
+        else:
+            entry_data = column_data
+            entry_columns = variable_to_column
         quadobj_data = []
         quadmatrix_data = []
         # constraint rhs
@@ -384,7 +527,7 @@ class ProblemWriter_mps(AbstractProblemWriter):
 
                 if gen_obj_repn:
                     repn = \
-                        generate_standard_repn(objective_data.expr)
+                        generate_repn(objective_data.expr)
                     block_repn[objective_data] = repn
                 else:
                     repn = block_repn[objective_data]
@@ -403,9 +546,9 @@ class ProblemWriter_mps(AbstractProblemWriter):
                 constant = extract_variable_coefficients(
                     objective_label,
                     repn,
-                    column_data,
+                    entry_data,
                     quadobj_data,
-                    variable_to_column)
+                    entry_columns)
                 if force_objective_constant or (constant != 0.0):
                     # ONE_VAR_CONSTANT
                     column_data[-1].append((objective_label, constant))
@@ -442,7 +585,7 @@ class ProblemWriter_mps(AbstractProblemWriter):
                     if constraint_data._linear_canonical_form:
                         repn = constraint_data.canonical_form()
                     elif gen_con_repn:
-                        repn = generate_standard_repn(constraint_data.body)
+                        repn = generate_repn(constraint_data.body)
                         block_repn[constraint_data] = repn
                     else:
                         repn = block_repn[constraint_data]
@@ -486,9 +629,9 @@ class ProblemWriter_mps(AbstractProblemWriter):
                 offset = extract_variable_coefficients(
                     label,
                     repn,
-                    column_data,
+                    entry_data,
                     quadmatrix_data,
-                    variable_to_column)
+                    entry_columns)
                 bound = constraint_data.lower
                 bound = _get_bound(bound) - offset
                 rhs_data.append((label, _no_negative_zero(bound)))
@@ -503,9 +646,9 @@ class ProblemWriter_mps(AbstractProblemWriter):
                     offset = extract_variable_coefficients(
                         label,
                         repn,
-                        column_data,
+                        entry_data,
                         quadmatrix_data,
-                        variable_to_column)
+                        entry_columns)
                     bound = constraint_data.lower
                     bound = _get_bound(bound) - offset
                     rhs_data.append((label, _no_negative_zero(bound)))
@@ -522,9 +665,9 @@ class ProblemWriter_mps(AbstractProblemWriter):
                     offset = extract_variable_coefficients(
                         label,
                         repn,
-                        column_data,
+                        entry_data,
                         quadmatrix_data,
-                        variable_to_column)
+                        entry_columns)
                     bound = constraint_data.upper
                     bound = _get_bound(bound) - offset
                     rhs_data.append((label, _no_negative_zero(bound)))
@@ -542,32 +685,40 @@ class ProblemWriter_mps(AbstractProblemWriter):
         #
         column_template = "     %s %s %"+self._precision_string+"\n"
         output_file.write("COLUMNS\n")
-        cnt = 0
-        for vardata in variable_list:
-            col_entries = column_data[variable_to_column[vardata]]
-            cnt += 1
-            if len(col_entries) > 0:
-                var_label = variable_symbol_dictionary[id(vardata)]
-                for i, (row_label, coef) in enumerate(col_entries):
+        if bulk_write:
+            self._print_columns_MPS_bulk(output_file,
+                                         entry_data,
+                                         variable_list,
+                                         variable_symbol_dictionary,
+                                         objective_label,
+                                         include_all_variable_bounds)
+        else:
+            cnt = 0
+            for vardata in variable_list:
+                col_entries = column_data[variable_to_column[vardata]]
+                cnt += 1
+                if len(col_entries) > 0:
+                    var_label = variable_symbol_dictionary[id(vardata)]
+                    for i, (row_label, coef) in enumerate(col_entries):
+                        output_file.write(column_template
+                                          % (var_label,
+                                             row_label,
+                                             _no_negative_zero(coef)))
+                elif include_all_variable_bounds:
+                    # the column is empty, so add a (0 * var)
+                    # term to the objective
+                    # * Note that some solvers (e.g., Gurobi)
+                    #   will accept an empty column as a line
+                    #   with just the column name. This doesn't
+                    #   seem to work for CPLEX 12.6, so I am
+                    #   doing it this way so that it will work for both
+                    var_label = variable_symbol_dictionary[id(vardata)]
                     output_file.write(column_template
                                       % (var_label,
-                                         row_label,
-                                         _no_negative_zero(coef)))
-            elif include_all_variable_bounds:
-                # the column is empty, so add a (0 * var)
-                # term to the objective
-                # * Note that some solvers (e.g., Gurobi)
-                #   will accept an empty column as a line
-                #   with just the column name. This doesn't
-                #   seem to work for CPLEX 12.6, so I am
-                #   doing it this way so that it will work for both
-                var_label = variable_symbol_dictionary[id(vardata)]
-                output_file.write(column_template
-                                  % (var_label,
-                                     objective_label,
-                                     0))
+                                         objective_label,
+                                         0))
 
-        assert cnt == len(column_data)-1
+            assert cnt == len(column_data)-1
         if len(column_data[-1]) > 0:
             col_entries = column_data[-1]
             var_label = "ONE_VAR_CONSTANT"
@@ -582,9 +733,16 @@ class ProblemWriter_mps(AbstractProblemWriter):
         #
         rhs_template = "     RHS %s %"+self._precision_string+"\n"
         output_file.write("RHS\n")
-        for i, (row_label, rhs) in enumerate(rhs_data):
-            # note: we have already converted any -0 to 0 by this point
-            output_file.write(rhs_template % (row_label, rhs))
+        if bulk_write:
+            for start in xrange(0, len(rhs_data), _BULK_ENTRY_CHUNK):
+                chunk = rhs_data[start:start+_BULK_ENTRY_CHUNK]
+                output_file.write(
+                    (rhs_template*len(chunk))
+                    % tuple(itertools.chain.from_iterable(chunk)))
+        else:
+            for i, (row_label, rhs) in enumerate(rhs_data):
+                # note: we have already converted any -0 to 0 by this point
+                output_file.write(rhs_template % (row_label, rhs))
 
         # SOS constraints
         SOSlines = StringIO()
@@ -10,7 +10,7 @@
 
 from __future__ import division
 
-__all__ = ['StandardRepn', 'generate_standard_repn']
+__all__ = ['StandardRepn', 'generate_standard_repn', 'StandardRepnCache']
 
 
 import sys
@@ -34,11 +34,13 @@ from pyomo.core.base.expression import SimpleExpression, _GeneralExpressionData
 from pyomo.core.base.var import (SimpleVar,
                                  Var,
                                  _GeneralVarData,
+                                 _ArrayVarData,
                                  _VarData,
                                  value)
 from pyomo.core.base.param import _ParamData
 from pyomo.core.base.numvalue import (NumericConstant,
                                       native_numeric_types,
+                                      nonpyomo_leaf_types,
                                       is_fixed)
 from pyomo.core.kernel.expression import IIdentityExpression, expression, noclone
 from pyomo.core.kernel.variable import IVariable
@@ -52,6 +54,10 @@ try:
     basestring
 except:
     basestring = str
+try:
+    RecursionError
+except NameError:
+    RecursionError = RuntimeError
 
 logger = logging.getLogger('pyomo.core')
 
@@ -379,7 +385,19 @@ def generate_standard_repn(expr, idMap=None, compute_values=True, verbose=False,
         #                        verbose=verbose,
         #                        repn=repn)
         #else:
-        return _generate_standard_repn(expr,
+        try:
+            return _generate_standard_repn(expr,
+                                idMap=idMap,
+                                compute_values=compute_values,
+                                verbose=verbose,
+                                quadratic=quadratic,
+                                repn=repn)
+        except RecursionError:
+            #
+            # The expression is nested too deeply for the recursive
+            # collector.  Start over using the iterative collector.
+            #
+            return _generate_standard_repn_iterative(expr,
                                 idMap=idMap,
                                 compute_values=compute_values,
                                 verbose=verbose,
@@ -601,6 +619,14 @@ def _collect_prod(exp, multiplier, idMap, compute_values, verbose, quadratic):
     #
     rhs = _collect_standard_repn(exp._args_[1], 1, idMap,
                                   compute_values, verbose, quadratic)
+    return _multiply_results(exp, multiplier, lhs, rhs, idMap, quadratic)
+
+def _multiply_results(exp, multiplier, lhs, rhs, idMap, quadratic):
+    #
+    # Combine the repns of the LHS and RHS of a product.  The LHS is
+    # known not to be constant.
+    #
+    lhs_nonl_None = lhs.nonl.__class__ in native_numeric_types and lhs.nonl == 0
     rhs_nonl_None = rhs.nonl.__class__ in native_numeric_types and rhs.nonl == 0
     #
     # If RHS is zero, then return an empty results
@@ -900,6 +926,7 @@ _repn_collectors = {
     #parameter               : _collect_linear_const,
     NumericConstant                             : _collect_const,
     _GeneralVarData                             : _collect_var,
+    _ArrayVarData                               : _collect_var,
     SimpleVar                                   : _collect_var,
     Var                                         : _collect_var,
     variable                                    : _collect_var,
@@ -916,11 +943,10 @@ _repn_collectors = {
     }
 
 
-def _collect_standard_repn(exp, multiplier, idMap,
-                                      compute_values, verbose, quadratic):
+def _lookup_repn_collector(exp):
     fn = _repn_collectors.get(exp.__class__, None)
     if fn is not None:
-        return fn(exp, multiplier, idMap, compute_values, verbose, quadratic)
+        return fn
     #
     # These are types that might be extended using duck typing.
     #
@@ -933,10 +959,18 @@ def _collect_standard_repn(exp, multiplier, idMap,
         pass
     if fn is not None:
         _repn_collectors[exp.__class__] = fn
-        return fn(exp, multiplier, idMap, compute_values, verbose, quadratic)
+        return fn
     raise ValueError( "Unexpected expression (type %s)" % type(exp).__name__)       # TODO: coverage?
 
 
+def _collect_standard_repn(exp, multiplier, idMap,
+                                      compute_values, verbose, quadratic):
+    fn = _repn_collectors.get(exp.__class__, None)
+    if fn is None:
+        fn = _lookup_repn_collector(exp)
+    return fn(exp, multiplier, idMap, compute_values, verbose, quadratic)
+
+
 def _generate_standard_repn(expr, idMap=None, compute_values=True, verbose=False, quadratic=True, repn=None):
     if expr.__class__ is EXPR.SumExpression:
         #
@@ -948,6 +982,10 @@ def _generate_standard_repn(expr, idMap=None, compute_values=True, verbose=False
         # Call generic recursive logic
         #
         ans = _collect_standard_repn(expr, 1, idMap, compute_values, verbose, quadratic)
+    return _finalize_standard_repn(ans, idMap, quadratic, repn)
+
+
+def _finalize_standard_repn(ans, idMap, quadratic, repn):
     #
     # Create the final object here from 'ans'
     #
@@ -1015,6 +1053,598 @@ def _generate_standard_repn(expr, idMap=None, compute_values=True, verbose=False
     return repn
 
 
+##-----------------------------------------------------------------------
+##
+## Logic for _generate_standard_repn_iterative
+##
+##-----------------------------------------------------------------------
+
+#
+# The iterative collector produces the same results as the recursive
+# _collect_* functions above, but walks the expression with a
+# StreamBasedExpressionVisitor so that the depth of the expression is
+# not limited by the Python recursion limit.  Every node on the path
+# from the root to the current node has a frame on an explicit stack.
+# A frame records the multiplier applied to its node, decides which
+# children are collected (and with what multiplier), and combines the
+# child results when the node is exited.
+#
+
+class _RepnFrame(object):
+    """
+    A node whose result is either known when the node is entered, or
+    is the result of a single child collected with a given multiplier.
+    """
+
+    __slots__ = ('args', 'child_multiplier', 'result')
+
+    def __init__(self, args=(), child_multiplier=1, result=None):
+        self.args = args
+        self.child_multiplier = child_multiplier
+        self.result = result
+
+    def before(self, visitor, child):
+        visitor.multiplier = self.child_multiplier
+        return True
+
+    def accept(self, visitor, result):
+        self.result = result
+
+    def exit(self, visitor):
+        return self.result
+
+
+class _SumFrame(object):
+
+    __slots__ = ('args', 'multiplier', 'ans', 'nonl')
+
+    def __init__(self, visitor, exp, multiplier):
+        self.multiplier = multiplier
+        self.ans = Results()
+        self.nonl = []
+        #
+        # Add the leading simple terms without involving the walker.
+        # Terms after the first nested expression are processed in
+        # before() so that the order of the linear terms matches the
+        # recursive collector.
+        #
+        args = exp.args
+        for i, e_ in enumerate(args):
+            if self.before(visitor, e_):
+                self.args = args[i:]
+                break
+        else:
+            self.args = ()
+
+    def before(self, visitor, e_):
+        #
+        # Simple terms are added directly to the results of the sum
+        #
+        ans = self.ans
+        multiplier = self.multiplier
+        compute_values = visitor.compute_values
+        if e_.__class__ is EXPR.MonomialTermExpression:
+            lhs, v = e_._args_
+            if compute_values and not lhs.__class__ in native_numeric_types:
+                lhs = value(lhs)
+            if v.fixed:
+                if compute_values:
+                    ans.constant += multiplier*lhs*value(v)
+                else:
+                    ans.constant += multiplier*lhs*v
+            else:
+                key = visitor.var_key(v)
+                if key in ans.linear:
+                    ans.linear[key] += multiplier*lhs
+                else:
+                    ans.linear[key] = multiplier*lhs
+        elif e_.__class__ in native_numeric_types:
+            ans.constant += multiplier*e_
+        elif e_.is_variable_type():
+            if e_.fixed:
+                if compute_values:
+                    ans.constant += multiplier*e_.value
+                else:
+                    ans.constant += multiplier*e_
+            else:
+                key = visitor.var_key(e_)
+                if key in ans.linear:
+                    ans.linear[key] += multiplier
+                else:
+                    ans.linear[key] = multiplier
+        elif not e_.is_potentially_variable():
+            if compute_values:
+                ans.constant += multiplier * value(e_)
+            else:
+                ans.constant += multiplier * e_
+        else:
+            visitor.multiplier = multiplier
+            return True
+        return False
+
+    def accept(self, visitor, res_):
+        if res_ is None:
+            return
+        ans = self.ans
+        ans.constant += res_.constant
+        if not (res_.nonl.__class__ in native_numeric_types and res_.nonl == 0):
+            self.nonl.append(res_.nonl)
+        for i in res_.linear:
+            ans.linear[i] = ans.linear.get(i,0) + res_.linear[i]
+        if visitor.quadratic:
+            for i in res_.quadratic:
+                ans.quadratic[i] = ans.quadratic.get(i, 0) + res_.quadratic[i]
+
+    def exit(self, visitor):
+        nonl = self.nonl
+        if len(nonl) > 0:
+            if len(nonl) == 1:
+                self.ans.nonl = nonl[0]
+            else:
+                self.ans.nonl = EXPR.SumExpression(nonl)
+        return self.ans
+
+
+class _ProductFrame(object):
+    """
+    A product where both factors are potentially variable.  The LHS is
+    collected first; if it turns out to be constant, the RHS is
+    collected using the LHS as multiplier.
+    """
+
+    __slots__ = ('exp', 'args', 'multiplier', 'lhs', 'rhs_multiplier',
+                 'passthrough', 'result')
+
+    def __init__(self, visitor, exp, multiplier):
+        self.exp = exp
+        self.args = exp._args_
+        self.multiplier = multiplier
+        self.lhs = None
+        self.rhs_multiplier = 1
+        self.passthrough = False
+        self.result = None
+
+    def before(self, visitor, child):
+        if self.lhs is not None and self.result is not None:
+            return False
+        visitor.multiplier = self.rhs_multiplier
+        return True
+
+    def accept(self, visitor, res):
+        if self.lhs is not None:
+            if self.passthrough:
+                self.result = res
+            elif res is not None:
+                self.result = _multiply_results(
+                    self.exp, self.multiplier, self.lhs, res,
+                    visitor.idMap, visitor.quadratic)
+            return
+        lhs = self.lhs = res
+        #
+        # LHS is potentially variable, but it turns out to be a constant
+        # because the variables were fixed.
+        #
+        if lhs.nonl.__class__ in native_numeric_types and lhs.nonl == 0 \
+           and len(lhs.linear) == 0 \
+           and (not visitor.quadratic or len(lhs.quadratic) == 0):
+            if lhs.constant.__class__ in native_numeric_types and lhs.constant == 0:
+                self.result = Results()
+            elif visitor.compute_values:
+                val = value(lhs.constant)
+                if val == 0:
+                    self.result = Results()
+                else:
+                    self.rhs_multiplier = self.multiplier*val
+                    self.passthrough = True
+            else:
+                self.rhs_multiplier = self.multiplier*lhs.constant
+                self.passthrough = True
+
+    def exit(self, visitor):
+        return self.result
+
+
+class _SquareFrame(object):
+    """The base of a power with exponent 2 (when collecting quadratics)"""
+
+    __slots__ = ('exp', 'args', 'multiplier', 'exponent', 'result')
+
+    def __init__(self, exp, multiplier, exponent):
+        self.exp = exp
+        self.args = (exp._args_[0],)
+        self.multiplier = multiplier
+        self.exponent = exponent
+        self.result = None
+
+    def before(self, visitor, child):
+        visitor.multiplier = 1
+        return True
+
+    def accept(self, visitor, result):
+        self.result = result
+
+    def exit(self, visitor):
+        res = self.result
+        multiplier = self.multiplier
+        #
+        # If arg(0) is nonlinear, then this is a nonlinear repn
+        #
+        if not (res.nonl.__class__ in native_numeric_types and res.nonl == 0) or len(res.quadratic) > 0:
+            return Results(nonl=multiplier*self.exp)
+        #
+        # If computing values and no linear terms, then the return a constant repn
+        #
+        elif visitor.compute_values and len(res.linear) == 0:
+            return Results(constant=multiplier*res.constant**self.exponent)
+        #
+        # If there is one linear term, then we compute the quadratic expression for it.
+        #
+        elif len(res.linear) == 1:
+            key, coef = res.linear.popitem()
+            ans = Results()
+            if not (res.constant.__class__ in native_numeric_types and res.constant == 0):
+                ans.constant = multiplier*res.constant*res.constant
+                ans.linear[key] = 2*multiplier*coef*res.constant
+            ans.quadratic[key,key] = multiplier*coef*coef
+            return ans
+        return _pow_results(visitor, self.exp, multiplier, self.exponent)
+
+
+def _pow_results(visitor, exp, multiplier, exponent):
+    #
+    # If args(0) is a numeric value or it is fixed, then we have a constant value
+    #
+    if exp._args_[0].__class__ in native_numeric_types or exp._args_[0].is_fixed():
+        if visitor.compute_values:
+            return Results(constant=multiplier*value(exp._args_[0])**exponent)
+        else:
+            return Results(constant=multiplier*exp)
+    #
+    # Return a nonlinear expression here
+    #
+    return Results(nonl=multiplier*exp)
+
+
+def _pow_frame(visitor, exp, multiplier, exponent):
+    if exponent.__class__ in native_numeric_types:
+        if exponent == 0:
+            return _RepnFrame(result=Results(constant=multiplier))
+        elif exponent == 1:
+            return _RepnFrame((exp._args_[0],), multiplier)
+        elif exponent == 2 and visitor.quadratic:
+            return _SquareFrame(exp, multiplier, exponent)
+    return _RepnFrame(result=_pow_results(visitor, exp, multiplier, exponent))
+
+
+class _DelegatingFrame(object):
+    """
+    A node whose first child must be collected before deciding how the
+    remaining children are processed.  Once the first child is known,
+    the work is delegated to another frame.
+    """
+
+    __slots__ = ('exp', 'args', 'multiplier', 'count', 'first', 'frame')
+
+    def __init__(self, exp, args, multiplier):
+        self.exp = exp
+        self.args = args
+        self.multiplier = multiplier
+        self.count = 0
+        self.first = None
+        self.frame = None
+
+    def before(self, visitor, child):
+        self.count += 1
+        if self.count == 1:
+            visitor.multiplier = 1
+            return True
+        if self.select(self.count) and self.frame.args:
+            return self.frame.before(visitor, child)
+        return False
+
+    def accept(self, visitor, result):
+        if self.frame is None:
+            self.first = result
+            self.frame = self.delegate(visitor, result)
+        elif result is not None:
+            self.frame.accept(visitor, result)
+
+    def exit(self, visitor):
+        return self.frame.exit(visitor)
+
+    def select(self, count):
+        return True
+
+
+class _PowFrame(_DelegatingFrame):
+    """A power with a potentially variable exponent"""
+
+    __slots__ = ()
+
+    def __init__(self, visitor, exp, multiplier):
+        _DelegatingFrame.__init__(self, exp, (exp._args_[1], exp._args_[0]),
+                                  multiplier)
+
+    def delegate(self, visitor, res):
+        #
+        # If the expression is variable, then return a nonlinear expression
+        #
+        if not (res.nonl.__class__ in native_numeric_types and res.nonl == 0) or len(res.linear) > 0 or (visitor.quadratic and len(res.quadratic) > 0):
+            return _RepnFrame(result=Results(nonl=self.multiplier*self.exp))
+        return _pow_frame(visitor, self.exp, self.multiplier, res.constant)
+
+
+def _branch_frame(visitor, exp, multiplier, if_val):
+    if if_val:
+        if exp._then.__class__ in native_numeric_types:
+            return _RepnFrame(result=Results(constant=multiplier*exp._then))
+        return _RepnFrame((exp._then,), multiplier)
+    else:
+        if exp._else.__class__ in native_numeric_types:
+            return _RepnFrame(result=Results(constant=multiplier*exp._else))
+        return _RepnFrame((exp._else,), multiplier)
+
+
+class _BranchFrame(_DelegatingFrame):
+    """An Expr_if with a potentially variable condition"""
+
+    __slots__ = ('if_val',)
+
+    def __init__(self, visitor, exp, multiplier):
+        _DelegatingFrame.__init__(self, exp, (exp._if, exp._then, exp._else),
+                                  multiplier)
+        self.if_val = None
+
+    def select(self, count):
+        # Only one of the THEN (count 2) and ELSE (count 3) branches
+        # is collected
+        return bool(self.if_val) == (count == 2)
+
+    def delegate(self, visitor, res):
+        if not (res.nonl.__class__ in native_numeric_types and res.nonl == 0) or len(res.linear) > 0 or (visitor.quadratic and len(res.quadratic) > 0):
+            return _RepnFrame(result=Results(nonl=self.multiplier*self.exp))
+        elif res.constant.__class__ in native_numeric_types:
+            self.if_val = res.constant
+            return _branch_frame(visitor, self.exp, self.multiplier,
+                                 res.constant)
+        else:
+            return _RepnFrame(result=Results(constant=self.multiplier*self.exp))
+
+
+class _ArgumentFrame(object):
+    """
+    A node whose (single) argument is collected with multiplier 1 and
+    then post-processed.
+    """
+
+    __slots__ = ('exp', 'args', 'multiplier', 'result')
+
+    def __init__(self, visitor, exp, multiplier):
+        self.exp = exp
+        self.args = (exp._args_[0],)
+        self.multiplier = multiplier
+        self.result = None
+
+    def before(self, visitor, child):
+        visitor.multiplier = 1
+        return True
+
+    def accept(self, visitor, result):
+        self.result = result
+
+    def exit(self, visitor):
+        res = self.result
+        if not (res.nonl.__class__ in native_numeric_types and res.nonl == 0) or len(res.linear) > 0 or (visitor.quadratic and len(res.quadratic) > 0):
+            return Results(nonl=self.multiplier*self.exp)
+        return self.constant(visitor, res.constant)
+
+
+class _ReciprocalFrame(_ArgumentFrame):
+
+    __slots__ = ()
+
+    def constant(self, visitor, constant):
+        denom = 1.0*constant
+        if denom.__class__ in native_numeric_types and denom == 0:
+            raise ZeroDivisionError
+        return Results(constant=self.multiplier/denom)
+
+
+class _NonlFrame(_ArgumentFrame):
+
+    __slots__ = ()
+
+    def constant(self, visitor, constant):
+        if visitor.compute_values:
+            return Results(constant=self.multiplier*self.exp._apply_operation([constant]))
+        else:
+            return Results(constant=self.multiplier*self.exp)
+
+
+def _enter_leaf(fn):
+    def _enter(visitor, exp, multiplier):
+        return _RepnFrame(result=fn(exp, multiplier, visitor.idMap,
+                                    visitor.compute_values, False,
+                                    visitor.quadratic))
+    return _enter
+
+def _enter_term(visitor, exp, multiplier):
+    lhs = exp._args_[0]
+    if lhs.__class__ in native_numeric_types:
+        if lhs == 0:
+            return _RepnFrame(result=Results())
+        return _RepnFrame((exp._args_[1],), multiplier * lhs)
+    elif visitor.compute_values:
+        val = value(lhs)
+        if val == 0:
+            return _RepnFrame(result=Results())
+        return _RepnFrame((exp._args_[1],), multiplier * val)
+    else:
+        return _RepnFrame((exp._args_[1],), multiplier*lhs)
+
+def _enter_prod(visitor, exp, multiplier):
+    lhs, rhs = exp._args_
+    if lhs.__class__ in native_numeric_types:
+        if lhs == 0:
+            return _RepnFrame(result=Results())
+        return _RepnFrame((rhs,), multiplier * lhs)
+    if rhs.__class__ in native_numeric_types:
+        if rhs == 0:
+            return _RepnFrame(result=Results())
+        return _RepnFrame((lhs,), multiplier * rhs)
+    elif not lhs.is_potentially_variable():
+        if visitor.compute_values:
+            val = value(lhs)
+            if val == 0:
+                return _RepnFrame(result=Results())
+            return _RepnFrame((rhs,), multiplier * val)
+        return _RepnFrame((rhs,), multiplier*lhs)
+    elif not rhs.is_potentially_variable():
+        if visitor.compute_values:
+            val = value(rhs)
+            if val == 0:
+                return _RepnFrame(result=Results())
+            return _RepnFrame((lhs,), multiplier * val)
+        return _RepnFrame((lhs,), multiplier*rhs)
+    return _ProductFrame(visitor, exp, multiplier)
+
+def _enter_pow(visitor, exp, multiplier):
+    exponent = exp._args_[1]
+    if exponent.__class__ in native_numeric_types:
+        pass
+    elif not exponent.is_potentially_variable():
+        if visitor.compute_values:
+            exponent = value(exponent)
+    else:
+        return _PowFrame(visitor, exp, multiplier)
+    return _pow_frame(visitor, exp, multiplier, exponent)
+
+def _enter_reciprocal(visitor, exp, multiplier):
+    arg = exp._args_[0]
+    if arg.__class__ in native_numeric_types or not arg.is_potentially_variable():
+        if visitor.compute_values:
+            denom = 1.0 * value(arg)
+        else:
+            denom = 1.0 * arg
+        if denom.__class__ in native_numeric_types and denom == 0:
+            raise ZeroDivisionError
+        return _RepnFrame(result=Results(constant=multiplier/denom))
+    return _ReciprocalFrame(visitor, exp, multiplier)
+
+def _enter_branching_expr(visitor, exp, multiplier):
+    if exp._if.__class__ in native_numeric_types:
+        if_val = exp._if
+    elif not exp._if.is_potentially_variable():
+        if visitor.compute_values:
+            if_val = value(exp._if)
+        else:
+            return _RepnFrame(result=Results(nonl=multiplier*exp))
+    else:
+        return _BranchFrame(visitor, exp, multiplier)
+    return _branch_frame(visitor, exp, multiplier, if_val)
+
+def _enter_negation(visitor, exp, multiplier):
+    return _RepnFrame((exp._args_[0],), -1*multiplier)
+
+def _enter_identity(visitor, exp, multiplier):
+    arg = exp._args_[0]
+    if arg.__class__ in native_numeric_types:
+        return _RepnFrame(result=Results(constant=multiplier*arg))
+    if not arg.is_potentially_variable():
+        if visitor.compute_values:
+            return _RepnFrame(result=Results(constant=multiplier*value(arg)))
+        else:
+            return _RepnFrame(result=Results(constant=multiplier*arg))
+    return _RepnFrame((exp.expr,), multiplier)
+
+
+#
+# Map the recursive collector for each expression type to the function
+# that creates the corresponding frame in the iterative collector
+#
+_repn_frame_builders = {
+    _collect_sum                : _SumFrame,
+    _collect_prod               : _enter_prod,
+    _collect_term               : _enter_term,
+    _collect_pow                : _enter_pow,
+    _collect_reciprocal         : _enter_reciprocal,
+    _collect_branching_expr     : _enter_branching_expr,
+    _collect_nonl               : _NonlFrame,
+    _collect_negation           : _enter_negation,
+    _collect_identity           : _enter_identity,
+    _collect_linear             : _enter_leaf(_collect_linear),
+    _collect_comparison         : _enter_leaf(_collect_comparison),
+    _collect_external_fn        : _enter_leaf(_collect_external_fn),
+    _collect_const              : _enter_leaf(_collect_const),
+    _collect_var                : _enter_leaf(_collect_var),
+    }
+
+
+class _StandardRepnVisitor(EXPR.StreamBasedExpressionVisitor):
+
+    def __init__(self, idMap, compute_values, quadratic):
+        EXPR.StreamBasedExpressionVisitor.__init__(self)
+        self.idMap = idMap
+        self.varkeys = idMap[None]
+        self.compute_values = compute_values
+        self.quadratic = quadratic
+        # The multiplier for the next node that is entered
+        self.multiplier = 1
+        self.frames = []
+
+    def var_key(self, v):
+        id_ = id(v)
+        varkeys = self.varkeys
+        if id_ in varkeys:
+            return varkeys[id_]
+        key = len(self.idMap) - 1
+        varkeys[id_] = key
+        self.idMap[key] = v
+        return key
+
+    def enterNode(self, node):
+        fn = _repn_collectors.get(node.__class__, None)
+        if fn is None:
+            fn = _lookup_repn_collector(node)
+        frame = _repn_frame_builders[fn](self, node, self.multiplier)
+        self.frames.append(frame)
+        return frame.args, frame
+
+    def beforeChild(self, node, child):
+        return self.frames[-1].before(self, child), None
+
+    def acceptChildResult(self, node, frame, child_result):
+        frame.accept(self, child_result)
+        return frame
+
+    def exitNode(self, node, frame):
+        self.frames.pop()
+        return frame.exit(self)
+
+
+def _generate_standard_repn_iterative(expr, idMap=None, compute_values=True, verbose=False, quadratic=True, repn=None):
+    """
+    Generate the standard repn of an expression without recursion.
+
+    This produces the same result as _generate_standard_repn, but uses
+    an explicit stack, so it can process expressions that are nested
+    more deeply than the Python recursion limit allows.
+    """
+    global Results
+    if quadratic:
+        Results = ResultsWithQuadratics
+    else:
+        Results = ResultsWithoutQuadratics
+    if idMap is None:
+        idMap = {}
+    idMap.setdefault(None, {})
+    if repn is None:
+        repn = StandardRepn()
+    visitor = _StandardRepnVisitor(idMap, compute_values, quadratic)
+    ans = visitor.walk_expression(expr)
+    return _finalize_standard_repn(ans, idMap, quadratic, repn)
+
+
 """
 WEH - This code assumes the expression is linear and fills in a dictionary.
       This avoids creating temporary Results objects, but in practice that's
@@ -1290,6 +1920,7 @@ _linear_repn_collectors = {
     ##param.Param             : _collect_linear_const,
     ##parameter               : _collect_linear_const,
     _GeneralVarData                             : _linear_collect_var,
+    _ArrayVarData                               : _linear_collect_var,
     SimpleVar                                   : _linear_collect_var,
     Var                                         : _linear_collect_var,
     variable                                    : _linear_collect_var,
@@ -1352,6 +1983,272 @@ def _generate_linear_standard_repn(expr, idMap=None, compute_values=True, verbos
 """
 
 
+##-----------------------------------------------------------------------
+##
+## Logic for StandardRepnCache
+##
+##-----------------------------------------------------------------------
+
+class _StandardRepnTemplate(object):
+    """
+    The compiled form of a polynomial expression.
+
+    The template is a standard representation generated with
+    compute_values=False, so the coefficients and the constant are
+    (possibly constant) expressions in terms of mutable parameters and
+    fixed variables.  The template also records the information needed
+    to decide if it is still valid: the fixed status of every variable
+    in the expression and the expressions stored in every named
+    sub-expression.
+    """
+
+    __slots__ = ('expr',              # The compiled expression
+                 'compiled',          # False if the expression is nonlinear
+                 'quadratic',         # The quadratic flag used to compile
+                 'drop_zeros',        # Drop linear terms with zero coefficients
+                 'dependencies',      # The ExpressionDependencies of expr
+                 'constant',          # The constant (expression)
+                 'linear_vars',
+                 'linear_coefs',      # Native linear coefficients
+                 'linear_exprs',      # (index, expr) for non-native coefficients
+                 'quadratic_vars',
+                 'quadratic_coefs',   # Native quadratic coefficients
+                 'quadratic_exprs')   # (index, expr) for non-native coefficients
+
+    def __init__(self, expr, quadratic):
+        self.expr = expr
+        self.quadratic = quadratic
+        self.drop_zeros = expr.__class__ is not EXPR.LinearExpression
+        self.dependencies = ExpressionDependencies((expr,),
+                                                   track_values=False)
+
+        repn = generate_standard_repn(expr,
+                                      compute_values=False,
+                                      quadratic=quadratic)
+        #
+        # Nonlinear expressions are not compiled, but we keep the
+        # template so that we do not try to compile them again
+        #
+        self.compiled = repn.nonlinear_expr is None
+        if not self.compiled:
+            return
+        self.constant = repn.constant
+        self.linear_vars = repn.linear_vars
+        self.linear_coefs, self.linear_exprs \
+            = _split_template_coefs(repn.linear_coefs)
+        self.quadratic_vars = repn.quadratic_vars
+        self.quadratic_coefs, self.quadratic_exprs \
+            = _split_template_coefs(repn.quadratic_coefs)
+
+    def is_valid(self, expr, quadratic):
+        if quadratic != self.quadratic:
+            return False
+        return self.dependencies.is_valid((expr,))
+
+    def instantiate(self, repn):
+        const = self.constant
+        if const.__class__ in native_numeric_types:
+            repn.constant = const
+        else:
+            repn.constant = value(const)
+
+        repn.linear_vars, repn.linear_coefs = _instantiate_template_coefs(
+            self.linear_vars, self.linear_coefs, self.linear_exprs,
+            self.drop_zeros)
+        if self.quadratic_vars:
+            repn.quadratic_vars, repn.quadratic_coefs \
+                = _instantiate_template_coefs(
+                    self.quadratic_vars, self.quadratic_coefs,
+                    self.quadratic_exprs, self.drop_zeros)
+        return repn
+
+
+def _instantiate_template_coefs(vars_, coefs, exprs, drop_zeros):
+    """
+    Evaluate the coefficient expressions in a template.  Terms whose
+    coefficient expression evaluates to zero are dropped (as
+    generate_standard_repn does when computing values).
+    """
+    if not exprs:
+        return vars_, coefs
+    coefs = list(coefs)
+    zeros = []
+    for i, c in exprs:
+        coefs[i] = val = value(c)
+        if val == 0:
+            zeros.append(i)
+    if zeros and drop_zeros:
+        zeros = set(zeros)
+        keep = [i for i in range(len(coefs)) if i not in zeros]
+        return tuple(vars_[i] for i in keep), tuple(coefs[i] for i in keep)
+    return vars_, tuple(coefs)
+
+
+def _split_template_coefs(coefs):
+    """Separate native coefficients from coefficient expressions"""
+    native = list(coefs)
+    exprs = []
+    for i, c in enumerate(coefs):
+        if c.__class__ not in native_numeric_types:
+            exprs.append((i, c))
+            native[i] = None
+    return tuple(native), tuple(exprs)
+
+
+def _expression_dependencies(exprs):
+    """
+    Return the unique variables, mutable parameters and (named
+    expression, expression) pairs that appear in a sequence of
+    expressions.
+    """
+    variables = []
+    params = []
+    named = []
+    seen = set()
+    stack = list(exprs)
+    while stack:
+        node = stack.pop()
+        if node.__class__ in nonpyomo_leaf_types:
+            continue
+        if node.is_variable_type() or node.is_parameter_type():
+            if id(node) not in seen:
+                seen.add(id(node))
+                if node.is_variable_type():
+                    variables.append(node)
+                elif not node.is_constant():
+                    params.append(node)
+        elif not node.is_expression_type():
+            continue
+        elif node.__class__ is EXPR.LinearExpression:
+            stack.append(node.constant)
+            stack.extend(node.linear_vars)
+            stack.extend(node.linear_coefs)
+        else:
+            if node.is_named_expression_type():
+                named.append((node, node.expr))
+            stack.extend(node.args)
+    return tuple(variables), tuple(params), tuple(named)
+
+
+class ExpressionDependencies(object):
+    """
+    The variables, mutable parameters and named sub-expressions that
+    appear in a tuple of expressions, recorded so that data derived
+    from the expressions (e.g., a compiled or cached standard
+    representation) can be checked for staleness.
+
+    The recorded state is invalid once one of the expression objects
+    is replaced, a named sub-expression is assigned a new expression,
+    or a variable is fixed or unfixed.  If track_values is True, it is
+    also invalid once the value of a fixed variable or of a mutable
+    parameter changes.
+    """
+
+    __slots__ = ('exprs', 'variables', 'params', 'named',
+                 'track_values', 'state')
+
+    def __init__(self, exprs, track_values=True):
+        self.exprs = tuple(exprs)
+        self.track_values = track_values
+        self.variables, self.params, self.named = \
+            _expression_dependencies(self.exprs)
+        self.state = self.current_state()
+
+    def current_state(self):
+        if not self.track_values:
+            return tuple(v.fixed for v in self.variables)
+        return (tuple((v.fixed, v.value if v.fixed else None)
+                      for v in self.variables),
+                tuple(p() for p in self.params))
+
+    def is_valid(self, exprs):
+        if len(exprs) != len(self.exprs):
+            return False
+        for expr, old_expr in zip(exprs, self.exprs):
+            if expr is not old_expr:
+                return False
+        for e, e_expr in self.named:
+            if e.expr is not e_expr:
+                return False
+        return self.current_state() == self.state
+
+
+class StandardRepnCache(object):
+    """
+    A cache of compiled standard representations.
+
+    The first time an expression is processed, a template is compiled
+    that records the structure of the standard representation (the
+    variables and the coefficient expressions in terms of mutable
+    parameters).  Later calls to :meth:`generate` for the same
+    expression object only re-evaluate the coefficients, skipping the
+    walk of the expression tree.
+
+    A template is recompiled if the expression object changes (e.g.,
+    the constraint was given a new expression), a variable in the
+    expression is fixed or unfixed, or a named sub-expression is
+    assigned a new expression.  Expressions that are not polynomial
+    (of degree 2 or less) are never cached.
+
+    The cache is keyed by expression identity, so it holds references
+    to all expressions it has compiled.  Call :meth:`clear` to release
+    them.
+
+    Example:
+
+        >>> cache = StandardRepnCache()
+        >>> repn = cache.generate(model.c.body)
+
+    or, to use the cache when writing LP or MPS files,
+
+        >>> opt.solve(model, io_options={'repn_cache': cache})
+    """
+
+    def __init__(self):
+        self._templates = {}
+
+    def __len__(self):
+        return len(self._templates)
+
+    def clear(self):
+        """Discard all compiled templates"""
+        self._templates = {}
+
+    def discard(self, expr):
+        """Discard the compiled template for an expression"""
+        self._templates.pop(id(expr), None)
+
+    def generate(self, expr, quadratic=True, repn=None):
+        """
+        Return the standard representation of an expression, computing
+        values of mutable parameters and fixed variables.
+
+        Args:
+            expr: The expression.
+            quadratic (bool): If :const:`True`, then quadratic terms
+                are collected.  Defaults to :const:`True`.
+            repn: An optional :class:`StandardRepn` that is populated.
+
+        Returns:
+            A :class:`StandardRepn` object.
+        """
+        if expr.__class__ in native_numeric_types \
+           or not expr.is_potentially_variable():
+            return generate_standard_repn(expr, quadratic=quadratic, repn=repn)
+
+        key = id(expr)
+        template = self._templates.get(key, None)
+        if template is None or not template.is_valid(expr, quadratic):
+            template = _StandardRepnTemplate(expr, quadratic)
+            self._templates[key] = template
+
+        if not template.compiled:
+            return generate_standard_repn(expr, quadratic=quadratic, repn=repn)
+        if repn is None:
+            repn = StandardRepn()
+        return template.instantiate(repn)
+
+
 ##-----------------------------------------------------------------------
 ##
 ## Functions to preprocess blocks
@@ -0,0 +1,244 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+#
+# Test the binary NL file format
+#
+
+import struct
+import sys
+
+import pyutilib.th as unittest
+from pyutilib.services import TempfileManager
+
+from pyomo.environ import (ConcreteModel, Var, Param, Constraint,
+                           Objective, Suffix, SOSConstraint, sin, exp,
+                           log, Expr_if, Binary, NonNegativeReals)
+
+# Operators that take two (or three) operands; sumlist (o54) and
+# external functions carry an explicit argument count, everything
+# else is unary.
+_binary_ops = set((0, 1, 2, 3, 4, 5, 6, 20, 21, 22, 23, 24, 25, 26,
+                   27, 28, 29, 30, 48, 55, 56, 57, 58, 73))
+_ternary_ops = set((35, 65, 72))
+
+
+class _BinaryNLReader(object):
+    """Decode a binary NL file into the line/token structure of the
+    equivalent text NL file."""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+        self.lines = []
+
+    def _unpack(self, fmt):
+        vals = struct.unpack_from(fmt, self.data, self.pos)
+        self.pos += struct.calcsize(fmt)
+        return vals
+
+    def _char(self):
+        c = self.data[self.pos:self.pos+1].decode('ascii')
+        self.pos += 1
+        return c
+
+    def _string(self):
+        n, = self._unpack('=i')
+        s = self.data[self.pos:self.pos+n].decode('utf-8')
+        self.pos += n
+        return n, s
+
+    def _expr(self):
+        key = self._char()
+        if key == 'o':
+            op, = self._unpack('=i')
+            self.lines.append(['o', op])
+            if op == 54:
+                n, = self._unpack('=i')
+                self.lines.append([n])
+            elif op in _ternary_ops:
+                n = 3
+            elif op in _binary_ops:
+                n = 2
+            else:
+                n = 1
+            for i in range(n):
+                self._expr()
+        elif key == 'n':
+            self.lines.append(['n'] + list(self._unpack('=d')))
+        elif key == 'v':
+            self.lines.append(['v'] + list(self._unpack('=i')))
+        elif key == 'f':
+            fid, n = self._unpack('=ii')
+            self.lines.append(['f', fid, n])
+            for i in range(n):
+                if self.data[self.pos:self.pos+1] == b'h':
+                    self.pos += 1
+                    self.lines.append(['h'] + list(self._string()))
+                else:
+                    self._expr()
+        else:
+            raise ValueError("unexpected expression key %r" % (key,))
+
+    def _bounds(self, n):
+        for i in range(n):
+            t = int(self._char())
+            if t == 5:
+                self.lines.append([t] + list(self._unpack('=ii')))
+            else:
+                nvals = {0: 2, 1: 1, 2: 1, 3: 0, 4: 1}[t]
+                self.lines.append([t] + list(self._unpack('=%dd' % nvals)))
+
+    def read(self):
+        header = []
+        for i in range(10):
+            end = self.data.index(b'\n', self.pos)
+            header.append(self.data[self.pos:end].decode('utf-8'))
+            self.pos = end + 1
+        n_vars, n_cons = (int(x) for x in header[1].split()[:2])
+        while self.pos < len(self.data):
+            key = self._char()
+            if key == 'F':
+                self.lines.append(['F'] + list(self._unpack('=iii')) +
+                                  [self._string()[1]])
+            elif key == 'S':
+                kind, n = self._unpack('=ii')
+                self.lines.append(['S', kind, n, self._string()[1]])
+                fmt = '=id' if kind & 4 else '=ii'
+                for i in range(n):
+                    self.lines.append(list(self._unpack(fmt)))
+            elif key == 'C':
+                self.lines.append(['C'] + list(self._unpack('=i')))
+                self._expr()
+            elif key == 'O':
+                self.lines.append(['O'] + list(self._unpack('=ii')))
+                self._expr()
+            elif key in 'dx':
+                n, = self._unpack('=i')
+                self.lines.append([key, n])
+                for i in range(n):
+                    self.lines.append(list(self._unpack('=id')))
+            elif key == 'r':
+                self.lines.append(['r'])
+                self._bounds(n_cons)
+            elif key == 'b':
+                self.lines.append(['b'])
+                self._bounds(n_vars)
+            elif key == 'k':
+                n, = self._unpack('=i')
+                self.lines.append(['k', n])
+                for i in range(n):
+                    self.lines.append(list(self._unpack('=i')))
+            elif key in 'JG':
+                i, n = self._unpack('=ii')
+                self.lines.append([key, i, n])
+                for i in range(n):
+                    self.lines.append(list(self._unpack('=id')))
+            else:
+                raise ValueError("unexpected segment key %r" % (key,))
+        return header, self.lines
+
+
+def _parse_text_nl(text):
+    lines = text.split('\n')
+    assert lines.pop() == ''
+    header = lines[:10]
+    body = []
+    for line in lines[10:]:
+        if line[0] == 'h':
+            n, s = line[1:].split(':', 1)
+            body.append(['h', int(n), s])
+            continue
+        line = line.split('\t#')[0]
+        if line[0] in 'SF':
+            tokens = line[1:].split(None, 3 if line[0] == 'F' else 2)
+            body.append([line[0]] + [int(x) for x in tokens[:-1]] +
+                        [tokens[-1].strip()])
+        elif line[0].isalpha():
+            body.append([line[0]] + [float(x) for x in line[1:].split()])
+        else:
+            body.append([float(x) for x in line.split()])
+    return header, body
+
+
+class TestBinaryNLWriter(unittest.TestCase):
+
+    def tearDown(self):
+        TempfileManager.clear_tempfiles()
+
+    def _model(self):
+        m = ConcreteModel()
+        m.x = Var([1, 2, 3], bounds=(-1, 4), initialize=1.5)
+        m.y = Var(within=Binary)
+        m.z = Var(within=NonNegativeReals, initialize=0.25)
+        m.w = Var(bounds=(None, 10))
+        m.p = Param(mutable=True, initialize=2.5)
+        m.c1 = Constraint(expr=m.x[1]**2 + sin(m.x[2]) + m.p*m.z <= 3)
+        m.c2 = Constraint(expr=(-1, m.x[1] + 2*m.x[2] - m.x[3], 5))
+        m.c3 = Constraint(expr=m.y + m.z == 1)
+        m.c4 = Constraint(expr=exp(m.x[3])*m.w/m.z + m.x[1]*m.x[2]*m.x[3] +
+                          m.w + m.z + log(m.x[2]+2) >= -3)
+        m.c5 = Constraint(expr=Expr_if(IF=m.x[1] <= 0, THEN=m.z,
+                                       ELSE=-m.w) >= 0)
+        m.c6 = Constraint(expr=m.w >= -100)
+        m.o = Objective(expr=m.x[1]*m.x[2] + 3*m.z - m.w + 1)
+        m.sos = SOSConstraint(var=m.x, sos=1)
+        m.dual = Suffix(direction=Suffix.EXPORT)
+        m.dual[m.c1] = 0.5
+        m.scale = Suffix(direction=Suffix.EXPORT, datatype=Suffix.INT)
+        m.scale[m.z] = 3
+        m.scale[m.c2] = 4
+        m.priority = Suffix(direction=Suffix.EXPORT)
+        m.priority[m.o] = 1.25
+        m.priority[m.w] = 0.125
+        return m
+
+    def _write(self, m, io_options):
+        fname = TempfileManager.create_tempfile(suffix='.nl')
+        m.write(fname, format='nl', io_options=io_options)
+        with open(fname, 'rb') as FILE:
+            return FILE.read()
+
+    def _compare(self, m, **opts):
+        text_header, text_body = _parse_text_nl(
+            self._write(m, opts).decode('utf-8'))
+        opts['binary'] = True
+        bin_header, bin_body = _BinaryNLReader(self._write(m, opts)).read()
+
+        self.assertEqual(bin_header[0], 'b' + text_header[0][1:])
+        arith = bin_header[5].split()[2]
+        self.assertEqual(arith, '1' if sys.byteorder == 'little' else '2')
+        self.assertEqual(bin_header[1:5], text_header[1:5])
+        self.assertEqual(bin_header[6:], text_header[6:])
+        self.assertEqual(bin_body, text_body)
+        return bin_body
+
+    def test_binary_matches_text(self):
+        m = self._model()
+        body = self._compare(m)
+        keys = set(line[0] for line in body if type(line[0]) is str)
+        for key in 'SCOdxrbkJG':
+            self.assertIn(key, keys)
+
+    def test_binary_symbolic_labels(self):
+        m = self._model()
+        self._compare(m, symbolic_solver_labels=True)
+
+    def test_binary_fixed_variable_bounds(self):
+        m = self._model()
+        m.sos.deactivate()
+        m.y.fix(1)
+        self._compare(m, output_fixed_variable_bounds=True)
+        self.assertRaisesRegexp(
+            ValueError, "unrecognized io_options", self._write, m,
+            {'binary': True, 'bogus': 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+#
+# Test incremental NL file writes through an NLWriterCache
+#
+
+import pyutilib.th as unittest
+from pyutilib.services import TempfileManager
+
+from pyomo.environ import (ConcreteModel, Var, Param, Constraint,
+                           Objective, Expression, sin, exp, maximize)
+from pyomo.repn.plugins.ampl import NLWriterCache
+
+
+class TestNLWriterCache(unittest.TestCase):
+
+    def tearDown(self):
+        TempfileManager.clear_tempfiles()
+
+    def _model(self):
+        m = ConcreteModel()
+        m.x = Var([1, 2, 3], bounds=(0, 4), initialize=1)
+        m.y = Var(initialize=2)
+        m.p = Param([1, 2, 3], mutable=True, initialize={1: 1, 2: 2, 3: 3})
+        m.q = Param(mutable=True, initialize=0.5)
+        m.e = Expression(expr=m.q*exp(m.x[1]))
+        m.c1 = Constraint(expr=m.e + sin(m.x[2]) <= 4)
+        m.c2 = Constraint(expr=m.x[2]**2 + m.p[2]*m.y >= m.q)
+        m.c3 = Constraint(rule=lambda m: (0, sum(m.p[i]*m.x[i] for i in m.x),
+                                          m.p[3]))
+        m.c4 = Constraint(expr=m.x[1] - m.y == 0)
+        m.o = Objective(expr=m.p[1]*m.x[1]*m.x[3] + m.q*m.y + 1,
+                        sense=maximize)
+        return m
+
+    def _write(self, m, io_options):
+        fname = TempfileManager.create_tempfile(suffix='.nl')
+        m.write(fname, format='nl', io_options=io_options)
+        with open(fname, 'rb') as FILE:
+            return FILE.read()
+
+    def _check(self, m, cache, **io_options):
+        baseline = self._write(m, io_options)
+        io_options['nl_cache'] = cache
+        self.assertEqual(self._write(m, io_options), baseline)
+
+    def test_reuse(self):
+        m = self._model()
+        cache = NLWriterCache()
+        self._check(m, cache)
+        self.assertEqual(len(cache), 5)
+        self.assertEqual(cache.repn_hits, 0)
+        self.assertEqual(cache.text_hits, 0)
+
+        # Changing bounds and initial values does not affect the
+        # representations or the expression text
+        m.x[2].setub(10)
+        m.y.value = -3
+        self._check(m, cache)
+        self.assertEqual(cache.repn_hits, 5)
+        self.assertEqual(cache.text_hits, 3)
+
+        # A linear coefficient only regenerates one constraint
+        m.p[3] = 7
+        self._check(m, cache)
+        self.assertEqual(cache.repn_hits, 9)
+        self.assertEqual(cache.text_hits, 6)
+
+        # A parameter in a named expression (and a constraint bound)
+        m.q = 1.5
+        self._check(m, cache)
+        self.assertEqual(cache.repn_hits, 12)
+        self.assertEqual(cache.text_hits, 7)
+
+    def test_structure_changes(self):
+        m = self._model()
+        cache = NLWriterCache()
+        self._check(m, cache)
+
+        m.x[3].fix(2)
+        self._check(m, cache, output_fixed_variable_bounds=True)
+        m.x[3].value = 3
+        self._check(m, cache, output_fixed_variable_bounds=True)
+        m.x[3].unfix()
+        self._check(m, cache)
+
+        m.e = m.q*m.y**2
+        self._check(m, cache)
+
+        m.c2.set_value(m.x[2]**3 >= 1)
+        self._check(m, cache)
+
+        m.c1.deactivate()
+        self._check(m, cache)
+        m.c5 = Constraint(expr=m.x[1]*m.x[2]*m.y >= -1)
+        self._check(m, cache)
+        m.c1.activate()
+        self._check(m, cache, symbolic_solver_labels=True)
+        self._check(m, cache, binary=True)
+
+    def test_new_model(self):
+        cache = NLWriterCache()
+        m1 = self._model()
+        self._check(m1, cache)
+        m2 = self._model()
+        m2.p[1] = 5
+        self._check(m2, cache)
+        self.assertEqual(cache.repn_hits, 0)
+        self.assertIs(cache._model, m2)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache._model)
+
+
+if __name__ == "__main__":
+    unittest.main()
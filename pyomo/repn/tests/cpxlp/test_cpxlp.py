@@ -18,11 +18,14 @@ import pyutilib.th as unittest
 
 from pyomo.environ import *
 import pyomo.opt
+import pyomo.repn.plugins.cpxlp as cpxlp
 
 thisdir = os.path.dirname(os.path.abspath(__file__))
 
 class TestCPXLPOrdering(unittest.TestCase):
 
+    io_options = {}
+
     def _cleanup(self, fname):
         try:
             os.remove(fname)
@@ -38,6 +41,7 @@ class TestCPXLPOrdering(unittest.TestCase):
         baseline_fname, test_fname = self._get_fnames()
         self._cleanup(test_fname)
         io_options = {"symbolic_solver_labels": True}
+        io_options.update(self.io_options)
         io_options.update(kwds)
         model.write(test_fname,
                     format="lp",
@@ -169,6 +173,11 @@ class TestCPXLPOrdering(unittest.TestCase):
         row_order[model.con4[2]] = -1
         self._check_baseline(model, row_order=row_order)
 
+@unittest.skipIf(not cpxlp.numpy_available, "numpy is not available")
+class TestCPXLPOrdering_bulk(TestCPXLPOrdering):
+
+    io_options = {"bulk_write": True}
+
 class TestCPXLP_writer(unittest.TestCase):
 
     def _cleanup(self, fname):
@@ -235,6 +244,47 @@ class TestCPXLP_writer(unittest.TestCase):
             model.write, test_fname, format='lp')
         self._cleanup(test_fname)
 
+    def _write(self, model, **io_options):
+        baseline_fname, test_fname = self._get_fnames()
+        self._cleanup(test_fname)
+        model.write(test_fname, format='lp', io_options=io_options)
+        with open(test_fname) as FILE:
+            ans = FILE.read()
+        self._cleanup(test_fname)
+        return ans
+
+    @unittest.skipIf(not cpxlp.numpy_available, "numpy is not available")
+    def test_bulk_write(self):
+        model = ConcreteModel()
+        model.I = RangeSet(0, 49)
+        model.x = Var(model.I, bounds=(-1, 1))
+        model.y = Var(model.I, within=Binary)
+        model.z = Var()
+        model.z.fix(2)
+        model.obj = Objective(expr=sum(model.x[i] for i in model.I))
+        model.c = Constraint(model.I, rule=lambda m, i:
+            (i-10)*m.x[i] - 0.5*m.y[(i*7) % 50] + m.z*m.x[(i+3) % 50]
+            + 3.125*m.y[i] >= -i)
+        model.r = Constraint(model.I, rule=lambda m, i:
+            (-1, m.x[i] + m.y[i], i))
+        model.e = Constraint(expr=sum(model.y[i] for i in model.I) == 10)
+        model.q = Constraint(expr=model.x[1]*model.x[2] + model.y[3] <= 4)
+        model.t = Constraint(expr=model.z + 1 <= 5)
+        for io_options in ({},
+                           {'symbolic_solver_labels': True},
+                           {'skip_trivial_constraints': True},
+                           {'file_determinism': 2}):
+            orig_chunk = cpxlp._BULK_ROW_CHUNK
+            try:
+                cpxlp._BULK_ROW_CHUNK = 7
+                bulk = self._write(model, bulk_write=True,
+                                   output_fixed_variable_bounds=True,
+                                   **io_options)
+            finally:
+                cpxlp._BULK_ROW_CHUNK = orig_chunk
+            ref = self._write(model, output_fixed_variable_bounds=True,
+                              **io_options)
+            self.assertEqual(bulk, ref)
 
 
 if __name__ == "__main__":
@@ -18,11 +18,14 @@ import pyutilib.th as unittest
 
 from pyomo.environ import *
 import pyomo.opt
+import pyomo.repn.plugins.mps as mps
 
 thisdir = os.path.dirname(os.path.abspath(__file__))
 
 class TestMPSOrdering(unittest.TestCase):
 
+    io_options = {}
+
     def _cleanup(self, fname):
         try:
             os.remove(fname)
@@ -38,6 +41,7 @@ class TestMPSOrdering(unittest.TestCase):
         baseline_fname, test_fname = self._get_fnames()
         self._cleanup(test_fname)
         io_options = {"symbolic_solver_labels": True}
+        io_options.update(self.io_options)
         io_options.update(kwds)
         model.write(test_fname,
                     format="mps",
@@ -169,5 +173,55 @@ class TestMPSOrdering(unittest.TestCase):
         row_order[model.con4[2]] = -1
         self._check_baseline(model, row_order=row_order)
 
+@unittest.skipIf(not mps.numpy_available, "numpy is not available")
+class TestMPSOrdering_bulk(TestMPSOrdering):
+
+    io_options = {"bulk_write": True}
+
+class TestMPS_writer(unittest.TestCase):
+
+    def _write(self, model, **io_options):
+        fname = os.path.join(thisdir, "bulk_write.mps.out")
+        model.write(fname, format='mps', io_options=io_options)
+        with open(fname) as FILE:
+            ans = FILE.read()
+        os.remove(fname)
+        return ans
+
+    @unittest.skipIf(not mps.numpy_available, "numpy is not available")
+    def test_bulk_write(self):
+        model = ConcreteModel()
+        model.I = RangeSet(0, 49)
+        model.x = Var(model.I, bounds=(-1, 1))
+        model.y = Var(model.I, within=Binary)
+        model.u = Var(model.I)
+        model.z = Var()
+        model.z.fix(2)
+        model.obj = Objective(expr=sum(model.x[i] for i in model.I) + 5)
+        model.c = Constraint(model.I, rule=lambda m, i:
+            (i-10)*m.x[i] - 0.5*m.y[(i*7) % 50] + m.z*m.x[(i+3) % 50]
+            + 3.125*m.y[i] >= -i)
+        model.r = Constraint(model.I, rule=lambda m, i:
+            (-1, m.x[i] + m.y[i], i))
+        model.e = Constraint(expr=sum(model.y[i] for i in model.I) == 10)
+        model.q = Constraint(expr=model.x[1]*model.x[2] + model.y[3] <= 4)
+        model.t = Constraint(expr=model.z + 1 <= 5)
+        for io_options in ({},
+                           {'symbolic_solver_labels': True},
+                           {'skip_trivial_constraints': True},
+                           {'include_all_variable_bounds': True},
+                           {'file_determinism': 2}):
+            orig_chunk = mps._BULK_ENTRY_CHUNK
+            try:
+                mps._BULK_ENTRY_CHUNK = 7
+                bulk = self._write(model, bulk_write=True,
+                                   output_fixed_variable_bounds=True,
+                                   **io_options)
+            finally:
+                mps._BULK_ENTRY_CHUNK = orig_chunk
+            ref = self._write(model, output_fixed_variable_bounds=True,
+                              **io_options)
+            self.assertEqual(bulk, ref)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,133 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+#
+# Test the extraction of block linear data as SciPy/NumPy arrays
+#
+
+import pyutilib.th as unittest
+
+from pyomo.environ import (ConcreteModel, Block, Var, Param, Constraint,
+                           Objective, NonNegativeReals, maximize, minimize,
+                           exp)
+from pyomo.repn import StandardRepnCache
+from pyomo.repn.beta.matrix import (extract_block_linear_data,
+                                    numpy_available, scipy_available)
+
+if numpy_available:
+    import numpy
+
+
+@unittest.skipIf(not (numpy_available and scipy_available),
+                 "numpy and scipy are required")
+class TestExtractBlockLinearData(unittest.TestCase):
+
+    def _model(self):
+        m = ConcreteModel()
+        m.x = Var([1, 2, 3], within=NonNegativeReals)
+        m.y = Var(bounds=(-1, 5))
+        m.z = Var(initialize=2)
+        m.p = Param(mutable=True, initialize=3)
+        m.c1 = Constraint(expr=m.x[1] + 2*m.x[2] - m.y <= 4)
+        m.c2 = Constraint(expr=(-1, m.p*m.x[3] + m.z + 1, 7))
+        m.c3 = Constraint(expr=m.x[1] + m.x[1] == m.y + 2)
+        m.o = Objective(expr=3*m.x[1] - m.y + 5, sense=maximize)
+        return m
+
+    def test_extract(self):
+        m = self._model()
+        data = extract_block_linear_data(m)
+        self.assertEqual([v.name for v in data.variables],
+                         ['x[1]', 'x[2]', 'x[3]', 'y', 'z'])
+        self.assertEqual([c.name for c in data.constraints],
+                         ['c1', 'c2', 'c3'])
+        self.assertIs(data.objective, m.o)
+        self.assertEqual(data.sense, maximize)
+        self.assertEqual(data.A.shape, (3, 5))
+        self.assertTrue(numpy.array_equal(
+            data.A.toarray(),
+            [[1, 2, 0, -1, 0],
+             [0, 0, 3, 0, 1],
+             [2, 0, 0, -1, 0]]))
+        self.assertEqual(list(data.con_lb), [-numpy.inf, -2, 2])
+        self.assertEqual(list(data.con_ub), [4, 6, 2])
+        self.assertEqual(list(data.c), [3, 0, 0, -1, 0])
+        self.assertEqual(data.c0, 5)
+        self.assertEqual(list(data.var_lb), [0, 0, 0, -1, -numpy.inf])
+        self.assertEqual(list(data.var_ub),
+                         [numpy.inf, numpy.inf, numpy.inf, 5, numpy.inf])
+
+    def test_fixed_and_unreferenced(self):
+        m = self._model()
+        m.w = Var()
+        m.z.fix(4)
+        m.c2.deactivate()
+        m.c4 = Constraint(expr=m.z >= 1)
+        data = extract_block_linear_data(m)
+        self.assertEqual([v.name for v in data.variables],
+                         ['x[1]', 'x[2]', 'y'])
+        self.assertEqual([c.name for c in data.constraints],
+                         ['c1', 'c3', 'c4'])
+        self.assertEqual(data.A.shape, (3, 3))
+        self.assertEqual(data.A.getrow(2).nnz, 0)
+        self.assertEqual(list(data.con_lb), [-numpy.inf, 2, -3])
+
+        data = extract_block_linear_data(m, skip_trivial_constraints=True,
+                                         include_unreferenced_variables=True)
+        self.assertEqual([v.name for v in data.variables],
+                         ['w', 'x[1]', 'x[2]', 'x[3]', 'y'])
+        self.assertEqual([c.name for c in data.constraints], ['c1', 'c3'])
+
+    def test_sub_blocks(self):
+        m = self._model()
+        m.b = Block()
+        m.b.v = Var()
+        m.b.c = Constraint(expr=m.b.v - m.x[3] >= 0)
+        m.o.deactivate()
+        data = extract_block_linear_data(m)
+        self.assertEqual([v.name for v in data.variables],
+                         ['x[1]', 'x[2]', 'x[3]', 'y', 'z', 'b.v'])
+        self.assertEqual(data.sense, minimize)
+        self.assertIsNone(data.objective)
+        self.assertEqual(list(data.c), [0]*6)
+
+        # Variables declared outside the block follow the block variables
+        data = extract_block_linear_data(m.b)
+        self.assertEqual([v.name for v in data.variables], ['b.v', 'x[3]'])
+        self.assertTrue(numpy.array_equal(data.A.toarray(), [[1, -1]]))
+
+        data = extract_block_linear_data(m, descend_into=False)
+        self.assertEqual(len(data.constraints), 3)
+
+    def test_repn_cache(self):
+        m = self._model()
+        cache = StandardRepnCache()
+        extract_block_linear_data(m, repn_cache=cache)
+        m.p = 8
+        data = extract_block_linear_data(m, repn_cache=cache)
+        self.assertEqual(data.A[1, 2], 8)
+        self.assertEqual(len(cache), 4)
+
+    def test_errors(self):
+        m = self._model()
+        m.n = Constraint(expr=exp(m.y) <= 1)
+        self.assertRaisesRegexp(ValueError, "Component 'n' is not linear",
+                                extract_block_linear_data, m)
+        m.n.deactivate()
+        m.o2 = Objective(expr=m.y)
+        self.assertRaisesRegexp(ValueError, "More than one active objective",
+                                extract_block_linear_data, m)
+        m.o2.deactivate()
+        m.o.set_value(m.y*m.x[1])
+        self.assertRaisesRegexp(ValueError, "Component 'o' is not linear",
+                                extract_block_linear_data, m)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+#
+# Test the compiled standard representation cache
+#
+
+import os
+from os.path import abspath, dirname
+currdir = dirname(abspath(__file__))+os.sep
+
+import pyutilib.th as unittest
+from pyutilib.services import TempfileManager
+
+from pyomo.repn import generate_standard_repn, StandardRepnCache
+from pyomo.repn.standard_repn import ExpressionDependencies
+from pyomo.environ import (ConcreteModel, Var, Param, Constraint,
+                           Objective, Expression, exp, value)
+
+
+def repn_to_dict(repn):
+    result = {}
+    for v, c in zip(repn.linear_vars, repn.linear_coefs):
+        result[v.name] = result.get(v.name, 0) + c
+    for (v1, v2), c in zip(repn.quadratic_vars, repn.quadratic_coefs):
+        result[tuple(sorted((v1.name, v2.name)))] = c
+    if repn.constant != 0:
+        result[None] = repn.constant
+    return result
+
+
+class TestStandardRepnCache(unittest.TestCase):
+
+    def _model(self):
+        m = ConcreteModel()
+        m.x = Var([1, 2, 3])
+        m.p = Param([1, 2, 3], mutable=True, initialize={1: 1, 2: 2, 3: 3})
+        m.q = Param(mutable=True, initialize=5)
+        return m
+
+    def assertSameRepn(self, expr, repn):
+        baseline = generate_standard_repn(expr)
+        self.assertEqual(repn_to_dict(baseline), repn_to_dict(repn))
+        self.assertEqual([id(v) for v in baseline.linear_vars],
+                         [id(v) for v in repn.linear_vars])
+        self.assertEqual(baseline.polynomial_degree(),
+                         repn.polynomial_degree())
+
+    def test_mutable_coefficients(self):
+        m = self._model()
+        e = sum(m.p[i]*m.x[i] for i in m.x) + m.q
+        cache = StandardRepnCache()
+        repn = cache.generate(e)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(repn_to_dict(repn),
+                         {'x[1]': 1, 'x[2]': 2, 'x[3]': 3, None: 5})
+        template = cache._templates[id(e)]
+
+        m.p[2] = 10
+        m.q = -1
+        repn = cache.generate(e)
+        self.assertIs(cache._templates[id(e)], template)
+        self.assertEqual(repn_to_dict(repn),
+                         {'x[1]': 1, 'x[2]': 10, 'x[3]': 3, None: -1})
+        self.assertSameRepn(e, repn)
+
+    def test_zero_coefficient(self):
+        m = self._model()
+        e = sum(m.p[i]*m.x[i] for i in m.x)
+        cache = StandardRepnCache()
+        m.p[2] = 0
+        repn = cache.generate(e)
+        self.assertSameRepn(e, repn)
+        self.assertEqual(len(repn.linear_vars), 2)
+        m.p[2] = 4
+        repn = cache.generate(e)
+        self.assertSameRepn(e, repn)
+        self.assertEqual(len(repn.linear_vars), 3)
+
+    def test_fixed_variable(self):
+        m = self._model()
+        e = m.p[1]*m.x[1] + m.x[2]*m.x[3]
+        cache = StandardRepnCache()
+        repn = cache.generate(e)
+        self.assertSameRepn(e, repn)
+        self.assertEqual(repn.polynomial_degree(), 2)
+
+        m.x[3].fix(2)
+        repn = cache.generate(e)
+        self.assertSameRepn(e, repn)
+        self.assertEqual(repn_to_dict(repn), {'x[1]': 1, 'x[2]': 2})
+
+        # Changing the value of a fixed variable does not require
+        # recompiling the template
+        template = cache._templates[id(e)]
+        m.x[3].value = 7
+        repn = cache.generate(e)
+        self.assertIs(cache._templates[id(e)], template)
+        self.assertEqual(repn_to_dict(repn), {'x[1]': 1, 'x[2]': 7})
+
+        m.x[3].unfix()
+        repn = cache.generate(e)
+        self.assertIsNot(cache._templates[id(e)], template)
+        self.assertSameRepn(e, repn)
+
+    def test_named_expression(self):
+        m = self._model()
+        m.e = Expression(expr=m.p[1]*m.x[1])
+        e = m.e + m.x[2]
+        cache = StandardRepnCache()
+        repn = cache.generate(e)
+        self.assertEqual(repn_to_dict(repn), {'x[1]': 1, 'x[2]': 1})
+        m.e = m.q*m.x[3]
+        repn = cache.generate(e)
+        self.assertEqual(repn_to_dict(repn), {'x[3]': 5, 'x[2]': 1})
+        self.assertSameRepn(e, repn)
+
+    def test_nonlinear(self):
+        m = self._model()
+        e = exp(m.x[1]) + m.p[2]*m.x[2]
+        cache = StandardRepnCache()
+        repn = cache.generate(e)
+        self.assertIsNotNone(repn.nonlinear_expr)
+        self.assertFalse(cache._templates[id(e)].compiled)
+        m.x[1].fix(0)
+        repn = cache.generate(e)
+        self.assertTrue(cache._templates[id(e)].compiled)
+        self.assertEqual(repn_to_dict(repn), {'x[2]': 2, None: 1})
+
+    def test_constant(self):
+        m = self._model()
+        cache = StandardRepnCache()
+        repn = cache.generate(m.q + 1)
+        self.assertEqual(repn.constant, 6)
+        self.assertEqual(len(cache), 0)
+        repn = cache.generate(2)
+        self.assertEqual(repn.constant, 2)
+
+    def test_clear(self):
+        m = self._model()
+        e = m.x[1] + m.x[2]
+        cache = StandardRepnCache()
+        cache.generate(e)
+        cache.generate(m.x[1])
+        self.assertEqual(len(cache), 2)
+        cache.discard(e)
+        self.assertEqual(len(cache), 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def _write(self, m, fmt, io_options):
+        fname = TempfileManager.create_tempfile(suffix='.'+fmt)
+        m.write(fname, format=fmt, io_options=io_options)
+        with open(fname) as FILE:
+            return FILE.read()
+
+    def test_writers(self):
+        m = self._model()
+        m.c = Constraint([1, 2, 3], rule=lambda m, i: m.p[i]*m.x[i] + m.q*m.x[1] >= i)
+        m.d = Constraint(expr=m.x[1]*m.x[2] + m.q*m.x[3]**2 <= 4)
+        m.o = Objective(expr=sum(m.p[i]*m.x[i] for i in m.x))
+        cache = StandardRepnCache()
+        try:
+            for fmt in ('lp', 'mps'):
+                for q in (5, 0, 3):
+                    m.q = q
+                    m.p[1] = q + 1
+                    self.assertEqual(
+                        self._write(m, fmt, {'repn_cache': cache}),
+                        self._write(m, fmt, {}))
+        finally:
+            TempfileManager.clear_tempfiles()
+        self.assertEqual(len(cache), 5)
+
+
+
+class TestExpressionDependencies(unittest.TestCase):
+
+    def test_dependencies(self):
+        m = ConcreteModel()
+        m.x = Var([1, 2])
+        m.p = Param(mutable=True, initialize=2)
+        m.r = Param(initialize=3)
+        m.e = Expression(expr=m.p*m.x[1])
+        exprs = (m.e + m.r*m.x[2] + m.x[1], 0)
+        deps = ExpressionDependencies(exprs)
+        self.assertEqual(set(id(v) for v in deps.variables),
+                         set(id(v) for v in m.x.values()))
+        self.assertEqual(len(deps.variables), 2)
+        self.assertEqual([id(p) for p in deps.params], [id(m.p)])
+        self.assertEqual(len(deps.named), 1)
+        self.assertTrue(deps.is_valid(exprs))
+        self.assertFalse(deps.is_valid(exprs[:1]))
+        self.assertFalse(deps.is_valid((m.x[1], 0)))
+
+    def test_state(self):
+        m = ConcreteModel()
+        m.x = Var([1, 2])
+        m.p = Param(mutable=True, initialize=2)
+        m.e = Expression(expr=m.p*m.x[1])
+        exprs = (m.e + m.x[2],)
+        deps = ExpressionDependencies(exprs)
+        structure = ExpressionDependencies(exprs, track_values=False)
+        m.p = 3
+        self.assertFalse(deps.is_valid(exprs))
+        self.assertTrue(structure.is_valid(exprs))
+        m.x[2].fix(1)
+        self.assertFalse(structure.is_valid(exprs))
+        structure = ExpressionDependencies(exprs, track_values=False)
+        m.x[2].value = 4
+        self.assertTrue(structure.is_valid(exprs))
+        m.e = m.x[1]
+        self.assertFalse(structure.is_valid(exprs))
+
+
+if __name__ == "__main__":
+    unittest.main()
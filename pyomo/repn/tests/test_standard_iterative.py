@@ -0,0 +1,139 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+#
+# Test the iterative (non-recursive) standard representation collector
+#
+
+import sys
+
+import pyutilib.th as unittest
+
+from pyomo.core.expr import current as EXPR
+from pyomo.environ import (ConcreteModel, Var, Param, Expression,
+                           Expr_if, exp, sin, value)
+from pyomo.repn import generate_standard_repn
+from pyomo.repn.standard_repn import (_generate_standard_repn,
+                                      _generate_standard_repn_iterative,
+                                      StandardRepn)
+
+
+def _generate(fn, expr, compute_values, quadratic):
+    # generate_standard_repn() selects the global Results class
+    generate_standard_repn(0, quadratic=quadratic)
+    return fn(expr, idMap={None: {}}, compute_values=compute_values,
+              quadratic=quadratic, repn=StandardRepn())
+
+
+class TestIterativeStandardRepn(unittest.TestCase):
+
+    def _model(self):
+        m = ConcreteModel()
+        m.x = Var([1, 2, 3], initialize=2)
+        m.y = Var(initialize=3)
+        m.z = Var(initialize=0.5)
+        m.z.fix()
+        m.p = Param(mutable=True, initialize=2)
+        m.q = Param(mutable=True, initialize=0)
+        m.e = Expression(expr=m.x[1] + m.p*m.x[2]**2)
+        return m
+
+    def _expressions(self, m):
+        x, y, z, p, q = m.x, m.y, m.z, m.p, m.q
+        return [
+            x[1] + 2*x[2] - 3 + p*x[3],
+            sum(x[i]*x[i] for i in x) + x[1]*y - y,
+            x[1] + (x[2] + 3*(y - x[1])) + 5*x[1],
+            (x[1] + 2)*(3*x[2] - 1),
+            (x[1] + 2)*(z - 0.5),
+            (z + 1)*(x[1] + x[2]),
+            (z*z)*(x[1] + x[2]),
+            q*(x[1]*x[2]) + p*x[3],
+            x[1]**2 + (x[2] + 1)**2 + (2*x[3])**2 + x[1]**3 + x[1]**p,
+            (x[1] + x[2])**2 + y**1 + y**0 + z**2 + x[1]**x[2],
+            (x[1] + x[2])**(z*2) + x[1]**(y - y),
+            x[1]/(z + 1) + x[2]/(1 + p) + 1/(x[1] + z),
+            Expr_if(IF=z >= 0, THEN=x[1], ELSE=x[2]) + Expr_if(
+                IF=x[1] >= 0, THEN=x[2], ELSE=3),
+            Expr_if(IF=z + 1, THEN=3, ELSE=x[2]) + Expr_if(
+                IF=p - 2, THEN=x[1], ELSE=2*x[2]),
+            abs(z - 1) + sin(x[1]) + exp(z) + abs(x[2] + 1),
+            -(x[1] - 2*(x[2] + y)) + m.e + 2*m.e,
+            m.e*(3 + x[1]) + m.e*m.e,
+            EXPR.LinearExpression([2, 1, p, 3, x[1], x[2], z])*2 + x[3],
+            x[1]*(x[2]*(x[3]*(y + 1))),
+            (x[1]*x[2] - x[2]*x[1])*y,
+        ]
+
+    def _check(self, expr, compute_values, quadratic):
+        rec = _generate(_generate_standard_repn, expr,
+                        compute_values, quadratic)
+        it = _generate(_generate_standard_repn_iterative, expr,
+                       compute_values, quadratic)
+        self.assertEqual([id(v) for v in rec.linear_vars],
+                         [id(v) for v in it.linear_vars])
+        self.assertEqual([value(c) for c in rec.linear_coefs],
+                         [value(c) for c in it.linear_coefs])
+        self.assertEqual(value(rec.constant), value(it.constant))
+        self.assertEqual([(id(a), id(b)) for a, b in rec.quadratic_vars],
+                         [(id(a), id(b)) for a, b in it.quadratic_vars])
+        self.assertEqual([value(c) for c in rec.quadratic_coefs],
+                         [value(c) for c in it.quadratic_coefs])
+        self.assertEqual(str(rec.nonlinear_expr), str(it.nonlinear_expr))
+        self.assertEqual([id(v) for v in rec.nonlinear_vars],
+                         [id(v) for v in it.nonlinear_vars])
+        if not compute_values:
+            self.assertEqual(str(rec.constant), str(it.constant))
+            self.assertEqual([str(c) for c in rec.linear_coefs],
+                             [str(c) for c in it.linear_coefs])
+
+    def test_equivalence(self):
+        m = self._model()
+        for expr in self._expressions(m):
+            for compute_values in (True, False):
+                for quadratic in (True, False):
+                    self._check(expr, compute_values, quadratic)
+
+    def test_zero_division(self):
+        m = self._model()
+        m.q = 0
+        for fn in (_generate_standard_repn, _generate_standard_repn_iterative):
+            self.assertRaises(ZeroDivisionError, _generate, fn,
+                              m.x[1]/(m.z - 0.5), True, True)
+            self.assertRaises(ZeroDivisionError, _generate, fn,
+                              m.x[1]/m.q, True, True)
+
+    def test_deep_expression(self):
+        m = ConcreteModel()
+        N = 3*sys.getrecursionlimit()
+        m.x = Var(range(N))
+        e = m.x[0]
+        for i in range(1, N):
+            if i % 2:
+                e = 1*(e + m.x[i])
+            else:
+                e = -(e - 2*m.x[i])
+        repn = generate_standard_repn(e)
+        self.assertTrue(repn.is_linear())
+        self.assertEqual(len(repn.linear_vars), N)
+        coefs = dict((id(v), c) for v, c in zip(repn.linear_vars,
+                                                repn.linear_coefs))
+        # x[N-1] is the outermost term
+        self.assertEqual(coefs[id(m.x[N-1])], 2 if (N-1) % 2 == 0 else 1)
+
+        e = m.x[0]
+        for i in range(1, N):
+            e = m.x[i]*(1 + e)
+        repn = generate_standard_repn(e, quadratic=False)
+        self.assertFalse(repn.is_linear())
+        self.assertEqual(len(repn.nonlinear_vars), N)
+
+
+if __name__ == "__main__":
+    unittest.main()
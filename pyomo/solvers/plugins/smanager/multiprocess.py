@@ -0,0 +1,281 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+
+__all__ = []
+
+import os
+import time
+
+try:
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    concurrent_futures_available = True
+except ImportError:                             #pragma:nocover
+    concurrent_futures_available = False
+
+import pyutilib.misc
+import pyutilib.services
+from pyomo.opt.base import OptSolver, SolverFactory
+from pyomo.opt.solver import SystemCallSolver
+from pyomo.opt.parallel.manager import (ActionManagerError,
+                                        ActionStatus,
+                                        ActionHandle)
+from pyomo.opt.parallel.async_solver import (AsynchronousSolverManager,
+                                             SolverManagerFactory)
+from pyomo.core.base import Block
+import pyomo.core.base.suffix
+
+import six
+
+
+def _solve_problem_file(data):
+    """
+    Apply a solver to a problem file in a worker process.  This mirrors
+    the pyro_mip_server worker: the problem file is written to a local
+    temporary file and the results (which contain the solutions, because
+    no model is provided) are returned to the solver manager.
+    """
+    # Register the solver plugins (required when the worker process is
+    # spawned rather than forked)
+    import pyomo.environ
+
+    data = pyutilib.misc.Bunch(**data)
+    time_start = time.time()
+    with pyutilib.services.TempfileManager.push():
+        with SolverFactory(data.opt) as opt:
+            if opt is None:
+                raise ActionManagerError(
+                    "Problem constructing solver `%s'" % (data.opt,))
+            for key, value in data.solver_options.items():
+                setattr(opt.options, key, value)
+
+            temp_problem_filename = \
+                pyutilib.services.TempfileManager.create_tempfile(
+                    suffix="."+os.path.split(data.filename)[1])
+            with open(temp_problem_filename, 'wb') as f:
+                f.write(data.file)
+
+            kwds = data.kwds
+            if data.warmstart_filename is not None:
+                temp_warmstart_filename = \
+                    pyutilib.services.TempfileManager.create_tempfile(
+                        suffix="."+os.path.split(data.warmstart_filename)[1])
+                with open(temp_warmstart_filename, 'wb') as f:
+                    f.write(data.warmstart_file)
+                kwds['warmstart_file'] = temp_warmstart_filename
+
+            results = opt.solve(temp_problem_filename, **kwds)
+            assert results._smap_id is None
+
+    results.pyomo_solve_time = time.time()-time_start
+    return results
+
+
+@SolverManagerFactory.register('multiprocess',
+                               doc="Execute solvers in parallel local processes")
+class SolverManager_Multiprocess(AsynchronousSolverManager):
+    """
+    A solver manager that applies shell solvers in a pool of local
+    worker processes.  Problem files are written by the calling process
+    (the symbol maps stay with the model), the solvers are executed by
+    the workers, and the solutions are loaded back into the models when
+    wait_any returns the corresponding ActionHandle.
+
+    Keyword Arguments
+    -----------------
+    max_workers: int
+        The number of worker processes (defaults to the number of CPUs).
+    """
+
+    def __init__(self, **kwds):
+        self._max_workers = kwds.pop('max_workers', None)
+        self._executor = None
+        self._futures = {}
+        self._opt_data = {}
+        self._args = {}
+        super(SolverManager_Multiprocess, self).__init__(**kwds)
+
+    def clear(self):
+        """
+        Clear manager state
+        """
+        super(SolverManager_Multiprocess, self).clear()
+        for future in self._futures:
+            future.cancel()
+        self._futures = {}
+        self._opt_data = {}
+        self._args = {}
+
+    def shutdown(self, wait=True):
+        """
+        Shut down the worker processes.  A new pool is started if more
+        solves are queued.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def _get_task_data(self, ah, *args, **kwds):
+
+        opt = kwds.pop('solver', kwds.pop('opt', None))
+        if opt is None:
+            raise ActionManagerError(
+                "No solver passed to %s, use keyword option 'solver'"
+                % (type(self).__name__) )
+        if isinstance(opt, six.string_types):
+            opt = SolverFactory(opt, solver_io=kwds.pop('solver_io', None))
+        if not isinstance(opt, SystemCallSolver):
+            raise ActionManagerError(
+                "The %s only supports solvers that are executed through "
+                "problem files (solver=%s)" % (type(self).__name__, opt.name))
+
+        #
+        # Collect suffix names to try and import from solution (see
+        # OptSolver.solve())
+        #
+        for arg in args:
+            if isinstance(arg, Block):
+                if not arg.is_constructed():
+                    raise RuntimeError(
+                        "Attempting to solve model=%s with unconstructed "
+                        "component(s)" % (arg.name))
+                model_suffixes = list(name for (name,comp) \
+                                      in pyomo.core.base.suffix.\
+                                      active_import_suffix_generator(arg))
+                if len(model_suffixes) > 0:
+                    kwds_suffixes = kwds.setdefault('suffixes',[])
+                    for name in model_suffixes:
+                        if name not in kwds_suffixes:
+                            kwds_suffixes.append(name)
+
+        #
+        # Ephemeral solver options override the options dictionary of
+        # the solver in the worker process
+        #
+        solver_options = {}
+        for key in opt.options:
+            solver_options[key]=opt.options[key]
+        solver_options.update(kwds.pop('options', {}))
+        solver_options.update(
+            OptSolver._options_string_to_dict(kwds.pop('options_string', '')))
+
+        #
+        # Write the problem file.  The worker processes check for solver
+        # availability.
+        #
+        del_available = bool('available' not in kwds)
+        kwds['available'] = True
+        keepfiles = kwds.get('keepfiles', False)
+        try:
+            opt._presolve(*args, **kwds)
+            with open(opt._problem_files[0], 'rb') as f:
+                problem_file_string = f.read()
+            warm_start_file_string = None
+            warm_start_file_name = None
+            if getattr(opt, "_warm_start_solve", False) and \
+               (opt._warm_start_file_name is not None):
+                warm_start_file_name = opt._warm_start_file_name
+                with open(warm_start_file_name, 'rb') as f:
+                    warm_start_file_string = f.read()
+        finally:
+            pyutilib.services.TempfileManager.pop(remove=not keepfiles)
+        if del_available:
+            del kwds['available']
+        # These options were handled when the problem file was written
+        for key in ('symbolic_solver_labels', 'output_fixed_variable_bounds',
+                    'skip_trivial_constraints', 'file_determinism',
+                    'io_options', 'solver_io', 'keepfiles', 'load_solutions',
+                    'select', 'suffixes'):
+            kwds.pop(key, None)
+
+        data = dict(opt=opt.type,
+                    file=problem_file_string,
+                    filename=opt._problem_files[0],
+                    warmstart_file=warm_start_file_string,
+                    warmstart_filename=warm_start_file_name,
+                    kwds=kwds,
+                    solver_options=solver_options)
+        data['kwds']['suffixes'] = opt._suffixes
+
+        self._args[ah.id] = args
+        self._opt_data[ah.id] = (opt._smap_id,
+                                 opt._load_solutions,
+                                 opt._select_index,
+                                 opt._default_variable_value)
+
+        return data
+
+    def _perform_queue(self, ah, *args, **kwds):
+        """
+        Perform the queue operation.  This method returns the ActionHandle,
+        and the ActionHandle status indicates whether the queue was successful.
+        """
+        data = self._get_task_data(ah, *args, **kwds)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        self._futures[self._executor.submit(_solve_problem_file, data)] = ah.id
+        ah.status = ActionStatus.queued
+        return ah
+
+    def _perform_wait_any(self):
+        """
+        Perform the wait_any operation.  This method returns an
+        ActionHandle with the results of waiting.  If None is returned
+        then the ActionManager assumes that it can call this method again.
+        Note that an ActionHandle can be returned with a dummy value,
+        to indicate an error.
+        """
+        if len(self._futures) == 0:
+            return ActionHandle(error=True,
+                                explanation=("No queued evaluations available "
+                                             "in the 'multiprocess' solver "
+                                             "manager"))
+        done, _ = wait(list(self._futures), return_when=FIRST_COMPLETED)
+        # Return the earliest queued action that has completed
+        future = min(done, key=self._futures.get)
+        ah_id = self._futures.pop(future)
+        ah = self.event_handle[ah_id]
+        (smap_id,
+         load_solutions,
+         select_index,
+         default_variable_value) = self._opt_data.pop(ah_id)
+        args = self._args.pop(ah_id)
+
+        if future.exception() is not None:
+            ah.status = ActionStatus.error
+            raise RuntimeError(
+                "Worker process reported an error for task with id=%s. "
+                "Reason: \n%s" % (ah_id, future.exception()))
+
+        results = future.result()
+        # Tag the results object with the symbol map id.
+        results._smap_id = smap_id
+        if isinstance(args[0], Block):
+            _model = args[0]
+            if load_solutions:
+                _model.solutions.load_from(
+                    results,
+                    select=select_index,
+                    default_variable_value=default_variable_value)
+                results._smap_id = None
+                results.solution.clear()
+            else:
+                results._smap = _model.solutions.symbol_map[smap_id]
+                _model.solutions.delete_symbol_map(smap_id)
+
+        ah.status = ActionStatus.done
+        self.results[ah_id] = results
+        return ah
+
+    def __exit__(self, t, v, traceback):
+        self.shutdown()
+
+if not concurrent_futures_available:                #pragma:nocover
+    SolverManagerFactory.unregister('multiprocess')
@@ -24,6 +24,12 @@ from pyomo.opt.solver import SystemCallSolver
 
 from six import iteritems, string_types
 
+try:
+    import numpy
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
 logger = logging.getLogger('pyomo.solvers')
 
 _glpk_version = None
@@ -251,6 +257,24 @@ class GLPKSHELL(SystemCallSolver):
 
         return results
 
+    def _variable_arrays(self):
+        # When the solution is loaded directly into a model, the
+        # variable data is stored as arrays (see Solution.set_arrays),
+        # rather than as a dictionary for each variable
+        if self._load_solutions and (self._smap_id is not None):
+            return [], [], []
+        return None
+
+    def _set_variable_arrays(self, soln, symbols, values, rc=None):
+        if numpy_available:
+            values = numpy.array(values, dtype=float)
+            if rc is not None:
+                rc = numpy.array(rc, dtype=float)
+        if rc is None:
+            soln.set_arrays('variable', symbols, Value=values)
+        else:
+            soln.set_arrays('variable', symbols, Value=values, Rc=rc)
+
     def _glpk_get_solution_status(self, status):
         if GLP_FEAS     == status: return SolutionStatus.feasible
         elif GLP_INFEAS == status: return SolutionStatus.infeasible
@@ -406,6 +430,7 @@ class GLPKSHELL(SystemCallSolver):
                 elif re.match(suffix, "rc"):
                     extract_reduced_costs = True
 
+            arrays = self._variable_arrays()
             range_duals = {}
             while True:
                 row = next(reader)
@@ -435,7 +460,12 @@ class GLPKSHELL(SystemCallSolver):
                     if 'ONE_VAR_CONSTANT' == vname:
                         continue
                     cprim = float(cprim)
-                    if extract_reduced_costs is False:
+                    if arrays is not None:
+                        arrays[0].append(vname)
+                        arrays[1].append(cprim)
+                        if extract_reduced_costs:
+                            arrays[2].append(float(cdual))
+                    elif extract_reduced_costs is False:
                         soln.variable[vname] = {"Value" : cprim}
                     else:
                         soln.variable[vname] = {"Value" : cprim, "Rc" : float(cdual)}
@@ -449,6 +479,11 @@ class GLPKSHELL(SystemCallSolver):
                 else:
                     raise ValueError("Unexpected row type: "+rtype)
 
+            if arrays is not None:
+                self._set_variable_arrays(
+                    soln, arrays[0], arrays[1],
+                    arrays[2] if extract_reduced_costs else None)
+
             # For the range constraints, supply only the dual with the largest
             # magnitude (at least one should always be numerically zero)
             scon = soln.Constraint
@@ -500,6 +535,7 @@ class GLPKSHELL(SystemCallSolver):
             # less 'arbitrary', as in the yaml key 'f'.  Weird
             soln.objective[obj_name] = {'Value': obj_val}
 
+            arrays = self._variable_arrays()
             while True:
                 row = next(reader)
                 if len(row) == 0:
@@ -514,7 +550,11 @@ class GLPKSHELL(SystemCallSolver):
                     vname = variable_names[int(cid)]
                     if 'ONE_VAR_CONSTANT' == vname:
                         continue
-                    soln.variable[vname] = {"Value" : float(cval)}
+                    if arrays is not None:
+                        arrays[0].append(vname)
+                        arrays[1].append(float(cval))
+                    else:
+                        soln.variable[vname] = {"Value" : float(cval)}
 
                 elif rtype == 'e':
                     break
@@ -524,3 +564,6 @@ class GLPKSHELL(SystemCallSolver):
 
                 else:
                     raise ValueError("Unexpected row type: "+rtype)
+
+            if arrays is not None:
+                self._set_variable_arrays(soln, arrays[0], arrays[1])
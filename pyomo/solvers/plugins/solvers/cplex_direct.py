@@ -225,9 +225,9 @@ class CPLEXDirect(DirectSolver):
 
         return cplex_expr, referenced_vars
 
-    def _add_var(self, var):
-        varname = self._symbol_map.getSymbol(var, self._labeler)
-        vtype = self._cplex_vtype_from_var(var)
+    def _cplex_lb_ub_from_var(self, var):
+        if var.is_fixed():
+            return var.value, var.value
         if var.has_lb():
             lb = value(var.lb)
         else:
@@ -236,18 +236,32 @@ class CPLEXDirect(DirectSolver):
             ub = value(var.ub)
         else:
             ub = self._cplex.infinity
+        return lb, ub
 
-        self._solver_model.variables.add(lb=[lb], ub=[ub], types=[vtype], names=[varname])
-
-        self._pyomo_var_to_solver_var_map[var] = varname
-        self._solver_var_to_pyomo_var_map[varname] = var
-        self._pyomo_var_to_ndx_map[var] = self._ndx_count
-        self._ndx_count += 1
-        self._referenced_variables[var] = 0
-
-        if var.is_fixed():
-            self._solver_model.variables.set_lower_bounds(varname, var.value)
-            self._solver_model.variables.set_upper_bounds(varname, var.value)
+    def _add_var(self, var):
+        self._add_vars([var])
+
+    def _add_vars(self, var_seq):
+        varnames = []
+        vtypes = []
+        lbs = []
+        ubs = []
+        for var in var_seq:
+            varname = self._symbol_map.getSymbol(var, self._labeler)
+            varnames.append(varname)
+            vtypes.append(self._cplex_vtype_from_var(var))
+            lb, ub = self._cplex_lb_ub_from_var(var)
+            lbs.append(lb)
+            ubs.append(ub)
+
+            self._pyomo_var_to_solver_var_map[var] = varname
+            self._solver_var_to_pyomo_var_map[varname] = var
+            self._pyomo_var_to_ndx_map[var] = self._ndx_count
+            self._ndx_count += 1
+            self._referenced_variables[var] = 0
+
+        if len(varnames) > 0:
+            self._solver_model.variables.add(lb=lbs, ub=ubs, types=vtypes, names=varnames)
 
     def _set_instance(self, model, kwds={}):
         self._pyomo_var_to_ndx_map = ComponentMap()
@@ -280,7 +294,7 @@ class CPLEXDirect(DirectSolver):
                             "by overwriting its bounds in the CPLEX instance."
                             % (var.name, self._pyomo_model.name,))
 
-    def _add_constraint(self, con):
+    def _get_cplex_constraint(self, con):
         if not con.active:
             return None
 
@@ -310,56 +324,93 @@ class CPLEXDirect(DirectSolver):
 
         if con.equality:
             my_sense = 'E'
-            my_rhs = [value(con.lower) - cplex_expr.offset]
-            my_range = []
+            my_rhs = value(con.lower) - cplex_expr.offset
+            my_range = 0.0
         elif con.has_lb() and con.has_ub():
             my_sense = 'R'
             lb = value(con.lower)
             ub = value(con.upper)
-            my_rhs = [ub - cplex_expr.offset]
-            my_range = [lb - ub]
-            self._range_constraints.add(con)
+            my_rhs = ub - cplex_expr.offset
+            my_range = lb - ub
         elif con.has_lb():
             my_sense = 'G'
-            my_rhs = [value(con.lower) - cplex_expr.offset]
-            my_range = []
+            my_rhs = value(con.lower) - cplex_expr.offset
+            my_range = 0.0
         elif con.has_ub():
             my_sense = 'L'
-            my_rhs = [value(con.upper) - cplex_expr.offset]
-            my_range = []
+            my_rhs = value(con.upper) - cplex_expr.offset
+            my_range = 0.0
         else:
             raise ValueError("Constraint does not have a lower "
                              "or an upper bound: {0} \n".format(con))
 
-        if len(cplex_expr.q_coefficients) == 0:
-            self._solver_model.linear_constraints.add(
-                lin_expr=[[cplex_expr.variables,
-                           cplex_expr.coefficients]],
-                senses=my_sense,
-                rhs=my_rhs,
-                range_values=my_range,
-                names=[conname])
-        else:
-            if my_sense == 'R':
-                raise ValueError("The CPLEXDirect interface does not "
-                                 "support quadratic range constraints: "
-                                 "{0}".format(con))
-            self._solver_model.quadratic_constraints.add(
-                lin_expr=[cplex_expr.variables,
-                          cplex_expr.coefficients],
-                quad_expr=[cplex_expr.q_variables1,
-                           cplex_expr.q_variables2,
-                           cplex_expr.q_coefficients],
-                sense=my_sense,
-                rhs=my_rhs[0],
-                name=conname)
+        if len(cplex_expr.q_coefficients) != 0 and my_sense == 'R':
+            raise ValueError("The CPLEXDirect interface does not "
+                             "support quadratic range constraints: "
+                             "{0}".format(con))
+
+        return conname, cplex_expr, referenced_vars, my_sense, my_rhs, my_range
 
+    def _register_constraint(self, con, conname, referenced_vars, my_sense):
+        if my_sense == 'R':
+            self._range_constraints.add(con)
         for var in referenced_vars:
             self._referenced_variables[var] += 1
         self._vars_referenced_by_con[con] = referenced_vars
         self._pyomo_con_to_solver_con_map[con] = conname
         self._solver_con_to_pyomo_con_map[conname] = con
 
+    def _add_constraint(self, con):
+        self._add_constraints([con])
+
+    def _add_constraints(self, con_seq):
+        # Linear constraints (including ranges) are collected and
+        # passed to linear_constraints.add in a single call.
+        # Quadratic constraints are added individually through
+        # quadratic_constraints.add. Linear constraints are only
+        # registered once the batched add has succeeded.
+        lin_expr = []
+        senses = []
+        rhs = []
+        range_values = []
+        names = []
+        lin_cons = []
+        for con in con_seq:
+            cplex_con = self._get_cplex_constraint(con)
+            if cplex_con is None:
+                continue
+            conname, cplex_expr, referenced_vars, my_sense, my_rhs, my_range = cplex_con
+
+            if len(cplex_expr.q_coefficients) == 0:
+                lin_expr.append([cplex_expr.variables,
+                                 cplex_expr.coefficients])
+                senses.append(my_sense)
+                rhs.append(my_rhs)
+                range_values.append(my_range)
+                names.append(conname)
+                lin_cons.append((con, conname, referenced_vars, my_sense))
+            else:
+                self._solver_model.quadratic_constraints.add(
+                    lin_expr=[cplex_expr.variables,
+                              cplex_expr.coefficients],
+                    quad_expr=[cplex_expr.q_variables1,
+                               cplex_expr.q_variables2,
+                               cplex_expr.q_coefficients],
+                    sense=my_sense,
+                    rhs=my_rhs,
+                    name=conname)
+                self._register_constraint(con, conname, referenced_vars, my_sense)
+
+        if len(names) > 0:
+            self._solver_model.linear_constraints.add(
+                lin_expr=lin_expr,
+                senses=senses,
+                rhs=rhs,
+                range_values=range_values,
+                names=names)
+            for con, conname, referenced_vars, my_sense in lin_cons:
+                self._register_constraint(con, conname, referenced_vars, my_sense)
+
     def _add_sos_constraint(self, con):
         if not con.active:
             return None
@@ -412,7 +463,7 @@ class CPLEXDirect(DirectSolver):
             raise ValueError('Variable domain type is not recognized for {0}'.format(var.domain))
         return vtype
 
-    def _set_objective(self, obj):
+    def _set_objective(self, obj, repn=None):
         if self._objective is not None:
             for var in self._vars_referenced_by_obj:
                 self._referenced_variables[var] -= 1
@@ -432,7 +483,10 @@ class CPLEXDirect(DirectSolver):
         else:
             raise ValueError('Objective sense is not recognized: {0}'.format(obj.sense))
 
-        cplex_expr, referenced_vars = self._get_expr_from_pyomo_expr(obj.expr, self._max_obj_degree)
+        if repn is None:
+            cplex_expr, referenced_vars = self._get_expr_from_pyomo_expr(obj.expr, self._max_obj_degree)
+        else:
+            cplex_expr, referenced_vars = self._get_expr_from_pyomo_repn(repn, self._max_obj_degree)
         for i in range(len(cplex_expr.q_coefficients)):
             cplex_expr.q_coefficients[i] *= 2
 
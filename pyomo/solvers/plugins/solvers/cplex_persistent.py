@@ -13,6 +13,7 @@ from pyomo.core.base.PyomoModel import ConcreteModel
 from pyomo.core.base.constraint import Constraint
 from pyomo.core.base.var import Var
 from pyomo.core.base.sos import SOSConstraint
+from pyomo.core.kernel.component_set import ComponentSet
 from pyomo.solvers.plugins.solvers.cplex_direct import CPLEXDirect
 from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
 from pyomo.opt.base import SolverFactory
@@ -72,6 +73,59 @@ class CPLEXPersistent(PersistentSolver, CPLEXDirect):
         del self._pyomo_var_to_ndx_map[pyomo_var]
         self._solver_model.variables.delete(solver_var)
 
+    def _update_constraint_coefficients(self, cons):
+        # Linear constraints are modified in place with a single call to
+        # each of set_coefficients, set_rhs and set_range_values;
+        # quadratic constraints are removed and added again
+        fallback = []
+        coefficients = []
+        rhs = []
+        range_values = []
+        for con in cons:
+            repn = self._get_param_repn(con)
+            if repn.nonlinear_expr is not None:
+                fallback.append(con)
+                continue
+            conname = self._pyomo_con_to_solver_con_map[con]
+
+            new_vars = ComponentSet()
+            for var, coef in zip(repn.linear_vars, repn.linear_coefs):
+                coefficients.append((conname, self._pyomo_var_to_solver_var_map[var], value(coef)))
+                new_vars.add(var)
+            old_vars = self._vars_referenced_by_con[con]
+            for var in old_vars:
+                if var not in new_vars:
+                    coefficients.append((conname, self._pyomo_var_to_solver_var_map[var], 0.0))
+                    self._referenced_variables[var] -= 1
+            for var in new_vars:
+                if var not in old_vars:
+                    self._referenced_variables[var] += 1
+            self._vars_referenced_by_con[con] = new_vars
+
+            offset = value(repn.constant)
+            if con in self._range_constraints:
+                lb = value(con.lower)
+                ub = value(con.upper)
+                rhs.append((conname, ub - offset))
+                range_values.append((conname, lb - ub))
+            elif con.has_lb():
+                rhs.append((conname, value(con.lower) - offset))
+            else:
+                rhs.append((conname, value(con.upper) - offset))
+
+        if len(coefficients) > 0:
+            self._solver_model.linear_constraints.set_coefficients(coefficients)
+        if len(rhs) > 0:
+            self._solver_model.linear_constraints.set_rhs(rhs)
+        if len(range_values) > 0:
+            self._solver_model.linear_constraints.set_range_values(range_values)
+        PersistentSolver._update_constraint_coefficients(self, fallback)
+
+    def _update_objective_coefficients(self):
+        # see GurobiPersistent._update_objective_coefficients
+        repn = self._get_objective_param_repn(quadratic=(self._max_obj_degree == 2))
+        CPLEXDirect._set_objective(self, self._objective, repn=repn)
+
     def _warm_start(self):
         CPLEXDirect._warm_start(self)
 
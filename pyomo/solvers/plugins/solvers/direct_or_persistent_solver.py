@@ -198,15 +198,16 @@ class DirectOrPersistentSolver(OptSolver):
             self._labeler = NumericLabeler('x')
 
     def _add_block(self, block):
-        for var in block.component_data_objects(
-                ctype=pyomo.core.base.var.Var,
-                descend_into=True,
-                active=True,
-                sort=True):
-            self._add_var(var)
-
-        for sub_block in block.block_data_objects(descend_into=True,
-                                                  active=True):
+        self._add_vars(block.component_data_objects(
+            ctype=pyomo.core.base.var.Var,
+            descend_into=True,
+            active=True,
+            sort=True))
+
+        sub_blocks = list(block.block_data_objects(descend_into=True,
+                                                   active=True))
+        cons = []
+        for sub_block in sub_blocks:
             for con in sub_block.component_data_objects(
                     ctype=pyomo.core.base.constraint.Constraint,
                     descend_into=False,
@@ -216,8 +217,10 @@ class DirectOrPersistentSolver(OptSolver):
                    (not con.has_ub()):
                     assert not con.equality
                     continue  # non-binding, so skip
-                self._add_constraint(con)
+                cons.append(con)
+        self._add_constraints(cons)
 
+        for sub_block in sub_blocks:
             for con in sub_block.component_data_objects(
                     ctype=pyomo.core.base.sos.SOSConstraint,
                     descend_into=False,
@@ -246,6 +249,15 @@ class DirectOrPersistentSolver(OptSolver):
         raise NotImplementedError("This method should be implemented "
                                   "by subclasses")
 
+    def _add_constraints(self, con_seq):
+        """Add a sequence of constraints to the solver model.
+
+        Subclasses may override this method to collect the constraints
+        and pass them to the solver in a single batched call.
+        """
+        for con in con_seq:
+            self._add_constraint(con)
+
     """ This method should be implemented by subclasses."""
     def _add_sos_constraint(self, con):
         raise NotImplementedError("This method should be implemented "
@@ -256,6 +268,15 @@ class DirectOrPersistentSolver(OptSolver):
         raise NotImplementedError("This method should be implemented "
                                   "by subclasses")
 
+    def _add_vars(self, var_seq):
+        """Add a sequence of variables to the solver model.
+
+        Subclasses may override this method to collect the variables
+        and pass them to the solver in a single batched call.
+        """
+        for var in var_seq:
+            self._add_var(var)
+
     """ This method should be implemented by subclasses."""
     def _get_expr_from_pyomo_repn(self, repn, max_degree=None):
         raise NotImplementedError("This method should be implemented "
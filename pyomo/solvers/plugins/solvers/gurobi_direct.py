@@ -29,6 +29,13 @@ from pyomo.opt.base import SolverFactory
 from pyomo.core.base.suffix import Suffix
 import pyomo.core.base.var
 
+try:
+    import numpy
+    import scipy.sparse
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
 
 logger = logging.getLogger('pyomo.solvers')
 
@@ -200,9 +207,9 @@ class GurobiDirect(DirectSolver):
 
         return gurobi_expr, referenced_vars
 
-    def _add_var(self, var):
-        varname = self._symbol_map.getSymbol(var, self._labeler)
-        vtype = self._gurobi_vtype_from_var(var)
+    def _gurobi_lb_ub_from_var(self, var):
+        if var.is_fixed():
+            return var.value, var.value
         if var.has_lb():
             lb = value(var.lb)
         else:
@@ -211,6 +218,12 @@ class GurobiDirect(DirectSolver):
             ub = value(var.ub)
         else:
             ub = self._gurobipy.GRB.INFINITY
+        return lb, ub
+
+    def _add_var(self, var):
+        varname = self._symbol_map.getSymbol(var, self._labeler)
+        vtype = self._gurobi_vtype_from_var(var)
+        lb, ub = self._gurobi_lb_ub_from_var(var)
 
         gurobipy_var = self._solver_model.addVar(lb=lb, ub=ub, vtype=vtype, name=varname)
 
@@ -218,9 +231,29 @@ class GurobiDirect(DirectSolver):
         self._solver_var_to_pyomo_var_map[gurobipy_var] = var
         self._referenced_variables[var] = 0
 
-        if var.is_fixed():
-            gurobipy_var.setAttr('lb', var.value)
-            gurobipy_var.setAttr('ub', var.value)
+    def _add_vars(self, var_seq):
+        var_seq = list(var_seq)
+        if len(var_seq) == 0:
+            return
+        varnames = []
+        vtypes = []
+        lbs = []
+        ubs = []
+        for var in var_seq:
+            varnames.append(self._symbol_map.getSymbol(var, self._labeler))
+            vtypes.append(self._gurobi_vtype_from_var(var))
+            lb, ub = self._gurobi_lb_ub_from_var(var)
+            lbs.append(lb)
+            ubs.append(ub)
+
+        gurobipy_vars = self._solver_model.addVars(len(var_seq), lb=lbs, ub=ubs, vtype=vtypes)
+        gurobipy_vars = [gurobipy_vars[i] for i in range(len(var_seq))]
+        self._solver_model.setAttr('VarName', gurobipy_vars, varnames)
+
+        for var, gurobipy_var in zip(var_seq, gurobipy_vars):
+            self._pyomo_var_to_solver_var_map[var] = gurobipy_var
+            self._solver_var_to_pyomo_var_map[gurobipy_var] = var
+            self._referenced_variables[var] = 0
 
     def _set_instance(self, model, kwds={}):
         self._range_constraints = set()
@@ -325,6 +358,97 @@ class GurobiDirect(DirectSolver):
         self._pyomo_con_to_solver_con_map[con] = gurobipy_con
         self._solver_con_to_pyomo_con_map[gurobipy_con] = con
 
+    def _add_constraints(self, con_seq):
+        # The matrix-oriented API (addMConstrs) was added in Gurobi
+        # 9.0.  It only accepts single-sense linear constraints, so
+        # range and quadratic constraints are still added one at a
+        # time (after flushing the pending rows to preserve order).
+        if not numpy_available or (self._version_major < 9) or \
+           not hasattr(self._solver_model, 'addMConstrs'):
+            for con in con_seq:
+                self._add_constraint(con)
+            return
+
+        GRB = self._gurobipy.GRB
+        # variable indices are only available after an update
+        self._solver_model.update()
+
+        cons = []
+        senses = []
+        rhs = []
+        pRows = [0]
+        jCols = []
+        vals = []
+        for con in con_seq:
+            if not con.active:
+                continue
+            if is_fixed(con.body) and self._skip_trivial_constraints:
+                continue
+
+            if con._linear_canonical_form:
+                repn = con.canonical_form()
+            else:
+                repn = generate_standard_repn(con.body, quadratic=False)
+
+            sense = None
+            if con.equality:
+                sense = GRB.EQUAL
+                bound = con.lower
+            elif con.has_lb() and con.has_ub():
+                pass
+            elif con.has_lb():
+                sense = GRB.GREATER_EQUAL
+                bound = con.lower
+            elif con.has_ub():
+                sense = GRB.LESS_EQUAL
+                bound = con.upper
+
+            if (sense is None) or (repn.nonlinear_expr is not None) or \
+               (not is_fixed(bound)):
+                # range and nonlinear constraints (and constraints
+                # with invalid bounds, which raise the appropriate
+                # exception) go through _add_constraint
+                self._add_linear_constraint_rows(cons, senses, rhs,
+                                                 pRows, jCols, vals)
+                cons, senses, rhs, pRows, jCols, vals = [], [], [], [0], [], []
+                self._add_constraint(con)
+                continue
+
+            cons.append((con, repn.linear_vars))
+            senses.append(sense)
+            rhs.append(value(bound) - value(repn.constant))
+            jCols.extend(self._pyomo_var_to_solver_var_map[v].index
+                         for v in repn.linear_vars)
+            vals.extend(repn.linear_coefs)
+            pRows.append(len(jCols))
+
+        self._add_linear_constraint_rows(cons, senses, rhs, pRows, jCols, vals)
+
+    def _add_linear_constraint_rows(self, cons, senses, rhs, pRows, jCols, vals):
+        if len(cons) == 0:
+            return
+        # addRange may have queued new (range) variables; A must
+        # have one column per variable in the model
+        self._solver_model.update()
+        A = scipy.sparse.csr_matrix(
+            (numpy.array(vals, dtype=numpy.float64),
+             numpy.array(jCols, dtype=numpy.int64),
+             numpy.array(pRows, dtype=numpy.int64)),
+            shape=(len(cons), self._solver_model.NumVars))
+        gurobipy_cons = self._solver_model.addMConstrs(
+            A, None, numpy.array(senses), numpy.array(rhs, dtype=numpy.float64)).tolist()
+        self._solver_model.setAttr(
+            'ConstrName', gurobipy_cons,
+            [self._symbol_map.getSymbol(con, self._labeler) for con, _ in cons])
+
+        for (con, linear_vars), gurobipy_con in zip(cons, gurobipy_cons):
+            referenced_vars = ComponentSet(linear_vars)
+            for var in referenced_vars:
+                self._referenced_variables[var] += 1
+            self._vars_referenced_by_con[con] = referenced_vars
+            self._pyomo_con_to_solver_con_map[con] = gurobipy_con
+            self._solver_con_to_pyomo_con_map[gurobipy_con] = con
+
     def _add_sos_constraint(self, con):
         if not con.active:
             return None
@@ -377,7 +501,7 @@ class GurobiDirect(DirectSolver):
             raise ValueError('Variable domain type is not recognized for {0}'.format(var.domain))
         return vtype
 
-    def _set_objective(self, obj):
+    def _set_objective(self, obj, repn=None):
         if self._objective is not None:
             for var in self._vars_referenced_by_obj:
                 self._referenced_variables[var] -= 1
@@ -394,7 +518,10 @@ class GurobiDirect(DirectSolver):
         else:
             raise ValueError('Objective sense is not recognized: {0}'.format(obj.sense))
 
-        gurobi_expr, referenced_vars = self._get_expr_from_pyomo_expr(obj.expr, self._max_obj_degree)
+        if repn is None:
+            gurobi_expr, referenced_vars = self._get_expr_from_pyomo_expr(obj.expr, self._max_obj_degree)
+        else:
+            gurobi_expr, referenced_vars = self._get_expr_from_pyomo_repn(repn, self._max_obj_degree)
 
         for var in referenced_vars:
             self._referenced_variables[var] += 1
@@ -12,6 +12,7 @@ from pyomo.core.base.PyomoModel import ConcreteModel
 from pyomo.solvers.plugins.solvers.gurobi_direct import GurobiDirect
 from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
 from pyomo.core.expr.numvalue import value
+from pyomo.core.kernel.component_set import ComponentSet
 from pyomo.opt.base import SolverFactory
 
 
@@ -79,6 +80,30 @@ class GurobiPersistent(PersistentSolver, GurobiDirect):
         PersistentSolver.add_constraint(self, con)
         self._solver_model.update()
 
+    def add_vars(self, vars):
+        """
+        Add a collection of variables to the solver's model in a single batched call. This will keep any existing
+        model components intact.
+
+        Parameters
+        ----------
+        vars: iterable of Var
+        """
+        PersistentSolver.add_vars(self, vars)
+        self._solver_model.update()
+
+    def add_constraints(self, cons):
+        """
+        Add a collection of constraints to the solver's model. With Gurobi 9.0 or later, linear constraints are
+        added in batches through the matrix-oriented API. This will keep any existing model components intact.
+
+        Parameters
+        ----------
+        cons: iterable of Constraint
+        """
+        PersistentSolver.add_constraints(self, cons)
+        self._solver_model.update()
+
     def add_sos_constraint(self, con):
         """
         Add an SOS constraint to the solver's model (if supported). This will keep any existing model components intact.
@@ -90,6 +115,52 @@ class GurobiPersistent(PersistentSolver, GurobiDirect):
         PersistentSolver.add_sos_constraint(self, con)
         self._solver_model.update()
 
+    def _update_constraint_coefficients(self, cons):
+        # Linear constraints with a single sense are modified in place
+        # with chgCoeff and the RHS attribute; range and quadratic
+        # constraints are removed and added again
+        fallback = []
+        for con in cons:
+            gurobipy_con = self._pyomo_con_to_solver_con_map[con]
+            if (con in self._range_constraints) or \
+               (not isinstance(gurobipy_con, self._gurobipy.Constr)):
+                fallback.append(con)
+                continue
+            repn = self._get_param_repn(con)
+            if repn.nonlinear_expr is not None:
+                fallback.append(con)
+                continue
+
+            new_vars = ComponentSet()
+            for var, coef in zip(repn.linear_vars, repn.linear_coefs):
+                self._solver_model.chgCoeff(gurobipy_con, self._pyomo_var_to_solver_var_map[var], coef)
+                new_vars.add(var)
+            old_vars = self._vars_referenced_by_con[con]
+            for var in old_vars:
+                if var not in new_vars:
+                    self._solver_model.chgCoeff(gurobipy_con, self._pyomo_var_to_solver_var_map[var], 0.0)
+                    self._referenced_variables[var] -= 1
+            for var in new_vars:
+                if var not in old_vars:
+                    self._referenced_variables[var] += 1
+            self._vars_referenced_by_con[con] = new_vars
+
+            if con.has_lb():
+                rhs = value(con.lower)
+            else:
+                rhs = value(con.upper)
+            gurobipy_con.setAttr('RHS', rhs - value(repn.constant))
+        PersistentSolver._update_constraint_coefficients(self, fallback)
+
+    def _update_objective_coefficients(self):
+        # The objective is compiled once through the StandardRepnCache,
+        # so repeated updates only re-evaluate its coefficients
+        repn = self._get_objective_param_repn(quadratic=(self._max_obj_degree == 2))
+        GurobiDirect._set_objective(self, self._objective, repn=repn)
+
+    def _update_solver_model(self):
+        self._solver_model.update()
+
     def _warm_start(self):
         GurobiDirect._warm_start(self)
 
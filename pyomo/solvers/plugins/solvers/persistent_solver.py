@@ -20,12 +20,55 @@ import pyutilib.common
 import time
 import logging
 from pyomo.core.base.constraint import Constraint
+from pyomo.core.base.param import Param
 from pyomo.core.base.var import Var
 from pyomo.core.base.sos import SOSConstraint
+from pyomo.core.kernel.component_map import ComponentMap
+from pyomo.core.kernel.component_set import ComponentSet
+from pyomo.repn import StandardRepnCache
+from pyomo.repn.standard_repn import ExpressionDependencies
 
 
 logger = logging.getLogger('pyomo.solvers')
 
+# The value recorded for a mutable Param whose value when the model
+# was sent to the solver is not known (it compares unequal to any value)
+_unknown_param_value = object()
+
+
+class _TrackedExpression(object):
+    """
+    The state of the expressions defining a constraint or objective
+    when it was last sent to the solver.  The component must be sent
+    again if its expressions are no longer valid (see
+    ExpressionDependencies) or its sense or bound flags change.
+    """
+
+    __slots__ = ('dependencies', 'extra')
+
+    def __init__(self, exprs, extra):
+        self.dependencies = ExpressionDependencies(exprs)
+        self.extra = extra
+
+    def is_valid(self, exprs, extra):
+        if extra != self.extra:
+            return False
+        return self.dependencies.is_valid(exprs)
+
+
+def _constraint_key(con):
+    return ((con.body, con.lower, con.upper),
+            (con.equality, con.has_lb(), con.has_ub()))
+
+
+def _objective_key(obj):
+    return ((obj.expr,), obj.sense)
+
+
+def _var_state(var):
+    return (var.lb, var.ub, var.fixed, var.value if var.fixed else None,
+            var.domain)
+
 
 class PersistentSolver(DirectOrPersistentSolver):
     """
@@ -50,6 +93,30 @@ class PersistentSolver(DirectOrPersistentSolver):
     def __init__(self, **kwds):
         DirectOrPersistentSolver.__init__(self, **kwds)
 
+        self._auto_update = False
+        """A bool. If True, changes to the pyomo model are detected and sent to the solver at each solve."""
+
+        self._tracked_vars = ComponentMap()
+        self._tracked_cons = ComponentMap()
+        self._tracked_sos = ComponentSet()
+        self._tracked_obj = None
+        """The state of the model components when they were last sent to the solver (used when auto_update
+        is True)."""
+
+        self._param_dependents = None
+        """dict: {param: ComponentSet} of the constraints and objectives whose expressions contain a mutable
+        Param (see update_params). The index is built by the first call to update_params (or update); it is None
+        until then."""
+
+        self._param_values = ComponentMap()
+        """dict: {param: value} of the parameter values last sent to the solver."""
+
+        self._param_repn_cache = StandardRepnCache()
+        """Compiled representations of the constraints updated by update_params."""
+
+        self._param_repn_exprs = ComponentMap()
+        """dict: {component: expression} of the expressions compiled in _param_repn_cache."""
+
     def _presolve(self, **kwds):
         DirectOrPersistentSolver._presolve(self, **kwds)
 
@@ -76,8 +143,318 @@ class PersistentSolver(DirectOrPersistentSolver):
             If False then an error will be raised if a fixed variable is used in one of the solver constraints.
             This is useful for catching bugs. Ordinarily a fixed variable should appear as a constant value in the
             solver constraints. If True, then the error will not be raised.
+        auto_update: bool
+            If True, the solver interface records the state of the model and every call to solve first calls
+            update, which detects changes to variable bounds, domains and fixed values, mutable parameter values,
+            expressions, and the active status of constraints and objectives, and sends only those changes to the
+            solver. The Pyomo model is then the single source of truth: components that are active on the model
+            but were removed from the solver with (for example) remove_constraint are added back.
+        """
+        self._auto_update = kwds.pop('auto_update', False)
+        self._tracked_vars = ComponentMap()
+        self._tracked_cons = ComponentMap()
+        self._tracked_sos = ComponentSet()
+        self._tracked_obj = None
+        self._param_dependents = None
+        self._param_values = ComponentMap()
+        self._param_repn_cache.clear()
+        self._param_repn_exprs = ComponentMap()
+        ans = self._set_instance(model, kwds)
+        # Only the parameter values are recorded here: the index of the
+        # components that depend on each parameter requires a walk of
+        # all the expressions, so it is built by the first call to
+        # update_params (see _build_param_index)
+        if isinstance(model, _BlockData):
+            for param in model.component_objects(Param, descend_into=True):
+                if param._mutable:
+                    for param_data in param.values():
+                        self._param_values[param_data] = param_data()
+        if self._auto_update:
+            if not isinstance(model, _BlockData):
+                raise ValueError("The auto_update option is only supported for "
+                                 "pyomo.environ (Block-based) models")
+            self.update()
+        return ans
+
+    def _active_model_components(self):
+        model = self._pyomo_model
+        variables = list(model.component_data_objects(
+            ctype=Var, descend_into=True, active=True, sort=True))
+        cons = []
+        sos_cons = []
+        objs = []
+        for sub_block in model.block_data_objects(descend_into=True,
+                                                  active=True):
+            for con in sub_block.component_data_objects(
+                    ctype=Constraint, descend_into=False,
+                    active=True, sort=True):
+                if (not con.has_lb()) and (not con.has_ub()):
+                    continue  # non-binding, so skip
+                cons.append(con)
+            sos_cons.extend(sub_block.component_data_objects(
+                ctype=SOSConstraint, descend_into=False,
+                active=True, sort=True))
+            objs.extend(sub_block.component_data_objects(
+                ctype=Objective, descend_into=False, active=True))
+        return variables, cons, sos_cons, objs
+
+    def update(self):
+        """
+        Detect the changes made to the Pyomo model since the last call to set_instance or update and send only
+        those changes to the solver. This requires set_instance to have been called with auto_update=True, in
+        which case update is called automatically at the start of solve.
+
+        Returns
+        -------
+        changes: dict
+            The number of components added, removed or updated, keyed by 'vars_added', 'vars_updated',
+            'vars_removed', 'params_updated', 'cons_added', 'cons_removed', 'sos_added', 'sos_removed' and
+            'objective'.
+        """
+        if self._pyomo_model is None:
+            raise RuntimeError('You must call set_instance before calling update.')
+        if not self._auto_update:
+            raise RuntimeError('update requires the persistent solver instance to be set with auto_update=True.')
+
+        changes = dict.fromkeys(('vars_added', 'vars_updated', 'vars_removed', 'cons_added',
+                                 'cons_removed', 'sos_added', 'sos_removed', 'objective'), 0)
+        variables, cons, sos_cons, objs = self._active_model_components()
+        if len(objs) > 1:
+            raise ValueError("Solver interface does not support multiple objectives.")
+
+        # Variables: add new variables before anything references them
+        new_vars = []
+        for var in variables:
+            if var not in self._pyomo_var_to_solver_var_map:
+                new_vars.append(var)
+            elif var not in self._tracked_vars:
+                self._tracked_vars[var] = _var_state(var)
+            else:
+                state = _var_state(var)
+                if state != self._tracked_vars[var]:
+                    self.update_var(var)
+                    self._tracked_vars[var] = state
+                    changes['vars_updated'] += 1
+        if new_vars:
+            self._add_vars(new_vars)
+            for var in new_vars:
+                self._tracked_vars[var] = _var_state(var)
+            changes['vars_added'] = len(new_vars)
+
+        # Parameter values: update the coefficients in place
+        param_cons, param_obj = self._update_params(None)
+        for con in param_cons:
+            if con in self._tracked_cons:
+                self._tracked_cons[con] = _TrackedExpression(*_constraint_key(con))
+        if param_obj and self._tracked_obj is not None:
+            self._tracked_obj = _TrackedExpression(*_objective_key(self._objective))
+        changes['params_updated'] = len(param_cons) + param_obj
+
+        # Constraints: remove the constraints that were deactivated
+        # (or deleted) and the constraints that changed, then add the
+        # changed and new constraints in a single batch
+        active_cons = ComponentSet(cons)
+        for con in list(self._tracked_cons):
+            if con not in active_cons:
+                del self._tracked_cons[con]
+                if con in self._pyomo_con_to_solver_con_map:
+                    self.remove_constraint(con)
+                    changes['cons_removed'] += 1
+        new_cons = []
+        for con in cons:
+            exprs, extra = _constraint_key(con)
+            if con in self._pyomo_con_to_solver_con_map:
+                tracked = self._tracked_cons.get(con)
+                if tracked is None:
+                    self._tracked_cons[con] = _TrackedExpression(exprs, extra)
+                    continue
+                if tracked.is_valid(exprs, extra):
+                    continue
+                self.remove_constraint(con)
+                changes['cons_removed'] += 1
+            elif con in self._tracked_cons:
+                # a trivial constraint that was skipped
+                if self._tracked_cons[con].is_valid(exprs, extra):
+                    continue
+            new_cons.append(con)
+            self._tracked_cons[con] = _TrackedExpression(exprs, extra)
+        if new_cons:
+            self._add_constraints(new_cons)
+            self._index_params(new_cons)
+            changes['cons_added'] = len(new_cons)
+
+        # SOS constraints
+        active_sos = ComponentSet(sos_cons)
+        for con in list(self._tracked_sos):
+            if con not in active_sos:
+                self._tracked_sos.remove(con)
+                if con in self._pyomo_con_to_solver_con_map:
+                    self.remove_sos_constraint(con)
+                    changes['sos_removed'] += 1
+        for con in sos_cons:
+            if con not in self._pyomo_con_to_solver_con_map:
+                self._add_sos_constraint(con)
+                changes['sos_added'] += 1
+            self._tracked_sos.add(con)
+
+        # Objective
+        if objs:
+            obj = objs[0]
+            exprs, extra = _objective_key(obj)
+            if obj is self._objective and self._tracked_obj is None:
+                self._tracked_obj = _TrackedExpression(exprs, extra)
+            elif obj is not self._objective or \
+                 not self._tracked_obj.is_valid(exprs, extra):
+                if self._objective is not None and obj is not self._objective:
+                    self._discard_param_repn(self._objective)
+                self._set_objective(obj)
+                self._index_params([obj])
+                self._tracked_obj = _TrackedExpression(exprs, extra)
+                changes['objective'] = 1
+
+        # Variables that were deleted from the model (or live on
+        # deactivated blocks) and are no longer referenced
+        active_vars = ComponentSet(variables)
+        for var in list(self._tracked_vars):
+            if var not in active_vars:
+                del self._tracked_vars[var]
+                if var in self._pyomo_var_to_solver_var_map and \
+                   self._referenced_variables[var] == 0:
+                    self.remove_var(var)
+                    changes['vars_removed'] += 1
+
+        self._update_solver_model()
+        return changes
+
+    def _update_solver_model(self):
+        """Flush pending modifications to the solver model (for solvers that queue them)."""
+        pass
+
+    def _index_params(self, components):
+        # Until the index is built, nothing needs to be recorded (the
+        # new components are indexed when it is built)
+        if self._param_dependents is None:
+            return
+        for comp in components:
+            if hasattr(comp, 'sense'):
+                exprs = (comp.expr,)
+            elif hasattr(comp, 'body'):
+                exprs = (comp.body, comp.lower, comp.upper)
+            else:
+                # SOS constraints
+                continue
+            for param in ExpressionDependencies(exprs).params:
+                dependents = self._param_dependents.get(param)
+                if dependents is None:
+                    dependents = self._param_dependents[param] = ComponentSet()
+                    self._param_values[param] = param()
+                dependents.add(comp)
+
+    def _build_param_index(self):
+        self._param_dependents = ComponentMap()
+        components = list(self._pyomo_con_to_solver_con_map)
+        if self._objective is not None:
+            components.append(self._objective)
+        # The parameters were recorded by set_instance with the values
+        # that were sent to the solver; those values must not be
+        # replaced by the current values (that may have changed since)
+        param_values = self._param_values
+        self._param_values = ComponentMap()
+        self._index_params(components)
+        for param in self._param_values:
+            self._param_values[param] = param_values.get(param, _unknown_param_value)
+
+    def update_params(self, params=None):
+        """
+        Update the solver's model after the values of mutable Params changed. The coefficients and right-hand
+        sides of the affected constraints are modified in place (for solvers that support it) and the objective
+        is reset if it depends on a changed parameter. This is much faster than removing and re-adding the
+        constraints.
+
+        Parameters
+        ----------
+        params: iterable of Param (optional)
+            The parameters that changed. By default, every parameter whose value differs from the value last sent
+            to the solver is updated.
+
+        Returns
+        -------
+        n: int
+            The number of constraints and objectives that were updated.
+        """
+        if self._pyomo_model is None:
+            raise RuntimeError('You must call set_instance before calling update_params.')
+        cons, obj_updated = self._update_params(params)
+        self._update_solver_model()
+        return len(cons) + obj_updated
+
+    def _update_params(self, params):
+        if self._param_dependents is None:
+            self._build_param_index()
+        if params is None:
+            params = [param for param, val in self._param_values.items()
+                      if param() != val]
+        cons = ComponentSet()
+        obj_updated = 0
+        for param in params:
+            dependents = self._param_dependents.get(param)
+            if dependents is None:
+                continue
+            for comp in list(dependents):
+                if comp is self._objective:
+                    obj_updated = 1
+                elif comp in self._pyomo_con_to_solver_con_map:
+                    cons.add(comp)
+                else:
+                    # removed from the solver model
+                    dependents.remove(comp)
+            self._param_values[param] = param()
+        cons = list(cons)
+        if cons:
+            self._update_constraint_coefficients(cons)
+        if obj_updated:
+            self._update_objective_coefficients()
+        return cons, obj_updated
+
+    def _get_param_repn(self, con):
+        if con._linear_canonical_form:
+            return con.canonical_form()
+        return self._generate_param_repn(con, con.body, quadratic=False)
+
+    def _get_objective_param_repn(self, quadratic=True):
+        return self._generate_param_repn(self._objective, self._objective.expr, quadratic=quadratic)
+
+    def _generate_param_repn(self, comp, expr, quadratic):
+        old_expr = self._param_repn_exprs.get(comp)
+        if old_expr is not expr:
+            # the component was given a new expression
+            if old_expr is not None:
+                self._param_repn_cache.discard(old_expr)
+            self._param_repn_exprs[comp] = expr
+        return self._param_repn_cache.generate(expr, quadratic=quadratic)
+
+    def _discard_param_repn(self, comp):
+        expr = self._param_repn_exprs.pop(comp, None)
+        if expr is not None:
+            self._param_repn_cache.discard(expr)
+
+    def _update_constraint_coefficients(self, cons):
+        """
+        Send the current coefficients and bounds of constraints that are already in the solver's model.
+        Subclasses should override this method to modify the constraints in place; by default the constraints
+        are removed and added again.
         """
-        return self._set_instance(model, kwds)
+        for con in cons:
+            self.remove_constraint(con)
+        self._add_constraints(cons)
+
+    def _update_objective_coefficients(self):
+        """
+        Send the current coefficients of the objective that is already in the solver's model. Subclasses should
+        override this method to reuse the compiled representation of the objective; by default the objective is
+        set again.
+        """
+        return self._set_objective(self._objective)
 
     def add_block(self, block):
         """Add a single Pyomo Block to the solver's model.
@@ -99,19 +476,33 @@ class PersistentSolver(DirectOrPersistentSolver):
         #        self._add_block(block)
         #    return
         self._add_block(block)
+        for ctype in (Constraint, Objective):
+            self._index_params(block.component_data_objects(
+                ctype=ctype, descend_into=True, active=True))
 
     def set_objective(self, obj):
         """
         Set the solver's objective. Note that, at least for now, any existing objective will be discarded. Other than
         that, any existing model components will remain intact.
 
+        If obj is already the solver's objective (e.g., it is set again after the values of mutable Params in the
+        objective changed), the representation of the objective compiled the previous time is reused when possible,
+        so only its coefficients are re-evaluated.
+
         Parameters
         ----------
         obj: Objective
         """
         if self._pyomo_model is None:
             raise RuntimeError('You must call set_instance before calling set_objective.')
-        return self._set_objective(obj)
+        if obj is self._objective:
+            ans = self._update_objective_coefficients()
+        else:
+            if self._objective is not None:
+                self._discard_param_repn(self._objective)
+            ans = self._set_objective(obj)
+        self._index_params([obj])
+        return ans
 
     def add_constraint(self, con):
         """Add a single constraint to the solver's model.
@@ -133,6 +524,7 @@ class PersistentSolver(DirectOrPersistentSolver):
         #        self._add_constraint(child_con)
         #else:
         self._add_constraint(con)
+        self._index_params([con])
 
     def add_var(self, var):
         """Add a single variable to the solver's model.
@@ -155,6 +547,42 @@ class PersistentSolver(DirectOrPersistentSolver):
         #else:
         self._add_var(var)
 
+    def add_constraints(self, cons):
+        """Add a collection of constraints to the solver's model.
+
+        The constraints are collected and passed to the solver in as
+        few calls as the solver interface supports, which is much
+        faster than calling add_constraint for each constraint. This
+        will keep any existing model components intact.
+
+        Parameters
+        ----------
+        cons: iterable of Constraint (scalar Constraint or single _ConstraintData)
+
+        """
+        if self._pyomo_model is None:
+            raise RuntimeError('You must call set_instance before calling add_constraints.')
+        cons = list(cons)
+        self._add_constraints(cons)
+        self._index_params(cons)
+
+    def add_vars(self, vars):
+        """Add a collection of variables to the solver's model.
+
+        The variables are collected and passed to the solver in as few
+        calls as the solver interface supports, which is much faster
+        than calling add_var for each variable. This will keep any
+        existing model components intact.
+
+        Parameters
+        ----------
+        vars: iterable of Var (scalar Var or single _VarData)
+
+        """
+        if self._pyomo_model is None:
+            raise RuntimeError('You must call set_instance before calling add_vars.')
+        self._add_vars(list(vars))
+
     def add_sos_constraint(self, con):
         """Add a single SOS constraint to the solver's model (if supported).
 
@@ -236,6 +664,7 @@ class PersistentSolver(DirectOrPersistentSolver):
         #    return
         solver_con = self._pyomo_con_to_solver_con_map[con]
         self._remove_constraint(solver_con)
+        self._discard_param_repn(con)
         self._symbol_map.removeSymbol(con)
         self._labeler.remove_obj(con)
         for var in self._vars_referenced_by_con[con]:
@@ -346,6 +775,9 @@ class PersistentSolver(DirectOrPersistentSolver):
 
         self.available(exception_flag=True)
 
+        if self._auto_update:
+            self.update()
+
         # Collect suffix names to try and import from solution.
         if isinstance(self._pyomo_model, _BlockData):
             model_suffixes = list(name for (name, comp) in active_import_suffix_generator(self._pyomo_model))
@@ -0,0 +1,80 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+#
+# Test the processing of GLPK solution files
+#
+
+import pyutilib.th as unittest
+from pyutilib.services import TempfileManager
+
+from pyomo.environ import SolverFactory
+from pyomo.opt import SolverResults
+
+_glp_file = """p lp min 1 3 2
+n p unknown
+n z o
+n i 1 c_l_c_
+n j 1 x1
+n j 2 ONE_VAR_CONSTANT
+n j 3 x2
+"""
+
+_raw_file = """c Problem:
+c Status:    OPTIMAL
+s bas 1 3 f f 3.5
+i 1 b 1 0.5
+j 1 b 1 0
+j 2 b 1 0
+j 3 l 0 2
+e o f
+"""
+
+
+class GLPKSolutionTests(unittest.TestCase):
+
+    def tearDown(self):
+        TempfileManager.clear_tempfiles()
+
+    def _process(self, smap_id):
+        opt = SolverFactory('_glpk_shell')
+        opt._glpfile = TempfileManager.create_tempfile(suffix='.glpk.glp')
+        opt._rawfile = TempfileManager.create_tempfile(suffix='.glpk.raw')
+        with open(opt._glpfile, 'w') as f:
+            f.write(_glp_file)
+        with open(opt._rawfile, 'w') as f:
+            f.write(_raw_file)
+        opt._load_solutions = True
+        opt._smap_id = smap_id
+        opt._suffixes = ['rc']
+        results = SolverResults()
+        opt.process_soln_file(results)
+        self.assertEqual(len(results.solution), 1)
+        return results.solution(1)
+
+    def test_solution_dicts(self):
+        soln = self._process(None)
+        self.assertEqual(soln._arrays, {})
+        self.assertEqual(soln.variable, {'x1': {'Value': 1, 'Rc': 0},
+                                         'x2': {'Value': 0, 'Rc': 2}})
+
+    def test_solution_arrays(self):
+        soln = self._process(1)
+        self.assertEqual(soln.variable, {})
+        symbols, data = soln._arrays['variable']
+        self.assertEqual(symbols, ['x1', 'x2'])
+        self.assertEqual(list(data['Value']), [1, 0])
+        self.assertEqual(list(data['Rc']), [0, 2])
+        soln.expand_arrays()
+        self.assertEqual(soln.variable, {'x1': {'Value': 1, 'Rc': 0},
+                                         'x2': {'Value': 0, 'Rc': 2}})
+
+
+if __name__ == "__main__":
+    unittest.main()
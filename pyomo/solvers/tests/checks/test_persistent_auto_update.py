@@ -0,0 +1,404 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+#
+# Test the change tracking (auto_update) mode of the persistent solver
+# interfaces.  The tests use a persistent solver that records the
+# operations it is asked to perform on the solver model.
+#
+
+import pyutilib.th as unittest
+from pyomo.environ import *
+from pyomo.core.expr.numvalue import is_fixed
+from pyomo.core.kernel.component_set import ComponentSet
+from pyomo.repn import generate_standard_repn
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
+
+
+class _RecordingPersistent(PersistentSolver):
+
+    def __init__(self, **kwds):
+        kwds['type'] = 'recording_persistent'
+        PersistentSolver.__init__(self, **kwds)
+        self._python_api_exists = True
+        self.log = []
+
+    def _set_instance(self, model, kwds={}):
+        PersistentSolver._set_instance(self, model, kwds)
+        self._add_block(model)
+
+    def _add_var(self, var):
+        self._symbol_map.getSymbol(var, self._labeler)
+        self._pyomo_var_to_solver_var_map[var] = var.name
+        self._solver_var_to_pyomo_var_map[var.name] = var
+        self._referenced_variables[var] = 0
+        self.log.append(('add_var', var.name))
+
+    def _add_constraint(self, con):
+        if is_fixed(con.body) and self._skip_trivial_constraints:
+            return
+        self._symbol_map.getSymbol(con, self._labeler)
+        repn = generate_standard_repn(con.body)
+        referenced_vars = ComponentSet(repn.linear_vars)
+        for var in referenced_vars:
+            self._referenced_variables[var] += 1
+        self._vars_referenced_by_con[con] = referenced_vars
+        self._pyomo_con_to_solver_con_map[con] = con.name
+        self._solver_con_to_pyomo_con_map[con.name] = con
+        self.log.append(('add_con', con.name, value(repn.constant)))
+
+    def _add_sos_constraint(self, con):
+        self._symbol_map.getSymbol(con, self._labeler)
+        self._vars_referenced_by_con[con] = ComponentSet()
+        self._pyomo_con_to_solver_con_map[con] = con.name
+        self._solver_con_to_pyomo_con_map[con.name] = con
+        self.log.append(('add_sos', con.name))
+
+    def _set_objective(self, obj):
+        for var in self._vars_referenced_by_obj:
+            self._referenced_variables[var] -= 1
+        repn = generate_standard_repn(obj.expr)
+        self._vars_referenced_by_obj = ComponentSet(repn.linear_vars)
+        for var in self._vars_referenced_by_obj:
+            self._referenced_variables[var] += 1
+        self._objective = obj
+        self.log.append(('set_obj', obj.name))
+
+    def _remove_constraint(self, solver_con):
+        self.log.append(('remove_con', solver_con))
+
+    def _remove_sos_constraint(self, solver_con):
+        self.log.append(('remove_sos', solver_con))
+
+    def _remove_var(self, solver_var):
+        self.log.append(('remove_var', solver_var))
+
+    def update_var(self, var):
+        self.log.append(('update_var', var.name))
+
+
+class _InPlaceRecordingPersistent(_RecordingPersistent):
+
+    def _update_constraint_coefficients(self, cons):
+        for con in cons:
+            repn = self._get_param_repn(con)
+            self.log.append(('chg_con', con.name,
+                             tuple((v.name, value(c)) for v, c in
+                                   zip(repn.linear_vars, repn.linear_coefs))))
+
+
+class _ObjectiveRecordingPersistent(_InPlaceRecordingPersistent):
+
+    def _update_objective_coefficients(self):
+        repn = self._get_objective_param_repn()
+        self.log.append(('chg_obj', self._objective.name,
+                         tuple((v.name, value(c)) for v, c in
+                               zip(repn.linear_vars, repn.linear_coefs)),
+                         tuple(((v1.name, v2.name), value(c)) for (v1, v2), c in
+                               zip(repn.quadratic_vars, repn.quadratic_coefs)),
+                         value(repn.constant)))
+
+
+class TestPersistentAutoUpdate(unittest.TestCase):
+
+    def _model(self):
+        m = ConcreteModel()
+        m.x = Var([1, 2, 3], bounds=(0, 10))
+        m.y = Var()
+        m.p = Param(mutable=True, initialize=2)
+        m.e = Expression(expr=m.x[1] + m.x[2])
+        m.c1 = Constraint(expr=m.x[1] + m.p*m.x[2] >= 1)
+        m.c2 = Constraint(expr=m.e - m.y <= 4)
+        m.c3 = Constraint(expr=m.x[3] + m.y == 2)
+        m.o = Objective(expr=m.x[1] + m.p*m.y)
+        return m
+
+    def _solver(self, m):
+        opt = _RecordingPersistent()
+        opt.set_instance(m, auto_update=True)
+        self.assertEqual(len(opt.log), 8)
+        del opt.log[:]
+        return opt
+
+    def test_no_changes(self):
+        m = self._model()
+        opt = self._solver(m)
+        changes = opt.update()
+        self.assertEqual(opt.log, [])
+        self.assertEqual(sum(changes.values()), 0)
+
+    def test_update_requires_auto_update(self):
+        m = self._model()
+        opt = _RecordingPersistent()
+        self.assertRaises(RuntimeError, opt.update)
+        opt.set_instance(m)
+        self.assertRaises(RuntimeError, opt.update)
+
+    def test_var_changes(self):
+        m = self._model()
+        opt = self._solver(m)
+        m.x[1].setub(5)
+        m.y.domain = Integers
+        opt.update()
+        self.assertEqual(opt.log, [('update_var', 'x[1]'),
+                                   ('update_var', 'y')])
+        del opt.log[:]
+
+        # fixing a variable updates its bounds; the constraints
+        # referencing the variable are regenerated
+        m.x[3].fix(1)
+        opt.update()
+        self.assertEqual(opt.log, [('update_var', 'x[3]'),
+                                   ('remove_con', 'c3'),
+                                   ('add_con', 'c3', 1)])
+        del opt.log[:]
+        m.x[3].value = 2
+        opt.update()
+        self.assertEqual(opt.log, [('update_var', 'x[3]'),
+                                   ('remove_con', 'c3'),
+                                   ('add_con', 'c3', 2)])
+        del opt.log[:]
+        m.x[3].value = 2
+        opt.update()
+        self.assertEqual(opt.log, [])
+
+    def test_param_and_expression_changes(self):
+        m = self._model()
+        opt = self._solver(m)
+        m.p = 3
+        changes = opt.update()
+        self.assertEqual(opt.log, [('remove_con', 'c1'),
+                                   ('add_con', 'c1', 0),
+                                   ('set_obj', 'o')])
+        self.assertEqual(changes['params_updated'], 2)
+        self.assertEqual(changes['cons_added'], 0)
+        del opt.log[:]
+
+        m.e.expr = m.x[1] - m.x[2]
+        opt.update()
+        self.assertEqual(opt.log, [('remove_con', 'c2'),
+                                   ('add_con', 'c2', 0)])
+        del opt.log[:]
+
+        m.c3.set_value(m.x[3] == 1)
+        opt.update()
+        self.assertEqual(opt.log, [('remove_con', 'c3'),
+                                   ('add_con', 'c3', 0)])
+
+    def test_component_changes(self):
+        m = self._model()
+        opt = self._solver(m)
+        m.c1.deactivate()
+        m.z = Var()
+        m.c4 = Constraint(expr=m.z + m.y >= 0)
+        m.s = SOSConstraint(var=m.x, sos=1)
+        changes = opt.update()
+        self.assertEqual(opt.log, [('add_var', 'z'),
+                                   ('remove_con', 'c1'),
+                                   ('add_con', 'c4', 0),
+                                   ('add_sos', 's')])
+        self.assertEqual(changes['vars_added'], 1)
+        self.assertEqual(changes['cons_removed'], 1)
+        del opt.log[:]
+
+        m.c1.activate()
+        m.del_component(m.c4)
+        m.del_component(m.z)
+        m.s.deactivate()
+        m.o.deactivate()
+        m.o2 = Objective(expr=m.x[2])
+        opt.update()
+        self.assertEqual(opt.log, [('remove_con', 'c4'),
+                                   ('add_con', 'c1', 0),
+                                   ('remove_sos', 's'),
+                                   ('set_obj', 'o2'),
+                                   ('remove_var', 'z')])
+        self.assertEqual(opt._referenced_variables[m.y], 2)
+
+    def test_trivial_constraints(self):
+        m = self._model()
+        m.x[3].fix(0)
+        m.c5 = Constraint(expr=m.x[3] <= 1)
+        opt = _RecordingPersistent()
+        opt.set_instance(m, auto_update=True,
+                         skip_trivial_constraints=True,
+                         output_fixed_variable_bounds=True)
+        self.assertNotIn(m.c5, opt._pyomo_con_to_solver_con_map)
+        del opt.log[:]
+        opt.update()
+        self.assertEqual(opt.log, [])
+        m.x[3].unfix()
+        opt.update()
+        self.assertEqual(opt.log, [('update_var', 'x[3]'),
+                                   ('remove_con', 'c3'),
+                                   ('add_con', 'c3', 0),
+                                   ('add_con', 'c5', 0)])
+
+
+class TestPersistentUpdateParams(unittest.TestCase):
+
+    def _model(self):
+        m = ConcreteModel()
+        m.x = Var([1, 2])
+        m.p = Param(mutable=True, initialize=2)
+        m.q = Param(mutable=True, initialize=0)
+        m.c1 = Constraint(expr=m.x[1] + m.p*m.x[2] >= 1)
+        m.c2 = Constraint(expr=m.q*m.x[1] + m.x[2] <= m.p)
+        m.c3 = Constraint(expr=m.x[1] - m.x[2] == 0)
+        m.o = Objective(expr=m.x[1] + m.q*m.x[2])
+        return m
+
+    def test_remove_and_add(self):
+        m = self._model()
+        opt = _RecordingPersistent()
+        opt.set_instance(m)
+        del opt.log[:]
+        self.assertEqual(opt.update_params(), 0)
+        self.assertEqual(opt.log, [])
+
+        m.p = 3
+        self.assertEqual(opt.update_params(), 2)
+        self.assertEqual(sorted(opt.log), [('add_con', 'c1', 0),
+                                           ('add_con', 'c2', 0),
+                                           ('remove_con', 'c1'),
+                                           ('remove_con', 'c2')])
+        del opt.log[:]
+
+        # explicitly listed parameters are updated even if their value
+        # did not change
+        self.assertEqual(opt.update_params([m.q]), 2)
+        self.assertEqual(opt.log, [('remove_con', 'c2'),
+                                   ('add_con', 'c2', 0),
+                                   ('set_obj', 'o')])
+
+    def test_in_place(self):
+        m = self._model()
+        opt = _InPlaceRecordingPersistent()
+        opt.set_instance(m)
+        del opt.log[:]
+        m.q = 4
+        self.assertEqual(opt.update_params(), 2)
+        self.assertEqual(opt.log, [('chg_con', 'c2', (('x[1]', 4),
+                                                      ('x[2]', 1))),
+                                   ('set_obj', 'o')])
+        del opt.log[:]
+
+        opt.remove_constraint(m.c1)
+        del opt.log[:]
+        m.p = 5
+        self.assertEqual(opt.update_params(), 1)
+        self.assertEqual(opt.log, [('chg_con', 'c2', (('x[1]', 4),
+                                                      ('x[2]', 1)))])
+        del opt.log[:]
+
+        m.c4 = Constraint(expr=m.p*m.x[1] >= 0)
+        opt.add_constraint(m.c4)
+        del opt.log[:]
+        m.p = 6
+        self.assertEqual(opt.update_params(), 2)
+        self.assertEqual(sorted(opt.log), [('chg_con', 'c2', (('x[1]', 4),
+                                                              ('x[2]', 1))),
+                                           ('chg_con', 'c4', (('x[1]', 6),))])
+
+    def test_lazy_param_index(self):
+        m = self._model()
+        opt = _InPlaceRecordingPersistent()
+        opt.set_instance(m)
+        m.c4 = Constraint(expr=m.p*m.x[1] >= 0)
+        opt.add_constraint(m.c4)
+        # the expressions are not indexed until update_params is called
+        self.assertIsNone(opt._param_dependents)
+        del opt.log[:]
+
+        # ...but changes made before that are still detected
+        m.q = 4
+        self.assertEqual(opt.update_params(), 2)
+        self.assertEqual(opt.log, [('chg_con', 'c2', (('x[1]', 4),
+                                                      ('x[2]', 1))),
+                                   ('set_obj', 'o')])
+        self.assertEqual(sorted(p.name for p in opt._param_dependents),
+                         ['p', 'q'])
+        del opt.log[:]
+
+        m.p = 5
+        self.assertEqual(opt.update_params(), 3)
+        self.assertEqual(opt.update_params(), 0)
+
+    def test_param_repn_cache(self):
+        m = self._model()
+        m.c1.set_value(m.x[1] + m.p*m.x[2]**2 >= 1)
+        m.c2.set_value(m.q*m.x[1] + m.x[2]**2 <= m.p)
+        opt = _InPlaceRecordingPersistent()
+        opt.set_instance(m)
+        m.p = 3
+        self.assertEqual(opt.update_params(), 2)
+        self.assertEqual(len(opt._param_repn_cache), 2)
+
+        # the templates of removed constraints are discarded
+        opt.remove_constraint(m.c1)
+        self.assertEqual(len(opt._param_repn_cache), 1)
+
+        # as are the templates of constraints given a new expression
+        body = m.c2.body
+        m.c2.set_value(m.q*m.x[1] + m.x[2]**2 <= m.p)
+        self.assertIsNot(m.c2.body, body)
+        m.p = 4
+        self.assertEqual(opt.update_params(), 1)
+        self.assertEqual(len(opt._param_repn_cache), 1)
+        opt.remove_constraint(m.c2)
+        self.assertEqual(len(opt._param_repn_cache), 0)
+
+    def test_objective_coefficients(self):
+        m = self._model()
+        m.r = Param(mutable=True, initialize=1)
+        m.e = Expression(expr=m.r*(m.x[1] - m.p)**2)
+        m.o.set_value(m.x[1] + m.q*m.x[2] + m.e)
+        opt = _ObjectiveRecordingPersistent()
+        opt.set_instance(m)
+        self.assertEqual(opt.log[-1], ('set_obj', 'o'))
+        del opt.log[:]
+
+        # setting the same objective again only updates its coefficients
+        m.r = 2
+        opt.set_objective(m.o)
+        self.assertEqual(opt.log, [('chg_obj', 'o',
+                                    (('x[1]', -7),),
+                                    ((('x[1]', 'x[1]'), 2),),
+                                    8)])
+        del opt.log[:]
+
+        m.q = 3
+        self.assertEqual(opt.update_params(), 2)
+        self.assertEqual(opt.log[-1], ('chg_obj', 'o',
+                                       (('x[1]', -7), ('x[2]', 3)),
+                                       ((('x[1]', 'x[1]'), 2),),
+                                       8))
+        del opt.log[:]
+
+        # the compiled objective is updated when an expression changes
+        m.e = m.r*m.x[2]
+        opt.set_objective(m.o)
+        self.assertEqual(opt.log, [('chg_obj', 'o',
+                                    (('x[1]', 1), ('x[2]', 5)),
+                                    (),
+                                    0)])
+        del opt.log[:]
+
+        m.o2 = Objective(expr=m.x[2])
+        m.o.deactivate()
+        opt.set_objective(m.o2)
+        self.assertEqual(opt.log, [('set_obj', 'o2')])
+
+    def test_update_params_requires_instance(self):
+        opt = _RecordingPersistent()
+        self.assertRaises(RuntimeError, opt.update_params)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+import pyutilib.th as unittest
+from pyomo.environ import *
+
+try:
+    import cplex
+    cplexpy_available = True
+except ImportError:
+    cplexpy_available = False
+
+try:
+    import gurobipy
+    gurobipy_available = True
+except ImportError:
+    gurobipy_available = False
+
+
+class PersistentBulkAddTests(object):
+
+    solver_name = None
+
+    def _model(self):
+        m = ConcreteModel()
+        m.x = Var([1, 2, 3], bounds=(0, 10))
+        m.y = Var(within=NonNegativeReals)
+        m.z = Var()
+        m.z.fix(1)
+        m.c = ConstraintList()
+        m.c.add(m.x[1] + m.x[2] >= 2*m.z)
+        m.c.add((1, m.x[2] - m.x[3], 4))
+        m.c.add(m.x[1] + m.y == 3)
+        m.c.add(m.x[3]**2 <= 9)
+        m.c.add(m.y <= 2)
+        m.o = Objective(expr=m.x[1] + 2*m.x[2] + m.x[3] + 3*m.y)
+        return m
+
+    def test_set_instance(self):
+        m = self._model()
+        opt = SolverFactory(self.solver_name)
+        opt.set_instance(m)
+        opt.solve()
+        self.assertAlmostEqual(value(m.o), 5)
+        self.assertAlmostEqual(m.x[1].value, 3)
+        self.assertAlmostEqual(m.y.value, 0)
+        for con in m.c.values():
+            self.assertIn(con, opt._pyomo_con_to_solver_con_map)
+
+    def test_add_vars_and_constraints(self):
+        m = self._model()
+        opt = SolverFactory(self.solver_name)
+        opt.set_instance(m)
+        m.w = Var([1, 2], bounds=(1, 5))
+        opt.add_vars(m.w.values())
+        m.d = ConstraintList()
+        m.d.add(m.x[1] >= m.w[1])
+        m.d.add((2, m.w[1] + m.w[2], 3))
+        opt.add_constraints(m.d.values())
+        m.o.deactivate()
+        m.o2 = Objective(expr=m.o.expr + m.w[1] + m.w[2])
+        opt.set_objective(m.o2)
+        opt.solve()
+        self.assertAlmostEqual(value(m.o2), 7)
+
+        opt.remove_constraint(m.d[2])
+        opt.remove_constraint(m.d[1])
+        for v in m.w.values():
+            self.assertEqual(opt._referenced_variables[v], 1)
+
+    def test_update_params(self):
+        m = self._model()
+        m.p = Param(mutable=True, initialize=1)
+        m.d = Constraint(expr=m.p*m.x[1] + m.x[2] >= 2*m.p)
+        m.r = Constraint(expr=(0, m.x[3] - m.p*m.y, 10*m.p))
+        opt = SolverFactory(self.solver_name)
+        opt.set_instance(m)
+        opt.solve()
+        self.assertAlmostEqual(value(m.o), 5)
+
+        m.p = 4
+        self.assertEqual(opt.update_params(), 2)
+        opt.solve()
+        self.assertAlmostEqual(m.x[1].value, 3)
+        self.assertAlmostEqual(m.x[2].value, 1)
+        self.assertAlmostEqual(value(m.o), 5)
+        self.assertEqual(opt.update_params(), 0)
+
+
+@unittest.skipIf(not cplexpy_available,
+                 "The 'cplex' python bindings are not available")
+class CPLEXPersistentBulkAddTests(PersistentBulkAddTests, unittest.TestCase):
+    solver_name = 'cplex_persistent'
+
+    def test_add_constraints_error(self):
+        m = self._model()
+        opt = SolverFactory(self.solver_name)
+        opt.set_instance(m)
+        m.d = ConstraintList()
+        m.d.add(m.x[1] >= 1)
+        m.d.add(m.x[2] + m.y <= 4)
+        def add(*args, **kwds):
+            raise cplex.exceptions.CplexError("failed")
+        opt._solver_model.linear_constraints.add = add
+        self.assertRaises(cplex.exceptions.CplexError,
+                          opt.add_constraints, m.d.values())
+        for con in m.d.values():
+            self.assertNotIn(con, opt._pyomo_con_to_solver_con_map)
+        self.assertEqual(opt._referenced_variables[m.y], 3)
+
+
+@unittest.skipIf(not gurobipy_available,
+                 "The 'gurobipy' python bindings are not available")
+class GurobiPersistentBulkAddTests(PersistentBulkAddTests, unittest.TestCase):
+    solver_name = 'gurobi_persistent'
+
+
+if __name__ == "__main__":
+    unittest.main()
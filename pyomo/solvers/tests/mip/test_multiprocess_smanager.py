@@ -0,0 +1,148 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+#
+# Test the multiprocess solver manager
+#
+
+import os
+import re
+import multiprocessing
+
+import pyutilib.th as unittest
+import pyutilib.misc
+import pyutilib.services
+
+from pyomo.environ import (ConcreteModel, Var, Constraint, Objective,
+                           SolverFactory, SolverManagerFactory)
+from pyomo.opt import (SolverResults, SolverStatus, TerminationCondition,
+                       SolutionStatus, ProblemFormat)
+from pyomo.opt.solver import SystemCallSolver
+from pyomo.opt.parallel.manager import (ActionManagerError, ActionStatus,
+                                        FailedActionHandle)
+
+currdir = os.path.dirname(os.path.abspath(__file__))
+
+multiprocess_available = 'multiprocess' in SolverManagerFactory
+try:
+    fork_available = multiprocessing.get_start_method() == 'fork'
+except AttributeError:
+    fork_available = False
+
+old_tempdir = None
+def setUpModule():
+    global old_tempdir
+    old_tempdir = pyutilib.services.TempfileManager.tempdir
+    pyutilib.services.TempfileManager.tempdir = currdir
+
+def tearDownModule():
+    pyutilib.services.TempfileManager.tempdir = old_tempdir
+
+
+@SolverFactory.register('_mp_test_solver', doc='A solver used to test the multiprocess solver manager')
+class _MPTestSolver(SystemCallSolver):
+    """Sets every bounded variable in an LP file to the id of the solver process"""
+
+    def __init__(self, **kwds):
+        kwds['type'] = '_mp_test_solver'
+        SystemCallSolver.__init__(self, **kwds)
+        self._valid_problem_formats = [ProblemFormat.cpxlp]
+        self.set_problem_format(ProblemFormat.cpxlp)
+
+    def available(self, exception_flag=False):
+        return True
+
+    def executable(self):
+        return 'mp_test_solver'
+
+    def _default_results_format(self, prob_format):
+        return None
+
+    def create_command_line(self, executable, problem_files):
+        self._test_problem_file = problem_files[0]
+        return pyutilib.misc.Bunch(cmd=[executable], log_file=None, env=None)
+
+    def _apply_solver(self):
+        return pyutilib.misc.Bunch(rc=0, log='')
+
+    def _postsolve(self):
+        with open(self._test_problem_file) as f:
+            names = re.findall(r'<= (x\d+) <=', f.read())
+        SystemCallSolver._postsolve(self)
+        results = SolverResults()
+        results.solver.status = SolverStatus.ok
+        results.solver.termination_condition = TerminationCondition.optimal
+        soln = results.solution.add()
+        soln.status = SolutionStatus.optimal
+        for name in names:
+            soln.variable[name] = {'Value': float(os.getpid())}
+        return results
+
+
+@unittest.skipIf(not multiprocess_available,
+                 "The multiprocess solver manager is not available")
+class TestMultiprocessSolverManager(unittest.TestCase):
+
+    def _model(self, ub):
+        m = ConcreteModel()
+        m.x = Var(bounds=(0, ub))
+        m.y = Var(bounds=(0, 1))
+        m.c = Constraint(expr=m.x + m.y <= ub)
+        m.o = Objective(expr=-m.x - m.y)
+        return m
+
+    def test_errors(self):
+        with SolverManagerFactory('multiprocess') as mngr:
+            self.assertRaises(ActionManagerError, mngr.queue, self._model(1))
+            # direct solvers do not write problem files
+            self.assertRaises(ActionManagerError, mngr.queue, self._model(1),
+                              opt=SolverFactory('gurobi_direct'))
+            self.assertEqual(mngr.wait_any(), FailedActionHandle)
+
+    @unittest.skipIf(not fork_available,
+                     "The test solver is only registered in forked processes")
+    def test_solve_all(self):
+        instances = [self._model(i+1) for i in range(4)]
+        with SolverManagerFactory('multiprocess', max_workers=2) as mngr:
+            mngr.solve_all('_mp_test_solver', instances)
+        pids = set()
+        for m in instances:
+            self.assertIsNotNone(m.x.value)
+            self.assertEqual(m.x.value, m.y.value)
+            pids.add(m.x.value)
+        self.assertNotIn(float(os.getpid()), pids)
+
+    @unittest.skipIf(not fork_available,
+                     "The test solver is only registered in forked processes")
+    def test_queue_and_wait(self):
+        instances = [self._model(i+1) for i in range(3)]
+        opt = SolverFactory('_mp_test_solver')
+        with SolverManagerFactory('multiprocess') as mngr:
+            handles = [mngr.queue(m, opt=opt, load_solutions=(i != 1))
+                       for i, m in enumerate(instances)]
+            self.assertEqual(mngr.num_queued(), 3)
+            done = set()
+            while len(done) < 3:
+                ah = mngr.wait_any()
+                self.assertEqual(mngr.get_status(ah), ActionStatus.done)
+                done.add(ah)
+            self.assertEqual(done, set(handles))
+            self.assertEqual(mngr.num_queued(), 0)
+
+            results = mngr.get_results(handles[1])
+            self.assertIsNone(instances[1].x.value)
+            self.assertEqual(len(results.solution), 1)
+            instances[1].solutions.load_from(results)
+            self.assertIsNotNone(instances[1].x.value)
+            self.assertEqual(len(mngr.get_results(handles[0]).solution), 0)
+            self.assertIsNotNone(instances[0].x.value)
+
+
+if __name__ == "__main__":
+    unittest.main()
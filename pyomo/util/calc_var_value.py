@@ -9,6 +9,7 @@
 #  ___________________________________________________________________________
 
 from pyomo.core.expr.numvalue import native_numeric_types, value
+from pyomo.core.expr.compiler import compile_expression
 from pyomo.core.base.symbolic import differentiate
 
 import logging
@@ -137,6 +138,18 @@ def calculate_variable_from_constraint(variable, constraint,
             'Initial value for variable results in a derivative value that is '
             'very close to zero.\n\tPlease provide a different initial guess.')
 
+    # The residual and its derivative are evaluated at every Newton
+    # (and line search) iteration: compile them once
+    expr_value = compile_expression(expr)
+    expr_deriv_value = compile_expression(expr_deriv)
+
+    def _residual():
+        # Equivalent to value(expr, exception=False)
+        try:
+            return expr_value()
+        except (ValueError, TypeError):
+            return None
+
     iter_left = iterlim
     fk = residual_1 - upper
     while abs(fk) > eps and iter_left:
@@ -149,7 +162,7 @@ def calculate_variable_from_constraint(variable, constraint,
         # compute step
         xk = value(variable)
         try:
-            fk = value(expr)
+            fk = expr_value()
             if type(fk) is complex:
                 raise ValueError(
                     "Complex numbers are not allowed in Newton's method.")
@@ -161,7 +174,7 @@ def calculate_variable_from_constraint(variable, constraint,
                 "expression.\n\tPlease provide a different initial guess "
                 "or enable the linesearch if you have not.")
             raise
-        fpk = value(expr_deriv)
+        fpk = expr_deriv_value()
         if abs(fpk) < 1e-12:
             raise RuntimeError(
                 "Newton's method encountered a derivative that was too "
@@ -178,7 +191,7 @@ def calculate_variable_from_constraint(variable, constraint,
             while alpha > alpha_min:
                 # check if the value at xkp1 has sufficient reduction in
                 # the residual
-                fkp1 = value(expr, exception=False)
+                fkp1 = _residual()
                 # HACK for Python3 support, pending resolution of #879
                 # Issue #879 also pertains to other checks for "complex"
                 # in this method.
@@ -195,7 +208,7 @@ def calculate_variable_from_constraint(variable, constraint,
                 variable.set_value(xkp1)
 
             if alpha <= alpha_min:
-                residual = value(expr, exception=False)
+                residual = _residual()
                 if residual is None or type(residual) is complex:
                     residual = "{function evaluation error}"
                 raise RuntimeError(